@@ -5,6 +5,7 @@ Protected with permission-based access control.
 """
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Optional, Dict, Any
+from app.core.auth import invalidate_user_cache
 from app.core.database import get_client
 from app.core.permissions import Permission, require_permissions
 from app.core.exceptions import NotFoundError, ForbiddenError
@@ -120,6 +121,7 @@ async def update_user_role(request: UserRoleUpdate):
     try:
         client = get_client()
         client.table("profiles").update({"role": request.role}).eq("id", request.user_id).execute()
+        invalidate_user_cache(request.user_id)
         return {"message": "User role updated successfully"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -744,6 +746,7 @@ async def admin_update_user_profile(user_id: str, data: AdminProfileUpdate):
 
         # Update profile in database
         result = client.table("profiles").update(update_data).eq("id", user_id).execute()
+        invalidate_user_cache(user_id)
 
         return {
             "success": True,
@@ -861,6 +864,7 @@ async def bulk_user_action(request: BulkUserAction):
 
             for user_id in request.user_ids:
                 client.table("profiles").update({column: True}).eq("id", user_id).execute()
+                invalidate_user_cache(user_id)
                 affected_count += 1
             message = f"Role '{request.role}' added to {affected_count} users"
 
@@ -874,6 +878,7 @@ async def bulk_user_action(request: BulkUserAction):
 
             for user_id in request.user_ids:
                 client.table("profiles").update({column: False}).eq("id", user_id).execute()
+                invalidate_user_cache(user_id)
                 affected_count += 1
             message = f"Role '{request.role}' removed from {affected_count} users"
 
@@ -1307,6 +1312,7 @@ async def update_user_roles(update: UserRolesUpdate):
             update_data["alpha_tester_since"] = None
 
         client.table("profiles").update(update_data).eq("id", update.user_id).execute()
+        invalidate_user_cache(update.user_id)
 
         return {"message": "Roles updated successfully", "roles": update.roles}
     except Exception as e:
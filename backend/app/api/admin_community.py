@@ -14,6 +14,7 @@ from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime, timezone, timedelta
 from app.core.database import execute_query, execute_single, execute_insert, execute_update, execute_delete
+from app.core.auth import get_cognito_user_from_token
 import uuid
 
 
@@ -24,28 +25,9 @@ router = APIRouter()
 # AUTH HELPERS
 # =====================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 async def require_admin(authorization: str = Header(None)) -> Dict[str, Any]:
     """Require admin access for endpoint"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     profile = execute_single(
         "SELECT is_admin, is_superadmin, is_moderator FROM profiles WHERE id = :id",
@@ -4,35 +4,22 @@ Endpoints for monitoring and managing user storage quotas
 """
 from fastapi import APIRouter, HTTPException, Header
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional
 from datetime import datetime
 
 from app.core.database import get_client
+from app.core.auth import get_cognito_user_from_token
 
 router = APIRouter()
 
 
-async def get_current_user_from_token(token: str) -> Dict[str, Any]:
-    """Extract and validate user from token"""
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "sub": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 async def require_admin(authorization: str) -> dict:
     """Verify user is admin"""
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing authorization")
 
     token = authorization.replace("Bearer ", "")
-    user = await get_current_user_from_token(token)
+    user = await get_cognito_user_from_token(token)
 
     if not user:
         raise HTTPException(status_code=401, detail="Invalid token")
@@ -4,37 +4,24 @@ Endpoints for admin user creation and management
 """
 from fastapi import APIRouter, HTTPException, Header
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List, Dict, Any
+from typing import Optional, List
 from datetime import datetime
 import secrets
 import string
 
+from app.core.auth import invalidate_user_cache, get_cognito_user_from_token
 from app.core.database import get_client, get_db_session
 
 router = APIRouter()
 
 
-async def get_current_user_from_token(token: str) -> Dict[str, Any]:
-    """Extract and validate user from token"""
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "sub": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 async def require_admin(authorization: str) -> dict:
     """Verify user is admin"""
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing authorization")
 
     token = authorization.replace("Bearer ", "")
-    user = await get_current_user_from_token(token)
+    user = await get_cognito_user_from_token(token)
 
     if not user:
         raise HTTPException(status_code=401, detail="Invalid token")
@@ -418,6 +405,7 @@ async def update_user(user_id: str, data: UpdateUserRequest, authorization: str
         update_data["bio"] = data.bio
 
     result = client.table("profiles").update(update_data).eq("id", user_id).execute()
+    invalidate_user_cache(user_id)
 
     if not result.data:
         raise HTTPException(status_code=404, detail="User not found")
@@ -546,6 +534,7 @@ async def change_user_email(user_id: str, data: ChangeEmailRequest, authorizatio
             "email": data.new_email,
             "updated_at": datetime.utcnow().isoformat()
         }).eq("id", user_id).execute()
+        invalidate_user_cache(user_id)
 
         return {
             "success": True,
@@ -717,7 +706,8 @@ async def delete_user(user_id: str, authorization: str = Header(None)):
 
             # Delete the profile in the same transaction
             db.execute(text('DELETE FROM profiles WHERE id = :uid'), {"uid": user_id})
-            db.commit()
+
+        invalidate_user_cache(user_id)
 
         return {
             "success": True,
@@ -8,7 +8,7 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 
 from app.core.database import get_client
-from app.api.community import get_current_user_from_token
+from app.core.auth import get_cognito_user_from_token
 
 router = APIRouter()
 
@@ -58,7 +58,7 @@ async def list_templates(
 
     print(f"[application_templates] Authorization header: {authorization[:50] if authorization else 'None'}...")
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     # Convert Cognito ID to profile UUID
@@ -87,7 +87,7 @@ async def create_template(
     """Create a new application template"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="Profile not found")
@@ -137,7 +137,7 @@ async def get_template(
     """Get a single template"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="Profile not found")
@@ -169,7 +169,7 @@ async def update_template(
     """Update an application template"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="Profile not found")
@@ -237,7 +237,7 @@ async def delete_template(
     """Delete an application template"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="Profile not found")
@@ -271,7 +271,7 @@ async def set_default_template(
     """Set a template as the default"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="Profile not found")
@@ -314,7 +314,7 @@ async def record_template_use(
     """Record that a template was used (increments use_count)"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="Profile not found")
@@ -20,13 +20,6 @@ from app.services.breakdown_pdf_service import (
     generate_project_breakdown_pdf,
 )
 
-# Excel export is optional - only available if openpyxl is installed
-try:
-    from app.services.excel_service import generate_call_sheet_excel
-    EXCEL_EXPORT_AVAILABLE = True
-except ImportError:
-    EXCEL_EXPORT_AVAILABLE = False
-    generate_call_sheet_excel = None
 from fastapi.responses import Response
 import uuid
 import re
@@ -36,8 +29,7 @@ import tempfile
 import requests
 import secrets
 import hashlib
-from pypdf import PdfReader
-from app.core.database import get_client, execute_single, execute_query, execute_insert
+from app.core.database import get_client, execute_single, execute_query, execute_insert, execute_reorder
 from app.core.config import settings
 from app.core.storage import upload_file, get_signed_url, generate_unique_filename, BACKLOT_FILES_BUCKET, download_from_s3_uri
 from app.core.quota_enforcement import (
@@ -45,6 +37,8 @@ from app.core.quota_enforcement import (
     enforce_bandwidth_limit,
     record_bandwidth_usage,
 )
+from app.core.auth import get_current_user_from_token
+from app.core.backlot_permissions import invalidate_permission_cache
 from app.socketio_app import get_user_from_token
 
 router = APIRouter()
@@ -1594,46 +1588,6 @@ class CallSheetSendHistory(BaseModel):
 # Helper Functions
 # =====================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token using AWS Cognito.
-    Returns the profile ID (not Cognito ID) for database lookups.
-    """
-    if not authorization or not authorization.startswith("Bearer "):
-        print("[AUTH] Missing or invalid authorization header")
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            print("[AUTH] Token verification returned None")
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        # Try 'user_id', 'sub', and 'id' as Cognito might return any of these
-        cognito_id = user.get("user_id") or user.get("sub") or user.get("id")
-        email = user.get("email")
-
-        if not cognito_id:
-            print(f"[AUTH] No cognito_id found in user object: {list(user.keys())}")
-            raise HTTPException(status_code=401, detail="No user ID in token")
-
-        # Convert Cognito ID to profile ID for database lookups
-        profile_id = get_profile_id_from_cognito_id(cognito_id)
-        if not profile_id:
-            print(f"[AUTH] No profile found for cognito_id: {cognito_id}")
-            raise HTTPException(status_code=401, detail="User profile not found")
-
-        # Return both 'id' and 'user_id' to handle both access patterns
-        return {"id": profile_id, "user_id": profile_id, "cognito_id": cognito_id, "email": email}
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"[AUTH] Authentication exception: {type(e).__name__}: {str(e)}")
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 async def check_storage_quota(user_id: str, file_size: int = 0) -> Dict[str, Any]:
     """Check if user has available storage quota for upload.
 
@@ -3415,8 +3369,7 @@ async def reorder_call_sheet_scenes(
     await verify_project_access(client, project_id, user_id, require_edit=True)
 
     # Update sort orders
-    for index, scene_id in enumerate(scene_ids):
-        client.table("backlot_call_sheet_scenes").update({"sort_order": index}).eq("id", scene_id).eq("call_sheet_id", call_sheet_id).execute()
+    execute_reorder("backlot_call_sheet_scenes", scene_ids, start=0, scope={"call_sheet_id": call_sheet_id})
 
     return {"success": True, "message": "Scenes reordered"}
 
@@ -3936,8 +3889,11 @@ async def download_call_sheet_excel(
     - Scenes: Scene breakdown
     - Locations: Location details with contacts
     """
-    # Check if Excel export is available
-    if not EXCEL_EXPORT_AVAILABLE or generate_call_sheet_excel is None:
+    # Excel export is optional - only available if openpyxl is installed.
+    # Imported here so openpyxl isn't loaded with the router.
+    try:
+        from app.services.excel_service import generate_call_sheet_excel
+    except ImportError:
         raise HTTPException(
             status_code=501,
             detail="Excel export is not available. Please install openpyxl: pip install openpyxl"
@@ -13978,8 +13934,7 @@ async def reorder_scenes(
             raise HTTPException(status_code=403, detail="You don't have permission to reorder scenes")
 
     try:
-        for idx, scene_id in enumerate(scene_ids):
-            client.table("backlot_scenes").update({"sequence": idx + 1}).eq("id", scene_id).eq("project_id", project_id).execute()
+        execute_reorder("backlot_scenes", scene_ids, column="sequence", scope={"project_id": project_id})
 
         return {"success": True, "message": f"Reordered {len(scene_ids)} scenes"}
 
@@ -16000,6 +15955,7 @@ async def create_script_highlight(
                         tmp_file_path = tmp_file.name
 
                     # Extract text from each page and search for the highlighted text
+                    from pypdf import PdfReader
                     reader = PdfReader(tmp_file_path)
                     print(f"DEBUG: PDF has {len(reader.pages)} pages")
                     search_text = label.lower()
@@ -36246,6 +36202,7 @@ async def assign_member_role(
         result = client.table("backlot_project_roles").upsert(
             role_data, on_conflict="project_id,user_id,backlot_role"
         ).execute()
+        invalidate_permission_cache(project_id, input.user_id)
 
         if result.data:
             role = result.data[0]
@@ -36282,6 +36239,7 @@ async def remove_member_role(
         await verify_project_access(client, str(project_id), user["id"])
 
         client.table("backlot_project_roles").delete().eq("id", role_id).execute()
+        invalidate_permission_cache(project_id)
 
         return {"success": True, "message": "Role removed"}
 
@@ -36325,6 +36283,7 @@ async def set_primary_member_role(
         result = client.table("backlot_project_roles").update(
             {"is_primary": True}
         ).eq("id", role_id).execute()
+        invalidate_permission_cache(project_id, role_user_id)
 
         if result.data:
             return result.data[0]
@@ -46429,6 +46388,259 @@ async def confirm_desktop_dailies_upload(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ==================== Desktop Dailies Multipart Upload ====================
+#
+# Camera originals run to tens of GB per clip, past what one presigned PUT
+# (5GB) or one request body in memory can carry. These mirror the
+# project_files multipart flow (initiate / part-url / complete / abort) for the
+# desktop helper's API key, storing the file as a standalone asset exactly
+# like /dailies/upload-url so confirm-upload and register-clips are unchanged.
+
+DESKTOP_MULTIPART_MIN_PART = 8 * 1024 * 1024  # S3 minimum is 5MB
+DESKTOP_MULTIPART_MAX_PART = 512 * 1024 * 1024
+DESKTOP_MULTIPART_MAX_PARTS = 10000  # S3 limit
+DESKTOP_MULTIPART_MAX_URLS = 100  # part URLs per request
+
+
+class DesktopMultipartInitiate(BaseModel):
+    project_id: str
+    file_name: str
+    content_type: str = "application/octet-stream"
+    file_size: int = Field(..., gt=0)
+    part_size: Optional[int] = None
+
+
+class DesktopMultipartPartUrls(BaseModel):
+    project_id: str
+    s3_key: str
+    upload_id: str
+    part_numbers: List[int]
+
+
+class DesktopMultipartComplete(BaseModel):
+    project_id: str
+    s3_key: str
+    upload_id: str
+    parts: List[Dict[str, Any]]  # [{partNumber, etag}]
+
+
+class DesktopMultipartUpload(BaseModel):
+    project_id: str
+    s3_key: str
+    upload_id: str
+
+
+def _desktop_part_size(file_size: int, requested: Optional[int]) -> int:
+    """Requested part size clamped to S3 limits, grown so the file fits in 10,000 parts."""
+    part_size = min(max(requested or 0, DESKTOP_MULTIPART_MIN_PART), DESKTOP_MULTIPART_MAX_PART)
+    needed = -(-file_size // DESKTOP_MULTIPART_MAX_PARTS)
+    if needed > part_size:
+        mb = 1024 * 1024
+        part_size = -(-needed // mb) * mb
+    return part_size
+
+
+def _check_desktop_upload_key(project_id: str, s3_key: str):
+    """Multipart calls may only touch the project's own standalone asset keys."""
+    # A ".." segment could escape the prefix; ".." inside a file name is fine
+    if not s3_key.startswith(f"projects/{project_id}/assets/") or ".." in s3_key.split("/"):
+        raise HTTPException(status_code=403, detail="Upload key does not belong to this project")
+
+
+@router.post("/desktop-keys/dailies/multipart/initiate")
+async def initiate_desktop_dailies_multipart(
+    request: DesktopMultipartInitiate,
+    x_api_key: str = Header(None, alias="X-API-Key")
+):
+    """
+    Start a multipart dailies upload from the desktop helper.
+    Returns the upload_id, S3 key and the part size the client must use.
+    """
+    from app.core.storage import s3_client
+
+    user_id = await verify_desktop_key_and_project_access(x_api_key, request.project_id)
+    if request.file_size > DESKTOP_MULTIPART_MAX_PART * DESKTOP_MULTIPART_MAX_PARTS:
+        raise HTTPException(status_code=400, detail="File too large for multipart upload")
+
+    await check_storage_quota(user_id, request.file_size)
+    _enforce_org_storage(request.project_id, request.file_size)
+
+    try:
+        project_id = request.project_id
+        standalone_asset_id = str(uuid.uuid4())
+        s3_key = f"projects/{project_id}/assets/{standalone_asset_id}/{request.file_name}"
+        part_size = _desktop_part_size(request.file_size, request.part_size)
+
+        response = s3_client.create_multipart_upload(
+            Bucket=BACKLOT_FILES_BUCKET,
+            Key=s3_key,
+            ContentType=request.content_type,
+        )
+
+        file_ext = request.file_name.rsplit('.', 1)[-1].lower() if '.' in request.file_name else ''
+        is_video = request.content_type.startswith('video/') or file_ext in ('mp4', 'mov', 'avi', 'webm', 'mkv', 'mxf', 'braw', 'ari', 'r3d')
+        asset_name = request.file_name.rsplit('.', 1)[0] if '.' in request.file_name else request.file_name
+        get_client().table("backlot_standalone_assets").insert({
+            "id": standalone_asset_id,
+            "project_id": project_id,
+            "name": asset_name,
+            "asset_type": "video" if is_video else "other",
+            "file_name": request.file_name,
+            "s3_key": s3_key,
+            "mime_type": request.content_type,
+            "file_size_bytes": request.file_size,
+            "tags": [],
+            "metadata": {},
+            "created_by_user_id": user_id,
+        }).execute()
+
+        return {
+            "upload_id": response["UploadId"],
+            "key": s3_key,
+            "s3_key": s3_key,
+            "standalone_asset_id": standalone_asset_id,
+            "bucket": BACKLOT_FILES_BUCKET,
+            "part_size": part_size,
+            "total_parts": -(-request.file_size // part_size),
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error initiating desktop multipart upload: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/desktop-keys/dailies/multipart/part-urls")
+async def get_desktop_dailies_part_urls(
+    request: DesktopMultipartPartUrls,
+    x_api_key: str = Header(None, alias="X-API-Key")
+):
+    """Presigned upload_part URLs for a batch of part numbers."""
+    from app.core.storage import s3_client
+
+    await verify_desktop_key_and_project_access(x_api_key, request.project_id)
+    _check_desktop_upload_key(request.project_id, request.s3_key)
+
+    if not request.part_numbers or len(request.part_numbers) > DESKTOP_MULTIPART_MAX_URLS:
+        raise HTTPException(status_code=400, detail=f"Request 1-{DESKTOP_MULTIPART_MAX_URLS} parts at a time")
+    if any(n < 1 or n > DESKTOP_MULTIPART_MAX_PARTS for n in request.part_numbers):
+        raise HTTPException(status_code=400, detail="Part numbers must be 1-10000")
+
+    try:
+        urls = {
+            str(n): s3_client.generate_presigned_url(
+                "upload_part",
+                Params={
+                    "Bucket": BACKLOT_FILES_BUCKET,
+                    "Key": request.s3_key,
+                    "UploadId": request.upload_id,
+                    "PartNumber": n,
+                },
+                ExpiresIn=3600,
+            )
+            for n in request.part_numbers
+        }
+        return {"urls": urls, "expires_in": 3600}
+    except Exception as e:
+        print(f"Error generating desktop part URLs: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/desktop-keys/dailies/multipart/parts")
+async def list_desktop_dailies_parts(
+    request: DesktopMultipartUpload,
+    x_api_key: str = Header(None, alias="X-API-Key")
+):
+    """Parts S3 already holds for an upload, so an interrupted upload can resume."""
+    from app.core.storage import s3_client
+
+    await verify_desktop_key_and_project_access(x_api_key, request.project_id)
+    _check_desktop_upload_key(request.project_id, request.s3_key)
+
+    parts = []
+    marker = 0
+    try:
+        while True:
+            response = s3_client.list_parts(
+                Bucket=BACKLOT_FILES_BUCKET,
+                Key=request.s3_key,
+                UploadId=request.upload_id,
+                PartNumberMarker=marker,
+            )
+            parts.extend(
+                {"partNumber": p["PartNumber"], "etag": p["ETag"], "size": p["Size"]}
+                for p in response.get("Parts", [])
+            )
+            if not response.get("IsTruncated"):
+                break
+            marker = response["NextPartNumberMarker"]
+    except s3_client.exceptions.NoSuchUpload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except Exception as e:
+        print(f"Error listing desktop multipart parts: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {"parts": parts}
+
+
+@router.post("/desktop-keys/dailies/multipart/complete")
+async def complete_desktop_dailies_multipart(
+    request: DesktopMultipartComplete,
+    x_api_key: str = Header(None, alias="X-API-Key")
+):
+    """Assemble the uploaded parts. Follow with confirm-upload as for a single PUT."""
+    from app.core.storage import s3_client
+
+    await verify_desktop_key_and_project_access(x_api_key, request.project_id)
+    _check_desktop_upload_key(request.project_id, request.s3_key)
+
+    try:
+        parts = sorted(
+            ({"PartNumber": int(p["partNumber"]), "ETag": p["etag"]} for p in request.parts),
+            key=lambda p: p["PartNumber"],
+        )
+        response = s3_client.complete_multipart_upload(
+            Bucket=BACKLOT_FILES_BUCKET,
+            Key=request.s3_key,
+            UploadId=request.upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+        return {"success": True, "s3_key": request.s3_key, "etag": response.get("ETag")}
+    except s3_client.exceptions.NoSuchUpload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except Exception as e:
+        print(f"Error completing desktop multipart upload: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/desktop-keys/dailies/multipart/abort")
+async def abort_desktop_dailies_multipart(
+    request: DesktopMultipartUpload,
+    x_api_key: str = Header(None, alias="X-API-Key")
+):
+    """Abort a multipart upload and drop its standalone asset record."""
+    from app.core.storage import s3_client
+
+    await verify_desktop_key_and_project_access(x_api_key, request.project_id)
+    _check_desktop_upload_key(request.project_id, request.s3_key)
+
+    try:
+        s3_client.abort_multipart_upload(
+            Bucket=BACKLOT_FILES_BUCKET,
+            Key=request.s3_key,
+            UploadId=request.upload_id,
+        )
+    except Exception as e:
+        print(f"Warning: Failed to abort S3 multipart upload: {e}")
+
+    get_client().table("backlot_standalone_assets").delete().eq(
+        "s3_key", request.s3_key
+    ).eq("project_id", request.project_id).execute()
+
+    return {"success": True}
+
+
 @router.post("/desktop-keys/dailies/register-clips")
 async def register_desktop_dailies_clips(
     request: dict,
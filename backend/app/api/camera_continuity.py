@@ -4,10 +4,11 @@ Provides CRUD operations for on-set camera tracking and continuity management
 """
 from fastapi import APIRouter, HTTPException, Header, Query
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional
 from datetime import datetime, date
 from app.core.database import get_client, execute_single
 from app.core.backlot_permissions import can_edit_tab, can_view_tab
+from app.core.auth import get_cognito_user_from_token
 import logging
 
 logger = logging.getLogger(__name__)
@@ -204,26 +205,6 @@ class UpdateContinuityNoteRequest(BaseModel):
 # HELPERS
 # =============================================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 async def verify_project_member(client, project_id: str, user_id: str) -> bool:
     """Verify user is a member of the project"""
     user_id_str = str(user_id)
@@ -250,7 +231,7 @@ async def get_shot_list(
     authorization: str = Header(None)
 ):
     """Get shot list for a project with optional filters"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -282,7 +263,7 @@ async def create_shot(
     authorization: str = Header(None)
 ):
     """Create a new shot in the shot list"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -329,7 +310,7 @@ async def update_shot(
     authorization: str = Header(None)
 ):
     """Update an existing shot"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -363,7 +344,7 @@ async def delete_shot(
     authorization: str = Header(None)
 ):
     """Delete a shot from the shot list"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -395,7 +376,7 @@ async def get_slate_logs(
     authorization: str = Header(None)
 ):
     """Get slate logs for a project with optional filters"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -428,7 +409,7 @@ async def create_slate_log(
     authorization: str = Header(None)
 ):
     """Log a new take/slate"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -473,7 +454,7 @@ async def update_slate_log(
     authorization: str = Header(None)
 ):
     """Update an existing slate log"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -507,7 +488,7 @@ async def delete_slate_log(
     authorization: str = Header(None)
 ):
     """Delete a slate log"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -535,7 +516,7 @@ async def get_next_take_number(
     authorization: str = Header(None)
 ):
     """Get the next take number for a scene/shot combination"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -574,7 +555,7 @@ async def get_camera_media(
     authorization: str = Header(None)
 ):
     """Get camera media items for a project with optional filters"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -606,7 +587,7 @@ async def create_camera_media(
     authorization: str = Header(None)
 ):
     """Register a new camera media item (card, SSD, etc.)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -651,7 +632,7 @@ async def update_camera_media(
     authorization: str = Header(None)
 ):
     """Update camera media status and details"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -688,7 +669,7 @@ async def delete_camera_media(
     authorization: str = Header(None)
 ):
     """Delete a camera media item"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -724,7 +705,7 @@ async def get_continuity_notes(
     authorization: str = Header(None)
 ):
     """Get continuity notes for a project with optional filters"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -758,7 +739,7 @@ async def create_continuity_note(
     authorization: str = Header(None)
 ):
     """Create a new continuity note"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -803,7 +784,7 @@ async def update_continuity_note(
     authorization: str = Header(None)
 ):
     """Update an existing continuity note"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -840,7 +821,7 @@ async def delete_continuity_note(
     authorization: str = Header(None)
 ):
     """Delete a continuity note"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Get profile ID from Cognito ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -4,10 +4,11 @@ Provides fast, painless camera notes for production days
 """
 from fastapi import APIRouter, HTTPException, Header, Query
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional
 from datetime import datetime
 from app.core.database import get_client, execute_single, execute_query
 from app.core.backlot_permissions import can_edit_tab, can_view_tab
+from app.core.auth import get_cognito_user_from_token
 import traceback
 import logging
 
@@ -15,30 +16,10 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[CameraLog] Authentication failed: {str(e)}")
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 def get_profile_id_from_cognito_id(cognito_user_id: str) -> Optional[str]:
     """Look up the profile ID from a Cognito user ID."""
-    if not cognito_user_id:
-        return None
+    if not cognito_user_id:
+        return None
     uid_str = str(cognito_user_id)
     # First try cognito_user_id (preferred, exact match)
     profile_row = execute_single(
@@ -150,7 +131,7 @@ async def get_camera_logs(
     """Get camera logs for a project, optionally filtered by day/camera/scene"""
     try:
         # Authenticate user
-        user = await get_current_user_from_token(authorization)
+        user = await get_cognito_user_from_token(authorization)
         user_id = get_profile_id_from_cognito_id(user["id"])
         if not user_id:
             raise HTTPException(status_code=401, detail="User profile not found")
@@ -190,7 +171,7 @@ async def create_camera_log(
     """Create a new camera log entry"""
     try:
         # Authenticate user
-        user = await get_current_user_from_token(authorization)
+        user = await get_cognito_user_from_token(authorization)
         user_id = get_profile_id_from_cognito_id(user["id"])
         if not user_id:
             raise HTTPException(status_code=401, detail="User profile not found")
@@ -257,7 +238,7 @@ async def update_camera_log(
     """Update a camera log entry"""
     try:
         # Authenticate user
-        user = await get_current_user_from_token(authorization)
+        user = await get_cognito_user_from_token(authorization)
         user_id = get_profile_id_from_cognito_id(user["id"])
         if not user_id:
             raise HTTPException(status_code=401, detail="User profile not found")
@@ -324,7 +305,7 @@ async def delete_camera_log(
     """Delete a camera log entry"""
     try:
         # Authenticate user
-        user = await get_current_user_from_token(authorization)
+        user = await get_cognito_user_from_token(authorization)
         user_id = get_profile_id_from_cognito_id(user["id"])
         if not user_id:
             raise HTTPException(status_code=401, detail="User profile not found")
@@ -364,7 +345,7 @@ async def get_next_take_number(
     """Get the next take number for a scene/shot/camera combo"""
     try:
         # Authenticate user
-        user = await get_current_user_from_token(authorization)
+        user = await get_cognito_user_from_token(authorization)
         user_id = get_profile_id_from_cognito_id(user["id"])
         if not user_id:
             raise HTTPException(status_code=401, detail="User profile not found")
@@ -414,7 +395,7 @@ async def get_camera_settings(
     """Get camera settings/presets for a project"""
     try:
         # Authenticate user
-        user = await get_current_user_from_token(authorization)
+        user = await get_cognito_user_from_token(authorization)
         user_id = get_profile_id_from_cognito_id(user["id"])
         if not user_id:
             raise HTTPException(status_code=401, detail="User profile not found")
@@ -455,7 +436,7 @@ async def update_camera_settings(
     """Update camera settings/presets for a project"""
     try:
         # Authenticate user
-        user = await get_current_user_from_token(authorization)
+        user = await get_cognito_user_from_token(authorization)
         user_id = get_profile_id_from_cognito_id(user["id"])
         if not user_id:
             raise HTTPException(status_code=401, detail="User profile not found")
@@ -10,6 +10,7 @@ import secrets
 
 from app.core.database import get_client
 from app.core.backlot_permissions import can_manage_access
+from app.core.auth import get_cognito_user_from_token
 
 router = APIRouter()
 
@@ -18,25 +19,6 @@ router = APIRouter()
 # AUTH HELPER
 # =============================================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 # =============================================================================
 # JOB POSTING MODELS
 # =============================================================================
@@ -142,7 +124,7 @@ async def create_job_posting(
     authorization: str = Header(None)
 ):
     """Create a new job posting for a project"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Verify project exists and user has access
@@ -187,7 +169,7 @@ async def list_job_postings(
     authorization: str = Header(None)
 ):
     """List all job postings for a project"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Verify project access
@@ -223,7 +205,7 @@ async def get_job_posting(
     authorization: str = Header(None)
 ):
     """Get a specific job posting"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     result = client.table("backlot_job_postings").select("*").eq("id", posting_id).execute()
@@ -249,7 +231,7 @@ async def update_job_posting(
     authorization: str = Header(None)
 ):
     """Update a job posting"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Get existing posting
@@ -288,7 +270,7 @@ async def publish_job_posting(
     authorization: str = Header(None)
 ):
     """Publish a job posting to the community board"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Get existing posting
@@ -316,7 +298,7 @@ async def delete_job_posting(
     authorization: str = Header(None)
 ):
     """Delete a job posting"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Get existing posting
@@ -345,7 +327,7 @@ async def submit_application(
     authorization: str = Header(None)
 ):
     """Submit an application for a job posting"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Verify posting exists and is published
@@ -389,7 +371,7 @@ async def list_applications(
     authorization: str = Header(None)
 ):
     """List all applications for a job posting (project owner/admin only)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Get posting and verify access
@@ -428,7 +410,7 @@ async def update_application_status(
     authorization: str = Header(None)
 ):
     """Update an application's status"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Get application and verify access
@@ -546,7 +528,7 @@ async def create_invitation(
     authorization: str = Header(None)
 ):
     """Create an email invitation to join a project"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await can_manage_access(project_id, user["id"]):
@@ -597,7 +579,7 @@ async def list_invitations(
     authorization: str = Header(None)
 ):
     """List pending invitations for a project"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await can_manage_access(project_id, user["id"]):
@@ -632,7 +614,7 @@ async def accept_invitation(
     authorization: str = Header(None)
 ):
     """Accept a project invitation"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Find the invitation
@@ -688,7 +670,7 @@ async def revoke_invitation(
     authorization: str = Header(None)
 ):
     """Revoke a pending invitation"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Get invitation
@@ -787,7 +769,7 @@ async def list_document_templates(
     authorization: str = Header(None)
 ):
     """List available document templates (system + project-specific)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Get system templates
@@ -826,7 +808,7 @@ async def create_document_template(
     authorization: str = Header(None)
 ):
     """Create a custom document template for a project"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await can_manage_access(project_id, user["id"]):
@@ -870,7 +852,7 @@ async def create_signature_request(
     authorization: str = Header(None)
 ):
     """Send a document for signature"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await can_manage_access(project_id, user["id"]):
@@ -919,7 +901,7 @@ async def create_bulk_signature_requests(
     authorization: str = Header(None)
 ):
     """Send multiple documents to multiple recipients (onboarding packet)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await can_manage_access(project_id, user["id"]):
@@ -976,7 +958,7 @@ async def list_signature_requests(
     authorization: str = Header(None)
 ):
     """List signature requests for a project"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await can_manage_access(project_id, user["id"]):
@@ -1006,7 +988,7 @@ async def list_my_signature_requests(
     authorization: str = Header(None)
 ):
     """List signature requests sent to the current user"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     query = client.table("backlot_signature_requests").select("*").eq("recipient_id", user["id"])
@@ -1033,7 +1015,7 @@ async def get_signature_request(
     authorization: str = Header(None)
 ):
     """Get a specific signature request"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     result = client.table("backlot_signature_requests").select("*").eq("id", request_id).execute()
@@ -1074,7 +1056,7 @@ async def sign_document(
     authorization: str = Header(None)
 ):
     """Sign a document"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Get signature request
@@ -1140,7 +1122,7 @@ async def list_signed_documents(
     authorization: str = Header(None)
 ):
     """List all signed documents for a project"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await can_manage_access(project_id, user["id"]):
@@ -1185,7 +1167,7 @@ async def save_user_signature(
     authorization: str = Header(None)
 ):
     """Save a user's signature for reuse"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # If setting as default, clear other defaults
@@ -1219,7 +1201,7 @@ async def get_user_signatures(
     authorization: str = Header(None)
 ):
     """Get the current user's saved signatures"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     result = client.table("backlot_user_signatures").select("*").eq(
@@ -1362,7 +1344,7 @@ async def create_channel(
     authorization: str = Header(None)
 ):
     """Create a new channel for crew communication"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await can_manage_access(project_id, user["id"]):
@@ -1402,7 +1384,7 @@ async def list_channels(
     authorization: str = Header(None)
 ):
     """List all channels for a project"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     result = client.table("backlot_channels").select("*").eq(
@@ -1433,7 +1415,7 @@ async def get_channel_messages(
     authorization: str = Header(None)
 ):
     """Get messages from a channel"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     result = client.table("backlot_channel_messages").select("*").eq(
@@ -1474,7 +1456,7 @@ async def send_channel_message(
     authorization: str = Header(None)
 ):
     """Send a message to a channel"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Verify channel exists
@@ -1525,7 +1507,7 @@ async def get_dm_thread(
     authorization: str = Header(None)
 ):
     """Get direct message thread with a user"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Get messages in both directions
@@ -1579,7 +1561,7 @@ async def send_dm(
     authorization: str = Header(None)
 ):
     """Send a direct message to a user"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     dm_data = {
@@ -1623,7 +1605,7 @@ async def create_announcement(
     authorization: str = Header(None)
 ):
     """Post an announcement to the project"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await can_manage_access(project_id, user["id"]):
@@ -1674,7 +1656,7 @@ async def list_announcements(
     authorization: str = Header(None)
 ):
     """List announcements for a project"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     result = client.table("backlot_announcements").select("*").eq(
@@ -1733,7 +1715,7 @@ async def acknowledge_announcement(
     authorization: str = Header(None)
 ):
     """Acknowledge an announcement"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Check if already acknowledged
@@ -4,10 +4,11 @@ Community/Search API Routes
 from fastapi import APIRouter, HTTPException, Header, Body, Query
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
-from app.core.database import get_client
+from app.core.database import get_client, keyset_page
+from app.core import search as search_layer
+from app.core.auth import get_cognito_user_from_token
 from app.api.users import get_profile_id_from_cognito_id
 from datetime import datetime
-import os
 import json
 
 
@@ -111,27 +112,6 @@ router = APIRouter()
 # AUTH HELPER
 # =====================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        USE_AWS = os.getenv('USE_AWS', 'false').lower() == 'true'
-
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 async def check_user_permission(user_id: str, permission: str) -> bool:
     """Check if user has a specific permission via their roles"""
     try:
@@ -271,59 +251,43 @@ async def search_filmmakers(
     limit: int = 20,
     sort_by: str = "updated_at"
 ):
-    """Search and list filmmakers with pagination"""
+    """Search and list filmmakers with pagination (ranked by name match when querying)"""
     try:
-        client = get_client()
-        
-        # Join profiles via user_id
-        db_query = client.table("filmmaker_profiles").select(
-            "*, profile:user_id(id, full_name, username, avatar_url, location, bio)"
+        if sort_by not in ("updated_at", "created_at"):
+            sort_by = "updated_at"
+
+        return search_layer.search(
+            "profiles",
+            query,
+            columns=(
+                "fp.*, jsonb_build_object('id', t.id, 'full_name', t.full_name, 'username', t.username, "
+                "'avatar_url', t.avatar_url, 'location', fp.location, 'bio', t.bio) AS profile"
+            ),
+            joins="JOIN filmmaker_profiles fp ON fp.user_id = t.id",
+            order_by=f"fp.{sort_by} DESC",
+            limit=limit,
+            offset=skip,
         )
-        
-        # Note: Searching nested fields requires raw SQL or separate query
-        # For now, skip the search filter and fetch all, then filter in the results
-        # TODO: Implement proper search with JOINs if needed
-        
-        # Sorting
-        response = db_query.range(skip, skip + limit - 1).order(
-            sort_by, desc=True
-        ).execute()
-        
-        return response.data
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/search")
 async def global_search(query: str, type: Optional[str] = None):
-    """Global search across multiple entities"""
+    """Global search across multiple entities, ranked, in one query"""
     try:
-        client = get_client()
-        results = {
-            "filmmakers": [],
-            "threads": [],
-            "content": []
+        entities = {
+            "filmmakers": "profiles",
+            "threads": "forum_threads",
+            "content": "content"
         }
+        selected = [entity for key, entity in entities.items() if not type or type == key]
+        found = search_layer.global_search(query, selected, limit_per_entity=10)
 
-        if not type or type == "filmmakers":
-            filmmakers = client.table("profiles").select("*").ilike(
-                "full_name", f"%{query}%"
-            ).limit(10).execute()
-            results["filmmakers"] = filmmakers.data
-
-        if not type or type == "threads":
-            threads = client.table("forum_threads").select("*").ilike(
-                "title", f"%{query}%"
-            ).limit(10).execute()
-            results["threads"] = threads.data
-
-        if not type or type == "content":
-            content = client.table("content").select("*").ilike(
-                "title", f"%{query}%"
-            ).limit(10).execute()
-            results["content"] = content.data
-
-        return results
+        return {
+            key: [hit["data"] for hit in found.get(entity, [])]
+            for key, entity in entities.items()
+        }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -562,7 +526,7 @@ async def create_community_thread(
     authorization: str = Header(None)
 ):
     """Create a community thread"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Check for forum ban
@@ -597,7 +561,7 @@ async def update_community_thread(
     authorization: str = Header(None)
 ):
     """Update a community thread"""
-    await get_current_user_from_token(authorization)
+    await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -620,7 +584,7 @@ async def delete_community_thread(
     authorization: str = Header(None)
 ):
     """Delete a community thread"""
-    await get_current_user_from_token(authorization)
+    await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -678,7 +642,7 @@ async def create_thread_reply(
     authorization: str = Header(None)
 ):
     """Create a reply to a thread"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Check for forum ban
@@ -712,7 +676,7 @@ async def update_thread_reply(
     authorization: str = Header(None)
 ):
     """Update a reply"""
-    await get_current_user_from_token(authorization)
+    await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -732,7 +696,7 @@ async def delete_thread_reply(
     authorization: str = Header(None)
 ):
     """Delete a reply"""
-    await get_current_user_from_token(authorization)
+    await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -815,7 +779,7 @@ async def list_collabs_by_project(
     authorization: str = Header(None)
 ):
     """List collabs linked to a Backlot project (for CastingCrewTab)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -950,7 +914,7 @@ async def create_collab(
     authorization: str = Header(None)
 ):
     """Create a collab"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -1056,7 +1020,7 @@ async def update_collab(
     authorization: str = Header(None)
 ):
     """Update a collab"""
-    await get_current_user_from_token(authorization)
+    await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -1100,7 +1064,7 @@ async def delete_collab(
     authorization: str = Header(None)
 ):
     """Delete a collab"""
-    await get_current_user_from_token(authorization)
+    await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -1118,7 +1082,7 @@ async def deactivate_collab(
     authorization: str = Header(None)
 ):
     """Deactivate a collab"""
-    await get_current_user_from_token(authorization)
+    await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -1283,7 +1247,7 @@ async def apply_to_collab(
     """Apply to a community collab"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     # Convert Cognito ID to profile UUID
@@ -1468,7 +1432,7 @@ async def list_collab_applications(
     """
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     # Convert Cognito ID to profile UUID
@@ -1577,7 +1541,7 @@ async def list_my_collab_applications(
     """List current user's collab applications"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     # Convert Cognito ID to profile UUID
@@ -1637,7 +1601,7 @@ async def list_collab_applications_received(
     """
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     # Convert Cognito ID to profile UUID
@@ -1761,7 +1725,7 @@ async def update_application_status(
     """Update application status (collab owner only)"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     # Convert Cognito ID to profile UUID
@@ -1822,7 +1786,7 @@ async def promote_application(
     authorization: str = Header(None)
 ):
     """Promote an application (boost visibility)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = user["id"]
     client = get_client()
 
@@ -1921,7 +1885,7 @@ async def get_collab_application(
     authorization: str = Header(None)
 ):
     """Get a single collab application"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = user["id"]
     client = get_client()
 
@@ -1974,7 +1938,7 @@ async def withdraw_application(
     """Withdraw/delete a collab application (applicant only)"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     # Convert Cognito ID to profile UUID
@@ -2016,7 +1980,7 @@ async def get_application_messages(
     authorization: str = Header(None)
 ):
     """Get messages for an application (applicant or collab owner only)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = user["id"]
     client = get_client()
 
@@ -2071,7 +2035,7 @@ async def send_application_message(
     authorization: str = Header(None)
 ):
     """Send a message for an application (applicant or collab owner only)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = user["id"]
     client = get_client()
 
@@ -2129,7 +2093,7 @@ async def mark_application_messages_read(
     authorization: str = Header(None)
 ):
     """Mark all messages as read for the current user"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = user["id"]
     client = get_client()
 
@@ -2175,7 +2139,7 @@ async def get_unread_message_count(
     authorization: str = Header(None)
 ):
     """Get count of unread messages for an application"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = user["id"]
     client = get_client()
 
@@ -2228,7 +2192,7 @@ async def update_application_schedule(
     """Update interview/callback schedule for an application (collab owner only)"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     # Convert Cognito ID to profile UUID
@@ -2306,7 +2270,7 @@ async def book_applicant(
     """Book an applicant (collab owner only)"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     # Convert Cognito ID to profile UUID
@@ -2502,7 +2466,7 @@ async def unbook_applicant(
     """Unbook an applicant (collab owner only) - reverses a booking"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     # Convert Cognito ID to profile UUID
@@ -2593,7 +2557,7 @@ async def get_applicant_email(
     """
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     # Convert Cognito ID to profile UUID
@@ -2705,7 +2669,7 @@ async def get_application_history(
     authorization: str = Header(None)
 ):
     """Get status change history for an application (collab owner or applicant)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = user["id"]
     client = get_client()
 
@@ -2755,7 +2719,7 @@ async def list_collab_permissions(
     """List all users who have permission to view applications for a collab (owner only)"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
     user_id = get_profile_id_from_cognito_id(cognito_id)
     if not user_id:
@@ -2790,7 +2754,7 @@ async def grant_collab_permission(
     """Grant a user permission to view/manage applications for a collab (owner only)"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
     user_id = get_profile_id_from_cognito_id(cognito_id)
     if not user_id:
@@ -2846,7 +2810,7 @@ async def update_collab_permission(
     """Update an existing permission (owner only)"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
     user_id = get_profile_id_from_cognito_id(cognito_id)
     if not user_id:
@@ -2894,7 +2858,7 @@ async def revoke_collab_permission(
     """Revoke a user's permission to view applications (owner only)"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
     user_id = get_profile_id_from_cognito_id(cognito_id)
     if not user_id:
@@ -2931,7 +2895,7 @@ async def grant_team_permissions(
     """
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
     user_id = get_profile_id_from_cognito_id(cognito_id)
     if not user_id:
@@ -3002,7 +2966,7 @@ async def submit_content_report(
     authorization: str = Header(None)
 ):
     """Submit a content report (authenticated users only)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Validate content type
@@ -3070,7 +3034,7 @@ async def submit_content_report(
 @router.get("/user-forum-status")
 async def get_user_forum_status(authorization: str = Header(None)):
     """Get current user's forum ban status"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -3264,16 +3228,17 @@ async def enrich_comments_with_profiles(comments: List[Dict]) -> List[Dict]:
 async def list_public_feed(
     limit: int = Query(20, le=50),
     before: Optional[str] = None,
+    cursor: Optional[str] = None,
     authorization: str = Header(None)
 ):
-    """List public posts with cursor pagination"""
+    """List public posts, newest first; pass next_cursor back as cursor"""
     client = get_client()
 
     # Get current user if authenticated (for like status)
     current_user_id = None
     if authorization:
         try:
-            user = await get_current_user_from_token(authorization)
+            user = await get_cognito_user_from_token(authorization)
             current_user_id = user["id"]
         except:
             pass
@@ -3281,22 +3246,29 @@ async def list_public_feed(
     try:
         query = client.table("community_posts").select("*").eq(
             "visibility", "public"
-        ).eq("is_hidden", False).order("created_at", desc=True).limit(limit)
+        ).eq("is_hidden", False).order("created_at", desc=True).limit(limit + 1)
 
-        if before:
+        try:
+            query = query.after(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if before and not cursor:
+            # Legacy timestamp cursor from before keyset paging
             query = query.lt("created_at", before)
 
         result = query.execute()
-        posts = result.data or []
+        posts, next_cursor = keyset_page(result.data or [], limit, "created_at")
 
         # Enrich with profiles and like status
         posts = await enrich_posts_with_profiles(posts, current_user_id)
 
         return {
             "posts": posts,
-            "next_cursor": posts[-1]["created_at"] if posts else None
+            "next_cursor": next_cursor
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error fetching public feed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -3310,10 +3282,11 @@ async def list_public_feed(
 async def list_connections_feed(
     limit: int = Query(20, le=50),
     before: Optional[str] = None,
+    cursor: Optional[str] = None,
     authorization: str = Header(None)
 ):
     """List posts from user's connections"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -3326,20 +3299,25 @@ async def list_connections_feed(
         # Query posts from connections (both public and connections-only visibility)
         query = client.table("community_posts").select("*").in_(
             "user_id", connection_ids
-        ).eq("is_hidden", False).order("created_at", desc=True).limit(limit)
+        ).eq("is_hidden", False).order("created_at", desc=True).limit(limit + 1)
 
-        if before:
+        try:
+            query = query.after(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if before and not cursor:
+            # Legacy timestamp cursor from before keyset paging
             query = query.lt("created_at", before)
 
         result = query.execute()
-        posts = result.data or []
+        posts, next_cursor = keyset_page(result.data or [], limit, "created_at")
 
         # Enrich with profiles and like status
         posts = await enrich_posts_with_profiles(posts, user["id"])
 
         return {
             "posts": posts,
-            "next_cursor": posts[-1]["created_at"] if posts else None
+            "next_cursor": next_cursor
         }
 
     except HTTPException:
@@ -3359,7 +3337,7 @@ async def create_post(
     authorization: str = Header(None)
 ):
     """Create a new community post"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Check permission
     await require_permission(user["id"], "community_feed_post")
@@ -3414,7 +3392,7 @@ async def get_post(
     current_user_id = None
     if authorization:
         try:
-            user = await get_current_user_from_token(authorization)
+            user = await get_cognito_user_from_token(authorization)
             current_user_id = user["id"]
         except:
             pass
@@ -3458,7 +3436,7 @@ async def update_post(
     authorization: str = Header(None)
 ):
     """Update a post (owner only)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -3508,7 +3486,7 @@ async def delete_post(
     authorization: str = Header(None)
 ):
     """Delete a post (owner only)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -3545,7 +3523,7 @@ async def like_post(
     authorization: str = Header(None)
 ):
     """Like a post"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Check permission
     await require_permission(user["id"], "community_feed_like")
@@ -3591,7 +3569,7 @@ async def unlike_post(
     authorization: str = Header(None)
 ):
     """Unlike a post"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Check permission
     await require_permission(user["id"], "community_feed_like")
@@ -3626,7 +3604,7 @@ async def list_post_comments(
     current_user_id = None
     if authorization:
         try:
-            user = await get_current_user_from_token(authorization)
+            user = await get_cognito_user_from_token(authorization)
             current_user_id = user["id"]
         except:
             pass
@@ -3675,7 +3653,7 @@ async def create_post_comment(
     authorization: str = Header(None)
 ):
     """Add a comment to a post"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Check permission
     await require_permission(user["id"], "community_feed_comment")
@@ -3740,7 +3718,7 @@ async def update_comment(
     authorization: str = Header(None)
 ):
     """Update a comment (owner only)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -3780,7 +3758,7 @@ async def delete_comment(
     authorization: str = Header(None)
 ):
     """Delete a comment (owner only)"""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
@@ -3816,7 +3794,7 @@ async def fetch_link_preview(
     authorization: str = Header(None)
 ):
     """Fetch Open Graph metadata for a URL"""
-    await get_current_user_from_token(authorization)
+    await get_cognito_user_from_token(authorization)
 
     try:
         import httpx
@@ -3901,7 +3879,7 @@ async def get_user_directory(
     - 'pending_received': Current user received a request
     - 'connected': Already connected
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     current_user_id = user["id"]
     client = get_client()
 
@@ -4066,7 +4044,7 @@ async def score_all_collab_applications(
     from app.api.users import get_profile_id_from_cognito_id
     from app.jobs.score_applications import ApplicationScoringJob
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     user_id = get_profile_id_from_cognito_id(cognito_id)
@@ -4100,7 +4078,7 @@ async def score_single_application(
     from app.api.users import get_profile_id_from_cognito_id
     from app.jobs.score_applications import ApplicationScoringJob
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     user_id = get_profile_id_from_cognito_id(cognito_id)
@@ -4133,7 +4111,7 @@ async def get_application_score_details(
     from app.api.users import get_profile_id_from_cognito_id
     from app.services.applicant_scoring import ApplicantScoringService
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     user_id = get_profile_id_from_cognito_id(cognito_id)
@@ -4,7 +4,7 @@ Credits API Routes
 from fastapi import APIRouter, HTTPException, Header, Depends, Query
 from typing import List, Optional
 from app.core.database import get_client, execute_query, execute_single, execute_insert
-from app.api.community import get_current_user_from_token
+from app.core.auth import get_cognito_user_from_token
 from pydantic import BaseModel
 from datetime import date
 
@@ -16,7 +16,7 @@ async def get_my_credits(authorization: str = Header(None)):
     """Get current user's credits for application selection"""
     from app.api.users import get_profile_id_from_cognito_id
 
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     cognito_id = user["id"]
 
     # Convert Cognito ID to profile UUID
@@ -300,7 +300,7 @@ async def get_pending_credits(
     authorization: str = Header(None),
 ):
     """Get all pending credits for admin review."""
-    from app.api.profiles import get_current_user_from_token as get_user
+    from app.core.auth import get_current_user_from_token as get_user
     user = await get_user(authorization)
     user_id = user["id"]
 
@@ -362,7 +362,7 @@ async def approve_credit(
     authorization: str = Header(None),
 ):
     """Approve a pending credit."""
-    from app.api.profiles import get_current_user_from_token as get_user
+    from app.core.auth import get_current_user_from_token as get_user
     user = await get_user(authorization)
     user_id = user["id"]
 
@@ -414,7 +414,7 @@ async def reject_credit(
     authorization: str = Header(None),
 ):
     """Reject a pending credit. Note is required."""
-    from app.api.profiles import get_current_user_from_token as get_user
+    from app.core.auth import get_current_user_from_token as get_user
     user = await get_user(authorization)
     user_id = user["id"]
 
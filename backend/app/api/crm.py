@@ -13,7 +13,12 @@ from pydantic import BaseModel, EmailStr, validator
 from typing import Optional, List, Dict, Any
 from datetime import date, datetime
 
-from app.core.database import get_client, execute_query, execute_single, execute_insert, execute_update, execute_delete
+from app.core.database import (
+    get_client, execute_query, execute_single, execute_insert, execute_update, execute_delete, execute_insert_many,
+    count_rows, decode_cursor, keyset_condition, keyset_page,
+)
+from app.core.event_buffer import Sink, event_buffer, utc_now
+from app.core import search as search_layer
 from app.core.deps import get_user_profile
 from app.core.permissions import Permission, require_permissions, has_permission
 from app.services.pricing_engine import TIERS, ADDON_PRICES, compute_full_quote, calculate_monthly_quote
@@ -441,9 +446,14 @@ async def list_contacts(
     has_website: Optional[bool] = Query(None),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (replaces offset)"),
+    count: str = Query("exact", pattern="^(exact|planned|estimated|none)$"),
     profile: Dict[str, Any] = Depends(require_permissions(Permission.CRM_VIEW)),
 ):
-    """List contacts. Reps see their own + team-visible contacts, admins see all."""
+    """
+    List contacts. Reps see their own + team-visible contacts, admins see all.
+    Pages are ordered by (sort_by, id); pass next_cursor back as cursor.
+    """
     is_admin = has_permission(profile, Permission.CRM_MANAGE)
 
     conditions = ["c.status != 'inactive'"]
@@ -466,13 +476,10 @@ async def list_contacts(
     if unassigned and is_admin:
         conditions.append("c.assigned_rep_id IS NULL")
 
-    if search:
-        conditions.append(
-            "(c.first_name ILIKE :search OR c.last_name ILIKE :search "
-            "OR c.email ILIKE :search OR c.company ILIKE :search "
-            "OR c.phone ILIKE :search OR c.website ILIKE :search)"
-        )
-        params["search"] = f"%{search}%"
+    if search and search.strip():
+        condition, search_params = search_layer.search_condition("crm_contacts", search, "c")
+        conditions.append(condition)
+        params.update(search_params)
 
     if temperature:
         conditions.append("c.temperature = :temperature")
@@ -513,12 +520,22 @@ async def list_contacts(
         sort_by = "created_at"
     order_dir = "DESC" if sort_order == "desc" else "ASC"
 
-    # Get total count
-    count_row = execute_single(
-        f"SELECT COUNT(*) as total FROM crm_contacts c WHERE {where}",
-        params,
-    )
-    total = count_row["total"] if count_row else 0
+    total = count_rows(f"SELECT 1 FROM crm_contacts c WHERE {where}", params, count)
+
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+            if (after.get("s"), after.get("d")) != (sort_by, order_dir):
+                raise ValueError("cursor is for a different sort")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        condition, cursor_params = keyset_condition(
+            f"c.{sort_by}", "c.id", after, desc=order_dir == "DESC",
+            nullable=sort_by != "created_at",
+        )
+        where += f" AND {condition}"
+        params.update(cursor_params)
+        offset = 0
 
     # Get contacts with rep name — use CTE to paginate first, then compute counts
     rows = execute_query(
@@ -530,7 +547,7 @@ async def list_contacts(
             LEFT JOIN profiles p ON p.id = c.assigned_rep_id
             LEFT JOIN crm_companies cc ON cc.id = c.company_id
             WHERE {where}
-            ORDER BY c.{sort_by} {order_dir}
+            ORDER BY c.{sort_by} {order_dir}, c.id {order_dir}
             LIMIT :limit OFFSET :offset
         )
         SELECT paged.*,
@@ -546,11 +563,16 @@ async def list_contacts(
             SELECT COUNT(*) as email_thread_count
             FROM crm_email_threads et WHERE et.contact_id = paged.id
         ) ec ON true
+        ORDER BY paged.{sort_by} {order_dir}, paged.id {order_dir}
         """,
-        {**params, "limit": limit, "offset": offset},
+        {**params, "limit": limit + 1, "offset": offset},
     )
+    rows, next_cursor = keyset_page(rows, limit, sort_by, s=sort_by, d=order_dir)
 
-    return {"contacts": rows, "total": total, "limit": limit, "offset": offset}
+    return {
+        "contacts": rows, "total": total, "limit": limit, "offset": offset,
+        "next_cursor": next_cursor,
+    }
 
 
 @router.get("/contacts/{contact_id}")
@@ -802,9 +824,13 @@ async def list_activities(
     tz: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (replaces offset)"),
     profile: Dict[str, Any] = Depends(require_permissions(Permission.CRM_VIEW)),
 ):
-    """List activities. Filter by contact, rep, date range, type."""
+    """
+    List activities. Filter by contact, rep, date range, type.
+    Newest first by (activity_date, id); pass next_cursor back as cursor.
+    """
     is_admin = has_permission(profile, Permission.CRM_MANAGE)
 
     # Validate timezone
@@ -841,6 +867,18 @@ async def list_activities(
         conditions.append("(a.activity_date AT TIME ZONE :tz)::date <= :date_to::date")
         params["date_to"] = date_to
 
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        condition, cursor_params = keyset_condition(
+            "a.activity_date", "a.id", after, desc=True, nullable=True
+        )
+        conditions.append(condition)
+        params.update(cursor_params)
+        offset = 0
+
     where = " AND ".join(conditions) if conditions else "1=1"
 
     rows = execute_query(
@@ -853,12 +891,13 @@ async def list_activities(
         LEFT JOIN profiles p ON p.id = a.rep_id
         LEFT JOIN crm_contacts c ON c.id = a.contact_id
         WHERE {where}
-        ORDER BY a.activity_date DESC
+        ORDER BY a.activity_date DESC, a.id DESC
         LIMIT :limit OFFSET :offset
         """,
-        {**params, "limit": limit, "offset": offset},
+        {**params, "limit": limit + 1, "offset": offset},
     )
-    return {"activities": rows}
+    rows, next_cursor = keyset_page(rows, limit, "activity_date")
+    return {"activities": rows, "next_cursor": next_cursor}
 
 
 @router.post("/activities")
@@ -2697,9 +2736,10 @@ async def get_email_suggestions(
     account_id = account["id"] if account else None
     self_email = account["email_address"] if account else None
     like_q = f"%{q}%"
+    contact_match, search_params = search_layer.search_condition("crm_contacts", q, "c")
 
     suggestions = execute_query(
-        """
+        f"""
         SELECT DISTINCT ON (email) email, display_name, company, source, contact_id
         FROM (
             -- CRM contacts
@@ -2709,7 +2749,7 @@ async def get_email_suggestions(
             WHERE c.email IS NOT NULL
                 AND c.do_not_email IS NOT TRUE
                 AND c.status != 'inactive'
-                AND (c.email ILIKE :q OR c.first_name ILIKE :q OR c.last_name ILIKE :q OR c.company ILIKE :q)
+                AND {contact_match}
             UNION ALL
             -- Recent email threads
             SELECT t.contact_email as email,
@@ -2732,7 +2772,7 @@ async def get_email_suggestions(
         ORDER BY email, priority ASC
         LIMIT 10
         """,
-        {"q": like_q, "aid": account_id, "self_email": self_email or ""},
+        {"q": like_q, "aid": account_id, "self_email": self_email or "", **search_params},
     )
 
     return {"suggestions": suggestions}
@@ -4607,6 +4647,12 @@ async def cancel_scheduled_email(
 # CRM Email — Open Tracking (Public endpoint)
 # ============================================================================
 
+_email_open_sink = event_buffer.register(Sink(
+    "crm_email_open",
+    write=lambda events: execute_insert_many("crm_email_opens", events, returning=None),
+))
+
+
 @router.get("/email/track/{message_id}/open.png")
 async def track_email_open(
     message_id: str,
@@ -4619,13 +4665,10 @@ async def track_email_open(
     ip = request.client.host if request.client else None
     ua = request.headers.get("user-agent")
 
-    try:
-        execute_insert(
-            "INSERT INTO crm_email_opens (message_id, ip_address, user_agent) VALUES (:mid, :ip, :ua) RETURNING id",
-            {"mid": message_id, "ip": ip, "ua": ua},
-        )
-    except Exception:
-        pass
+    # Buffered; opens for unknown message ids are dropped at flush time
+    event_buffer.emit(_email_open_sink.name, {
+        "message_id": message_id, "ip_address": ip, "user_agent": ua, "opened_at": utc_now(),
+    })
 
     # 1x1 transparent PNG
     pixel = base64.b64decode(
@@ -9104,18 +9147,14 @@ async def search_companies(
     limit: int = Query(15, ge=1, le=50),
     profile: Dict[str, Any] = Depends(require_permissions(Permission.CRM_VIEW)),
 ):
-    """Search CRM companies by name for autocomplete."""
-    if not q.strip():
-        rows = execute_query(
-            "SELECT id, name, website, city, state FROM crm_companies ORDER BY name LIMIT :limit",
-            {"limit": limit},
-        )
-    else:
-        rows = execute_query(
-            "SELECT id, name, website, city, state FROM crm_companies WHERE name ILIKE :q ORDER BY name LIMIT :limit",
-            {"q": f"%{q}%", "limit": limit},
-        )
-    return rows
+    """Search CRM companies by name for autocomplete (best matches first)."""
+    return search_layer.search(
+        "crm_companies",
+        q,
+        columns="t.id, t.name, t.website, t.city, t.state",
+        order_by="t.name",
+        limit=limit,
+    )
 
 
 @router.get("/companies")
@@ -9129,9 +9168,10 @@ async def list_companies(
     conditions = []
     params = {}
 
-    if search:
-        conditions.append("c.name ILIKE :search")
-        params["search"] = f"%{search}%"
+    if search and search.strip():
+        condition, search_params = search_layer.search_condition("crm_companies", search, "c")
+        conditions.append(condition)
+        params.update(search_params)
 
     where = " AND ".join(conditions) if conditions else "1=1"
 
@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
 from app.core.database import get_client
+from app.core.auth import get_cognito_user_from_token
 
 router = APIRouter()
 
@@ -130,26 +131,6 @@ class DayOverview(BaseModel):
 # HELPERS
 # =============================================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 async def verify_project_access(client, project_id: str, user_id: str) -> bool:
     """Verify user has access to project"""
     project_resp = client.table("backlot_projects").select("owner_id").eq("id", project_id).execute()
@@ -193,7 +174,7 @@ async def list_production_days(
     """
     List all production days for a project with summary data
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await verify_project_access(client, project_id, user["id"]):
@@ -276,7 +257,7 @@ async def get_day_overview(
     """
     Get comprehensive overview of a production day with all related data
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await verify_project_access(client, project_id, user["id"]):
@@ -3,8 +3,10 @@ Directory API Routes - Site-wide user search for adding members to projects
 """
 from fastapi import APIRouter, HTTPException, Header, Query
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional
 from app.core.database import get_client
+from app.core import search as search_layer
+from app.core.auth import get_cognito_user_from_token
 
 router = APIRouter()
 
@@ -27,26 +29,6 @@ class DirectorySearchResponse(BaseModel):
     offset: int
 
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 @router.get("/users", response_model=DirectorySearchResponse)
 async def search_directory_users(
     q: Optional[str] = Query(None, description="Search term for username, full name, or display name"),
@@ -63,72 +45,37 @@ async def search_directory_users(
 
     Used by the Backlot "Add from Network" feature to find users to add to projects.
     """
-    user = await get_current_user_from_token(authorization)
-    client = get_client()
+    user = await get_cognito_user_from_token(authorization)
 
     try:
-        # Build the base query - select from profiles
-        # Include users who are community visible or have filmmaker profiles
-        base_query = client.table("profiles").select(
-            "id, username, full_name, display_name, avatar_url, created_at, community_visible"
-        )
-
-        # Get user IDs to exclude (existing project members)
-        excluded_user_ids = set()
+        # Community visible or filmmaker, minus existing project members/owner
+        conditions = [
+            "(t.community_visible = TRUE"
+            " OR EXISTS (SELECT 1 FROM filmmaker_profiles fp WHERE fp.user_id = t.id))"
+        ]
+        params = {}
         if exclude_project:
-            # Get existing project members
-            members_resp = client.table("backlot_project_members").select(
-                "user_id"
-            ).eq("project_id", exclude_project).execute()
-
-            if members_resp.data:
-                excluded_user_ids = {m["user_id"] for m in members_resp.data}
-
-            # Also exclude the project owner
-            project_resp = client.table("backlot_projects").select(
-                "owner_id"
-            ).eq("id", exclude_project).execute()
-
-            if project_resp.data:
-                excluded_user_ids.add(project_resp.data[0]["owner_id"])
-
-        # Get filmmaker user IDs (they should always be visible in directory)
-        filmmaker_resp = client.table("filmmaker_profiles").select("user_id").execute()
-        filmmaker_user_ids = {f["user_id"] for f in (filmmaker_resp.data or [])}
-
-        # Execute the query with search filter if provided
-        if q and q.strip():
-            search_term = q.strip()
-            # Search across username, full_name, and display_name
-            response = base_query.or_(
-                f"username.ilike.%{search_term}%,full_name.ilike.%{search_term}%,display_name.ilike.%{search_term}%"
-            ).order("full_name", desc=False).execute()
-        else:
-            response = base_query.order("full_name", desc=False).execute()
-
-        # Filter results:
-        # 1. Must be community_visible=true OR be a filmmaker
-        # 2. Must not be in excluded_user_ids
-        all_profiles = response.data or []
-        filtered_profiles = []
-
-        for profile in all_profiles:
-            user_id = profile["id"]
-
-            # Skip excluded users
-            if user_id in excluded_user_ids:
-                continue
-
-            # Include if community_visible or is a filmmaker
-            is_visible = profile.get("community_visible", False)
-            is_filmmaker = user_id in filmmaker_user_ids
-
-            if is_visible or is_filmmaker:
-                filtered_profiles.append(profile)
-
-        # Apply pagination
-        total = len(filtered_profiles)
-        paginated_profiles = filtered_profiles[offset:offset + limit]
+            conditions.append(
+                "NOT EXISTS (SELECT 1 FROM backlot_project_members m"
+                " WHERE m.project_id = :exclude_project AND m.user_id = t.id)"
+            )
+            conditions.append(
+                "NOT EXISTS (SELECT 1 FROM backlot_projects bp"
+                " WHERE bp.id = :exclude_project AND bp.owner_id = t.id)"
+            )
+            params["exclude_project"] = exclude_project
+
+        paginated_profiles = search_layer.search(
+            "profiles",
+            q,
+            columns="t.id, t.username, t.full_name, t.display_name, t.avatar_url, t.created_at",
+            conditions=conditions,
+            params=params,
+            order_by="t.full_name",
+            limit=limit,
+            offset=offset,
+        )
+        total = search_layer.search_count("profiles", q, conditions=conditions, params=params)
 
         # Convert to response format
         users = [
@@ -164,7 +111,7 @@ async def check_project_membership(
     Check if a user is already a member of a specific project.
     Returns membership status and role if member.
     """
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     try:
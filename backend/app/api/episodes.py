@@ -12,6 +12,7 @@ import io
 import json
 
 from app.core.database import get_client, execute_query, execute_single
+from app.core.auth import get_current_user_from_token
 
 router = APIRouter()
 
@@ -204,40 +205,6 @@ class EpisodeSettingsUpdate(BaseModel):
 # Helper Functions
 # =====================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token."""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    # Decode JWT to get user info
-    import jwt
-    try:
-        # Decode without verification for user info (Cognito already validated)
-        decoded = jwt.decode(token, options={"verify_signature": False})
-        cognito_id = decoded.get("sub")
-        if not cognito_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        # Get profile from cognito_user_id
-        profile = execute_single(
-            "SELECT id, email, display_name FROM profiles WHERE cognito_user_id = :cognito_id",
-            {"cognito_id": cognito_id}
-        )
-        if not profile:
-            raise HTTPException(status_code=401, detail="User profile not found")
-
-        return {
-            "user_id": str(profile["id"]),
-            "email": profile["email"],
-            "display_name": profile.get("display_name"),
-            "cognito_id": cognito_id
-        }
-    except jwt.DecodeError:
-        raise HTTPException(status_code=401, detail="Invalid token format")
-
-
 async def verify_project_access(project_id: str, user_id: str) -> Dict[str, Any]:
     """Verify user has access to project and return project data."""
     project = execute_single(
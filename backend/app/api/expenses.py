@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date, timedelta
 from app.core.database import get_client, execute_single
+from app.core.auth import get_current_user_from_token
 
 router = APIRouter()
 
@@ -339,31 +340,6 @@ class BulkSubmitReceiptsRequest(BaseModel):
 # HELPERS
 # =============================================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token, returning profile ID"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        cognito_id = user.get("id")
-        profile_id = get_profile_id_from_cognito_id(cognito_id)
-        if not profile_id:
-            raise HTTPException(status_code=401, detail="User profile not found")
-
-        return {"id": profile_id, "email": user.get("email"), "cognito_id": cognito_id}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 async def verify_project_member(client, project_id: str, user_id: str) -> bool:
     """Verify user is a member of the project"""
     project_resp = client.table("backlot_projects").select("owner_id").eq("id", project_id).execute()
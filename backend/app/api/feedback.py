@@ -3,21 +3,22 @@ Alpha Feedback API Routes
 User-facing endpoints for alpha testers to submit bug reports and feedback
 """
 from fastapi import APIRouter, HTTPException, Header
-from typing import Optional, Dict, Any
+from typing import Optional
 from pydantic import BaseModel
 from uuid import uuid4
 from datetime import datetime
 
 from app.core.database import get_client, execute_single
 from app.core.storage import StorageBucket
+from app.core.auth import get_cognito_user_from_token
 
 router = APIRouter()
 
 
 def get_profile_id_from_cognito_id(cognito_user_id: str) -> Optional[str]:
     """Look up profile ID from Cognito user ID"""
-    if not cognito_user_id:
-        return None
+    if not cognito_user_id:
+        return None
     uid_str = str(cognito_user_id)
 
     # Try cognito_user_id first
@@ -39,24 +40,6 @@ def get_profile_id_from_cognito_id(cognito_user_id: str) -> Optional[str]:
     return None
 
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "sub": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
 BACKLOT_FILES_BUCKET = "swn-backlot-files-517220555400"
 
 
@@ -82,7 +65,7 @@ async def submit_alpha_feedback(
 ):
     """Submit feedback - only alpha testers can use this endpoint"""
     try:
-        user = await get_current_user_from_token(authorization)
+        user = await get_cognito_user_from_token(authorization)
         cognito_id = user.get("sub") or user.get("user_id") or user.get("id")
 
         if not cognito_id:
@@ -141,7 +124,7 @@ async def get_screenshot_upload_url(
 ):
     """Get presigned URL for screenshot upload - only for alpha testers"""
     try:
-        user = await get_current_user_from_token(authorization)
+        user = await get_cognito_user_from_token(authorization)
         cognito_id = user.get("sub") or user.get("user_id") or user.get("id")
 
         if not cognito_id:
@@ -189,7 +172,7 @@ async def get_my_feedback(
 ):
     """Get feedback submitted by the current user"""
     try:
-        user = await get_current_user_from_token(authorization)
+        user = await get_cognito_user_from_token(authorization)
         user_id = user.get("sub") or user.get("user_id") or user.get("id")
 
         if not user_id:
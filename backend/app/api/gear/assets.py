@@ -10,7 +10,7 @@ from pydantic import BaseModel
 
 from app.core.auth import get_current_user
 
-from app.services import gear_service
+from app.services import gear_availability, gear_service
 
 router = APIRouter(prefix="/assets", tags=["Gear Assets"])
 
@@ -122,25 +122,32 @@ async def list_assets(
     search: Optional[str] = Query(None, description="Search term"),
     limit: int = Query(50, le=200),
     offset: int = Query(0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (replaces offset)"),
+    count: str = Query("exact", pattern="^(exact|planned|estimated|none)$"),
     user=Depends(get_current_user)
 ):
     """List assets for an organization with filtering."""
     profile_id = get_profile_id(user)
     require_org_access(org_id, profile_id)
 
-    result = gear_service.list_assets(
-        org_id,
-        status=status,
-        category_id=category_id,
-        custodian_id=custodian_id,
-        location_id=location_id,
-        search=search,
-        asset_type=asset_type,
-        parent_asset_id=parent_asset_id,
-        include_accessory_count=include_accessory_count,
-        limit=limit,
-        offset=offset
-    )
+    try:
+        result = gear_service.list_assets(
+            org_id,
+            status=status,
+            category_id=category_id,
+            custodian_id=custodian_id,
+            location_id=location_id,
+            search=search,
+            asset_type=asset_type,
+            parent_asset_id=parent_asset_id,
+            include_accessory_count=include_accessory_count,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            count=count
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
     return result
 
@@ -390,6 +397,63 @@ async def get_asset_stats(
     }
 
 
+# ============================================================================
+# AVAILABILITY ENDPOINTS
+# ============================================================================
+
+def _validate_date_range(start_date: date, end_date: date, max_days: Optional[int] = None) -> None:
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+    if max_days and (end_date - start_date).days + 1 > max_days:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {max_days} days")
+
+
+@router.get("/{org_id}/availability")
+async def check_assets_availability(
+    org_id: str,
+    asset_ids: List[str] = Query(..., description="Assets to check"),
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    timezone: Optional[str] = Query(None, description="Timezone for internal checkout times (e.g., 'America/Los_Angeles')"),
+    user=Depends(get_current_user)
+):
+    """Check which assets are free over a date range, with their conflicting bookings."""
+    profile_id = get_profile_id(user)
+    require_org_access(org_id, profile_id)
+    _validate_date_range(start_date, end_date)
+
+    results = gear_availability.check_availability(
+        asset_ids, start_date, end_date,
+        org_id=org_id, owner_org_id=org_id, tz=timezone or "UTC",
+    )
+
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "assets": results,
+        "available_asset_ids": [asset_id for asset_id, r in results.items() if r["available"]],
+    }
+
+
+@router.get("/{org_id}/availability/calendar")
+async def get_availability_calendar(
+    org_id: str,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    category_id: Optional[str] = Query(None, description="Filter by category"),
+    timezone: Optional[str] = Query(None, description="Timezone for internal checkout times (e.g., 'America/Los_Angeles')"),
+    user=Depends(get_current_user)
+):
+    """Per-day availability for the organization's whole inventory."""
+    profile_id = get_profile_id(user)
+    require_org_access(org_id, profile_id)
+    _validate_date_range(start_date, end_date, gear_availability.MAX_CALENDAR_DAYS)
+
+    return gear_availability.get_availability_calendar(
+        org_id, start_date, end_date, category_id=category_id, tz=timezone or "UTC"
+    )
+
+
 # ============================================================================
 # EQUIPMENT PACKAGE (ACCESSORY) ENDPOINTS
 # ============================================================================
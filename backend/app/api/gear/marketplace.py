@@ -10,9 +10,9 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel
 
 from app.core.auth import get_current_user
-from app.core.database import execute_query, execute_single, execute_insert, execute_delete
+from app.core.database import execute_query, execute_single, execute_insert, execute_delete, execute_insert_many
 
-from app.services import gear_service
+from app.services import gear_availability, gear_service, marketplace_geo
 
 router = APIRouter(prefix="/marketplace", tags=["Gear Marketplace"])
 
@@ -369,66 +369,17 @@ async def search_marketplace(
 
     # Date availability filtering (applies if either date provided)
     if available_from or available_to:
-        # Use user's timezone if provided, otherwise default to UTC
-        tz = timezone if timezone else 'UTC'
-
-        conditions.append(f"""
-            -- Exclude permanently unavailable assets only
-            -- Allow checked_out/under_repair/in_transit if dates don't overlap
-            a.status NOT IN ('retired', 'lost')
-
-            -- Filter out assets with overlapping rental orders
-            AND NOT EXISTS (
-                SELECT 1 FROM gear_rental_orders ro
-                JOIN gear_rental_order_items roi ON roi.order_id = ro.id
-                WHERE roi.asset_id = ml.asset_id
-                  AND ro.status IN ('confirmed', 'building', 'packed',
-                                   'ready_for_pickup', 'picked_up', 'in_use')
-                  AND ro.rental_start_date <= :available_to
-                  AND ro.rental_end_date >= :available_from
-            )
-
-            -- Filter out assets with overlapping internal checkouts
-            -- Includes both active checkouts and scheduled future checkouts
-            -- Uses user's timezone ({tz}) for TIMESTAMPTZ comparison
-            AND NOT EXISTS (
-                SELECT 1 FROM gear_transactions gt
-                JOIN gear_transaction_items gti ON gti.transaction_id = gt.id
-                WHERE gti.asset_id = ml.asset_id
-                  AND gt.organization_id = ml.organization_id
-                  AND gt.transaction_type = 'internal_checkout'
-                  AND gt.status IN ('pending', 'in_progress')
-                  AND gt.returned_at IS NULL
-                  AND gt.scheduled_at IS NOT NULL
-                  AND gt.expected_return_at IS NOT NULL
-                  AND DATE(gt.scheduled_at AT TIME ZONE '{tz}') <= :available_to
-                  AND DATE(gt.expected_return_at AT TIME ZONE '{tz}') >= :available_from
-            )
-
-            -- Filter out assets in work orders
-            -- ALWAYS blocks checked-out work orders (asset physically with custodian)
-            -- Conditionally blocks pre-checkout work orders based on rental house setting
-            AND NOT EXISTS (
-                SELECT 1 FROM gear_work_orders wo
-                JOIN gear_work_order_items woi ON woi.work_order_id = wo.id
-                LEFT JOIN gear_marketplace_settings gms ON gms.organization_id = wo.organization_id
-                WHERE woi.asset_id = ml.asset_id
-                  AND wo.organization_id = ml.organization_id
-                  AND wo.expected_return_date IS NOT NULL
-                  AND wo.pickup_date <= :available_to
-                  AND wo.expected_return_date >= :available_from
-                  AND (
-                    -- Always block checked-out work orders (mandatory)
-                    wo.status = 'checked_out'
-                    OR
-                    -- Conditionally block pre-checkout work orders (optional, rental house setting)
-                    (wo.status IN ('in_progress', 'ready')
-                     AND COALESCE(gms.work_order_reserves_dates, FALSE) = TRUE)
-                  )
-            )
-        """)
+        # Exclude permanently unavailable assets, and assets with a blocking
+        # rental order, internal checkout (compared in the user's timezone) or
+        # work order booking over the dates. Checked-out/under-repair assets
+        # stay listed when the dates don't overlap.
+        conditions.append(
+            "a.status NOT IN ('retired', 'lost') AND "
+            + gear_availability.unbooked_condition("ml.asset_id", "ml.organization_id")
+        )
         params["available_from"] = available_from
         params["available_to"] = available_to
+        params["tz"] = timezone or 'UTC'
 
     where_clause = " AND ".join(conditions)
 
@@ -1317,8 +1268,8 @@ async def bulk_create_listings(
             detail=f"The following assets need photos before they can be listed: {assets_without_photos}"
         )
 
-    # Create listings for assets not already listed
-    created = []
+    # Create listings for assets not already listed (one multi-row INSERT)
+    new_listings = []
     for asset_id in asset_ids:
         if asset_id not in already_listed:
             if listings_map:
@@ -1326,65 +1277,37 @@ async def bulk_create_listings(
                 item = listings_map[asset_id]
                 # Validate pricing based on listing type
                 validate_listing_type_pricing(item.listing_type, item.daily_rate, item.sale_price)
-                listing = execute_insert(
-                    """
-                    INSERT INTO gear_marketplace_listings (
-                        asset_id, organization_id, listing_type,
-                        daily_rate, weekly_rate, monthly_rate,
-                        deposit_amount, deposit_percent, insurance_required, min_rental_days, rental_notes,
-                        sale_price, sale_condition, sale_includes, sale_negotiable
-                    ) VALUES (
-                        :asset_id, :org_id, :listing_type,
-                        :daily_rate, :weekly_rate, :monthly_rate,
-                        :deposit_amount, :deposit_percent, :insurance_required, :min_rental_days, :rental_notes,
-                        :sale_price, :sale_condition, :sale_includes, :sale_negotiable
-                    )
-                    RETURNING *
-                    """,
-                    {
-                        "asset_id": asset_id,
-                        "org_id": org_id,
-                        "listing_type": item.listing_type,
-                        "daily_rate": item.daily_rate,
-                        "weekly_rate": item.weekly_rate,
-                        "monthly_rate": item.monthly_rate,
-                        "deposit_amount": item.deposit_amount,
-                        "deposit_percent": item.deposit_percent,
-                        "insurance_required": item.insurance_required,
-                        "min_rental_days": item.min_rental_days,
-                        "rental_notes": item.rental_notes,
-                        "sale_price": item.sale_price,
-                        "sale_condition": item.sale_condition,
-                        "sale_includes": item.sale_includes,
-                        "sale_negotiable": item.sale_negotiable
-                    }
-                )
+                new_listings.append({
+                    "asset_id": asset_id,
+                    "organization_id": org_id,
+                    "listing_type": item.listing_type,
+                    "daily_rate": item.daily_rate,
+                    "weekly_rate": item.weekly_rate,
+                    "monthly_rate": item.monthly_rate,
+                    "deposit_amount": item.deposit_amount,
+                    "deposit_percent": item.deposit_percent,
+                    "insurance_required": item.insurance_required,
+                    "min_rental_days": item.min_rental_days,
+                    "rental_notes": item.rental_notes,
+                    "sale_price": item.sale_price,
+                    "sale_condition": item.sale_condition,
+                    "sale_includes": item.sale_includes,
+                    "sale_negotiable": item.sale_negotiable
+                })
             else:
                 # Default settings (legacy format) - only supports rent type
-                listing = execute_insert(
-                    """
-                    INSERT INTO gear_marketplace_listings (
-                        asset_id, organization_id, listing_type,
-                        daily_rate, weekly_rate, monthly_rate,
-                        deposit_percent, insurance_required
-                    ) VALUES (
-                        :asset_id, :org_id, 'rent',
-                        :daily_rate, :weekly_rate, :monthly_rate,
-                        :deposit_percent, :insurance_required
-                    )
-                    RETURNING *
-                    """,
-                    {
-                        "asset_id": asset_id,
-                        "org_id": org_id,
-                        "daily_rate": data.daily_rate,
-                        "weekly_rate": data.weekly_rate,
-                        "monthly_rate": data.monthly_rate,
-                        "deposit_percent": data.deposit_percent,
-                        "insurance_required": data.insurance_required
-                    }
-                )
-            created.append(listing)
+                new_listings.append({
+                    "asset_id": asset_id,
+                    "organization_id": org_id,
+                    "listing_type": "rent",
+                    "daily_rate": data.daily_rate,
+                    "weekly_rate": data.weekly_rate,
+                    "monthly_rate": data.monthly_rate,
+                    "deposit_percent": data.deposit_percent,
+                    "insurance_required": data.insurance_required
+                })
+
+    created = execute_insert_many("gear_marketplace_listings", new_listings) if new_listings else []
 
     return {
         "created": created,
@@ -1423,36 +1346,18 @@ async def get_listing_availability(
     # Check if asset is available (not checked out, not under repair, etc.)
     asset_available = listing["asset_status"] in ["available", "reserved"]
 
-    # Check for overlapping rentals
-    overlapping_rentals = execute_query(
-        """
-        SELECT ro.id, ro.rental_start_date, ro.rental_end_date
-        FROM gear_rental_orders ro
-        JOIN gear_rental_order_items roi ON roi.order_id = ro.id
-        WHERE roi.asset_id = :asset_id
-          AND ro.status IN ('confirmed', 'in_progress')
-          AND ro.rental_start_date <= :end_date
-          AND ro.rental_end_date >= :start_date
-        """,
-        {
-            "asset_id": listing["asset_id"],
-            "start_date": start_date,
-            "end_date": end_date
-        }
+    # Bookings and blackout dates over the range, in one query
+    result = gear_availability.check_asset_availability(
+        listing["asset_id"], start_date, end_date,
+        org_id=listing["organization_id"], listing_id=listing_id,
     )
+    overlapping_rentals = [
+        {"id": c["source_id"], "status": c["status"], "starts_at": c["starts_at"], "ends_at": c["ends_at"]}
+        for c in result["conflicts"] if c["type"] == "rental_order"
+    ]
+    in_blackout = any(c["type"] == "blackout" for c in result["conflicts"])
 
-    # Check blackout dates
-    blackout_dates = listing.get("blackout_dates", []) or []
-    in_blackout = False
-    for bd in blackout_dates:
-        if bd.get("start") and bd.get("end"):
-            bd_start = datetime.strptime(bd["start"], "%Y-%m-%d").date()
-            bd_end = datetime.strptime(bd["end"], "%Y-%m-%d").date()
-            if bd_start <= end_date and bd_end >= start_date:
-                in_blackout = True
-                break
-
-    is_available = asset_available and len(overlapping_rentals) == 0 and not in_blackout
+    is_available = asset_available and result["available"]
 
     return {
         "listing_id": listing_id,
@@ -1462,7 +1367,9 @@ async def get_listing_availability(
         "asset_available": asset_available,
         "has_overlapping_rentals": len(overlapping_rentals) > 0,
         "overlapping_rentals": overlapping_rentals if overlapping_rentals else None,
-        "in_blackout_period": in_blackout
+        "in_blackout_period": in_blackout,
+        "reason": result["reason"],
+        "conflicts": result["conflicts"]
     }
 
 
@@ -1574,11 +1481,16 @@ async def search_marketplace_nearby(
     timezone: Optional[str] = Query(None, description="User's timezone (e.g., 'America/Los_Angeles')"),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (replaces offset)"),
     user=Depends(get_current_user)
 ):
     """
-    Search marketplace with proximity sorting using Haversine formula.
+    Search marketplace with proximity sorting.
     Returns either gear houses or individual gear items based on result_mode.
+
+    Radius and distance ordering use the PostGIS index when available, else a
+    bounding-box prefilter (see marketplace_geo). Pages are ordered by
+    (distance, id); pass next_cursor back as cursor for the next page.
     """
     # Validate and normalize date range
     # If only one date is provided, use it for both start and end (single day)
@@ -1600,14 +1512,21 @@ async def search_marketplace_nearby(
             raise HTTPException(status_code=400, detail="Date range cannot exceed 90 days")
 
     profile_id = get_profile_id(user)
+    prox = marketplace_geo.proximity(lat, lng, radius_miles)
     params: Dict[str, Any] = {
-        "user_lat": lat,
-        "user_lng": lng,
-        "radius_miles": radius_miles,
-        "limit": limit,
-        "offset": offset
+        **prox.params,
+        # One extra row tells us whether there is a next page
+        "limit": limit + 1,
+        "offset": 0 if cursor else offset
     }
 
+    after = None
+    if cursor:
+        try:
+            after = marketplace_geo.decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
     # Build conditions
     conditions = [
         "ms.is_marketplace_enabled = TRUE",
@@ -1624,47 +1543,65 @@ async def search_marketplace_nearby(
 
     if delivery_to_me_only:
         conditions.append("ms.offers_delivery = TRUE")
-        conditions.append("ms.delivery_radius_miles >= haversine_distance_miles(:user_lat, :user_lng, ms.location_latitude, ms.location_longitude)")
+        conditions.append(f"ms.delivery_radius_miles >= {prox.distance}")
 
+    conditions.append(prox.within)
     where_clause = " AND ".join(conditions)
 
+    def page_after(id_column: str) -> str:
+        if not after:
+            return ""
+        try:
+            clause, cursor_params = prox.after(id_column, after)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        params.update(cursor_params)
+        return f"AND {clause}"
+
+    def next_cursor(rows: list) -> Optional[str]:
+        """Drop the extra row; cursor after the last row kept when there is more."""
+        has_more = len(rows) > limit
+        del rows[limit:]
+        sort_keys = [row.pop("sort_key") for row in rows]
+        if not has_more:
+            return None
+        return marketplace_geo.encode_cursor(prox.mode, sort_keys[-1], rows[-1]["id"])
+
     if result_mode == "gear_houses":
         # Return gear houses sorted by distance
         query = f"""
-            WITH gear_house_data AS (
-                SELECT
-                    o.id,
-                    o.name,
-                    ms.marketplace_name,
-                    ms.marketplace_description,
-                    ms.marketplace_logo_url,
-                    CASE WHEN ms.hide_exact_address THEN ms.public_location_display ELSE ms.marketplace_location END as location_display,
-                    ms.location_latitude,
-                    ms.location_longitude,
-                    ms.lister_type,
-                    ms.is_verified,
-                    ms.offers_delivery,
-                    ms.delivery_radius_miles,
-                    ms.delivery_base_fee,
-                    ms.delivery_per_mile_fee,
-                    ms.contact_email,
-                    ms.contact_phone,
-                    haversine_distance_miles(:user_lat, :user_lng, ms.location_latitude, ms.location_longitude) as distance_miles,
-                    (SELECT COUNT(*) FROM gear_marketplace_listings ml WHERE ml.organization_id = o.id AND ml.is_listed = TRUE) as listing_count,
-                    EXISTS(SELECT 1 FROM gear_house_favorites f WHERE f.organization_id = o.id AND f.profile_id = :profile_id) as is_favorited
-                FROM organizations o
-                JOIN gear_marketplace_settings ms ON ms.organization_id = o.id
-                WHERE {where_clause}
-                  AND haversine_distance_miles(:user_lat, :user_lng, ms.location_latitude, ms.location_longitude) <= :radius_miles
-            )
-            SELECT *
-            FROM gear_house_data
-            WHERE listing_count > 0
-            ORDER BY distance_miles ASC
+            SELECT
+                o.id,
+                o.name,
+                ms.marketplace_name,
+                ms.marketplace_description,
+                ms.marketplace_logo_url,
+                CASE WHEN ms.hide_exact_address THEN ms.public_location_display ELSE ms.marketplace_location END as location_display,
+                ms.location_latitude,
+                ms.location_longitude,
+                ms.lister_type,
+                ms.is_verified,
+                ms.offers_delivery,
+                ms.delivery_radius_miles,
+                ms.delivery_base_fee,
+                ms.delivery_per_mile_fee,
+                ms.contact_email,
+                ms.contact_phone,
+                {prox.distance} as distance_miles,
+                {prox.order} as sort_key,
+                (SELECT COUNT(*) FROM gear_marketplace_listings ml WHERE ml.organization_id = o.id AND ml.is_listed = TRUE) as listing_count,
+                EXISTS(SELECT 1 FROM gear_house_favorites f WHERE f.organization_id = o.id AND f.profile_id = :profile_id) as is_favorited
+            FROM organizations o
+            JOIN gear_marketplace_settings ms ON ms.organization_id = o.id
+            WHERE {where_clause}
+              AND EXISTS (SELECT 1 FROM gear_marketplace_listings ml WHERE ml.organization_id = o.id AND ml.is_listed = TRUE)
+              {page_after("o.id")}
+            ORDER BY {prox.order}, o.id
             LIMIT :limit OFFSET :offset
         """
         params["profile_id"] = profile_id
         gear_houses = execute_query(query, params)
+        cursor_out = next_cursor(gear_houses)
 
         # Enrich with top categories and featured items
         enriched = []
@@ -1733,14 +1670,14 @@ async def search_marketplace_nearby(
             FROM organizations o
             JOIN gear_marketplace_settings ms ON ms.organization_id = o.id
             WHERE {where_clause}
-              AND haversine_distance_miles(:user_lat, :user_lng, ms.location_latitude, ms.location_longitude) <= :radius_miles
-              AND (SELECT COUNT(*) FROM gear_marketplace_listings ml WHERE ml.organization_id = o.id AND ml.is_listed = TRUE) > 0
+              AND EXISTS (SELECT 1 FROM gear_marketplace_listings ml WHERE ml.organization_id = o.id AND ml.is_listed = TRUE)
         """
         count_result = execute_single(count_query, params)
 
         return {
             "gear_houses": enriched,
             "total": count_result["total"] if count_result else 0,
+            "next_cursor": cursor_out,
             "user_location": {"lat": lat, "lng": lng},
             "radius_miles": radius_miles
         }
@@ -1757,62 +1694,15 @@ async def search_marketplace_nearby(
 
         # Date availability filtering (applies if either date provided)
         if available_from or available_to:
-            # Use user's timezone if provided, otherwise default to UTC
-            tz = timezone if timezone else 'UTC'
-
-            item_conditions.append(f"""
-                -- Exclude permanently unavailable assets only
-                -- Allow checked_out/under_repair/in_transit if dates don't overlap
-                a.status NOT IN ('retired', 'lost')
-
-                -- Filter out assets with overlapping rental orders
-                AND NOT EXISTS (
-                    SELECT 1 FROM gear_rental_orders ro
-                    JOIN gear_rental_order_items roi ON roi.order_id = ro.id
-                    WHERE roi.asset_id = ml.asset_id
-                      AND ro.status IN ('confirmed', 'building', 'packed',
-                                       'ready_for_pickup', 'picked_up', 'in_use')
-                      AND ro.rental_start_date <= :available_to
-                      AND ro.rental_end_date >= :available_from
-                )
-
-                -- Filter out assets with overlapping internal checkouts
-                -- Includes both active checkouts and scheduled future checkouts
-                -- Uses user's timezone ({tz}) for TIMESTAMPTZ comparison
-                AND NOT EXISTS (
-                    SELECT 1 FROM gear_transactions gt
-                    JOIN gear_transaction_items gti ON gti.transaction_id = gt.id
-                    WHERE gti.asset_id = ml.asset_id
-                      AND gt.organization_id = ml.organization_id
-                      AND gt.transaction_type = 'internal_checkout'
-                      AND gt.status IN ('pending', 'in_progress')
-                      AND gt.returned_at IS NULL
-                      AND gt.scheduled_at IS NOT NULL
-                      AND gt.expected_return_at IS NOT NULL
-                      AND DATE(gt.scheduled_at AT TIME ZONE '{tz}') <= :available_to
-                      AND DATE(gt.expected_return_at AT TIME ZONE '{tz}') >= :available_from
-                )
-
-                -- Filter out assets in work orders
-                AND NOT EXISTS (
-                    SELECT 1 FROM gear_work_orders wo
-                    JOIN gear_work_order_items woi ON woi.work_order_id = wo.id
-                    LEFT JOIN gear_marketplace_settings gms ON gms.organization_id = wo.organization_id
-                    WHERE woi.asset_id = ml.asset_id
-                      AND wo.organization_id = ml.organization_id
-                      AND wo.expected_return_date IS NOT NULL
-                      AND wo.pickup_date <= :available_to
-                      AND wo.expected_return_date >= :available_from
-                      AND (
-                        wo.status = 'checked_out'
-                        OR
-                        (wo.status IN ('in_progress', 'ready')
-                         AND COALESCE(gms.work_order_reserves_dates, FALSE) = TRUE)
-                      )
-                )
-            """)
+            # Exclude permanently unavailable assets and assets with a blocking
+            # booking over the dates (internal checkouts in the user's timezone)
+            item_conditions.append(
+                "a.status NOT IN ('retired', 'lost') AND "
+                + gear_availability.unbooked_condition("ml.asset_id", "ml.organization_id")
+            )
             params["available_from"] = available_from
             params["available_to"] = available_to
+            params["tz"] = timezone or 'UTC'
 
         item_where = " AND ".join(item_conditions)
 
@@ -1835,19 +1725,21 @@ async def search_marketplace_nearby(
                 ms.is_verified,
                 ms.offers_delivery,
                 ms.delivery_radius_miles,
-                haversine_distance_miles(:user_lat, :user_lng, ms.location_latitude, ms.location_longitude) as distance_miles
+                {prox.distance} as distance_miles,
+                {prox.order} as sort_key
             FROM gear_marketplace_listings ml
             JOIN gear_marketplace_settings ms ON ms.organization_id = ml.organization_id
             JOIN gear_assets a ON a.id = ml.asset_id
             JOIN organizations o ON o.id = ml.organization_id
             LEFT JOIN gear_categories c ON c.id = a.category_id
             WHERE {item_where}
-              AND haversine_distance_miles(:user_lat, :user_lng, ms.location_latitude, ms.location_longitude) <= :radius_miles
-            ORDER BY distance_miles ASC
+              {page_after("ml.id")}
+            ORDER BY {prox.order}, ml.id
             LIMIT :limit OFFSET :offset
             """,
             params
         )
+        cursor_out = next_cursor(listings)
 
         # Transform and add distance info
         transformed = []
@@ -1872,7 +1764,6 @@ async def search_marketplace_nearby(
             JOIN gear_marketplace_settings ms ON ms.organization_id = ml.organization_id
             JOIN gear_assets a ON a.id = ml.asset_id
             WHERE {item_where}
-              AND haversine_distance_miles(:user_lat, :user_lng, ms.location_latitude, ms.location_longitude) <= :radius_miles
             """,
             params
         )
@@ -1880,6 +1771,7 @@ async def search_marketplace_nearby(
         return {
             "listings": transformed,
             "total": count_result["total"] if count_result else 0,
+            "next_cursor": cursor_out,
             "user_location": {"lat": lat, "lng": lng},
             "radius_miles": radius_miles
         }
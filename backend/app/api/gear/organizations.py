@@ -8,6 +8,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 
 from app.core.auth import get_current_user
+from app.core.backlot_permissions import invalidate_permission_cache
 from app.services import gear_service
 
 router = APIRouter(prefix="/organizations", tags=["Gear Organizations"])
@@ -293,6 +294,7 @@ async def invite_member(
             "invited_by": profile_id
         }
     )
+    invalidate_permission_cache(user_id=data.user_id)
 
     return {"member": member}
 
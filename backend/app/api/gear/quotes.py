@@ -19,7 +19,7 @@ import logging
 from app.core.auth import get_current_user
 from app.core.database import execute_query, execute_single, execute_insert, execute_update
 
-from app.services import gear_service
+from app.services import gear_availability, gear_service
 
 router = APIRouter(prefix="/quotes", tags=["Gear Quotes"])
 logger = logging.getLogger(__name__)
@@ -211,123 +211,16 @@ async def validate_item_availability(
     """
     Check if gear is available for requested dates.
 
-    Checks:
-    1. Asset status (must be available/reserved)
-    2. Overlapping rental orders
-    3. Overlapping internal checkouts
-    4. Work order reservations (always for checked-out, conditionally for pre-checkout)
-    5. Blackout dates
+    Checks asset status, overlapping rental orders, internal checkouts, work
+    order reservations and the listing's blackout dates in one query (see
+    gear_availability.check_availability).
 
     Returns: (is_available, reason_if_not_available)
     """
-    # Check asset status
-    asset = execute_single(
-        "SELECT status FROM gear_assets WHERE id = :asset_id",
-        {"asset_id": asset_id}
+    result = gear_availability.check_asset_availability(
+        asset_id, start_date, end_date, org_id=org_id, listing_id=listing_id
     )
-
-    if not asset:
-        return (False, "Asset not found")
-
-    # Only reject permanently unavailable assets
-    # Allow checked_out/under_repair/in_transit if dates don't conflict (checked below)
-    if asset["status"] in ("retired", "lost"):
-        return (False, f"Asset is {asset.get('status', 'unavailable')}")
-
-    # Check overlapping rental orders
-    overlapping = execute_single(
-        """
-        SELECT COUNT(*) as count
-        FROM gear_rental_orders ro
-        JOIN gear_rental_order_items roi ON roi.order_id = ro.id
-        WHERE roi.asset_id = :asset_id
-          AND ro.status IN ('confirmed', 'building', 'packed',
-                           'ready_for_pickup', 'picked_up', 'in_use')
-          AND ro.rental_start_date <= :end_date
-          AND ro.rental_end_date >= :start_date
-        """,
-        {"asset_id": asset_id, "start_date": start_date, "end_date": end_date}
-    )
-
-    if overlapping and overlapping["count"] > 0:
-        return (False, "Already rented for these dates")
-
-    # Check overlapping internal checkouts
-    internal_checkout = execute_single(
-        """
-        SELECT COUNT(*) as count
-        FROM gear_transactions gt
-        JOIN gear_transaction_items gti ON gti.transaction_id = gt.id
-        WHERE gti.asset_id = :asset_id
-          AND gt.organization_id = :org_id
-          AND gt.transaction_type = 'internal_checkout'
-          AND gt.status IN ('pending', 'in_progress')
-          AND gt.returned_at IS NULL
-          AND gt.scheduled_at IS NOT NULL
-          AND gt.expected_return_at IS NOT NULL
-          AND DATE(gt.scheduled_at) <= :end_date
-          AND DATE(gt.expected_return_at) >= :start_date
-        """,
-        {"asset_id": asset_id, "org_id": org_id, "start_date": start_date, "end_date": end_date}
-    )
-
-    if internal_checkout and internal_checkout["count"] > 0:
-        return (False, "Internal checkout scheduled for these dates")
-
-    # Check work orders
-    # ALWAYS blocks checked-out work orders (asset physically with custodian)
-    # Conditionally blocks pre-checkout work orders based on rental house setting
-    settings = execute_single(
-        "SELECT work_order_reserves_dates FROM gear_marketplace_settings WHERE organization_id = :org_id",
-        {"org_id": org_id}
-    )
-
-    reserves_dates = settings.get("work_order_reserves_dates", False) if settings else False
-
-    wo_overlap = execute_single(
-        """
-        SELECT COUNT(*) as count
-        FROM gear_work_orders wo
-        JOIN gear_work_order_items woi ON woi.work_order_id = wo.id
-        WHERE woi.asset_id = :asset_id
-          AND wo.organization_id = :org_id
-          AND wo.expected_return_date IS NOT NULL
-          AND wo.pickup_date <= :end_date
-          AND wo.expected_return_date >= :start_date
-          AND (
-            -- Always block checked-out work orders (mandatory)
-            wo.status = 'checked_out'
-            OR
-            -- Conditionally block pre-checkout work orders (optional, rental house setting)
-            (wo.status IN ('in_progress', 'ready') AND :reserves_dates = TRUE)
-          )
-        """,
-        {"asset_id": asset_id, "org_id": org_id, "start_date": start_date, "end_date": end_date, "reserves_dates": reserves_dates}
-    )
-
-    if wo_overlap and wo_overlap["count"] > 0:
-        return (False, "Reserved for work order")
-
-    # Check blackout dates
-    if listing_id:
-        listing = execute_single(
-            "SELECT blackout_dates FROM gear_marketplace_listings WHERE id = :id",
-            {"id": listing_id}
-        )
-
-        if listing:
-            blackout_dates = listing.get("blackout_dates", []) or []
-            for bd in blackout_dates:
-                if bd.get("start") and bd.get("end"):
-                    try:
-                        bd_start = datetime.strptime(bd["start"], "%Y-%m-%d").date()
-                        bd_end = datetime.strptime(bd["end"], "%Y-%m-%d").date()
-                        if bd_start <= end_date and bd_end >= start_date:
-                            return (False, "Blackout period")
-                    except (ValueError, TypeError):
-                        continue
-
-    return (True, "")
+    return (result["available"], result["reason"])
 
 
 # ============================================================================
@@ -370,38 +263,30 @@ async def create_rental_request(
     validated_items = []
     unavailable_items = []
 
+    # One query for every requested asset. The rental house is the request's,
+    # otherwise each asset's owner.
+    availability = gear_availability.check_availability(
+        [item.asset_id for item in data.items if item.asset_id],
+        data.rental_start_date,
+        data.rental_end_date,
+        org_id=data.rental_house_org_id,
+        listing_ids=[item.listing_id for item in data.items if item.asset_id and item.listing_id],
+    )
+
     for item_data in data.items:
         if item_data.asset_id:
-            # Get the rental house org_id - either from request or from asset's owner
-            rental_house_id = data.rental_house_org_id
-            if not rental_house_id:
-                # Get asset's organization
-                asset_org = execute_single(
-                    "SELECT organization_id FROM gear_assets WHERE id = :asset_id",
-                    {"asset_id": item_data.asset_id}
-                )
-                if asset_org:
-                    rental_house_id = asset_org["organization_id"]
-
-            if rental_house_id:
-                is_available, reason = await validate_item_availability(
-                    asset_id=item_data.asset_id,
-                    listing_id=item_data.listing_id,
-                    start_date=data.rental_start_date,
-                    end_date=data.rental_end_date,
-                    org_id=rental_house_id
-                )
-
-                if is_available:
-                    validated_items.append(item_data)
-                else:
-                    unavailable_items.append({
-                        "asset_id": item_data.asset_id,
-                        "listing_id": item_data.listing_id,
-                        "reason": reason
-                    })
-            else:
+            result = availability[str(item_data.asset_id)]
+            if result["available"]:
                 validated_items.append(item_data)
+            elif not data.rental_house_org_id and result["reason"] == "Asset not found":
+                # No rental house to check against
+                validated_items.append(item_data)
+            else:
+                unavailable_items.append({
+                    "asset_id": item_data.asset_id,
+                    "listing_id": item_data.listing_id,
+                    "reason": result["reason"]
+                })
         else:
             # Category requests always pass
             validated_items.append(item_data)
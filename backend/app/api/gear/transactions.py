@@ -100,21 +100,28 @@ async def list_transactions(
     project_id: Optional[str] = Query(None),
     limit: int = Query(50, le=200),
     offset: int = Query(0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (replaces offset)"),
+    count: str = Query("exact", pattern="^(exact|planned|estimated|none)$"),
     user=Depends(get_current_user)
 ):
     """List transactions for an organization."""
     profile_id = get_profile_id(user)
     require_org_access(org_id, profile_id)
 
-    result = gear_service.list_transactions(
-        org_id,
-        transaction_type=transaction_type,
-        status=status,
-        custodian_id=custodian_id,
-        project_id=project_id,
-        limit=limit,
-        offset=offset
-    )
+    try:
+        result = gear_service.list_transactions(
+            org_id,
+            transaction_type=transaction_type,
+            status=status,
+            custodian_id=custodian_id,
+            project_id=project_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            count=count
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
     return result
 
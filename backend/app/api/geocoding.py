@@ -9,7 +9,7 @@ Provides:
 All requests are cached to reduce load on Nominatim.
 """
 
-from fastapi import APIRouter, HTTPException, Header, Query
+from fastapi import APIRouter, Header, Query
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 import httpx
@@ -19,6 +19,7 @@ from datetime import datetime
 
 from app.core.database import get_client, execute_query, execute_single
 from app.core.config import settings
+from app.core.auth import get_cognito_user_from_token
 
 router = APIRouter()
 
@@ -214,25 +215,6 @@ async def call_nominatim(endpoint: str, params: Dict[str, Any]) -> Dict[str, Any
 # Auth Helper
 # =============================================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("user_id") or user.get("sub") or user.get("id")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 # =============================================================================
 # API Endpoints
 # =============================================================================
@@ -261,7 +243,7 @@ async def autocomplete_address(
     - 'address': Returns full address results (default)
     - 'city': Returns only city/town results for location fields
     """
-    await get_current_user_from_token(authorization)
+    await get_cognito_user_from_token(authorization)
 
     # Check cache first
     cache_key = generate_cache_key("autocomplete", f"{q}:{limit}:{mode}")
@@ -364,7 +346,7 @@ async def forward_geocode(
     Provide a full address string. Returns coordinates and structured address.
     Results are cached for 7 days.
     """
-    await get_current_user_from_token(authorization)
+    await get_cognito_user_from_token(authorization)
 
     # Check cache first
     cache_key = generate_cache_key("forward", address)
@@ -439,7 +421,7 @@ async def reverse_geocode(
     Used for "Use My Location" feature to get address from GPS coordinates.
     Results are cached for 7 days.
     """
-    await get_current_user_from_token(authorization)
+    await get_cognito_user_from_token(authorization)
 
     # Check cache first (round to 5 decimal places for caching)
     rounded_lat = round(lat, 5)
@@ -531,7 +513,7 @@ async def aws_autocomplete_address(
     Uses the AWS Places API for accurate US address search.
     This is preferred for production use over Nominatim.
     """
-    await get_current_user_from_token(authorization)
+    await get_cognito_user_from_token(authorization)
 
     try:
         from app.services.geocoding import search_places
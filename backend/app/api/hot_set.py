@@ -13,7 +13,8 @@ from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime, timedelta
 from decimal import Decimal
 from zoneinfo import ZoneInfo
-from app.core.database import get_client
+from app.core.database import get_client, execute_reorder
+from app.core.auth import get_current_user_from_token
 
 
 def get_session_local_time(session: dict, project_settings: dict = None) -> datetime:
@@ -443,42 +444,6 @@ class DayPreviewResponse(BaseModel):
 # HELPERS
 # =============================================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    import jwt
-    try:
-        payload = jwt.decode(token, options={"verify_signature": False})
-        user_id = payload.get("sub")
-        email = payload.get("email")
-
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        client = get_client()
-        profile_result = client.table("profiles").select("id").eq(
-            "cognito_user_id", user_id
-        ).execute()
-
-        if profile_result.data:
-            return {"id": profile_result.data[0]["id"], "cognito_id": user_id, "email": email}
-
-        if email:
-            profile_result = client.table("profiles").select("id").eq(
-                "email", email
-            ).execute()
-            if profile_result.data:
-                return {"id": profile_result.data[0]["id"], "cognito_id": user_id, "email": email}
-
-        raise HTTPException(status_code=401, detail="User not found")
-    except jwt.InvalidTokenError as e:
-        raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
-
-
 async def verify_project_access(client, project_id: str, user_id: str) -> bool:
     """Check if user has access to project (member or owner)"""
     # Check if user is a project member
@@ -2736,10 +2701,7 @@ async def reorder_scenes(
     if not await verify_project_edit(client, project_id, user["id"]):
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    for i, scene_id in enumerate(body.scene_ids):
-        client.table("backlot_hot_set_scene_logs").update({
-            "sort_order": i
-        }).eq("id", scene_id).execute()
+    execute_reorder("backlot_hot_set_scene_logs", body.scene_ids, start=0, scope={"session_id": session_id})
 
     return {"success": True}
 
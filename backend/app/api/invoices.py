@@ -10,6 +10,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, date
 from decimal import Decimal
 from app.core.database import get_client, execute_single
+from app.core.auth import get_cognito_user_from_token
 import logging
 import traceback
 
@@ -32,29 +33,6 @@ def handle_invoice_error(e: Exception, operation: str) -> JSONResponse:
     )
 
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        logger.warning("[Invoices] Missing or invalid authorization header")
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            logger.warning("[Invoices] Invalid token - verify_token returned None")
-            raise HTTPException(status_code=401, detail="Invalid token")
-        logger.info(f"[Invoices] Authenticated user: {user.get('id')}")
-        return {"id": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[Invoices] Authentication failed: {str(e)}")
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 def get_profile_id_from_cognito_id(cognito_user_id: str) -> str:
     """Look up the profile ID from a Cognito user ID."""
     if not cognito_user_id:
@@ -431,7 +409,7 @@ async def get_my_invoices(
     from app.services.feature_gates import enforce_project_feature
     enforce_project_feature(project_id, "PO_INVOICING")
 
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -471,7 +449,7 @@ async def get_invoices_for_review(
     """Get all invoices for project (managers only)."""
     try:
         logger.info(f"[Invoices] get_invoices_for_review called for project {project_id}")
-        current_user = await get_current_user_from_token(authorization)
+        current_user = await get_cognito_user_from_token(authorization)
         user_id = get_profile_id_from_cognito_id(current_user["id"])
         if not user_id:
             logger.warning(f"[Invoices] User profile not found for cognito_id: {current_user['id']}")
@@ -524,7 +502,7 @@ async def get_invoice_summary(
     from app.services.feature_gates import enforce_project_feature
     enforce_project_feature(project_id, "PO_INVOICING")
 
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -568,7 +546,7 @@ async def get_next_invoice_number(
     authorization: str = Header(None)
 ):
     """Get next auto-generated invoice number."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -588,7 +566,7 @@ async def get_prefill_data(
     """Get data to prefill a new invoice (user profile, project info)."""
     try:
         logger.info(f"[Invoices] get_prefill_data called for project {project_id}")
-        current_user = await get_current_user_from_token(authorization)
+        current_user = await get_cognito_user_from_token(authorization)
         user_id = get_profile_id_from_cognito_id(current_user["id"])
         if not user_id:
             logger.warning(f"[Invoices] User profile not found for cognito_id: {current_user['id']}")
@@ -640,7 +618,7 @@ async def get_importable_data(
     """Get data available to import into invoices (approved timecards, expenses, etc.)."""
     try:
         logger.info(f"[Invoices] get_importable_data called for project {project_id}")
-        current_user = await get_current_user_from_token(authorization)
+        current_user = await get_cognito_user_from_token(authorization)
         user_id = get_profile_id_from_cognito_id(current_user["id"])
         if not user_id:
             logger.warning(f"[Invoices] User profile not found for cognito_id: {current_user['id']}")
@@ -798,7 +776,7 @@ async def get_pending_import_count_endpoint(
     """Get count of approved items not yet added to any invoice."""
     try:
         logger.info(f"[Invoices] get_pending_import_count called for project {project_id}")
-        current_user = await get_current_user_from_token(authorization)
+        current_user = await get_cognito_user_from_token(authorization)
         user_id = get_profile_id_from_cognito_id(current_user["id"])
         if not user_id:
             raise HTTPException(status_code=401, detail="User profile not found")
@@ -826,7 +804,7 @@ async def get_invoice(
     """Get single invoice with line items."""
     try:
         logger.info(f"[Invoices] get_invoice called for invoice {invoice_id}")
-        current_user = await get_current_user_from_token(authorization)
+        current_user = await get_cognito_user_from_token(authorization)
         user_id = get_profile_id_from_cognito_id(current_user["id"])
         if not user_id:
             logger.warning(f"[Invoices] User profile not found for cognito_id: {current_user['id']}")
@@ -872,7 +850,7 @@ async def create_invoice(
     authorization: str = Header(None)
 ):
     """Create a new invoice."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -935,7 +913,7 @@ async def update_invoice(
     authorization: str = Header(None)
 ):
     """Update an invoice (only drafts can be fully edited)."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -991,7 +969,7 @@ async def delete_invoice(
     authorization: str = Header(None)
 ):
     """Delete a draft invoice."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1032,7 +1010,7 @@ async def add_line_item(
     authorization: str = Header(None)
 ):
     """Add a line item to an invoice."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1096,7 +1074,7 @@ async def update_line_item(
     authorization: str = Header(None)
 ):
     """Update a line item."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1153,7 +1131,7 @@ async def delete_line_item(
     authorization: str = Header(None)
 ):
     """Delete a line item."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1188,7 +1166,7 @@ async def reorder_line_item(
     authorization: str = Header(None)
 ):
     """Move a line item up or down in the list."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1270,7 +1248,7 @@ async def send_invoice(
     authorization: str = Header(None)
 ):
     """Mark invoice as sent."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1318,7 +1296,7 @@ async def mark_invoice_paid(
     authorization: str = Header(None)
 ):
     """Mark invoice as paid (managers only)."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1359,7 +1337,7 @@ async def cancel_invoice(
     authorization: str = Header(None)
 ):
     """Cancel an invoice."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1401,7 +1379,7 @@ async def submit_for_approval(
     authorization: str = Header(None)
 ):
     """Submit invoice to project managers for approval."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1464,7 +1442,7 @@ async def approve_invoice(
     authorization: str = Header(None)
 ):
     """Approve an invoice (managers only). Optionally include approval notes."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1518,7 +1496,7 @@ async def deny_invoice(
     authorization: str = Header(None)
 ):
     """Deny an invoice permanently (managers only). Cannot be resubmitted."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1559,7 +1537,7 @@ async def request_changes(
     authorization: str = Header(None)
 ):
     """Request changes to an invoice (managers only)."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1599,7 +1577,7 @@ async def mark_invoice_sent(
     authorization: str = Header(None)
 ):
     """Mark invoice as sent externally (after approval)."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1642,7 +1620,7 @@ async def import_timecards(
     authorization: str = Header(None)
 ):
     """Import approved timecards as line items."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1723,7 +1701,7 @@ async def import_expenses(
     authorization: str = Header(None)
 ):
     """Import approved expenses as line items."""
-    current_user = await get_current_user_from_token(authorization)
+    current_user = await get_cognito_user_from_token(authorization)
     user_id = get_profile_id_from_cognito_id(current_user["id"])
     if not user_id:
         raise HTTPException(status_code=401, detail="User profile not found")
@@ -1875,7 +1853,7 @@ async def unlink_line_item(
     """
     try:
         logger.info(f"[Invoices] unlink_line_item called for item {item_id} on invoice {invoice_id}")
-        current_user = await get_current_user_from_token(authorization)
+        current_user = await get_cognito_user_from_token(authorization)
         user_id = get_profile_id_from_cognito_id(current_user["id"])
         if not user_id:
             raise HTTPException(status_code=401, detail="User profile not found")
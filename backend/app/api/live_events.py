@@ -8,8 +8,9 @@ from enum import Enum
 from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, Field
 
-from app.core.database import get_client, execute_single, execute_query
+from app.core.database import get_client, execute_single, execute_query, execute_update
 from app.core.auth import get_current_user, get_current_user_optional
+from app.core.event_buffer import Sink, event_buffer, utc_now, values_clause
 
 router = APIRouter()
 
@@ -1077,6 +1078,33 @@ async def join_event(
     return {"status": "joined"}
 
 
+def _write_heartbeats(events: List[dict]) -> None:
+    """One UPDATE for the latest heartbeat of each buffered session."""
+    values, params = values_clause(
+        events, ("event_id", "session_id", "at"),
+        {"event_id": "uuid", "session_id": "text", "at": "timestamptz"},
+    )
+    # A heartbeat older than the leave (e.g. replayed from a spill) must not
+    # reactivate the session
+    execute_update(
+        f"""
+        UPDATE live_event_viewer_sessions s
+        SET last_heartbeat = GREATEST(s.last_heartbeat, v.at), is_active = TRUE
+        FROM {values}
+        WHERE s.event_id = v.event_id AND s.session_id = v.session_id
+          AND (s.left_at IS NULL OR s.left_at < v.at)
+        """,
+        params,
+    )
+
+
+_heartbeat_sink = event_buffer.register(Sink(
+    "live_event_heartbeat",
+    write=_write_heartbeats,
+    key=lambda e: (e["event_id"], e["session_id"]),
+))
+
+
 @router.post("/{event_id}/heartbeat")
 async def event_heartbeat(
     event_id: str,
@@ -1085,13 +1113,9 @@ async def event_heartbeat(
 ):
     """
     Send heartbeat to keep viewer session active.
+    Buffered: only the latest heartbeat per session is written.
     """
-    client = get_client()
-
-    client.table("live_event_viewer_sessions").update({
-        "last_heartbeat": datetime.utcnow().isoformat(),
-        "is_active": True
-    }).eq("session_id", session_id).eq("event_id", event_id).execute()
+    event_buffer.emit(_heartbeat_sink.name, {"event_id": event_id, "session_id": session_id, "at": utc_now()})
 
     return {"status": "ok"}
 
@@ -1105,6 +1129,7 @@ async def leave_event(
     """
     Record leaving a live event.
     """
+    event_buffer.discard(_heartbeat_sink.name, (event_id, session_id))
     client = get_client()
 
     client.table("live_event_viewer_sessions").update({
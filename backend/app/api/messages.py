@@ -1,11 +1,11 @@
 """
 Messages & Conversations API Routes - Enhanced with WebSocket support
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from typing import List, Optional
 from datetime import datetime, timezone
 import logging
-from app.core.database import get_client
+from app.core.database import get_client, keyset_page
 from app.core.websocket_client import broadcast_to_dm, send_to_user
 from app.schemas.messages import Message, MessageCreate, Conversation
 
@@ -34,14 +34,35 @@ async def list_conversations(user_id: str):
 
 
 @router.get("/conversations/{conversation_id}/messages", response_model=List[Message])
-async def list_conversation_messages(conversation_id: str, skip: int = 0, limit: int = 100):
-    """List messages in a conversation"""
+async def list_conversation_messages(
+    conversation_id: str,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+):
+    """
+    List messages in a conversation, oldest first.
+    The X-Next-Cursor header carries the cursor for the next page; pass it
+    back as cursor (skip is ignored when a cursor is given).
+    """
     try:
         client = get_client()
-        response = client.table("messages").select("*").eq(
-            "conversation_id", conversation_id
-        ).range(skip, skip + limit - 1).order("created_at").execute()
-        return response.data
+        try:
+            query = client.table("messages").select("*").eq(
+                "conversation_id", conversation_id
+            ).order("created_at").after(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        start = 0 if cursor else skip
+        result = query.range(start, start + limit).execute()
+
+        rows, next_cursor = keyset_page(result.data, limit, "created_at")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return rows
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException, Header, Query
 from pydantic import BaseModel
 from typing import Optional, List
 from app.core.database import get_client
+from app.core.auth import get_current_user_from_token
 import re
 
 router = APIRouter()
@@ -14,43 +15,6 @@ router = APIRouter()
 # AUTH HELPER
 # =====================================================
 
-async def get_current_user_from_token(authorization: str = None):
-    """Extract and validate the current user from the authorization token."""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Authorization token required")
-
-    token = authorization.replace("Bearer ", "")
-
-    # Decode JWT to get user info (same approach as profiles.py)
-    import jwt
-    try:
-        # Decode without verification first to get claims (for Cognito tokens)
-        payload = jwt.decode(token, options={"verify_signature": False})
-        cognito_user_id = payload.get("sub")
-        email = payload.get("email")
-
-        if not cognito_user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        # Look up profile by cognito_user_id
-        client = get_client()
-        profile_result = client.table("profiles").select("id, email").eq(
-            "cognito_user_id", cognito_user_id
-        ).execute()
-
-        if profile_result.data:
-            profile = profile_result.data[0]
-            return {"id": profile["id"], "email": profile.get("email", email)}
-
-        raise HTTPException(status_code=401, detail="User profile not found")
-    except jwt.exceptions.DecodeError:
-        raise HTTPException(status_code=401, detail="Invalid token format")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Token validation failed: {str(e)}")
-
-
 class TvNetwork(BaseModel):
     id: str
     name: str
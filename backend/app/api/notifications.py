@@ -1,9 +1,9 @@
 """
 Notifications API Routes
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from typing import List, Optional
-from app.core.database import get_client, execute_single, execute_update
+from app.core.database import get_client, execute_single, execute_update, keyset_page
 from app.schemas.notifications import Notification, NotificationCreate, NotificationCounts
 
 router = APIRouter()
@@ -12,12 +12,18 @@ router = APIRouter()
 @router.get("/", response_model=List[Notification])
 async def list_notifications(
     user_id: str,
+    response: Response,
     skip: int = 0,
     limit: int = 50,
     status: Optional[str] = None,
-    type: Optional[str] = None
+    type: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
-    """List user notifications"""
+    """
+    List user notifications, newest first.
+    The X-Next-Cursor header carries the cursor for the next page; pass it
+    back as cursor (skip is ignored when a cursor is given).
+    """
     try:
         client = get_client()
         query = client.table("notifications").select("*").eq("user_id", user_id)
@@ -31,8 +37,20 @@ async def list_notifications(
         if type:
             query = query.eq("type", type)
 
-        response = query.range(skip, skip + limit - 1).order("created_at", desc=True).execute()
-        return response.data
+        try:
+            query = query.order("created_at", desc=True).after(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        start = 0 if cursor else skip
+        # One extra row tells us whether there is a next page
+        result = query.range(start, start + limit).execute()
+
+        rows, next_cursor = keyset_page(result.data, limit, "created_at")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return rows
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
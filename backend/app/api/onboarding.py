@@ -8,6 +8,7 @@ from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime, timezone
 from app.core.database import get_client, execute_single, execute_query, execute_insert
 from app.core.config import settings
+from app.core.auth import get_current_user_from_token
 import uuid
 import secrets
 import logging
@@ -45,43 +46,6 @@ def get_profile_id_from_cognito_id(cognito_user_id: str) -> str:
     return str(profile_row["id"])
 
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token using AWS Cognito.
-    Returns the profile ID (not Cognito ID) for database lookups.
-    """
-    if not authorization or not authorization.startswith("Bearer "):
-        logger.warning("[AUTH] Missing or invalid authorization header")
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            logger.warning("[AUTH] Token verification returned None")
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        cognito_id = user.get("user_id") or user.get("sub") or user.get("id")
-        email = user.get("email")
-
-        if not cognito_id:
-            logger.warning(f"[AUTH] No cognito_id found in user object: {list(user.keys())}")
-            raise HTTPException(status_code=401, detail="No user ID in token")
-
-        profile_id = get_profile_id_from_cognito_id(cognito_id)
-        if not profile_id:
-            logger.warning(f"[AUTH] No profile found for cognito_id: {cognito_id}")
-            raise HTTPException(status_code=401, detail="User profile not found")
-
-        return {"id": profile_id, "user_id": profile_id, "cognito_id": cognito_id, "email": email}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[AUTH] Authentication exception: {type(e).__name__}: {str(e)}")
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 def serialize_row(row: dict) -> dict:
     """Convert a database row to JSON-serializable format."""
     if not row:
@@ -13,9 +13,12 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from app.core import auth, backlot_permissions, database
+from app.core.event_buffer import event_buffer
 from app.core.deps import require_admin
 from app.services import ops_service
 from app.services import feature_flags_service
+from app.services import feature_gates
 
 router = APIRouter()
 
@@ -392,6 +395,54 @@ async def get_slow_requests(
     return ops_service.get_slow_requests(threshold_ms, limit)
 
 
+@router.get("/ops/db/query-cache", tags=["Ops"])
+async def get_query_cache_stats(
+    profile: dict = Depends(require_admin)
+):
+    """Get compiled-query cache hit rates for this worker process."""
+    return database.get_query_cache_stats()
+
+
+@router.get("/ops/auth-cache", tags=["Ops"])
+async def get_auth_cache_stats(
+    profile: dict = Depends(require_admin)
+):
+    """Get verified-token cache hit rates for this worker process."""
+    return auth.get_auth_cache_stats()
+
+
+@router.get("/ops/permission-cache", tags=["Ops"])
+async def get_permission_cache_stats(
+    profile: dict = Depends(require_admin)
+):
+    """Get Backlot effective-permission cache hit rates for this worker process."""
+    return backlot_permissions.get_permission_cache_stats()
+
+
+@router.get("/ops/entitlement-cache", tags=["Ops"])
+async def get_entitlement_cache_stats(
+    profile: dict = Depends(require_admin)
+):
+    """Get feature-gate entitlement snapshot cache hit rates for this worker process."""
+    return feature_gates.get_entitlement_cache_stats()
+
+
+@router.get("/ops/feature-flag-cache", tags=["Ops"])
+async def get_feature_flag_cache_stats(
+    profile: dict = Depends(require_admin)
+):
+    """Get flag snapshot version and evaluation-log buffer counters for this worker process."""
+    return feature_flags_service.get_evaluation_log_stats()
+
+
+@router.get("/ops/event-buffer", tags=["Ops"])
+async def get_event_buffer_stats(
+    profile: dict = Depends(require_admin)
+):
+    """Get write-behind tracking event counters (pending, written, spilled) for this worker process."""
+    return event_buffer.get_stats()
+
+
 # ============================================================================
 # FEATURE FLAGS
 # ============================================================================
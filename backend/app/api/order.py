@@ -1349,7 +1349,7 @@ class OrderProfileSettingsUpdate(BaseModel):
 @router.get("/profile-settings/me")
 async def get_my_order_profile_settings(authorization: str = Header(None)):
     """Get Order profile settings for current user"""
-    from app.api.profiles import get_current_user_from_token
+    from app.core.auth import get_current_user_from_token
 
     try:
         current_user = await get_current_user_from_token(authorization)
@@ -1388,7 +1388,7 @@ async def update_my_order_profile_settings(
     authorization: str = Header(None)
 ):
     """Update Order profile settings for current user"""
-    from app.api.profiles import get_current_user_from_token
+    from app.core.auth import get_current_user_from_token
 
     current_user = await get_current_user_from_token(authorization)
     user_id = current_user["id"]
@@ -13,8 +13,10 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 
 from app.core.auth import get_current_user
+from app.core.backlot_permissions import invalidate_permission_cache
 from app.core.database import execute_query, execute_single, execute_insert, execute_update, get_client
 from app.core.logging import get_logger
+from app.services.feature_gates import invalidate_project_org
 from app.api.users import get_profile_id_from_cognito_id
 
 router = APIRouter()
@@ -376,6 +378,7 @@ async def add_backlot_seat(
             "role": seat.role,
             "can_create": seat.can_create_projects
         })
+        invalidate_permission_cache(user_id=seat.user_id)
         member_id = existing["id"]
     else:
         # Create new membership
@@ -389,6 +392,7 @@ async def add_backlot_seat(
             "role": seat.role,
             "can_create": seat.can_create_projects
         })
+        invalidate_permission_cache(user_id=seat.user_id)
         member_id = result["id"]
 
     logger.info(f"Added Backlot seat for user {seat.user_id} in org {organization_id} as {seat.role}")
@@ -460,6 +464,7 @@ async def update_backlot_seat(
             SET {', '.join(updates)}
             WHERE organization_id = :organization_id AND user_id = :target_user_id
         """, params)
+        invalidate_permission_cache(user_id=target_user_id)
 
     # Return updated seat
     updated = execute_single("""
@@ -526,6 +531,7 @@ async def remove_backlot_seat(
         DELETE FROM organization_project_access
         WHERE organization_id = :organization_id AND user_id = :target_user_id
     """, {"organization_id": organization_id, "target_user_id": target_user_id})
+    invalidate_permission_cache(user_id=target_user_id)
 
     # TODO: Transfer work items to project owner (call transfer_work_on_removal)
 
@@ -637,6 +643,7 @@ async def grant_project_access(
         "tab_permissions": access.tab_permissions or {},
         "granted_by": user_id
     })
+    invalidate_permission_cache(access.project_id, target_user_id)
 
     logger.info(f"Granted project {access.project_id} access to user {target_user_id} in org {organization_id}")
 
@@ -688,6 +695,7 @@ async def update_project_access(
         "project_id": project_id,
         "tab_permissions": access.tab_permissions
     })
+    invalidate_permission_cache(project_id, target_user_id)
 
     return {"success": True, "message": "Project access updated"}
 
@@ -710,6 +718,7 @@ async def revoke_project_access(
           AND user_id = :target_user_id
           AND project_id = :project_id
     """, {"organization_id": organization_id, "target_user_id": target_user_id, "project_id": project_id})
+    invalidate_permission_cache(project_id, target_user_id)
 
     # TODO: Transfer work items to project owner
 
@@ -827,6 +836,8 @@ async def assign_project_to_organization(
         SET organization_id = :organization_id, updated_at = NOW()
         WHERE id = :project_id
     """, {"project_id": project_id, "organization_id": organization_id})
+    invalidate_project_org(project_id)
+    invalidate_permission_cache(project_id)
 
     action = "assigned to" if organization_id else "removed from"
     logger.info(f"Project {project_id} {action} organization {organization_id}")
@@ -11,6 +11,7 @@ from pydantic import BaseModel, Field
 import re
 
 from app.core.auth import get_current_user
+from app.core.backlot_permissions import invalidate_permission_cache
 from app.core.permissions import Permission, require_permissions
 from app.core.database import execute_query, execute_single, execute_insert, execute_update
 from app.core.logging import get_logger
@@ -470,6 +471,7 @@ async def add_organization_member(
             "user_id": invite.user_id,
             "role": invite.role
         })
+        invalidate_permission_cache(user_id=invite.user_id)
         member_data = result[0] if result else None
     else:
         # Create new membership
@@ -482,6 +484,7 @@ async def add_organization_member(
             "user_id": invite.user_id,
             "role": invite.role
         })
+        invalidate_permission_cache(user_id=invite.user_id)
 
     if not member_data:
         raise HTTPException(500, "Failed to add member")
@@ -543,6 +546,7 @@ async def update_member_role(
         "member_user_id": member_user_id,
         "role": role
     })
+    invalidate_permission_cache(user_id=member_user_id)
 
     if result == 0:
         raise HTTPException(404, "Member not found")
@@ -593,6 +597,7 @@ async def remove_organization_member(
         "org_id": org_id,
         "member_user_id": member_user_id
     })
+    invalidate_permission_cache(user_id=member_user_id)
 
     if result == 0:
         raise HTTPException(404, "Member not found")
@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
 from app.core.database import get_client, execute_single
+from app.core.auth import get_cognito_user_from_token
 
 router = APIRouter()
 
@@ -116,26 +117,6 @@ class PersonOverview(BaseModel):
 # HELPERS
 # =============================================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 async def verify_project_access(client, project_id: str, user_id: str) -> Dict[str, Any]:
     """Verify user has access to project and return access level"""
     # Check owner
@@ -187,7 +168,7 @@ async def list_project_people(
     """
     List all people on a project with summary data
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for access check
@@ -315,7 +296,7 @@ async def get_person_overview(
     """
     Get comprehensive overview of a person within a project
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for access check
@@ -489,7 +470,7 @@ async def get_my_person_overview(
     """
     Get the current user's person overview for this project
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     # Convert Cognito user ID to profile ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
     if not profile_id:
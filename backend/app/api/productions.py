@@ -5,8 +5,8 @@ Includes "The Slate" public production detail pages
 from fastapi import APIRouter, HTTPException, Header, Query
 from pydantic import BaseModel, Field
 from typing import Optional, List, Literal
-from app.api.community import get_current_user_from_token
 from app.core.database import get_client, execute_query, execute_single
+from app.core.auth import get_cognito_user_from_token
 
 router = APIRouter()
 
@@ -101,7 +101,7 @@ async def list_productions(
     List productions with optional search/filtering.
     Used for autocomplete when selecting a production.
     """
-    user = get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
@@ -141,7 +141,7 @@ async def create_production(
     authorization: str = Header(None),
 ):
     """Create a new production."""
-    user = get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
@@ -547,7 +547,7 @@ async def search_productions(
     Returns minimal data for autocomplete dropdown.
     Searches ALL productions (not just user's own).
     """
-    user = get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
@@ -595,7 +595,7 @@ async def quick_create_production(
     Used by the ProductionSelector's "Add new" feature.
     Auth required.
     """
-    user = get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
@@ -909,7 +909,7 @@ async def get_production(
     authorization: str = Header(None),
 ):
     """Get a single production by ID."""
-    user = get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
@@ -936,7 +936,7 @@ async def update_production(
     authorization: str = Header(None),
 ):
     """Update a production."""
-    user = get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
@@ -994,7 +994,7 @@ async def delete_production(
     authorization: str = Header(None),
 ):
     """Delete a production."""
-    user = get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
@@ -6,7 +6,9 @@ from typing import List, Optional
 from pydantic import BaseModel
 import io
 import uuid
+from app.core.auth import invalidate_user_cache, get_current_user_from_token
 from app.core.database import get_client
+from app.core import search as search_layer
 from app.core.storage import storage_client, generate_unique_filename
 from app.schemas.profiles import (
     Profile, ProfileUpdate,
@@ -16,46 +18,6 @@ from app.schemas.profiles import (
 router = APIRouter()
 
 
-async def get_current_user_from_token(authorization: str):
-    """Get current user from Authorization header"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Not authenticated")
-
-    token = authorization.replace("Bearer ", "")
-
-    # Decode JWT to get user info
-    import jwt
-    try:
-        # Decode without verification first to get claims (for Cognito tokens)
-        payload = jwt.decode(token, options={"verify_signature": False})
-        user_id = payload.get("sub")
-        email = payload.get("email")
-
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        # Look up profile by cognito_user_id
-        client = get_client()
-        profile_result = client.table("profiles").select("*").eq(
-            "cognito_user_id", user_id
-        ).execute()
-
-        if profile_result.data:
-            return {"id": profile_result.data[0]["id"], "cognito_id": user_id, "email": email}
-
-        # Fallback to email lookup
-        if email:
-            profile_result = client.table("profiles").select("*").eq(
-                "email", email
-            ).execute()
-            if profile_result.data:
-                return {"id": profile_result.data[0]["id"], "cognito_id": user_id, "email": email}
-
-        raise HTTPException(status_code=401, detail="User not found")
-    except jwt.InvalidTokenError as e:
-        raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
-
-
 class AvatarUploadResponse(BaseModel):
     success: bool
     avatar_url: str = ""
@@ -300,6 +262,7 @@ async def update_profile(user_id: str, profile: ProfileUpdate):
         response = client.table("profiles").update(
             profile.model_dump(exclude_unset=True)
         ).eq("id", user_id).execute()
+        invalidate_user_cache(user_id)
 
         if not response.data:
             # Re-fetch if update didn't return data
@@ -777,25 +740,15 @@ async def search_users(query: str = "", limit: int = 10):
     If query is empty, returns recent users up to limit.
     """
     try:
-        client = get_client()
-
-        base_query = client.table("profiles").select(
-            "id, username, full_name, display_name, avatar_url"
+        # Ranked by match when querying, most recently updated otherwise
+        return search_layer.search(
+            "profiles",
+            query,
+            columns="t.id, t.username, t.full_name, t.display_name, t.avatar_url",
+            order_by="t.updated_at DESC",
+            limit=limit,
         )
 
-        if query and len(query) >= 1:
-            # Search by name/username
-            response = base_query.or_(
-                f"username.ilike.%{query}%,full_name.ilike.%{query}%,display_name.ilike.%{query}%"
-            ).limit(limit).execute()
-        else:
-            # No query - return users ordered by most recently updated
-            response = base_query.order(
-                "updated_at", desc=True
-            ).limit(limit).execute()
-
-        return response.data or []
-
     except Exception as e:
         print(f"User search error: {e}")
         return []
@@ -1057,6 +1010,7 @@ async def onboard_filmmaker(
             "location_visible": True,
             "has_completed_filmmaker_onboarding": True,
         }).eq("id", user_id).execute()
+        invalidate_user_cache(user_id)
 
         # Upsert filmmaker profile
         filmmaker_data = {
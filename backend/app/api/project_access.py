@@ -13,7 +13,9 @@ from app.core.backlot_permissions import (
     get_all_backlot_roles,
     get_default_config_for_role,
     DEFAULT_VIEW_CONFIGS,
+    invalidate_permission_cache,
 )
+from app.core.auth import get_cognito_user_from_token
 
 router = APIRouter()
 
@@ -242,26 +244,6 @@ def suggest_backlot_role(role_interest: Optional[str]) -> Optional[str]:
 # HELPERS
 # =============================================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 # =============================================================================
 # MEMBER MANAGEMENT ENDPOINTS
 # =============================================================================
@@ -274,7 +256,7 @@ async def list_project_members(
     """
     List all project members with their roles and permission status
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Get project info first
@@ -400,7 +382,7 @@ async def add_member(
     """
     Add a new member to the project
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for permission check
@@ -443,6 +425,7 @@ async def add_member(
             "backlot_role": request.backlot_role,
             "is_primary": True,
         }).execute()
+        invalidate_permission_cache(project_id, request.user_id)
 
     # Get profile info
     profile_resp = client.table("profiles").select("full_name, avatar_url, username").eq("id", request.user_id).execute()
@@ -476,7 +459,7 @@ async def update_member(
     """
     Update a member's project role or info
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for permission check
@@ -517,7 +500,7 @@ async def remove_member(
     """
     Remove a member from the project
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for permission check
@@ -547,6 +530,7 @@ async def remove_member(
     client.table("backlot_project_members").delete().eq("id", member_id).execute()
     client.table("backlot_project_roles").delete().eq("project_id", project_id).eq("user_id", member_user_id).execute()
     client.table("backlot_project_view_overrides").delete().eq("project_id", project_id).eq("user_id", member_user_id).execute()
+    invalidate_permission_cache(project_id, member_user_id)
 
     return {"success": True}
 
@@ -564,7 +548,7 @@ async def assign_role(
     """
     Assign a Backlot role to a user
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for permission check
@@ -597,6 +581,7 @@ async def assign_role(
             client.table("backlot_project_roles").update({"is_primary": request.is_primary}).eq(
                 "id", existing_resp.data[0]["id"]
             ).execute()
+            invalidate_permission_cache(project_id, request.user_id)
 
         return {"success": True, "message": "Role updated"}
 
@@ -613,6 +598,7 @@ async def assign_role(
         "backlot_role": request.backlot_role,
         "is_primary": request.is_primary,
     }).execute()
+    invalidate_permission_cache(project_id, request.user_id)
 
     if not create_resp.data:
         raise HTTPException(status_code=500, detail="Failed to assign role")
@@ -629,7 +615,7 @@ async def remove_role(
     """
     Remove a Backlot role from a user
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for permission check
@@ -643,6 +629,7 @@ async def remove_role(
     client.table("backlot_project_roles").delete().eq(
         "project_id", project_id
     ).eq("user_id", request.user_id).eq("backlot_role", request.backlot_role).execute()
+    invalidate_permission_cache(project_id, request.user_id)
 
     return {"success": True}
 
@@ -659,7 +646,7 @@ async def list_view_profiles(
     """
     List all custom view profiles for the project
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for permission check
@@ -685,7 +672,7 @@ async def get_default_profiles(
     """
     Get the default view config presets for all roles
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     presets = []
     for role in await get_all_backlot_roles():
@@ -709,7 +696,7 @@ async def update_view_profile(
     """
     Update or create a custom view profile for a role
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for permission check
@@ -740,6 +727,7 @@ async def update_view_profile(
         update_resp = client.table("backlot_project_view_profiles").update(profile_data).eq(
             "id", existing_resp.data[0]["id"]
         ).execute()
+        invalidate_permission_cache(project_id)
         if not update_resp.data:
             raise HTTPException(status_code=500, detail="Failed to update profile")
         return ViewProfile(**update_resp.data[0])
@@ -752,6 +740,7 @@ async def update_view_profile(
             "created_by_user_id": profile_id,
         })
         create_resp = client.table("backlot_project_view_profiles").insert(profile_data).execute()
+        invalidate_permission_cache(project_id)
         if not create_resp.data:
             raise HTTPException(status_code=500, detail="Failed to create profile")
         return ViewProfile(**create_resp.data[0])
@@ -766,7 +755,7 @@ async def delete_view_profile(
     """
     Delete a custom view profile (reverts to system defaults)
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for permission check
@@ -780,6 +769,7 @@ async def delete_view_profile(
     client.table("backlot_project_view_profiles").delete().eq(
         "project_id", project_id
     ).eq("backlot_role", role).execute()
+    invalidate_permission_cache(project_id)
 
     return {"success": True}
 
@@ -796,7 +786,7 @@ async def list_overrides(
     """
     List all per-user view overrides for the project
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for permission check
@@ -847,7 +837,7 @@ async def get_user_override(
     """
     Get a specific user's override config
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for permission check
@@ -894,7 +884,7 @@ async def update_user_override(
     """
     Create or update a user's permission overrides
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for permission check
@@ -915,6 +905,7 @@ async def update_user_override(
         update_resp = client.table("backlot_project_view_overrides").update({
             "config": request.config
         }).eq("id", existing_resp.data[0]["id"]).execute()
+        invalidate_permission_cache(project_id, user_id)
 
         if not update_resp.data:
             raise HTTPException(status_code=500, detail="Failed to update override")
@@ -926,6 +917,7 @@ async def update_user_override(
             "user_id": user_id,
             "config": request.config,
         }).execute()
+        invalidate_permission_cache(project_id, user_id)
 
         if not create_resp.data:
             raise HTTPException(status_code=500, detail="Failed to create override")
@@ -941,7 +933,7 @@ async def delete_user_override(
     """
     Delete a user's permission overrides (revert to role defaults)
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for permission check
@@ -955,6 +947,7 @@ async def delete_user_override(
     client.table("backlot_project_view_overrides").delete().eq(
         "project_id", project_id
     ).eq("user_id", user_id).execute()
+    invalidate_permission_cache(project_id, user_id)
 
     return {"success": True}
 
@@ -971,7 +964,7 @@ async def get_my_effective_config(
     """
     Get the current user's effective view config for the project
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Convert Cognito user ID to profile ID
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -998,7 +991,7 @@ async def get_user_effective_config(
     """
     Get a specific user's effective view config (admin only)
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
 
     # Convert Cognito user ID to profile ID for permission check
     profile_id = get_profile_id_from_cognito_id(user["id"])
@@ -1028,7 +1021,7 @@ async def preview_role_config(
     """
     Preview what a user with a specific role would see (view as role)
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Get project-specific profile if exists
@@ -1063,7 +1056,7 @@ async def get_unified_people(
     Get unified view of all people associated with the project.
     Combines team members and contacts, de-duplicating where user_id matches.
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Verify project exists
@@ -1259,7 +1252,7 @@ async def add_member_from_contact(
     Convert a contact to a team member.
     The contact must have a user_id (linked to a system account).
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Convert Cognito user ID to profile ID for permission check
@@ -1327,6 +1320,7 @@ async def add_member_from_contact(
             "backlot_role": backlot_role,
             "is_primary": True,
         }).execute()
+        invalidate_permission_cache(project_id, contact_user_id)
 
     # Update contact status to "confirmed"
     client.table("backlot_project_contacts").update({
@@ -1365,7 +1359,7 @@ async def suggest_role_for_contact(
     """
     Get a suggested backlot role for a contact based on their role_interest
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     # Get the contact
@@ -1438,7 +1432,7 @@ async def list_external_seats(
     authorization: str = Header(None)
 ) -> List[ExternalSeatResponse]:
     """List all external seats (freelancers and clients) for a project."""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = user["id"]
 
     # Verify access (owner or admin)
@@ -1488,7 +1482,7 @@ async def add_external_seat(
     authorization: str = Header(None)
 ) -> ExternalSeatResponse:
     """Add a freelancer or client to a project."""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = user["id"]
 
     # Verify access (owner or admin)
@@ -1535,6 +1529,7 @@ async def add_external_seat(
         insert_data["tab_permissions"] = seat.tab_permissions or {}
 
     result = client.table("backlot_project_external_seats").insert(insert_data).execute()
+    invalidate_permission_cache(project_id, seat.user_id)
 
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to add external seat")
@@ -1568,7 +1563,7 @@ async def update_external_seat(
     authorization: str = Header(None)
 ) -> ExternalSeatResponse:
     """Update an external seat's permissions."""
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = user["id"]
 
     # Verify access (owner or admin)
@@ -1604,6 +1599,7 @@ async def update_external_seat(
     result = client.table("backlot_project_external_seats").update(
         update_data
     ).eq("id", seat_id).execute()
+    invalidate_permission_cache(project_id, existing.data[0]["user_id"])
 
     s = result.data[0] if result.data else existing.data[0]
     profile = existing.data[0].get("profiles") or {}
@@ -1639,7 +1635,7 @@ async def remove_external_seat(
     Remove an external seat from a project.
     Optionally transfers their work to the project owner.
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     user_id = user["id"]
 
     # Verify access (owner or admin)
@@ -1685,6 +1681,7 @@ async def remove_external_seat(
             "revoked_at": datetime.utcnow().isoformat(),
             "revoked_by": user_id,
         }).eq("id", seat_id).execute()
+    invalidate_permission_cache(project_id, removed_user_id)
 
     return {
         "success": True,
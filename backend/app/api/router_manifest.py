@@ -0,0 +1,189 @@
+"""
+Router manifest: every API router, in registration order.
+
+Each entry is (module, prefix, tag). The module must expose `router`; the
+prefix is appended to settings.API_V1_PREFIX. Order matters - routes are
+matched in the order their routers are listed here, whether they are
+included at startup or lazily (LAZY_ROUTERS=true, see app.core.routing).
+
+The per-module path prefixes used for lazy loading live next to this file in
+route_prefixes.json. Regenerate it after adding a router or a new top-level
+path segment:
+
+    python -m app.tools.route_manifest
+"""
+from typing import List, Tuple
+
+ROUTERS: List[Tuple[str, str, str]] = [
+    ("app.api.auth", "/auth", "Authentication"),
+    ("app.api.profiles", "/profiles", "Profiles"),
+    ("app.api.users", "/users", "Users"),
+    ("app.api.submissions", "/submissions", "Submissions"),
+    ("app.api.content", "/content", "Content"),
+    ("app.api.filmmakers", "/filmmakers", "Filmmakers"),
+    ("app.api.messages", "/messages", "Messages"),
+    ("app.api.message_templates", "/message-templates", "Message Templates"),
+    ("app.api.e2ee", "/e2ee", "E2EE Encryption"),
+    ("app.api.channels", "/channels", "Message Channels"),
+    ("app.api.message_folders", "/message-folders", "Message Folders"),
+    ("app.api.message_settings", "/message-settings", "Message Settings"),
+    ("app.api.forum", "/forum", "Forum"),
+    ("app.api.notifications", "/notifications", "Notifications"),
+    ("app.api.connections", "/connections", "Connections"),
+    ("app.api.admin", "/admin", "Admin"),
+    ("app.api.admin_community", "/admin/community", "Admin Community"),
+    ("app.api.admin_content", "/admin/content", "Admin Content"),
+    ("app.api.admin_backlot", "/admin/backlot", "Admin Backlot"),
+    ("app.api.admin_profiles", "/admin/profiles", "Admin Profiles"),
+    ("app.api.admin_roles", "/admin", "Admin Roles"),
+    ("app.api.admin_storage", "/admin/storage", "Admin Storage"),
+    ("app.api.admin_users", "/admin/users", "Admin Users"),
+    ("app.api.admin_emails", "/admin", "Admin Emails"),
+    ("app.api.admin_messages", "/admin/messages", "Admin Messages"),
+    ("app.api.admin_organizations", "/admin/organizations", "Admin Organizations"),
+    ("app.api.admin_billing", "/admin", "Admin Billing"),
+    ("app.api.organization_usage", "/organizations", "Organization Usage"),
+    ("app.api.ses_webhook", "", "SES Webhook"),
+    ("app.api.availability", "/availability", "Availability"),
+    ("app.api.credits", "/credits", "Credits"),
+    ("app.api.community", "/community", "Community"),
+    ("app.api.application_templates", "/application-templates", "Application Templates"),
+    ("app.api.cover_letter_templates", "/cover-letter-templates", "Cover Letter Templates"),
+    ("app.api.resumes", "/resumes", "Resumes"),
+    ("app.api.networks", "/networks", "TV Networks"),
+    ("app.api.productions", "/productions", "Productions"),
+    ("app.api.companies", "/companies", "Companies"),
+    ("app.api.cast_position_types", "/cast-position-types", "Cast Position Types"),
+    ("app.api.greenroom", "/greenroom", "Green Room"),
+    ("app.api.order", "/order", "Order"),
+    ("app.api.billing", "/billing", "Billing"),
+    ("app.api.backlot", "/backlot", "Backlot"),
+
+    # Backlot Glue Views
+    ("app.api.scene_view", "/backlot", "Backlot Scene View"),
+    ("app.api.day_view", "/backlot", "Backlot Day View"),
+    ("app.api.person_view", "/backlot", "Backlot Person View"),
+    ("app.api.timecards", "/backlot", "Backlot Timecards"),
+    ("app.api.expenses", "/backlot", "Backlot Expenses"),
+    ("app.api.project_access", "/backlot", "Backlot Project Access"),
+    ("app.api.cast_crew", "/backlot", "Cast & Crew"),
+    ("app.api.onboarding", "/onboarding", "Onboarding"),
+    ("app.api.directory", "/directory", "Directory"),
+    ("app.api.geocoding", "/geocoding", "Geocoding"),
+
+    # Camera & Continuity and Utilities
+    ("app.api.camera_continuity", "/backlot", "Camera & Continuity"),
+    ("app.api.camera_log", "/backlot", "Camera Log"),
+    ("app.api.continuity", "/backlot", "Scripty Continuity"),
+    ("app.api.utilities", "/backlot", "Utilities"),
+    ("app.api.hot_set", "/backlot", "Hot Set"),
+    ("app.api.invoices", "/backlot", "Invoices"),
+    ("app.api.dood", "/backlot", "Day Out of Days"),
+    ("app.api.storyboard", "/backlot", "Storyboard"),
+    ("app.api.episodes", "/backlot", "Episodes"),
+    ("app.api.moodboard", "/backlot", "Moodboard"),
+    ("app.api.story_management", "/backlot", "Story Management"),
+    ("app.api.script_sides", "/backlot", "Script Sides"),
+    ("app.api.stripboard", "/backlot", "Stripboard"),
+    ("app.api.project_files", "/backlot", "Project Files"),
+    ("app.api.downloads", "/downloads", "Downloads"),
+    ("app.api.coms", "/coms", "Coms"),
+    ("app.api.dm_adapter", "/dm", "Direct Messages"),
+    ("app.api.uploads", "/uploads", "Uploads"),
+    ("app.api.feedback", "/feedback", "Alpha Feedback"),
+
+    # Consumer Streaming Platform
+    ("app.api.worlds", "/worlds", "Worlds"),
+    ("app.api.consumer_video", "/video", "Video Pipeline"),
+    ("app.api.shorts", "/shorts", "Shorts"),
+    ("app.api.live_events", "/events", "Live Events"),
+    ("app.api.recommendations", "/recommendations", "Recommendations"),
+    ("app.api.engagement", "/engagement", "Engagement"),
+
+    # Church Production Tools
+    ("app.api.church_services", "/church", "Church Services"),
+    ("app.api.church_people", "/church", "Church People"),
+    ("app.api.church_content", "/church", "Church Content"),
+    ("app.api.church_planning", "/church", "Church Planning"),
+    ("app.api.church_resources", "/church", "Church Resources"),
+    ("app.api.church_readiness", "/church", "Church Readiness"),
+
+    # Dashboard Customization & Themes
+    ("app.api.dashboard_settings", "/dashboard-settings", "Dashboard Settings"),
+    ("app.api.themes", "/themes", "Themes"),
+
+    # Media Processing
+    ("app.api.media", "/media", "Media Processing"),
+
+    # Creator Monetization & Organizations
+    # NOTE: organization_backlot must come BEFORE organizations so that
+    # /organizations/my-backlot-orgs matches before /organizations/{org_id}
+    ("app.api.organization_backlot", "", "Organization Backlot"),
+    ("app.api.organizations", "", "Organizations"),
+    ("app.api.creator_earnings", "", "Creator Earnings"),
+
+    # Phase 2A: Linear Channels
+    ("app.api.linear", "/linear", "Linear Channels"),
+
+    # Phase 2B: Ad/Partner Stack
+    ("app.api.ads", "/ads", "Ads"),
+    ("app.api.partners", "/partners", "Partners"),
+
+    # Phase 2C: Festival Lifecycle & Venue Distribution
+    ("app.api.festivals", "", "Festivals"),
+    ("app.api.venues", "", "Venues"),
+
+    # Phase 3A: Community Scoping & Careers
+    ("app.api.community_threads", "", "Community Threads"),
+    ("app.api.career", "/career", "Career & Filmography"),
+
+    # Phase 3B: Lodge Programming
+    ("app.api.lodges", "", "Lodge Programming"),
+
+    # Phase 4A: Mobile/TV Client APIs
+    ("app.api.client_api", "", "Client API"),
+
+    # Phase 4B: Content Review and Moderation
+    ("app.api.moderation", "/moderation", "Moderation"),
+
+    # Phase 4C: Creator UX and Internationalization
+    ("app.api.world_onboarding", "", "World Onboarding"),
+    ("app.api.i18n", "/i18n", "Internationalization"),
+
+    # Phase 5A: Third-party Distribution and Export
+    ("app.api.distribution", "/distribution", "Distribution"),
+
+    # Phase 5B: Advanced Analytics
+    ("app.api.analytics", "/analytics", "Analytics"),
+
+    # Phase 5C: Watch Parties and Live Production
+    ("app.api.watch_parties", "", "Watch Parties"),
+    ("app.api.live_production", "", "Live Production"),
+
+    # Phase 6A: Order Governance and Funds
+    ("app.api.order_governance", "", "Order Governance"),
+
+    # Phase 6B: Creator Financing and Recoupment
+    ("app.api.financing", "", "Financing"),
+
+    # Phase 6C: Operational Resilience and Feature Flags
+    ("app.api.ops", "", "Ops"),
+
+    # Performance Diagnostics - Client-side timing metrics
+    ("app.api.client_metrics", "/client-metrics", "Client Metrics"),
+
+    # Gear House - Equipment Management
+    ("app.api.gear", "/gear", "Gear House"),
+
+    # Set House - Space/Location Management
+    ("app.api.set_house", "/set-house", "Set House"),
+
+    ("app.api.org_messages", "", "Organization Messages"),
+
+    # CRM - Sales & Customer Relationship Management
+    ("app.api.crm", "/crm", "CRM"),
+    ("app.api.crm_admin", "/admin/crm", "CRM Admin"),
+    ("app.api.media_hub", "/media-hub", "Media Hub"),
+    ("app.api.subscription_billing", "/subscription-billing", "Subscription Billing"),
+    ("app.api.filmmaker_pro", "/filmmaker-pro", "Filmmaker Pro"),
+]
@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from app.core.database import get_client
+from app.core.auth import get_cognito_user_from_token
 
 router = APIRouter()
 
@@ -196,26 +197,6 @@ class SceneHubData(BaseModel):
 # HELPERS
 # =============================================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 def get_profile_id_from_cognito_id(client, cognito_user_id: str) -> str:
     """Look up the profile ID from a Cognito user ID."""
     if not cognito_user_id:
@@ -263,7 +244,7 @@ async def list_scenes(
     """
     List all scenes for a project with summary data
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await verify_project_access(client, project_id, user["id"]):
@@ -363,7 +344,7 @@ async def get_scene_overview(
     """
     Get comprehensive overview of a scene with all related data
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await verify_project_access(client, project_id, user["id"]):
@@ -519,7 +500,7 @@ async def get_scene_hub(
     - Clearances (direct + inherited from location)
     - Coverage and budget summaries
     """
-    user = await get_current_user_from_token(authorization)
+    user = await get_cognito_user_from_token(authorization)
     client = get_client()
 
     if not await verify_project_access(client, project_id, user["id"]):
@@ -13,7 +13,8 @@ import io
 import re
 import json
 
-from app.core.database import get_client, execute_query, execute_single
+from app.core.database import get_client, execute_query, execute_single, execute_recompact
+from app.core.auth import get_current_user_from_token
 
 router = APIRouter()
 
@@ -195,37 +196,6 @@ def parse_script(raw_text: str, format: str) -> List[Dict[str, Any]]:
 # Helper Functions
 # =====================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token."""
-    if not authorization or not authorization.startswith("Bearer "):
-        print(f"[SCRIPT_SIDES_AUTH] Missing auth header: {authorization[:50] if authorization else 'None'}...")
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            print(f"[SCRIPT_SIDES_AUTH] Token verification returned None for token starting with: {token[:20]}...")
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        cognito_id = user.get("user_id") or user.get("sub") or user.get("id")
-        if not cognito_id:
-            raise HTTPException(status_code=401, detail="No user ID in token")
-
-        from app.api.backlot import get_profile_id_from_cognito_id
-        profile_id = get_profile_id_from_cognito_id(cognito_id)
-        if not profile_id:
-            raise HTTPException(status_code=401, detail="User profile not found")
-
-        return {"id": profile_id, "user_id": profile_id, "cognito_id": cognito_id}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 async def verify_project_access(project_id: str, user_id: str) -> bool:
     """Verify user has access to the project."""
     client = get_client()
@@ -255,10 +225,8 @@ def get_next_sort_order(table: str, filter_col: str, filter_val: str) -> int:
 
 def recompact_sort_orders(table: str, filter_col: str, filter_val: str):
     """Recompact sort orders after deletion."""
-    client = get_client()
-    items = client.table(table).select("id").eq(filter_col, filter_val).order("sort_order").execute()
-    for idx, item in enumerate(items.data or [], start=1):
-        client.table(table).update({"sort_order": idx}).eq("id", item["id"]).execute()
+    # Both sides tables have a UNIQUE (parent, sort_order) index
+    execute_recompact(table, {filter_col: filter_val}, unique=True)
 
 
 # =====================================================
@@ -7,8 +7,9 @@ from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, Field
 
-from app.core.database import get_client, execute_single, execute_query
+from app.core.database import get_client, execute_single, execute_query, execute_update
 from app.core.auth import get_current_user, get_current_user_optional
+from app.core.event_buffer import Sink, event_buffer, values_clause
 
 router = APIRouter()
 
@@ -601,6 +602,35 @@ async def unbookmark_short(
     return {"status": "unbookmarked", "short_id": short_id}
 
 
+def _write_counters(events: List[dict]) -> None:
+    """Apply the summed view/share deltas of each buffered short in one UPDATE."""
+    values, params = values_clause(
+        events, ("short_id", "views", "shares"),
+        {"short_id": "uuid", "views": "int", "shares": "int"},
+    )
+    execute_update(
+        f"""
+        UPDATE world_content w
+        SET view_count = w.view_count + v.views, share_count = w.share_count + v.shares
+        FROM {values}
+        WHERE w.id = v.short_id
+        """,
+        params,
+    )
+
+
+def _add_counters(pending: dict, event: dict) -> dict:
+    return {**pending, "views": pending["views"] + event["views"], "shares": pending["shares"] + event["shares"]}
+
+
+_counter_sink = event_buffer.register(Sink(
+    "short_counters",
+    write=_write_counters,
+    key=lambda e: e["short_id"],
+    merge=_add_counters,
+))
+
+
 @router.post("/{short_id}/view")
 async def record_view(
     short_id: str,
@@ -610,11 +640,8 @@ async def record_view(
     Record a view of a short.
     Called when user watches the short for a threshold duration.
     """
-    # Increment view count
-    execute_single(
-        "UPDATE world_content SET view_count = view_count + 1 WHERE id = :id",
-        {"id": short_id}
-    )
+    # Increment view count (buffered; views of the same short are summed)
+    event_buffer.emit(_counter_sink.name, {"short_id": short_id, "views": 1, "shares": 0})
 
     return {"status": "recorded"}
 
@@ -627,10 +654,7 @@ async def record_share(
     """
     Record a share of a short.
     """
-    execute_single(
-        "UPDATE world_content SET share_count = share_count + 1 WHERE id = :id",
-        {"id": short_id}
-    )
+    event_buffer.emit(_counter_sink.name, {"short_id": short_id, "views": 0, "shares": 1})
 
     return {"status": "recorded"}
 
@@ -12,6 +12,7 @@ import csv
 import io
 
 from app.core.database import get_client, execute_query, execute_single
+from app.core.auth import get_current_user_from_token
 
 router = APIRouter()
 
@@ -105,35 +106,6 @@ class CharacterArcUpdate(BaseModel):
 # Helper Functions
 # =====================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token."""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        cognito_id = user.get("user_id") or user.get("sub") or user.get("id")
-        if not cognito_id:
-            raise HTTPException(status_code=401, detail="No user ID in token")
-
-        from app.api.backlot import get_profile_id_from_cognito_id
-        profile_id = get_profile_id_from_cognito_id(cognito_id)
-        if not profile_id:
-            raise HTTPException(status_code=401, detail="User profile not found")
-
-        return {"id": profile_id, "user_id": profile_id, "cognito_id": cognito_id}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 async def verify_project_access(project_id: str, user_id: str) -> bool:
     """Verify user has access to the project."""
     client = get_client()
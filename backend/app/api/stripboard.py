@@ -12,7 +12,7 @@ import csv
 import io
 import json
 
-from app.core.database import get_client, execute_query, execute_single
+from app.core.database import get_client, execute_query, execute_single, execute_recompact
 
 router = APIRouter()
 
@@ -98,24 +98,8 @@ async def get_active_stripboard(project_id: str) -> Optional[dict]:
 
 async def recompact_bucket(stripboard_id: str, assigned_day_id: Optional[str]):
     """Recompact sort_order values for strips in a bucket (day or bank)"""
-    if assigned_day_id:
-        strips = execute_query("""
-            SELECT id FROM backlot_strips
-            WHERE stripboard_id = :stripboard_id AND assigned_day_id = :day_id
-            ORDER BY sort_order
-        """, {"stripboard_id": stripboard_id, "day_id": assigned_day_id})
-    else:
-        strips = execute_query("""
-            SELECT id FROM backlot_strips
-            WHERE stripboard_id = :stripboard_id AND assigned_day_id IS NULL
-            ORDER BY sort_order
-        """, {"stripboard_id": stripboard_id})
-
-    client = get_client()
-    for i, strip in enumerate(strips):
-        client.table("backlot_strips").update({
-            "sort_order": i + 1
-        }).eq("id", strip['id']).execute()
+    # No assigned day = the bank (assigned_day_id IS NULL)
+    execute_recompact("backlot_strips", {"stripboard_id": stripboard_id, "assigned_day_id": assigned_day_id})
 
 
 async def get_next_sort_order(stripboard_id: str, assigned_day_id: Optional[str]) -> int:
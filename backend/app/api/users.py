@@ -3,8 +3,9 @@ Users API Routes
 """
 from fastapi import APIRouter, HTTPException, Header
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from typing import Dict, List, Optional
 from app.core.database import get_client, execute_query, execute_single
+from app.core.auth import get_cognito_user_from_token
 
 router = APIRouter()
 
@@ -69,20 +70,6 @@ PERMISSION_KEYS = [
 ]
 
 
-async def get_current_user_from_token(token: str) -> Dict[str, Any]:
-    """Extract and validate user from token"""
-    try:
-        from app.core.cognito import CognitoAuth
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"id": user.get("id"), "sub": user.get("id"), "email": user.get("email")}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 @router.get("/me/permissions")
 async def get_my_permissions(authorization: str = Header(None)):
     """Get current user's effective permissions from all assigned roles"""
@@ -90,7 +77,7 @@ async def get_my_permissions(authorization: str = Header(None)):
         raise HTTPException(status_code=401, detail="Missing authorization")
 
     token = authorization.replace("Bearer ", "")
-    user = await get_current_user_from_token(token)
+    user = await get_cognito_user_from_token(token)
     user_id = user.get("id") or user.get("sub")
 
     client = get_client()
@@ -162,7 +149,7 @@ async def get_my_pending_documents(authorization: str = Header(None)):
         raise HTTPException(status_code=401, detail="Missing authorization")
 
     token = authorization.replace("Bearer ", "")
-    user = await get_current_user_from_token(token)
+    user = await get_cognito_user_from_token(token)
     cognito_id = user.get("id") or user.get("sub")
 
     # Get profile ID from Cognito ID
@@ -212,7 +199,7 @@ async def get_my_clearance_history(authorization: str = Header(None)):
         raise HTTPException(status_code=401, detail="Missing authorization")
 
     token = authorization.replace("Bearer ", "")
-    user = await get_current_user_from_token(token)
+    user = await get_cognito_user_from_token(token)
     cognito_id = user.get("id") or user.get("sub")
 
     # Get profile ID from Cognito ID
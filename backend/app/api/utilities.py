@@ -4,11 +4,12 @@ Provides supporting functionality for on-set production workflow
 """
 from fastapi import APIRouter, HTTPException, Header, Query
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict
 from datetime import datetime, date, time
 import secrets
 from app.core.database import get_client
 from app.core.backlot_permissions import can_edit_tab, can_view_tab, can_manage_access
+from app.core.auth import get_current_user_from_token
 
 router = APIRouter()
 
@@ -210,46 +211,6 @@ class CreateUserBookmarkRequest(BaseModel):
 # HELPERS
 # =============================================================================
 
-async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
-    """Extract and validate user from Bearer token"""
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
-
-    token = authorization.replace("Bearer ", "")
-
-    try:
-        from app.core.cognito import CognitoAuth
-        from app.core.database import execute_single
-
-        user = CognitoAuth.verify_token(token)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        cognito_id = user.get("id")
-        email = user.get("email")
-
-        # Convert Cognito ID to profile ID - prefer cognito_user_id match
-        profile = execute_single(
-            "SELECT id FROM profiles WHERE cognito_user_id = :cuid LIMIT 1",
-            {"cuid": cognito_id}
-        )
-        if not profile:
-            # Fallback: check if it's already a profile ID
-            profile = execute_single(
-                "SELECT id FROM profiles WHERE id::text = :uid LIMIT 1",
-                {"uid": cognito_id}
-            )
-
-        if not profile:
-            raise HTTPException(status_code=401, detail="User profile not found")
-
-        return {"id": str(profile["id"]), "cognito_id": cognito_id, "email": email}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
-
-
 async def verify_project_member(client, project_id: str, user_id: str) -> bool:
     """Verify user is a member of the project"""
     # Check owner
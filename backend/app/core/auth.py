@@ -3,44 +3,198 @@ Authentication Dependencies and Utilities
 
 Uses AWS Cognito for authentication.
 """
+import copy
+import hashlib
+import json
+import logging
+import time
+from contextvars import ContextVar
+
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional, Dict, Any
 
+from app.core.cache import TTLCache, get_shared_backend
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
 security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    authorization: str = Header(None)
-) -> Dict[str, Any]:
+# ============================================================================
+# Verified-token cache
+# ============================================================================
+#
+# Maps sha256(token) -> {"claims": verified claims, "user": get_current_user
+# dict}. Entries expire after AUTH_CACHE_TTL_SECONDS or at the token's exp,
+# whichever is first. The shared tier keeps a per-profile index of token
+# hashes so invalidate_user_cache() can drop every cached token of a profile.
+# Other processes' local entries may stay stale for up to the local TTL.
+
+_auth_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+
+_SHARED_ENTRY_PREFIX = "swn:auth:token:"
+_SHARED_INDEX_PREFIX = "swn:auth:profile:"
+
+
+def _token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _token_ttl(token: str) -> float:
+    """Seconds until the token's exp (0 if it has none), capped by the cache TTL."""
+    try:
+        import jwt
+        # Signature was already checked by CognitoAuth.verify_token; this
+        # only reads exp to bound the cache entry
+        exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+    except Exception:
+        return 0
+    if not exp:
+        return 0
+    return min(settings.AUTH_CACHE_TTL_SECONDS, exp - time.time())
+
+
+def _get_cached_auth(token: str) -> Optional[Dict[str, Any]]:
+    key = _token_hash(token)
+    entry = _auth_cache.get(key)
+    if entry is not None:
+        return entry
+
+    try:
+        raw = get_shared_backend().get(_SHARED_ENTRY_PREFIX + key)
+    except Exception as e:
+        logger.warning(f"Shared auth cache read failed: {e}")
+        return None
+    if not raw:
+        return None
+
+    entry = json.loads(raw)
+    ttl = _token_ttl(token)
+    if ttl <= 0:
+        return None
+    _auth_cache.set(key, entry, ttl)
+    return entry
+
+
+def _cache_auth(token: str, claims: Dict[str, Any], user: Optional[Dict[str, Any]] = None) -> None:
+    ttl = _token_ttl(token)
+    if ttl <= 0:
+        return
+    key = _token_hash(token)
+    entry = {"claims": claims, "user": user}
+    _auth_cache.set(key, entry, ttl)
+
+    if user is None:
+        return
+    try:
+        backend = get_shared_backend()
+        seconds = max(1, int(ttl))
+        backend.set(_SHARED_ENTRY_PREFIX + key, json.dumps(entry, default=str), ex=seconds)
+        index_key = _SHARED_INDEX_PREFIX + str(user["id"])
+        backend.sadd(index_key, key)
+        backend.expire(index_key, settings.AUTH_CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Shared auth cache write failed: {e}")
+
+
+def invalidate_user_cache(profile_id: str) -> None:
     """
-    Dependency to get current authenticated user from Bearer token.
-    Validates the token with AWS Cognito and returns profile ID.
+    Drop cached auth for a profile.
+
+    Call after changing anything get_current_user resolves from profiles
+    (full_name, is_admin, is_staff, role, email) or deleting the profile.
     """
-    # Get token from credentials or header
-    token = None
-    if credentials:
-        token = credentials.credentials
-    elif authorization:
-        if authorization.startswith('Bearer '):
-            token = authorization[7:]
-        else:
-            token = authorization
+    profile_id = str(profile_id)
+    _auth_cache.delete_where(
+        lambda _, entry: entry.get("user") is not None and str(entry["user"]["id"]) == profile_id
+    )
+    try:
+        backend = get_shared_backend()
+        index_key = _SHARED_INDEX_PREFIX + profile_id
+        token_keys = backend.smembers(index_key)
+        backend.delete(index_key, *[_SHARED_ENTRY_PREFIX + k for k in token_keys])
+    except Exception as e:
+        logger.warning(f"Shared auth cache invalidation failed: {e}")
+
+
+def clear_auth_cache() -> None:
+    """Drop every locally cached token (tests, key rotation)."""
+    _auth_cache.clear()
+
+
+def get_auth_cache_stats() -> Dict[str, Any]:
+    return _auth_cache.stats()
 
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+
+def _verify_token_cached(token: str) -> Optional[Dict[str, Any]]:
+    """CognitoAuth.verify_token, answered from the cache when possible."""
+    entry = _get_cached_auth(token)
+    if entry is not None:
+        return entry["claims"]
+    from app.core.cognito import CognitoAuth
+    claims = CognitoAuth.verify_token(token)
+    if claims:
+        _cache_auth(token, claims)
+    return claims
+
+
+# ============================================================================
+# Request-scoped identity memo
+# ============================================================================
+#
+# Handlers often resolve the caller inline (sometimes more than once, and
+# through helpers that do it again). The memo below makes every resolution
+# after the first in a request a dict lookup. RequestContextMiddleware opens
+# a scope per request; outside a request there is no memo.
+
+_request_identity: ContextVar[Optional[Dict[str, Any]]] = ContextVar("request_identity", default=None)
+
+
+def start_request_identity_scope() -> Dict[str, Any]:
+    """Open the identity memo for the current request (called by middleware)."""
+    scope = {"resolutions": 0, "users": {}, "claims": {}}
+    _request_identity.set(scope)
+    return scope
+
+
+def get_request_identity_scope() -> Optional[Dict[str, Any]]:
+    return _request_identity.get()
+
+
+def _bearer_token(authorization: Optional[str]) -> Optional[str]:
+    if not authorization:
+        return None
+    if authorization.startswith("Bearer "):
+        return authorization[7:]
+    return authorization
+
+
+async def _resolve_user(token: str) -> Dict[str, Any]:
+    """Verify the token and resolve the caller's profile, at most once per request."""
+    scope = _request_identity.get()
+    key = _token_hash(token)
+    if scope is not None and key in scope["users"]:
+        return copy.deepcopy(scope["users"][key])
+
+    user = await _resolve_user_uncached(token)
+    if scope is not None:
+        scope["resolutions"] += 1
+        scope["users"][key] = user
+    # Callers sometimes annotate the returned dict
+    return copy.deepcopy(user)
+
+
+async def _resolve_user_uncached(token: str) -> Dict[str, Any]:
+    cached = _get_cached_auth(token)
+    if cached is not None and cached.get("user") is not None:
+        return cached["user"]
 
     try:
-        # Use AWS Cognito authentication
-        from app.core.cognito import CognitoAuth
         from app.core.database import get_client
 
-        user = CognitoAuth.verify_token(token)
+        user = cached["claims"] if cached is not None else _verify_token_cached(token)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,50 +205,42 @@ async def get_current_user(
         cognito_id = user.get("id")
         email = user.get("email")
 
-        # Look up profile by cognito_user_id to get the profile ID
+        # Look up profile by cognito_user_id, falling back to email
         client = get_client()
-        profile_result = client.table("profiles").select("id, full_name, is_admin, is_staff, role").eq(
+        columns = "id, email, full_name, display_name, is_admin, is_staff, role"
+        profile_result = client.table("profiles").select(columns).eq(
             "cognito_user_id", cognito_id
         ).execute()
+        if not profile_result.data and email:
+            profile_result = client.table("profiles").select(columns).eq(
+                "email", email
+            ).execute()
 
-        profile_id = None
-        full_name = None
-        is_admin = False
-        is_staff = False
-        role = None
-        if profile_result.data:
-            profile_id = profile_result.data[0]["id"]
-            full_name = profile_result.data[0].get("full_name")
-            is_admin = profile_result.data[0].get("is_admin", False)
-            is_staff = profile_result.data[0].get("is_staff", False)
-            role = profile_result.data[0].get("role")
-        else:
-            # Fallback: try lookup by email
-            if email:
-                profile_result = client.table("profiles").select("id, full_name, is_admin, is_staff, role").eq(
-                    "email", email
-                ).execute()
-                if profile_result.data:
-                    profile_id = profile_result.data[0]["id"]
-                    full_name = profile_result.data[0].get("full_name")
-                    is_admin = profile_result.data[0].get("is_admin", False)
-                    is_staff = profile_result.data[0].get("is_staff", False)
-                    role = profile_result.data[0].get("role")
-
-        if not profile_id:
+        if not profile_result.data:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User profile not found",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        profile = profile_result.data[0]
+        profile_id = profile["id"]
+        full_name = profile.get("full_name")
+        is_admin = profile.get("is_admin", False)
+        is_staff = profile.get("is_staff", False)
+        role = profile.get("role")
+
         # Return user dict with profile ID (compatible with existing code)
-        # "sub" is an alias for cognito_id — many routes use current_user["sub"]
-        return {
+        # "sub" is an alias for cognito_id — many routes use current_user["sub"];
+        # "user_id" matches the old per-router get_current_user_from_token copies
+        current_user = {
             "id": profile_id,
+            "user_id": profile_id,
             "sub": cognito_id,
             "cognito_id": cognito_id,
-            "email": email,
+            # Access tokens carry no email claim; prefer the profile's
+            "email": profile.get("email") or email,
+            "display_name": profile.get("display_name"),
             "is_admin": is_admin,
             "is_staff": is_staff,
             "user_metadata": {
@@ -103,6 +249,8 @@ async def get_current_user(
                 "is_moderator": is_staff,
             },
         }
+        _cache_auth(token, user, current_user)
+        return current_user
 
     except HTTPException:
         raise
@@ -114,6 +262,72 @@ async def get_current_user(
         )
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    authorization: str = Header(None)
+) -> Dict[str, Any]:
+    """
+    Dependency to get current authenticated user from Bearer token.
+    Validates the token with AWS Cognito and returns profile ID.
+    """
+    token = credentials.credentials if credentials else _bearer_token(authorization)
+
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return await _resolve_user(token)
+
+
+async def get_current_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
+    """
+    Resolve the caller's profile from the Authorization header.
+
+    For routers that take `authorization: str = Header(None)` and resolve the
+    user inline: `user = await get_current_user_from_token(authorization)`.
+    Also works as a dependency. Same dict as get_current_user ("id" and
+    "user_id" are the profile ID).
+    """
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
+    return await _resolve_user(authorization[7:])
+
+
+async def get_cognito_user_from_token(authorization: str = Header(None)) -> Dict[str, Any]:
+    """
+    Verify the token without resolving a profile.
+
+    Returns {"id": cognito_id, "sub": cognito_id, "email": ...}. For routes
+    that work with the Cognito ID (or run before a profile exists). Accepts
+    the Authorization header or a bare token.
+    """
+    token = _bearer_token(authorization)
+    if not token:
+        raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
+
+    scope = _request_identity.get()
+    key = _token_hash(token)
+    if scope is not None and key in scope["claims"]:
+        return dict(scope["claims"][key])
+
+    try:
+        claims = _verify_token_cached(token)
+    except Exception as e:
+        raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
+    if not claims:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    cognito_id = claims.get("id")
+    user = {"id": cognito_id, "sub": cognito_id, "email": claims.get("email")}
+    if scope is not None:
+        scope["resolutions"] += 1
+        scope["claims"][key] = user
+    return dict(user)
+
+
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     authorization: str = Header(None)
@@ -164,8 +378,7 @@ def verify_token(token: str) -> Optional[Dict[str, Any]]:
     Used by endpoints that manually handle auth.
     """
     try:
-        from app.core.cognito import CognitoAuth
-        return CognitoAuth.verify_token(token)
+        return _verify_token_cached(token)
     except Exception as e:
         print(f"Token verification failed: {e}")
         return None
@@ -0,0 +1,41 @@
+"""
+Deferred boto3 clients.
+
+Importing boto3/botocore.config and building a client costs ~300ms of Lambda
+init per module that does it at import time. LazyClient stands in for a module
+level client and creates the real one on first use, so existing
+`from app.core.storage import s3_client` style imports keep working.
+"""
+import threading
+from typing import Any, Dict, Optional
+
+
+class LazyClient:
+    """boto3 client proxy, created on first attribute access."""
+
+    def __init__(self, service_name: str, config: Optional[Dict[str, Any]] = None, **client_kwargs):
+        self._service_name = service_name
+        self._config = config  # botocore Config kwargs, built lazily too
+        self._client_kwargs = client_kwargs
+        self._client = None
+        self._lock = threading.Lock()
+
+    def get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import boto3
+
+                    kwargs = dict(self._client_kwargs)
+                    if self._config is not None:
+                        from botocore.config import Config
+                        kwargs["config"] = Config(**self._config)
+                    self._client = boto3.client(self._service_name, **kwargs)
+        return self._client
+
+    def __getattr__(self, name: str):
+        return getattr(self.get_client(), name)
+
+    def __repr__(self) -> str:
+        state = "created" if self._client is not None else "deferred"
+        return f"<LazyClient {self._service_name} ({state})>"
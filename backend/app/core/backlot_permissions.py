@@ -8,8 +8,12 @@ It implements a layered permission system:
 3. View profiles define role-based tab/section visibility with view/edit permissions
 4. Per-user overrides can customize permissions for specific users
 """
+import copy
 from typing import Dict, Any, Optional, List, Tuple
-from app.core.database import get_client
+
+from app.core.cache import VersionedCache
+from app.core.config import settings
+from app.core.database import after_transaction, execute_single, get_client
 
 
 # Default view/edit configs per Backlot role
@@ -697,9 +701,71 @@ async def can_manage_access(project_id: str, user_id: str) -> bool:
     return row is not None and row.get("has_access", False)
 
 
-async def get_effective_view_config(project_id: str, user_id: str) -> Dict[str, Any]:
+# =============================================================================
+# Effective config resolution
+# =============================================================================
+
+# Everything get_effective_view_config needs, in one round trip: ownership,
+# org membership (+ collaborative project access), external seat, primary
+# (else oldest) Backlot role, that role's view profile and the user override.
+# No row means the project doesn't exist; that resolves like a role-less member.
+_ACCESS_FACTS_SQL = """
+    SELECT
+        p.owner_id::text = :user_id AS is_owner,
+        p.organization_id,
+        om.role AS org_role,
+        opa.tab_permissions AS org_tab_permissions,
+        opa.found AS has_org_project_access,
+        seat.seat AS external_seat,
+        r.backlot_role,
+        vp.config AS profile_config,
+        vo.config AS override_config
+    FROM backlot_projects p
+    LEFT JOIN LATERAL (
+        SELECT m.role FROM organization_members m
+        WHERE m.organization_id = p.organization_id
+          AND m.user_id = :user_id AND m.status = 'active'
+        LIMIT 1
+    ) om ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT a.tab_permissions, TRUE AS found FROM organization_project_access a
+        WHERE a.organization_id = p.organization_id
+          AND a.user_id = :user_id AND a.project_id = p.id
+        LIMIT 1
+    ) opa ON om.role = 'collaborative'
+    LEFT JOIN LATERAL (
+        SELECT to_jsonb(s) AS seat FROM backlot_project_external_seats s
+        WHERE s.project_id = p.id AND s.user_id = :user_id AND s.status = 'active'
+        LIMIT 1
+    ) seat ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT pr.backlot_role FROM backlot_project_roles pr
+        WHERE pr.project_id = p.id AND pr.user_id = :user_id
+        ORDER BY pr.is_primary IS TRUE DESC, pr.created_at
+        LIMIT 1
+    ) r ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT v.config FROM backlot_project_view_profiles v
+        WHERE v.project_id = p.id AND v.backlot_role = COALESCE(r.backlot_role, 'crew')
+          AND v.is_default = TRUE
+        LIMIT 1
+    ) vp ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT o.config FROM backlot_project_view_overrides o
+        WHERE o.project_id = p.id AND o.user_id = :user_id
+        LIMIT 1
+    ) vo ON TRUE
+    WHERE p.id = :project_id
+"""
+
+
+def _fetch_access_facts(project_id: str, user_id: str) -> Dict[str, Any]:
+    return execute_single(_ACCESS_FACTS_SQL, {"project_id": project_id, "user_id": user_id}) or {}
+
+
+def resolve_view_config(facts: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Get the effective view configuration for a user on a project.
+    Build the effective view config from the row returned by _ACCESS_FACTS_SQL.
 
     Resolution order:
     1. If project owner -> full access
@@ -709,21 +775,9 @@ async def get_effective_view_config(project_id: str, user_id: str) -> Dict[str,
     5. Get user's backlot role -> base config
     6. Check for project-specific view profile -> merge
     7. Check for user-specific overrides -> merge
-
-    Returns config in format:
-    {
-        "role": "showrunner" | "producer" | etc,
-        "is_owner": bool,
-        "has_overrides": bool,
-        "access_type": "owner" | "org_admin" | "org_collaborative" | "external_seat" | "member",
-        "tabs": { "tab_name": { "view": bool, "edit": bool }, ... },
-        "sections": { "section_name": { "view": bool, "edit": bool }, ... }
-    }
     """
-    client = get_client()
-
     # Check if owner
-    if await is_project_owner(project_id, user_id):
+    if facts.get("is_owner"):
         owner_config = DEFAULT_VIEW_CONFIGS["showrunner"].copy()
         return {
             "role": "owner",
@@ -734,33 +788,32 @@ async def get_effective_view_config(project_id: str, user_id: str) -> Dict[str,
         }
 
     # Check organization access
-    org_access = await get_org_project_access(project_id, user_id)
-    if org_access:
-        if org_access["role"] in ("owner", "admin"):
-            # Org owners/admins get full access to org projects
-            owner_config = DEFAULT_VIEW_CONFIGS["showrunner"].copy()
-            return {
-                "role": "org_admin",
-                "is_owner": False,
-                "has_overrides": False,
-                "access_type": "org_admin",
-                "organization_id": org_access["organization_id"],
-                **owner_config,
-            }
-        elif org_access["role"] == "collaborative":
-            # Collaborative members get their custom tab permissions
-            return {
-                "role": "collaborative",
-                "is_owner": False,
-                "has_overrides": True,
-                "access_type": "org_collaborative",
-                "organization_id": org_access["organization_id"],
-                "tabs": org_access.get("tab_permissions", {}),
-                "sections": {},
-            }
+    org_role = facts.get("org_role")
+    if org_role in ("owner", "admin"):
+        # Org owners/admins get full access to org projects
+        owner_config = DEFAULT_VIEW_CONFIGS["showrunner"].copy()
+        return {
+            "role": "org_admin",
+            "is_owner": False,
+            "has_overrides": False,
+            "access_type": "org_admin",
+            "organization_id": str(facts["organization_id"]),
+            **owner_config,
+        }
+    if org_role == "collaborative" and facts.get("has_org_project_access"):
+        # Collaborative members get their custom tab permissions
+        return {
+            "role": "collaborative",
+            "is_owner": False,
+            "has_overrides": True,
+            "access_type": "org_collaborative",
+            "organization_id": str(facts["organization_id"]),
+            "tabs": facts.get("org_tab_permissions") or {},
+            "sections": {},
+        }
 
     # Check external seat (freelancer/client)
-    external_seat = await get_external_seat_access(project_id, user_id)
+    external_seat = facts.get("external_seat")
     if external_seat:
         if external_seat["seat_type"] == "project":
             # Freelancers get limited access based on their permissions
@@ -793,25 +846,21 @@ async def get_effective_view_config(project_id: str, user_id: str) -> Dict[str,
                 "sections": {},
             }
 
-    # Get user's role (standard project member flow)
-    backlot_role = await get_user_backlot_role(project_id, user_id)
-    if not backlot_role:
-        backlot_role = "crew"  # Default to crew if no role assigned
+    # Standard project member flow; default to crew if no role assigned
+    backlot_role = facts.get("backlot_role") or "crew"
 
     # Start with default config for role
     base_config = DEFAULT_VIEW_CONFIGS.get(backlot_role, DEFAULT_VIEW_CONFIGS["crew"]).copy()
 
-    # Check for project-specific view profile
-    custom_profile = await get_project_view_profile(project_id, backlot_role)
-    if custom_profile:
-        base_config = merge_configs(base_config, custom_profile)
+    # Project-specific view profile
+    if facts.get("profile_config"):
+        base_config = merge_configs(base_config, facts["profile_config"])
 
-    # Check for user-specific overrides
+    # User-specific overrides
     has_overrides = False
-    user_override = await get_user_view_override(project_id, user_id)
-    if user_override:
+    if facts.get("override_config"):
         has_overrides = True
-        base_config = merge_configs(base_config, user_override)
+        base_config = merge_configs(base_config, facts["override_config"])
 
     return {
         "role": backlot_role,
@@ -822,6 +871,72 @@ async def get_effective_view_config(project_id: str, user_id: str) -> Dict[str,
     }
 
 
+# =============================================================================
+# Effective config cache
+# =============================================================================
+
+# Keyed by (project_id, user_id); depends on the project's and the user's
+# version counters (see VersionedCache)
+_permission_cache = VersionedCache(
+    "perm",
+    maxsize=settings.BACKLOT_PERMISSION_CACHE_MAX_ENTRIES,
+    ttl=settings.BACKLOT_PERMISSION_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_permission_cache(project_id: Any = None, user_id: Any = None) -> None:
+    """
+    Drop cached effective configs after an access change.
+
+    - user_id (with or without project_id): all of the user's projects (role,
+      override, seat and org membership changes)
+    - project_id only: everyone on the project (view profiles, project org)
+    - neither: everything
+
+    Runs now (so the rest of this request sees the change) and again when the
+    request's transaction ends (so concurrent requests can't re-cache the
+    pre-commit state).
+    """
+    if user_id is not None:
+        scopes = (f"u:{user_id}",)
+    elif project_id is not None:
+        scopes = (f"p:{project_id}",)
+    else:
+        scopes = ()
+    _permission_cache.bump(*scopes)
+    after_transaction(lambda: _permission_cache.bump(*scopes))
+
+
+def get_permission_cache_stats() -> Dict[str, Any]:
+    return _permission_cache.stats()
+
+
+async def get_effective_view_config(project_id: str, user_id: str) -> Dict[str, Any]:
+    """
+    Get the effective view configuration for a user on a project.
+
+    Resolved by one query (see resolve_view_config for the order) and cached
+    per (project_id, user_id) until invalidate_permission_cache().
+
+    Returns config in format:
+    {
+        "role": "showrunner" | "producer" | etc,
+        "is_owner": bool,
+        "has_overrides": bool,
+        "access_type": "owner" | "org_admin" | "org_collaborative" | "external_seat" | "member",
+        "tabs": { "tab_name": { "view": bool, "edit": bool }, ... },
+        "sections": { "section_name": { "view": bool, "edit": bool }, ... }
+    }
+    """
+    project_id, user_id = str(project_id), str(user_id)
+    config = _permission_cache.get_or_load(
+        (project_id, user_id),
+        (f"p:{project_id}", f"u:{user_id}"),
+        lambda: resolve_view_config(_fetch_access_facts(project_id, user_id)),
+    )
+    return copy.deepcopy(config)
+
+
 async def can_view_tab(project_id: str, user_id: str, tab: str) -> bool:
     """
     Check if user can view a specific tab.
@@ -0,0 +1,242 @@
+"""
+In-process TTL caches with an optional shared (Redis-compatible) tier.
+
+TTLCache is a bounded, thread-safe LRU with per-entry expiry, one per process.
+VersionedCache adds invalidation that reaches every process through version
+counters in the shared tier.
+The shared tier lets warm Lambda containers reuse each other's entries: set
+CACHE_REDIS_URL to a Redis/Valkey/ElastiCache endpoint. Without it an
+in-process stand-in with the same commands is used, so callers don't branch.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU whose entries expire after a per-entry TTL (seconds)."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Drop every entry for which predicate(key, value) is true."""
+        with self._lock:
+            doomed = [k for k, (_, v) in self._entries.items() if predicate(k, v)]
+            for key in doomed:
+                del self._entries[key]
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class VersionedCache:
+    """
+    TTLCache whose entries are stamped with version counters kept in the
+    shared tier, one per scope the entry depends on (plus a global one).
+
+    bump(scope) increments a counter, so every process drops the affected
+    entries on its next lookup without having to enumerate them. Without
+    CACHE_REDIS_URL the counters are process-local and the TTL bounds
+    staleness across processes. If the shared tier errors, lookups bypass the
+    cache rather than risk serving a stale entry.
+    """
+
+    def __init__(self, namespace: str, maxsize: int = 1024, ttl: float = 60.0):
+        self._prefix = f"swn:{namespace}:v:"
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _version_keys(self, scopes) -> list:
+        return [self._prefix + "all"] + [self._prefix + scope for scope in scopes]
+
+    def get_or_load(self, key: Hashable, scopes, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, or loader() (cached under the current stamp)."""
+        try:
+            stamp = tuple(get_shared_backend().mget(self._version_keys(scopes)))
+        except Exception as e:
+            logger.warning(f"Cache version lookup failed for {self._prefix}: {e}")
+            return loader()
+        cached = self._local.get(key)
+        if cached is not None and cached[1] == stamp:
+            return cached[2]
+        # Read the stamp before loading: a bump that lands mid-load leaves
+        # this entry stale-stamped, never fresh-stamped with old data
+        value = loader()
+        self._local.set(key, (frozenset(scopes), stamp, value))
+        return value
+
+    def bump(self, *scopes: str) -> None:
+        """Invalidate every entry depending on any of scopes (all entries if none)."""
+        if scopes:
+            doomed = set(scopes)
+            self._local.delete_where(lambda _, entry: not doomed.isdisjoint(entry[0]))
+        else:
+            self._local.clear()
+        try:
+            backend = get_shared_backend()
+            for key in ([self._prefix + scope for scope in scopes] or [self._prefix + "all"]):
+                backend.incr(key)
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed for {self._prefix}: {e}")
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._local.stats()
+
+
+class MemoryBackend:
+    """
+    In-process stand-in for the Redis commands the shared tier uses
+    (get / mget / set with ex / delete / incr / sadd / smembers / expire).
+    """
+
+    def __init__(self):
+        self._values: Dict[str, tuple] = {}  # key -> (expires_at or None, value)
+        self._lock = threading.Lock()
+
+    def _live(self, key: str):
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        return value
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._live(key)
+            return value if isinstance(value, str) else None
+
+    def mget(self, keys) -> list:
+        with self._lock:
+            return [v if isinstance(v, str) else None for v in map(self._live, keys)]
+
+    def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            self._values[key] = (time.monotonic() + ex if ex else None, value)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._values.pop(key, None) is not None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._live(key) or 0) + 1
+            expires_at = self._values[key][0] if key in self._values else None
+            self._values[key] = (expires_at, str(value))
+            return value
+
+    def sadd(self, key: str, *members: str) -> int:
+        with self._lock:
+            current = self._live(key)
+            if not isinstance(current, set):
+                current = set()
+                self._values[key] = (None, current)
+            before = len(current)
+            current.update(members)
+            return len(current) - before
+
+    def smembers(self, key: str) -> set:
+        with self._lock:
+            value = self._live(key)
+            return set(value) if isinstance(value, set) else set()
+
+    def expire(self, key: str, seconds: int) -> bool:
+        with self._lock:
+            value = self._live(key)
+            if value is None:
+                return False
+            self._values[key] = (time.monotonic() + seconds, value)
+            return True
+
+
+_shared_backend = None
+
+
+def get_shared_backend():
+    """
+    Get the shared cache tier (lazy initialization).
+
+    Returns a redis.Redis client when CACHE_REDIS_URL is set and the redis
+    package is installed, otherwise a process-local MemoryBackend. Callers
+    should treat errors from it as cache misses.
+    """
+    global _shared_backend
+    if _shared_backend is None:
+        url = settings.CACHE_REDIS_URL
+        if url:
+            try:
+                import redis
+                _shared_backend = redis.Redis.from_url(
+                    url,
+                    decode_responses=True,
+                    socket_timeout=0.25,
+                    socket_connect_timeout=0.5,
+                )
+            except ImportError:
+                logger.warning("CACHE_REDIS_URL is set but the redis package is not installed; using in-process cache")
+                _shared_backend = MemoryBackend()
+        else:
+            _shared_backend = MemoryBackend()
+    return _shared_backend
@@ -11,13 +11,13 @@ import base64
 from typing import Optional, Dict, Any
 from datetime import datetime
 
-import boto3
 from botocore.exceptions import ClientError
 import jwt
 from jwt import PyJWKClient
 from fastapi import HTTPException, Header, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from app.core.aws_clients import LazyClient
 from app.core.config import settings
 
 
@@ -34,7 +34,8 @@ COGNITO_JWKS_URL = f"{COGNITO_ISSUER}/.well-known/jwks.json"
 # Cognito client — use default credential chain (Lambda execution role, env vars, or ~/.aws)
 # Do NOT pass explicit aws_access_key_id/aws_secret_access_key as that skips
 # the session token needed for Lambda's temporary credentials.
-cognito_client = boto3.client(
+# Created on first use rather than at import (see app.core.aws_clients).
+cognito_client = LazyClient(
     'cognito-idp',
     region_name=AWS_REGION,
 )
@@ -21,6 +21,9 @@ class Settings(BaseSettings):
     APP_ENV: str = os.getenv("APP_ENV", "development")
     DEBUG: bool = os.getenv("DEBUG", "True") == "True"
     API_V1_PREFIX: str = "/api/v1"
+    # Import router modules on the first request under their path prefix
+    # instead of at startup (cuts Lambda cold-start; see app.core.routing)
+    LAZY_ROUTERS: bool = os.getenv("LAZY_ROUTERS", "false").lower() == "true"
 
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -50,6 +53,18 @@ class Settings(BaseSettings):
     DB_NAME: str = os.getenv("DB_NAME", "secondwatchnetwork")
     DB_USER: str = os.getenv("DB_USER", "")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "")
+    # Share one connection + transaction per request (committed by middleware)
+    DB_UNIT_OF_WORK: bool = os.getenv("DB_UNIT_OF_WORK", "true").lower() == "true"
+    # Server-side prepared statements: asyncpg's per-connection statement cache,
+    # and psycopg 3's prepare_threshold when DATABASE_URL uses postgresql+psycopg://
+    DB_PREPARED_STATEMENTS: bool = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() == "true"
+    DB_PREPARE_THRESHOLD: int = int(os.getenv("DB_PREPARE_THRESHOLD", "5"))
+    # auto (NullPool on Lambda, QueuePool elsewhere) | null | queue | proxy
+    # proxy: one persistent connection per warm container, safe for RDS Proxy /
+    # pgbouncer transaction pooling (forces prepared statements off)
+    DB_POOL_MODE: str = os.getenv("DB_POOL_MODE", "auto")
+    DB_PROXY_PING_AFTER_SECONDS: int = int(os.getenv("DB_PROXY_PING_AFTER_SECONDS", "30"))
+    DB_PROXY_RECYCLE_SECONDS: int = int(os.getenv("DB_PROXY_RECYCLE_SECONDS", "600"))
 
     # AWS S3 Storage
     AWS_S3_BUCKET: str = os.getenv("AWS_S3_BUCKET", "")
@@ -62,6 +77,40 @@ class Settings(BaseSettings):
     COGNITO_CLIENT_ID: str = os.getenv("COGNITO_CLIENT_ID", "")
     COGNITO_CLIENT_SECRET: str = os.getenv("COGNITO_CLIENT_SECRET", "")
     COGNITO_REGION: str = os.getenv("COGNITO_REGION", "us-east-1")
+    # Verified-token + profile cache for get_current_user (entries never outlive the token's exp)
+    AUTH_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+    AUTH_CACHE_MAX_ENTRIES: int = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "2048"))
+    # Effective Backlot permission configs per (project, user); invalidated on
+    # access changes, the TTL only bounds writes that skip invalidation
+    BACKLOT_PERMISSION_CACHE_TTL_SECONDS: int = int(os.getenv("BACKLOT_PERMISSION_CACHE_TTL_SECONDS", "30"))
+    BACKLOT_PERMISSION_CACHE_MAX_ENTRIES: int = int(os.getenv("BACKLOT_PERMISSION_CACHE_MAX_ENTRIES", "4096"))
+    # Org entitlement snapshots (tier + active modules) for feature gates;
+    # invalidated by subscription/module changes
+    FEATURE_GATE_CACHE_TTL_SECONDS: int = int(os.getenv("FEATURE_GATE_CACHE_TTL_SECONDS", "60"))
+    FEATURE_GATE_CACHE_MAX_ENTRIES: int = int(os.getenv("FEATURE_GATE_CACHE_MAX_ENTRIES", "2048"))
+    # Feature flag snapshot sync: "listen" (LISTEN/NOTIFY), "poll" (version row)
+    # or "auto" (poll on Lambda, listen elsewhere)
+    FEATURE_FLAG_SYNC: str = os.getenv("FEATURE_FLAG_SYNC", "auto")
+    FEATURE_FLAG_POLL_SECONDS: float = float(os.getenv("FEATURE_FLAG_POLL_SECONDS", "5"))
+    # Fraction of flag evaluations logged to feature_flag_evaluations, written in batches
+    FEATURE_FLAG_EVAL_SAMPLE_RATE: float = float(os.getenv("FEATURE_FLAG_EVAL_SAMPLE_RATE", "0.01"))
+    FEATURE_FLAG_EVAL_BATCH_SIZE: int = int(os.getenv("FEATURE_FLAG_EVAL_BATCH_SIZE", "500"))
+    FEATURE_FLAG_EVAL_FLUSH_SECONDS: float = float(os.getenv("FEATURE_FLAG_EVAL_FLUSH_SECONDS", "10"))
+
+    # Write-behind buffer for tracking events (views, heartbeats, email opens).
+    # Disabled = events are written synchronously as they are emitted. Off by
+    # default on Lambda, where the flush thread is frozen between invocations
+    # and /tmp spill files go away with the container.
+    EVENT_BUFFER_ENABLED: bool = os.getenv(
+        "EVENT_BUFFER_ENABLED", "false" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "true"
+    ).lower() == "true"
+    EVENT_BUFFER_MAX_EVENTS: int = int(os.getenv("EVENT_BUFFER_MAX_EVENTS", "1000"))
+    EVENT_BUFFER_FLUSH_SECONDS: float = float(os.getenv("EVENT_BUFFER_FLUSH_SECONDS", "2"))
+    # Batches that can't reach the database are spilled here and replayed later
+    EVENT_BUFFER_SPILL_DIR: str = os.getenv("EVENT_BUFFER_SPILL_DIR", "/tmp/swn-event-buffer")
+
+    # Shared cache tier (Redis-compatible; optional, requires the redis package)
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "")
 
     # Feature Flags
     USE_AWS: bool = os.getenv("USE_AWS", "true").lower() == "true"
@@ -81,6 +130,10 @@ class Settings(BaseSettings):
     NOMINATIM_URL: str = os.getenv("NOMINATIM_URL", "https://nominatim.openstreetmap.org")
     GEOCODING_CACHE_TTL_HOURS: int = int(os.getenv("GEOCODING_CACHE_TTL_HOURS", "168"))  # 7 days
 
+    # Marketplace proximity search: auto (PostGIS when migration 276 added the
+    # geography column, else bounding box), postgis, or bbox
+    MARKETPLACE_GEO_MODE: str = os.getenv("MARKETPLACE_GEO_MODE", "auto")
+
     # Email Configuration (Resend, SendGrid, or SMTP)
     EMAIL_PROVIDER: str = os.getenv("EMAIL_PROVIDER", "resend")  # resend, sendgrid, smtp
     RESEND_API_KEY: str = os.getenv("RESEND_API_KEY", "")
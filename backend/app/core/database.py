@@ -7,12 +7,21 @@ Uses lazy initialization to reduce Lambda cold start time.
 """
 
 import os
+import io
+import base64
 import json
-from typing import Generator, Optional
-from sqlalchemy import create_engine, text, Engine
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import AsyncGenerator, Callable, Dict, Generator, Optional, Union
+from sqlalchemy import create_engine, event, exc, text, bindparam, Engine, TextClause
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool, NullPool
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
 
 from app.core.config import settings
 
@@ -33,31 +42,100 @@ _engine: Optional[Engine] = None
 _SessionLocal: Optional[sessionmaker] = None
 
 
+def _get_pool_mode() -> str:
+    """
+    Resolve DB_POOL_MODE to "null", "queue" or "proxy".
+
+    - null:  NullPool, a fresh connection per session (Lambda default)
+    - queue: QueuePool (local / long-running server default)
+    - proxy: one persistent connection per container, for warm Lambdas
+             behind RDS Proxy or pgbouncer in transaction pooling mode
+    """
+    mode = (settings.DB_POOL_MODE or "auto").lower()
+    if mode in ("null", "queue", "proxy"):
+        return mode
+    is_lambda = os.getenv('AWS_LAMBDA_FUNCTION_NAME') is not None
+    return "null" if is_lambda else "queue"
+
+
+def _prepared_statements_enabled() -> bool:
+    # A transaction-pooling proxy hands each transaction a different server
+    # connection, so statements prepared on one are missing on the next
+    return settings.DB_PREPARED_STATEMENTS and _get_pool_mode() != "proxy"
+
+
+def _register_liveness_check(engine: Engine, idle_seconds: int) -> None:
+    """
+    Ping pooled connections that sat idle for more than idle_seconds.
+
+    A frozen Lambda container can wake up holding a connection the proxy has
+    already dropped. Unlike pool_pre_ping this skips the round-trip for
+    back-to-back requests; a failed ping makes the pool reconnect.
+    """
+    @event.listens_for(engine, "checkin")
+    def _stamp(dbapi_connection, connection_record):
+        connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping(dbapi_connection, connection_record, connection_proxy):
+        last_used = connection_record.info.get("last_used")
+        if last_used is None or time.monotonic() - last_used < idle_seconds:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        except Exception as e:
+            raise exc.DisconnectionError(f"stale pooled connection: {e}") from e
+
+
 def _get_engine() -> Engine:
     """Get or create the SQLAlchemy engine (lazy initialization)."""
     global _engine
     if _engine is None:
-        is_lambda = os.getenv('AWS_LAMBDA_FUNCTION_NAME') is not None
-
-        # Use NullPool for Lambda (no persistent connections between invocations)
-        # Use QueuePool for local development (connection reuse)
-        pool_class = NullPool if is_lambda else QueuePool
+        pool_mode = _get_pool_mode()
 
         engine_kwargs = {
-            "poolclass": pool_class,
             "echo": os.getenv('DEBUG', 'false').lower() == 'true',
         }
 
-        # Only add pool settings for QueuePool
-        if pool_class == QueuePool:
+        if pool_mode == "null":
+            # No persistent connections between invocations
+            engine_kwargs["poolclass"] = NullPool
+        elif pool_mode == "proxy":
+            # Keep one connection open across warm invocations. Overflow
+            # connections (nested sessions, background work) are closed on
+            # return. Recycle below the proxy's idle client timeout.
+            engine_kwargs.update({
+                "poolclass": QueuePool,
+                "pool_size": 1,
+                "max_overflow": 4,
+                "pool_timeout": 10,
+                "pool_recycle": settings.DB_PROXY_RECYCLE_SECONDS,
+            })
+        else:
             engine_kwargs.update({
+                "poolclass": QueuePool,
                 "pool_size": 5,
                 "max_overflow": 10,
                 "pool_timeout": 30,
                 "pool_recycle": 1800,
             })
 
-        _engine = create_engine(_get_database_url(), **engine_kwargs)
+        database_url = _get_database_url()
+        if make_url(database_url).get_driver_name() == "psycopg":
+            # psycopg 3 prepares a statement server-side once it has run
+            # prepare_threshold times on a connection (None disables it).
+            # psycopg2 has no server-side prepare, so this only applies
+            # when DATABASE_URL selects postgresql+psycopg://
+            engine_kwargs["connect_args"] = {
+                "prepare_threshold": settings.DB_PREPARE_THRESHOLD if _prepared_statements_enabled() else None,
+            }
+
+        _engine = create_engine(database_url, **engine_kwargs)
+        _register_stats_listeners(_engine)
+        if pool_mode == "proxy":
+            _register_liveness_check(_engine, settings.DB_PROXY_PING_AFTER_SECONDS)
 
     return _engine
 
@@ -89,12 +167,185 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+# ============================================================================
+# Per-request DB stats and unit of work
+# ============================================================================
+
+# Statement/commit/connection counters for the current request (logged by
+# log_request_end). A mutable dict so updates made inside call_next are
+# visible to the middleware that created it.
+_request_db_stats: ContextVar[Optional[Dict[str, int]]] = ContextVar("request_db_stats", default=None)
+
+
+def start_request_db_stats() -> Dict[str, int]:
+    """Start counting DB statements, commits and connection checkouts for this request."""
+    stats = {"statements": 0, "savepoints": 0, "commits": 0, "connections": 0}
+    _request_db_stats.set(stats)
+    return stats
+
+
+def get_request_db_stats() -> Optional[Dict[str, int]]:
+    """Get the DB counters for the current request, if any."""
+    return _request_db_stats.get()
+
+
+def _count_db_event(key: str) -> None:
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats[key] += 1
+
+
+def _count_statement(conn, cursor, statement: str, *args) -> None:
+    # Unit-of-work savepoints are bookkeeping, not application queries
+    if statement.startswith(("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")):
+        _count_db_event("savepoints")
+    else:
+        _count_db_event("statements")
+
+
+def _register_stats_listeners(engine: Engine) -> None:
+    """Hook engine/pool events into the per-request counters."""
+    event.listen(engine, "before_cursor_execute", _count_statement)
+    event.listen(engine, "commit", lambda *args: _count_db_event("commits"))
+    event.listen(engine.pool, "checkout", lambda *args: _count_db_event("connections"))
+
+
+class UnitOfWork:
+    """
+    Request-scoped session shared by every sync DB helper.
+
+    Instead of one pooled checkout + commit per statement, all statements in
+    the request run on one connection inside one transaction, committed once
+    by the middleware in app/main.py. Each statement runs in a SAVEPOINT so a
+    failed query that the caller catches doesn't abort the whole transaction
+    (matching the old per-statement behavior).
+
+    The connection is checked out lazily on the first statement, so requests
+    that never touch the DB cost nothing.
+    """
+
+    def __init__(self):
+        self._session: Optional[Session] = None
+        self._lock = threading.RLock()
+        self._finish_callbacks: list = []
+        self.active = True
+
+    def _get_session(self) -> Session:
+        if self._session is None:
+            self._session = _get_session_local()()
+        return self._session
+
+    @contextmanager
+    def statement_session(self) -> Generator[Session, None, None]:
+        """Yield the shared session with the statement wrapped in a savepoint."""
+        with self._lock:
+            session = self._get_session()
+            savepoint = session.begin_nested()
+            try:
+                yield session
+                savepoint.commit()
+            except Exception:
+                if savepoint.is_active:
+                    savepoint.rollback()
+                raise
+
+    def finish(self, commit: bool = True) -> None:
+        """Commit (or roll back) pending work and release the connection."""
+        with self._lock:
+            self.active = False
+            session, self._session = self._session, None
+            try:
+                if session is None:
+                    return
+                try:
+                    if commit:
+                        session.commit()
+                    else:
+                        session.rollback()
+                except Exception:
+                    session.rollback()
+                    raise
+                finally:
+                    session.close()
+            finally:
+                self._run_finish_callbacks()
+
+    def after_finish(self, callback: Callable[[], None]) -> None:
+        """Run callback once this unit of work has committed or rolled back."""
+        self._finish_callbacks.append(callback)
+
+    def _run_finish_callbacks(self) -> None:
+        callbacks, self._finish_callbacks = self._finish_callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Warning: unit of work callback failed: {e}")
+
+
+_current_unit_of_work: ContextVar[Optional[UnitOfWork]] = ContextVar("db_unit_of_work", default=None)
+
+
+def begin_unit_of_work() -> UnitOfWork:
+    """Start a unit of work for the current request (called by middleware)."""
+    uow = UnitOfWork()
+    _current_unit_of_work.set(uow)
+    return uow
+
+
+def release_unit_of_work() -> None:
+    """
+    Commit pending work and return this request to per-statement sessions.
+
+    Call before long-running work (external API calls, large exports, AI
+    generation) so the request doesn't hold a connection and an open
+    transaction for its whole duration. Safe to call when no unit of work
+    is active.
+    """
+    uow = _current_unit_of_work.get()
+    if uow is not None and uow.active:
+        uow.finish(commit=True)
+
+
+def after_transaction(callback: Callable[[], None]) -> None:
+    """
+    Run callback when the request's transaction ends (commit or rollback), or
+    right away when there is no open unit of work.
+
+    Cache invalidation uses this: invalidating before the commit alone lets a
+    concurrent request re-cache the pre-commit state.
+    """
+    uow = _current_unit_of_work.get()
+    if uow is not None and uow.active:
+        uow.after_finish(callback)
+    else:
+        callback()
+
+
+def no_unit_of_work() -> None:
+    """
+    FastAPI dependency opting a route out of the request unit of work.
+    Usage: @router.post("/export", dependencies=[Depends(no_unit_of_work)])
+    """
+    release_unit_of_work()
+
+
 @contextmanager
 def get_db_session() -> Generator[Session, None, None]:
     """
     Context manager for database sessions.
     Use in non-FastAPI contexts.
+
+    Inside a request with an active unit of work this yields the shared
+    request session instead (one statement = one savepoint). Don't call
+    db.commit() on it - the context manager and middleware commit.
     """
+    uow = _current_unit_of_work.get()
+    if uow is not None and uow.active:
+        with uow.statement_session() as db:
+            yield db
+        return
+
     SessionLocal = _get_session_local()
     db = SessionLocal()
     try:
@@ -133,21 +384,26 @@ def _convert_row(row_dict: dict) -> dict:
     return converted
 
 
-def execute_query(query: str, params: dict = None) -> list:
+def _as_text(query: Union[str, TextClause]) -> TextClause:
+    """Wrap a SQL string in text(); prebuilt clauses (the query cache) pass through."""
+    return query if isinstance(query, TextClause) else text(query)
+
+
+def execute_query(query: Union[str, TextClause], params: dict = None) -> list:
     """
     Execute a raw SQL query and return results.
     """
     with get_db_session() as db:
-        result = db.execute(text(query), params or {})
+        result = db.execute(_as_text(query), params or {})
         return [_convert_row(dict(row._mapping)) for row in result.fetchall()]
 
 
-def execute_single(query: str, params: dict = None) -> dict:
+def execute_single(query: Union[str, TextClause], params: dict = None) -> dict:
     """
     Execute a query and return a single result.
     """
     with get_db_session() as db:
-        result = db.execute(text(query), params or {})
+        result = db.execute(_as_text(query), params or {})
         row = result.fetchone()
         return _convert_row(dict(row._mapping)) if row else None
 
@@ -160,7 +416,6 @@ def execute_insert(query: str, params: dict = None) -> dict:
         result = db.execute(text(query), params or {})
         # Fetch BEFORE commit - psycopg2 can close cursor after commit
         row = result.fetchone()
-        db.commit()
         return _convert_row(dict(row._mapping)) if row else None
 
 
@@ -172,7 +427,6 @@ def execute_update(query: str, params: dict = None) -> int:
         result = db.execute(text(query), params or {})
         # Get rowcount BEFORE commit - psycopg2 can close cursor after commit
         count = result.rowcount
-        db.commit()
         return count
 
 
@@ -184,10 +438,506 @@ def execute_delete(query: str, params: dict = None) -> int:
         result = db.execute(text(query), params or {})
         # Get rowcount BEFORE commit - psycopg2 can close cursor after commit
         count = result.rowcount
-        db.commit()
         return count
 
 
+# ============================================================================
+# Bulk inserts
+# ============================================================================
+
+# Postgres caps a statement at 65535 bind parameters; stay well under it
+MAX_BIND_PARAMS = 32767
+MAX_ROWS_PER_INSERT = 1000
+# Row count above which insert(..., returning="minimal") streams via COPY
+COPY_THRESHOLD_ROWS = 5000
+
+
+def _insert_chunks(rows: list):
+    """
+    Yield (columns, chunk) for a multi-row INSERT.
+
+    Consecutive rows with the same keys share a statement (so result order
+    matches input order); each chunk stays under MAX_BIND_PARAMS.
+    """
+    run_columns, run = None, []
+    for row in rows:
+        columns = tuple(row.keys())
+        if columns != run_columns and run:
+            yield from _split_run(run_columns, run)
+            run = []
+        run_columns = columns
+        run.append(row)
+    if run:
+        yield from _split_run(run_columns, run)
+
+
+def _split_run(columns: tuple, rows: list):
+    size = min(MAX_ROWS_PER_INSERT, max(1, MAX_BIND_PARAMS // max(1, len(columns))))
+    for start in range(0, len(rows), size):
+        yield columns, rows[start:start + size]
+
+
+def execute_insert_many(table_name: str, rows: list, returning: Optional[str] = "*") -> list:
+    """
+    Insert many rows with multi-row `INSERT ... VALUES (...), (...)` statements.
+
+    Returns the RETURNING rows in input order (empty list if returning is None).
+    """
+    results = []
+    for columns, chunk in _insert_chunks(rows):
+        if not columns:
+            # DEFAULT VALUES can't be multi-row; rare enough to loop
+            query = f"INSERT INTO {table_name} DEFAULT VALUES"
+            for _ in chunk:
+                if returning:
+                    results.extend(execute_query(f"{query} RETURNING {returning}", {}))
+                else:
+                    execute_update(query, {})
+            continue
+
+        params = {}
+        values = []
+        for i, row in enumerate(chunk):
+            placeholders = []
+            for j, col in enumerate(columns):
+                name = f"r{i}_{j}"
+                params[name] = row[col]
+                placeholders.append(f":{name}")
+            values.append(f"({', '.join(placeholders)})")
+        query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES {', '.join(values)}"
+
+        if returning:
+            results.extend(execute_query(f"{query} RETURNING {returning}", params))
+        else:
+            execute_update(query, params)
+    return results
+
+
+def _copy_field(value) -> str:
+    """Format one value for COPY ... (FORMAT csv, NULL '\\N')."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        value = "t" if value else "f"
+    # Quote everything non-null so a literal "\\N" or "" stays a string
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def copy_supported() -> bool:
+    """COPY FROM STDIN needs the psycopg2 driver's copy_expert."""
+    return _get_engine().dialect.driver == "psycopg2"
+
+
+def execute_copy(table_name: str, rows: list) -> int:
+    """
+    Bulk load rows with `COPY table (cols) FROM STDIN`.
+
+    All rows must share the same keys. No RETURNING - use for large imports
+    where the caller doesn't need the inserted rows back. Returns row count.
+    """
+    if not rows:
+        return 0
+    columns = list(rows[0].keys())
+    buf = io.StringIO()
+    for row in rows:
+        buf.write(",".join(_copy_field(row.get(col)) for col in columns))
+        buf.write("\n")
+    buf.seek(0)
+
+    copy_sql = f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    with get_db_session() as db:
+        dbapi_connection = db.connection().connection.dbapi_connection
+        with dbapi_connection.cursor() as cursor:
+            cursor.copy_expert(copy_sql, buf)
+    # copy_expert bypasses SQLAlchemy's execute events
+    _count_db_event("statements")
+    return len(rows)
+
+
+# ============================================================================
+# Ordered collections
+# ============================================================================
+
+def _scope_clause(scope: Optional[dict], alias: str) -> tuple:
+    """AND-ed `col = :value` filters (None -> IS NULL) for the reorder helpers."""
+    clauses, params = [], {}
+    for i, (col, value) in enumerate((scope or {}).items()):
+        if value is None:
+            clauses.append(f"{alias}.{col} IS NULL")
+        else:
+            clauses.append(f"{alias}.{col} = :scope_{i}")
+            params[f"scope_{i}"] = value
+    return "".join(f" AND {c}" for c in clauses), params
+
+
+def _flip_negative_positions(table_name: str, column: str, scope: Optional[dict]) -> None:
+    scope_sql, params = _scope_clause(scope, "t")
+    execute_update(
+        f"UPDATE {table_name} AS t SET {column} = -t.{column} WHERE t.{column} < 0{scope_sql}",
+        params,
+    )
+
+
+def execute_reorder(
+    table_name: str,
+    ids: list,
+    column: str = "sort_order",
+    start: int = 1,
+    scope: Optional[dict] = None,
+    id_type: str = "uuid",
+    unique: bool = False,
+) -> int:
+    """
+    Set `column` to start, start+1, ... following the order of ids, in one
+    `UPDATE ... FROM unnest(ids, positions)` statement.
+
+    scope restricts the update to rows of one parent (e.g. {"call_sheet_id": x})
+    so ids from another collection are ignored. If an id repeats, its last
+    position wins. Returns the number of rows updated.
+
+    Postgres checks a plain UNIQUE (parent, column) index row by row, so a
+    single renumbering UPDATE can collide with itself; unique=True writes
+    negated positions first and flips them in a second statement.
+    """
+    positions = {}
+    for index, row_id in enumerate(ids):
+        positions[str(row_id)] = start + index
+    if not positions:
+        return 0
+
+    scope_sql, params = _scope_clause(scope, "t")
+    sign = "-" if unique else ""
+    count = execute_update(
+        f"""
+        UPDATE {table_name} AS t
+        SET {column} = {sign}v.position
+        FROM unnest(CAST(:ids AS {id_type}[]), CAST(:positions AS int[])) AS v(id, position)
+        WHERE t.id = v.id{scope_sql}
+        """,
+        {"ids": list(positions), "positions": list(positions.values()), **params},
+    )
+    if unique:
+        _flip_negative_positions(table_name, column, scope)
+    return count
+
+
+def execute_recompact(
+    table_name: str,
+    scope: dict,
+    column: str = "sort_order",
+    start: int = 1,
+    unique: bool = False,
+) -> int:
+    """
+    Renumber `column` within scope to start, start+1, ... keeping the current
+    order (gaps and duplicates removed), in one statement. Rows already in
+    place aren't rewritten. Returns the number of rows updated.
+
+    unique=True: as in execute_reorder, for columns under a UNIQUE index.
+    """
+    scope_sql, params = _scope_clause(scope, "s")
+    sign = "-" if unique else ""
+    count = execute_update(
+        f"""
+        UPDATE {table_name} AS t
+        SET {column} = {sign}r.position
+        FROM (
+            SELECT s.id, ROW_NUMBER() OVER (ORDER BY s.{column}, s.id) + :start - 1 AS position
+            FROM {table_name} s
+            WHERE TRUE{scope_sql}
+        ) r
+        WHERE t.id = r.id AND t.{column} IS DISTINCT FROM r.position
+        """,
+        {"start": start, **params},
+    )
+    if unique and count:
+        _flip_negative_positions(table_name, column, scope)
+    return count
+
+
+# ============================================================================
+# Keyset pagination
+# ============================================================================
+#
+# OFFSET pages get slower the deeper they go (every skipped row is read), and
+# shift when rows are inserted. Keyset pages seek past the last row instead:
+# ORDER BY sort, id and WHERE (sort, id) > (last sort, last id), which an index
+# on (sort, id) serves in constant time. Callers fetch limit + 1 rows and hand
+# them to keyset_page() for the page and its opaque next cursor.
+
+# "estimated" counts run an exact COUNT below this many planned rows
+EXACT_COUNT_THRESHOLD = 1000
+
+
+def encode_cursor(sort_key, row_id, **extra) -> str:
+    """Opaque cursor for the row a page ended on (extra: caller-checked tags)."""
+    payload = json.dumps({"k": sort_key, "id": str(row_id), **extra}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor from encode_cursor(). Raises ValueError when malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(data, dict) or "k" not in data or not isinstance(data.get("id"), str):
+            raise ValueError("not a cursor")
+        return data
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"invalid cursor: {e}") from e
+
+
+def keyset_condition(
+    sort_column: str,
+    id_column: str,
+    cursor: dict,
+    desc: bool = False,
+    nullable: bool = False,
+) -> tuple:
+    """
+    Seek predicate for rows after a decoded cursor in
+    `ORDER BY sort_column <dir>, id_column <dir>`. Returns (sql, params).
+
+    The plain form is a row comparison an index on (sort, id) can seek on. A
+    nullable sort column needs the expanded form, following Postgres' default
+    placement of NULLs (last ascending, first descending).
+    """
+    op = "<" if desc else ">"
+    params = {"cursor_key": cursor["k"], "cursor_id": cursor["id"]}
+    if not nullable:
+        return f"({sort_column}, {id_column}) {op} (:cursor_key, :cursor_id)", params
+
+    tie = f"{id_column} {op} :cursor_id"
+    if cursor["k"] is None:
+        del params["cursor_key"]
+        if desc:
+            return f"({sort_column} IS NOT NULL OR {tie})", params
+        return f"({sort_column} IS NULL AND {tie})", params
+    after_key = (
+        f"{sort_column} {op} :cursor_key OR ({sort_column} = :cursor_key AND {tie})"
+    )
+    if desc:
+        return f"({after_key})", params
+    return f"({after_key} OR {sort_column} IS NULL)", params
+
+
+def keyset_page(rows: list, limit: int, sort_field: str, id_field: str = "id", **extra) -> tuple:
+    """
+    Split limit + 1 fetched rows into (page, next_cursor). next_cursor is
+    None on the last page; extra is stored in the cursor as encode_cursor().
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last.get(sort_field), last[id_field], **extra)
+
+
+def _plan_rows(plan) -> int:
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_count(query: Union[str, TextClause], params: dict = None) -> int:
+    """
+    Planner's row estimate for a query (EXPLAIN only; nothing is executed).
+    Unfiltered scans come straight from pg_class.reltuples, so this is as
+    cheap as it gets but only as fresh as the last ANALYZE.
+    """
+    query = _as_text(query)
+    row = execute_single(text("EXPLAIN (FORMAT JSON) " + query.text), params)
+    return _plan_rows(row["QUERY PLAN"]) if row else 0
+
+
+def count_rows(query: str, params: dict = None, mode: str = "exact") -> Optional[int]:
+    """
+    Row count of a SELECT (no ORDER BY / LIMIT) in the given mode:
+    - exact     : COUNT(*)
+    - planned   : estimate_count()
+    - estimated : planned, but exact when under EXACT_COUNT_THRESHOLD rows
+    - none      : skipped, returns None
+    """
+    if mode == "none":
+        return None
+    if mode in ("planned", "estimated"):
+        planned = estimate_count(query, params)
+        if mode == "planned" or planned >= EXACT_COUNT_THRESHOLD:
+            return planned
+    row = execute_single(f"SELECT COUNT(*) AS cnt FROM ({query}) _counted", params)
+    return row["cnt"] if row else 0
+
+
+# ============================================================================
+# Async engine (asyncpg) - awaitable helpers for the FastAPI request path
+# ============================================================================
+#
+# The sync helpers above block the event loop for the full DB round-trip, so
+# one slow query inside an `async def` route stalls every other request on the
+# worker. The helpers below run on a native asyncio engine instead.
+#
+# NOTE: asyncpg is strict about parameter types - pass datetime/date objects
+# (not ISO strings) for timestamp columns. UUIDs may be passed as str.
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def _get_async_database_url():
+    """Rewrite the sync DATABASE_URL for the asyncpg driver."""
+    url = make_url(_get_database_url())
+    query = dict(url.query)
+    # asyncpg takes `ssl`, not libpq's `sslmode`
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return url.set(drivername="postgresql+asyncpg", query=query)
+
+
+def _get_async_engine():
+    """Get or create the async SQLAlchemy engine (lazy initialization)."""
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        is_lambda = os.getenv('AWS_LAMBDA_FUNCTION_NAME') is not None
+        pool_mode = _get_pool_mode()
+
+        engine_kwargs = {
+            "echo": os.getenv('DEBUG', 'false').lower() == 'true',
+        }
+
+        if pool_mode == "proxy":
+            # The asyncpg driver prepares every statement; unique names keep
+            # them from colliding on shared server connections, and a zero
+            # cache means none is reused in a later transaction
+            engine_kwargs["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+        elif not _prepared_statements_enabled():
+            # asyncpg prepares every statement and caches it per connection
+            engine_kwargs["connect_args"] = {"prepared_statement_cache_size": 0}
+
+        if is_lambda or pool_mode == "null":
+            # asyncpg connections are bound to the event loop that opened them,
+            # and Mangum may not reuse the loop between invocations
+            engine_kwargs["poolclass"] = NullPool
+        else:
+            engine_kwargs.update({
+                "pool_size": 5,
+                "max_overflow": 10,
+                "pool_timeout": 30,
+                "pool_recycle": 1800,
+            })
+
+        _async_engine = create_async_engine(_get_async_database_url(), **engine_kwargs)
+        _register_stats_listeners(_async_engine.sync_engine)
+
+    return _async_engine
+
+
+def _get_async_session_local():
+    """Get or create the async session factory (lazy initialization)."""
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _AsyncSessionLocal
+
+
+def get_async_engine():
+    """Get the async SQLAlchemy engine (lazy-initialized)."""
+    return _get_async_engine()
+
+
+@asynccontextmanager
+async def get_async_db_session() -> AsyncGenerator:
+    """
+    Async context manager for database sessions.
+    Commits on success, rolls back on error.
+    """
+    AsyncSessionLocal = _get_async_session_local()
+    db = AsyncSessionLocal()
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+
+def _async_text(query: Union[str, TextClause], params: dict):
+    """
+    Build a text() clause for the async driver.
+
+    psycopg2 renders a tuple parameter as `(a, b, c)` so `col IN :ids` works
+    with the sync helpers. asyncpg sends real bind parameters, so tuple values
+    are marked as expanding bind params to keep the same call convention.
+    """
+    stmt = _as_text(query)
+    expanding = [k for k, v in params.items() if isinstance(v, tuple)]
+    if expanding:
+        stmt = stmt.bindparams(*[bindparam(k, expanding=True) for k in expanding])
+    return stmt
+
+
+async def aexecute_query(query: str, params: dict = None) -> list:
+    """
+    Execute a raw SQL query on the async engine and return results.
+    """
+    params = params or {}
+    async with get_async_db_session() as db:
+        result = await db.execute(_async_text(query, params), params)
+        return [_convert_row(dict(row._mapping)) for row in result.fetchall()]
+
+
+async def aexecute_single(query: str, params: dict = None) -> dict:
+    """
+    Execute a query on the async engine and return a single result.
+    """
+    params = params or {}
+    async with get_async_db_session() as db:
+        result = await db.execute(_async_text(query, params), params)
+        row = result.fetchone()
+        return _convert_row(dict(row._mapping)) if row else None
+
+
+async def aexecute_insert(query: str, params: dict = None) -> dict:
+    """
+    Execute an INSERT query on the async engine and return the inserted row.
+    """
+    params = params or {}
+    async with get_async_db_session() as db:
+        result = await db.execute(_async_text(query, params), params)
+        row = result.fetchone()
+        return _convert_row(dict(row._mapping)) if row else None
+
+
+async def aexecute_update(query: str, params: dict = None) -> int:
+    """
+    Execute an UPDATE query on the async engine and return the number of affected rows.
+    """
+    params = params or {}
+    async with get_async_db_session() as db:
+        result = await db.execute(_async_text(query, params), params)
+        return result.rowcount
+
+
+async def aexecute_delete(query: str, params: dict = None) -> int:
+    """
+    Execute a DELETE query on the async engine and return the number of affected rows.
+    """
+    params = params or {}
+    async with get_async_db_session() as db:
+        result = await db.execute(_async_text(query, params), params)
+        return result.rowcount
+
+
 def test_connection() -> bool:
     """
     Test the database connection.
@@ -201,6 +951,204 @@ def test_connection() -> bool:
         return False
 
 
+# ============================================================================
+# Schema catalog (FK targets for embedded joins)
+# ============================================================================
+
+class SchemaCatalog:
+    """Tables, columns and single-column foreign keys in the public schema."""
+
+    def __init__(self, tables=None, columns=None, foreign_keys=None):
+        self.tables = tables or set()
+        self.columns = columns or set()  # {(table, column)}
+        self.foreign_keys = foreign_keys or {}  # {(table, column): referenced_table}
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self.tables)
+
+    def fk_columns_to(self, table_name: str, target_table: str) -> list:
+        """FK columns on table_name that reference target_table."""
+        return [
+            col for (tbl, col), target in self.foreign_keys.items()
+            if tbl == table_name and target == target_table
+        ]
+
+
+_schema_catalog: Optional[SchemaCatalog] = None
+
+
+def load_schema_catalog() -> SchemaCatalog:
+    """
+    (Re)load the schema catalog from pg_catalog and cache it for the process.
+
+    Reads pg_catalog rather than information_schema: same data, but the
+    information_schema views are much slower on a schema this size. On
+    failure an empty catalog is cached and embeds fall back to heuristics.
+    """
+    global _schema_catalog
+    try:
+        column_rows = execute_query("""
+            SELECT c.relname AS table_name, a.attname AS column_name
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            JOIN pg_attribute a ON a.attrelid = c.oid
+            WHERE n.nspname = 'public'
+              AND c.relkind IN ('r', 'p', 'v', 'm')
+              AND a.attnum > 0
+              AND NOT a.attisdropped
+        """, {})
+        fk_rows = execute_query("""
+            SELECT cl.relname AS table_name, att.attname AS column_name, fcl.relname AS foreign_table
+            FROM pg_constraint con
+            JOIN pg_class cl ON cl.oid = con.conrelid
+            JOIN pg_namespace ns ON ns.oid = cl.relnamespace
+            JOIN pg_class fcl ON fcl.oid = con.confrelid
+            JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = con.conkey[1]
+            WHERE con.contype = 'f'
+              AND array_length(con.conkey, 1) = 1
+              AND ns.nspname = 'public'
+        """, {})
+        _schema_catalog = SchemaCatalog(
+            tables={r["table_name"] for r in column_rows},
+            columns={(r["table_name"], r["column_name"]) for r in column_rows},
+            foreign_keys={(r["table_name"], r["column_name"]): r["foreign_table"] for r in fk_rows},
+        )
+    except Exception as e:
+        print(f"Warning: schema catalog load failed, embedded joins use heuristics: {e}")
+        _schema_catalog = SchemaCatalog()
+    return _schema_catalog
+
+
+def get_schema_catalog() -> SchemaCatalog:
+    """Get the cached schema catalog, loading it on first use."""
+    if _schema_catalog is None:
+        return load_schema_catalog()
+    return _schema_catalog
+
+
+# Embed shapes whose inlined query failed once; they use follow-up queries
+_inline_embed_failures: set = set()
+
+
+# ============================================================================
+# Compiled query cache (Supabase-compat builder)
+# ============================================================================
+
+QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "512"))
+
+
+class QueryCache:
+    """
+    Thread-safe LRU of builder queries compiled to TextClause, keyed on shape.
+
+    A shape key carries everything that changes the SQL text (table, select
+    columns, inlined embeds, filter columns and operators, OR clause shape,
+    order, whether limit/offset are set) and none of the values, which are
+    always bound parameters. Repeat calls with the same shape skip string
+    building and hand SQLAlchemy the same clause object.
+    """
+
+    def __init__(self, maxsize: int = QUERY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: tuple, build: Callable[[], str]) -> TextClause:
+        with self._lock:
+            stmt = self._entries.get(key)
+            if stmt is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return stmt
+            self.misses += 1
+
+        stmt = text(build())
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = stmt
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return stmt
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_query_cache = QueryCache()
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _parse_select(columns: str) -> tuple:
+    """
+    Parse a Supabase-style select string into (clean_columns, embedded_joins).
+
+    Memoized: select strings are literals at the call sites, so the regexes
+    run once per distinct string per process.
+    """
+    import re
+    embedded_joins = []
+
+    # Pattern to match embedded joins: alias:table_or_fk(columns) or alias:table!fk_column(columns)
+    pattern = r'(\w+):(\w+)(?:!(\w+))?\(([^)]+)\)'
+
+    # Find all embedded joins
+    for match in re.finditer(pattern, columns):
+        alias = match.group(1)
+        table_or_fk = match.group(2)
+        fk_column = match.group(3)  # May be None if not specified
+        cols = match.group(4)
+        # Store as tuple: (alias, table_name, fk_column, select_cols)
+        embedded_joins.append((alias, table_or_fk, fk_column, cols.strip()))
+
+    # Remove embedded joins from the select columns
+    clean_cols = re.sub(pattern, '', columns)
+    # Clean up extra commas and whitespace - repeat until no changes
+    prev = None
+    while prev != clean_cols:
+        prev = clean_cols
+        clean_cols = re.sub(r',\s*,', ',', clean_cols)  # multiple commas -> single
+    clean_cols = re.sub(r',\s*$', '', clean_cols)  # trailing comma
+    clean_cols = re.sub(r'^\s*,', '', clean_cols)  # leading comma
+    clean_cols = clean_cols.strip().rstrip(',').strip()  # final cleanup
+
+    return (clean_cols if clean_cols else "*"), tuple(embedded_joins)
+
+
+def get_query_cache_stats() -> dict:
+    """Hit/miss counters for the builder query cache and the select-string parser."""
+    stats = _query_cache.stats()
+    select_info = _parse_select.cache_info()
+    stats["select_parse"] = {
+        "size": select_info.currsize,
+        "hits": select_info.hits,
+        "misses": select_info.misses,
+    }
+    return stats
+
+
+def clear_query_cache():
+    """Drop compiled builder queries (e.g. after a migration renames columns)."""
+    _query_cache.clear()
+    _parse_select.cache_clear()
+
+
 # Compatibility layer for Supabase-style queries
 class DatabaseTable:
     """
@@ -220,6 +1168,7 @@ class DatabaseTable:
         self._offset = None
         self._single = False
         self._count_mode = None
+        self._keyset = None  # (id_column, decoded cursor or None) - see after()
         self._embedded_joins = []  # List of (alias, foreign_key_or_table, columns)
 
     def _parse_select_columns(self, columns: str):
@@ -227,37 +1176,13 @@ class DatabaseTable:
         Parse Supabase-style select string and extract embedded joins.
         Format: "*, alias:foreign_key(col1, col2)" or "*, alias:table_name!fk_column(col1, col2)"
         """
-        import re
-        self._embedded_joins = []
-
-        # Pattern to match embedded joins: alias:table_or_fk(columns) or alias:table!fk_column(columns)
-        pattern = r'(\w+):(\w+)(?:!(\w+))?\(([^)]+)\)'
-
-        # Find all embedded joins
-        for match in re.finditer(pattern, columns):
-            alias = match.group(1)
-            table_or_fk = match.group(2)
-            fk_column = match.group(3)  # May be None if not specified
-            cols = match.group(4)
-            # Store as tuple: (alias, table_name, fk_column, select_cols)
-            self._embedded_joins.append((alias, table_or_fk, fk_column, cols.strip()))
-
-        # Remove embedded joins from the select columns
-        clean_cols = re.sub(pattern, '', columns)
-        # Clean up extra commas and whitespace - repeat until no changes
-        prev = None
-        while prev != clean_cols:
-            prev = clean_cols
-            clean_cols = re.sub(r',\s*,', ',', clean_cols)  # multiple commas -> single
-        clean_cols = re.sub(r',\s*$', '', clean_cols)  # trailing comma
-        clean_cols = re.sub(r'^\s*,', '', clean_cols)  # leading comma
-        clean_cols = clean_cols.strip().rstrip(',').strip()  # final cleanup
-
-        return clean_cols if clean_cols else "*"
+        clean_cols, embedded_joins = _parse_select(columns)
+        self._embedded_joins = list(embedded_joins)
+        return clean_cols
 
     def select(self, columns: str = "*", count: str = None):
         self._select_cols = self._parse_select_columns(columns)
-        self._count_mode = count  # "exact" for Supabase compatibility
+        self._count_mode = count  # "exact" / "planned" / "estimated", as in Supabase
         return self
 
     def eq(self, column: str, value):
@@ -327,6 +1252,16 @@ class DatabaseTable:
         self._offset = count
         return self
 
+    def after(self, cursor: Optional[str], id_column: str = "id"):
+        """
+        Keyset pagination on the order() column: id_column is added as a
+        tiebreaker and, given a cursor from keyset_page(), only rows after it
+        are returned. Fetch limit(n + 1) and pass the rows to keyset_page().
+        The order column must not be NULL. Raises ValueError on a bad cursor.
+        """
+        self._keyset = (id_column, decode_cursor(cursor) if cursor else None)
+        return self
+
     def _parse_or_conditions(self, or_string: str, params: dict, start_idx: int) -> tuple:
         """
         Parse Supabase PostgREST-style OR conditions.
@@ -380,22 +1315,91 @@ class DatabaseTable:
 
         return conditions, params, idx
 
-    def _build_query(self) -> tuple:
-        query = f"SELECT {self._select_cols} FROM {self.table_name}"
+    def _embed_shape(self) -> tuple:
+        return (self.table_name, tuple(self._embedded_joins))
+
+    def _plan_embeds(self, allow_inline: bool = True) -> tuple:
+        """
+        Split embedded joins into (inline, follow_up) lists of resolved specs.
+
+        An embed is inlined when the schema catalog confirms both the FK
+        column on this table and the target table; anything else keeps the
+        follow-up `WHERE id IN :ids` query.
+        """
+        catalog = get_schema_catalog()
+        inline, follow_up = [], []
+        allow_inline = (
+            allow_inline
+            and catalog.loaded
+            and self._embed_shape() not in _inline_embed_failures
+        )
+        for join_tuple in self._embedded_joins:
+            spec = self._resolve_join_target(join_tuple)
+            _, target_table, fk_column, _ = spec
+            if (
+                allow_inline
+                and (self.table_name, fk_column) in catalog.columns
+                and target_table in catalog.tables
+            ):
+                inline.append(spec)
+            else:
+                follow_up.append(spec)
+        return inline, follow_up
+
+    def _inline_embed_columns(self, inline: list) -> str:
+        """
+        Compile inlined embeds into correlated scalar subqueries.
+
+        Scalar subqueries (rather than joins) keep the outer FROM clause
+        unchanged, so unqualified filter/order columns stay unambiguous.
+        Each embed comes back as one jsonb column named __embed_<n>.
+        """
+        exprs = []
+        for i, (alias, target_table, fk_column, cols) in enumerate(inline):
+            exprs.append(
+                f"(SELECT to_jsonb(_e{i}) FROM ("
+                f"SELECT id, {cols} FROM {target_table} _t{i} "
+                f"WHERE _t{i}.id = {self.table_name}.{fk_column} LIMIT 1"
+                f") _e{i}) AS __embed_{i}"
+            )
+        return ", ".join(exprs)
+
+    @staticmethod
+    def _unpack_inline_embeds(results: list, inline: list) -> list:
+        """Move __embed_<n> columns onto their aliases (same shape as follow-up joins)."""
+        for r in results:
+            for i, (alias, _, _, _) in enumerate(inline):
+                value = r.pop(f"__embed_{i}", None)
+                if isinstance(value, str):
+                    # asyncpg returns jsonb as text
+                    value = json.loads(value)
+                r[alias] = value
+        return results
+
+    def _filter_conditions(self, params: dict) -> list:
+        """Add filter values to params and return the WHERE conditions."""
+        conditions = []
+        for i, (col, op, val) in enumerate(self._filters):
+            param_name = f"p{i}"
+            if op == "IS" and val is None:
+                conditions.append(f"{col} IS NULL")
+            elif op == "IN":
+                params[param_name] = tuple(val)
+                conditions.append(f"{col} IN :{param_name}")
+            else:
+                params[param_name] = val
+                conditions.append(f"{col} {op} :{param_name}")
+        return conditions
+
+    def _build_query(self, inline: list = None) -> tuple:
+        """
+        Return (TextClause, params) for the main SELECT.
+
+        Values are always bound (limit/offset included), so the SQL text
+        depends only on the query shape and comes from the query cache.
+        """
         params = {}
-        all_conditions = []
-
-        if self._filters:
-            for i, (col, op, val) in enumerate(self._filters):
-                param_name = f"p{i}"
-                if op == "IS" and val is None:
-                    all_conditions.append(f"{col} IS NULL")
-                elif op == "IN":
-                    params[param_name] = tuple(val)
-                    all_conditions.append(f"{col} IN :{param_name}")
-                else:
-                    params[param_name] = val
-                    all_conditions.append(f"{col} {op} :{param_name}")
+        all_conditions = self._filter_conditions(params)
 
         # Handle OR conditions
         if self._or_conditions:
@@ -405,80 +1409,145 @@ class DatabaseTable:
             if or_conditions:
                 all_conditions.append(f"({' OR '.join(or_conditions)})")
 
-        if all_conditions:
-            query += " WHERE " + " AND ".join(all_conditions)
-
-        if self._order_by:
-            direction = "DESC" if self._order_desc else "ASC"
-            query += f" ORDER BY {self._order_by} {direction}"
+        keyset_id = None
+        if self._keyset:
+            if not self._order_by:
+                raise ValueError("after() needs an order() column")
+            keyset_id, cursor = self._keyset
+            if cursor:
+                condition, cursor_params = keyset_condition(
+                    self._order_by, keyset_id, cursor, desc=self._order_desc
+                )
+                all_conditions.append(condition)
+                params.update(cursor_params)
 
         if self._limit:
-            query += f" LIMIT {self._limit}"
-
+            params["_limit"] = self._limit
         if self._offset:
-            query += f" OFFSET {self._offset}"
+            params["_offset"] = self._offset
+
+        key = (
+            "select", self.table_name, self._select_cols, tuple(inline or ()),
+            tuple(all_conditions), self._order_by, self._order_desc, keyset_id,
+            bool(self._limit), bool(self._offset),
+        )
+
+        def build() -> str:
+            select_cols = self._select_cols
+            if inline:
+                select_cols = f"{select_cols}, {self._inline_embed_columns(inline)}"
+            query = f"SELECT {select_cols} FROM {self.table_name}"
+
+            if all_conditions:
+                query += " WHERE " + " AND ".join(all_conditions)
+
+            if self._order_by:
+                direction = "DESC" if self._order_desc else "ASC"
+                query += f" ORDER BY {self._order_by} {direction}"
+                if keyset_id:
+                    query += f", {keyset_id} {direction}"
 
-        return query, params
+            if self._limit:
+                query += " LIMIT :_limit"
 
-    def _resolve_embedded_joins(self, results: list) -> list:
+            if self._offset:
+                query += " OFFSET :_offset"
+
+            return query
+
+        return _query_cache.get_or_build(key, build), params
+
+    def _resolve_join_target(self, join_tuple: tuple) -> tuple:
         """
-        Fetch related data for embedded joins and attach to results.
+        Resolve an embedded join spec to (alias, target_table, fk_column, cols).
         Supports formats:
         - alias:foreign_key(columns) where foreign_key ends with _id
         - alias:table_name!fk_column(columns) with explicit FK column
-        """
-        if not self._embedded_joins or not results:
-            return results
+        - alias:table_name(columns)
 
-        for join_tuple in self._embedded_joins:
-            # Handle both 3-tuple (old) and 4-tuple (new) formats
-            if len(join_tuple) == 4:
-                alias, table_or_fk, explicit_fk_col, cols = join_tuple
-            else:
-                alias, table_or_fk, cols = join_tuple
-                explicit_fk_col = None
-
-            # Determine the foreign key column and target table
-            if explicit_fk_col:
-                # Explicit format: production_day:backlot_production_days!production_day_id(cols)
-                target_table = table_or_fk
-                fk_column = explicit_fk_col
-            elif table_or_fk.endswith("_id"):
-                # foreign_key pattern: profile:user_id(name) -> profiles table via user_id column
-                fk_column = table_or_fk
-                # Derive table name from foreign key (user_id -> users, profile_id -> profiles)
-                # Common patterns in this codebase
-                if fk_column == "user_id":
-                    target_table = "profiles"
-                elif fk_column == "call_sheet_id":
-                    target_table = "backlot_call_sheets"
-                elif fk_column == "task_list_id":
-                    target_table = "backlot_task_lists"
-                elif fk_column == "timecard_id":
-                    target_table = "backlot_timecards"
-                elif fk_column == "label_id":
-                    target_table = "backlot_task_labels"
-                elif fk_column == "scene_id":
-                    target_table = "backlot_scenes"
-                elif fk_column == "production_day_id":
-                    target_table = "backlot_production_days"
-                elif fk_column == "project_id":
-                    target_table = "backlot_projects"
-                elif fk_column == "created_by":
-                    target_table = "profiles"
-                    fk_column = "created_by"
-                elif fk_column == "assigned_to":
-                    target_table = "profiles"
-                    fk_column = "assigned_to"
-                else:
-                    # Generic: remove _id suffix and pluralize
-                    base = fk_column.replace("_id", "")
-                    target_table = base + "s" if not base.endswith("s") else base
+        Uses the schema catalog's foreign keys when available, falling back
+        to naming heuristics.
+        """
+        # Handle both 3-tuple (old) and 4-tuple (new) formats
+        if len(join_tuple) == 4:
+            alias, table_or_fk, explicit_fk_col, cols = join_tuple
+        else:
+            alias, table_or_fk, cols = join_tuple
+            explicit_fk_col = None
+
+        catalog = get_schema_catalog()
+        if not explicit_fk_col and catalog.loaded:
+            fk_target = catalog.foreign_keys.get((self.table_name, table_or_fk))
+            if fk_target:
+                # alias:fk_column(cols) with a real FK constraint
+                return alias, fk_target, table_or_fk, cols
+            fk_columns = catalog.fk_columns_to(self.table_name, table_or_fk)
+            if len(fk_columns) == 1:
+                # alias:table_name(cols) with exactly one FK to that table
+                return alias, table_or_fk, fk_columns[0], cols
+
+        # Determine the foreign key column and target table
+        if explicit_fk_col:
+            # Explicit format: production_day:backlot_production_days!production_day_id(cols)
+            target_table = table_or_fk
+            fk_column = explicit_fk_col
+        elif table_or_fk.endswith("_id"):
+            # foreign_key pattern: profile:user_id(name) -> profiles table via user_id column
+            fk_column = table_or_fk
+            # Derive table name from foreign key (user_id -> users, profile_id -> profiles)
+            # Common patterns in this codebase
+            if fk_column == "user_id":
+                target_table = "profiles"
+            elif fk_column == "call_sheet_id":
+                target_table = "backlot_call_sheets"
+            elif fk_column == "task_list_id":
+                target_table = "backlot_task_lists"
+            elif fk_column == "timecard_id":
+                target_table = "backlot_timecards"
+            elif fk_column == "label_id":
+                target_table = "backlot_task_labels"
+            elif fk_column == "scene_id":
+                target_table = "backlot_scenes"
+            elif fk_column == "production_day_id":
+                target_table = "backlot_production_days"
+            elif fk_column == "project_id":
+                target_table = "backlot_projects"
+            elif fk_column == "created_by":
+                target_table = "profiles"
+                fk_column = "created_by"
+            elif fk_column == "assigned_to":
+                target_table = "profiles"
+                fk_column = "assigned_to"
             else:
-                # Direct table reference: profile:profiles(name)
-                target_table = table_or_fk
-                fk_column = table_or_fk + "_id"  # Assume standard FK naming
+                # Generic: remove _id suffix and pluralize
+                base = fk_column.replace("_id", "")
+                target_table = base + "s" if not base.endswith("s") else base
+        else:
+            # Direct table reference: profile:profiles(name)
+            target_table = table_or_fk
+            fk_column = table_or_fk + "_id"  # Assume standard FK naming
+
+        return alias, target_table, fk_column, cols
+
+    @staticmethod
+    def _attach_related(results: list, alias: str, fk_column: str, related_results: list) -> None:
+        """Attach fetched related rows to results under `alias`."""
+        related_by_id = {str(rr["id"]): rr for rr in related_results}
+        for r in results:
+            fk_val = str(r.get(fk_column, ""))
+            r[alias] = related_by_id.get(fk_val)
+
+    def _resolve_embedded_joins(self, results: list, specs: list = None) -> list:
+        """
+        Fetch related data for follow-up (non-inlined) embedded joins and
+        attach to results. See _resolve_join_target for the supported formats.
+        """
+        if specs is None:
+            specs = [self._resolve_join_target(j) for j in self._embedded_joins]
+        if not specs or not results:
+            return results
 
+        for alias, target_table, fk_column, cols in specs:
             # Collect all foreign key values
             fk_values = list(set(
                 str(r.get(fk_column)) for r in results
@@ -495,7 +1564,6 @@ class DatabaseTable:
             related_query = f"SELECT id, {cols} FROM {target_table} WHERE id IN :ids"
             try:
                 related_results = execute_query(related_query, {"ids": tuple(fk_values)})
-                related_by_id = {str(rr["id"]): rr for rr in related_results}
             except Exception as e:
                 # If query fails, set alias to None
                 print(f"Warning: embedded join for {alias} failed: {e}")
@@ -503,47 +1571,171 @@ class DatabaseTable:
                     r[alias] = None
                 continue
 
-            # Attach related data to results
-            for r in results:
-                fk_val = str(r.get(fk_column, ""))
-                r[alias] = related_by_id.get(fk_val)
+            self._attach_related(results, alias, fk_column, related_results)
 
         return results
 
-    def execute(self):
-        query, params = self._build_query()
+    async def _aresolve_embedded_joins(self, results: list, specs: list = None) -> list:
+        """Async variant of _resolve_embedded_joins."""
+        if specs is None:
+            specs = [self._resolve_join_target(j) for j in self._embedded_joins]
+        if not specs or not results:
+            return results
 
-        # Handle count mode (Supabase compatibility)
-        if self._count_mode == "exact":
+        for alias, target_table, fk_column, cols in specs:
+            # Keep native values (rows are already converted, so UUIDs are str):
+            # asyncpg binds each value with the column's type, so stringified
+            # integer keys would be rejected.
+            fk_values = list(set(
+                r.get(fk_column) for r in results
+                if r.get(fk_column) is not None
+            ))
+
+            if not fk_values:
+                for r in results:
+                    r[alias] = None
+                continue
+
+            related_query = f"SELECT id, {cols} FROM {target_table} WHERE id IN :ids"
+            try:
+                related_results = await aexecute_query(related_query, {"ids": tuple(fk_values)})
+            except Exception as e:
+                print(f"Warning: embedded join for {alias} failed: {e}")
+                for r in results:
+                    r[alias] = None
+                continue
+
+            self._attach_related(results, alias, fk_column, related_results)
+
+        return results
+
+    def _build_count_query(self, params: dict) -> TextClause:
+        """Build the COUNT(*) query for count="exact" (filters only, no OR/limit)."""
+        conditions = self._filter_conditions(params)
+
+        def build() -> str:
             count_query = f"SELECT COUNT(*) as cnt FROM {self.table_name}"
-            if self._filters:
-                conditions = []
-                for i, (col, op, val) in enumerate(self._filters):
-                    param_name = f"p{i}"
-                    if op == "IS" and val is None:
-                        conditions.append(f"{col} IS NULL")
-                    elif op == "IN":
-                        params[param_name] = tuple(val)
-                        conditions.append(f"{col} IN :{param_name}")
-                    else:
-                        params[param_name] = val
-                        conditions.append(f"{col} {op} :{param_name}")
+            if conditions:
                 count_query += " WHERE " + " AND ".join(conditions)
-            count_result = execute_single(count_query, params)
-            count_value = count_result["cnt"] if count_result else 0
-            results = execute_query(query, params)
-            results = self._resolve_embedded_joins(results)
+            return count_query
+
+        return _query_cache.get_or_build(("count", self.table_name, tuple(conditions)), build)
+
+    def _build_plan_query(self, params: dict) -> TextClause:
+        """EXPLAIN of the count query's scan, for count="planned"/"estimated"."""
+        conditions = self._filter_conditions(params)
+
+        def build() -> str:
+            query = f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {self.table_name}"
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            return query
+
+        return _query_cache.get_or_build(("plan", self.table_name, tuple(conditions)), build)
+
+    def _count(self) -> int:
+        """Row count for the select(count=...) mode (filters only, no OR/limit)."""
+        if self._count_mode in ("planned", "estimated"):
+            params = {}
+            row = execute_single(self._build_plan_query(params), params)
+            planned = _plan_rows(row["QUERY PLAN"]) if row else 0
+            if self._count_mode == "planned" or planned >= EXACT_COUNT_THRESHOLD:
+                return planned
+        params = {}
+        count_result = execute_single(self._build_count_query(params), params)
+        return count_result["cnt"] if count_result else 0
+
+    async def _acount(self) -> int:
+        """Async variant of _count."""
+        if self._count_mode in ("planned", "estimated"):
+            params = {}
+            row = await aexecute_single(self._build_plan_query(params), params)
+            planned = _plan_rows(row["QUERY PLAN"]) if row else 0
+            if self._count_mode == "planned" or planned >= EXACT_COUNT_THRESHOLD:
+                return planned
+        params = {}
+        count_result = await aexecute_single(self._build_count_query(params), params)
+        return count_result["cnt"] if count_result else 0
+
+    def _fetch(self, fetch, inline: list, follow_up: list) -> tuple:
+        """
+        Run the main query with `inline` embeds compiled in.
+
+        If the inlined version fails (e.g. an FK/id type mismatch that the
+        string-compared follow-up query tolerated), remember the shape and
+        retry with follow-up queries only.
+        Returns (rows_or_row, inlined_specs, follow_up_specs).
+        """
+        query, params = self._build_query(inline)
+        if not inline:
+            return fetch(query, params), [], follow_up
+        try:
+            return fetch(query, params), inline, follow_up
+        except Exception as e:
+            print(f"Warning: inline embedded joins on {self.table_name} failed, using follow-up queries: {e}")
+            _inline_embed_failures.add(self._embed_shape())
+            query, params = self._build_query()
+            return fetch(query, params), [], inline + follow_up
+
+    async def _afetch(self, fetch, inline: list, follow_up: list) -> tuple:
+        """Async variant of _fetch."""
+        query, params = self._build_query(inline)
+        if not inline:
+            return await fetch(query, params), [], follow_up
+        try:
+            return await fetch(query, params), inline, follow_up
+        except Exception as e:
+            print(f"Warning: inline embedded joins on {self.table_name} failed, using follow-up queries: {e}")
+            _inline_embed_failures.add(self._embed_shape())
+            query, params = self._build_query()
+            return await fetch(query, params), [], inline + follow_up
+
+    def execute(self):
+        inline, follow_up = self._plan_embeds() if self._embedded_joins else ([], [])
+
+        # Handle count mode (Supabase compatibility)
+        if self._count_mode:
+            count_value = self._count()
+            results, inlined, follow_up = self._fetch(execute_query, inline, follow_up)
+            results = self._unpack_inline_embeds(results, inlined)
+            results = self._resolve_embedded_joins(results, follow_up)
+            return type('Response', (), {'data': results, 'error': None, 'count': count_value})()
+
+        if self._single:
+            result, inlined, follow_up = self._fetch(execute_single, inline, follow_up)
+            if result and self._embedded_joins:
+                results = self._unpack_inline_embeds([result], inlined)
+                results = self._resolve_embedded_joins(results, follow_up)
+                result = results[0] if results else None
+            return type('Response', (), {'data': result, 'error': None, 'count': None})()
+        else:
+            results, inlined, follow_up = self._fetch(execute_query, inline, follow_up)
+            results = self._unpack_inline_embeds(results, inlined)
+            results = self._resolve_embedded_joins(results, follow_up)
+            return type('Response', (), {'data': results, 'error': None, 'count': None})()
+
+    async def aexecute(self):
+        """Async variant of execute() that runs on the asyncpg engine."""
+        inline, follow_up = self._plan_embeds() if self._embedded_joins else ([], [])
+
+        if self._count_mode:
+            count_value = await self._acount()
+            results, inlined, follow_up = await self._afetch(aexecute_query, inline, follow_up)
+            results = self._unpack_inline_embeds(results, inlined)
+            results = await self._aresolve_embedded_joins(results, follow_up)
             return type('Response', (), {'data': results, 'error': None, 'count': count_value})()
 
         if self._single:
-            result = execute_single(query, params)
+            result, inlined, follow_up = await self._afetch(aexecute_single, inline, follow_up)
             if result and self._embedded_joins:
-                results = self._resolve_embedded_joins([result])
+                results = self._unpack_inline_embeds([result], inlined)
+                results = await self._aresolve_embedded_joins(results, follow_up)
                 result = results[0] if results else None
             return type('Response', (), {'data': result, 'error': None, 'count': None})()
         else:
-            results = execute_query(query, params)
-            results = self._resolve_embedded_joins(results)
+            results, inlined, follow_up = await self._afetch(aexecute_query, inline, follow_up)
+            results = self._unpack_inline_embeds(results, inlined)
+            results = await self._aresolve_embedded_joins(results, follow_up)
             return type('Response', (), {'data': results, 'error': None, 'count': None})()
 
     def single(self):
@@ -559,12 +1751,19 @@ class DatabaseTable:
 
 
 class DatabaseInsertBuilder:
-    """Handles INSERT operations with Supabase-compatible API."""
+    """
+    Handles INSERT operations with Supabase-compatible API.
 
-    def __init__(self, table_name: str, data: dict | list):
+    List inserts compile to batched multi-row INSERTs. With
+    returning="minimal", inserts of COPY_THRESHOLD_ROWS or more rows stream
+    through COPY FROM STDIN instead.
+    """
+
+    def __init__(self, table_name: str, data: dict | list, returning: str = "representation"):
         self.table_name = table_name
         self.data = data if isinstance(data, list) else [data]
         self._returning = "*"
+        self._minimal = returning == "minimal"
 
     def _serialize_value(self, value):
         """Convert dict/list to appropriate PostgreSQL format."""
@@ -595,16 +1794,21 @@ class DatabaseInsertBuilder:
         return value
 
     def execute(self):
-        results = []
-        for row in self.data:
-            # Serialize any dict/list values to JSON
-            serialized_row = {k: self._serialize_value(v) for k, v in row.items()}
-            columns = ", ".join(serialized_row.keys())
-            placeholders = ", ".join([f":{k}" for k in serialized_row.keys()])
-            query = f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders}) RETURNING {self._returning}"
-            result = execute_insert(query, serialized_row)
-            if result:
-                results.append(result)
+        # Serialize any dict/list values to JSON / array literals
+        rows = [{k: self._serialize_value(v) for k, v in row.items()} for row in self.data]
+
+        if self._minimal:
+            if (
+                len(rows) >= COPY_THRESHOLD_ROWS
+                and all(row.keys() == rows[0].keys() for row in rows)
+                and copy_supported()
+            ):
+                execute_copy(self.table_name, rows)
+            else:
+                execute_insert_many(self.table_name, rows, returning=None)
+            return type('Response', (), {'data': [], 'error': None})()
+
+        results = execute_insert_many(self.table_name, rows, returning=self._returning)
         return type('Response', (), {'data': results, 'error': None})()
 
 
@@ -673,7 +1877,6 @@ class DatabaseUpdateBuilder:
             result = db.execute(text(query), params)
             # Fetch BEFORE commit - psycopg2 can close cursor after commit
             rows = [_convert_row(dict(row._mapping)) for row in result.fetchall()]
-            db.commit()
             return type('Response', (), {'data': rows, 'error': None})()
 
 
@@ -753,8 +1956,8 @@ class DatabaseUpsertBuilder:
 class DatabaseTableWithMutations(DatabaseTable):
     """Extended table class that supports insert, update, delete operations."""
 
-    def insert(self, data: dict | list):
-        return DatabaseInsertBuilder(self.table_name, data)
+    def insert(self, data: dict | list, returning: str = "representation"):
+        return DatabaseInsertBuilder(self.table_name, data, returning)
 
     def update(self, data: dict):
         return DatabaseUpdateBuilder(self.table_name, data)
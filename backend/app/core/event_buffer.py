@@ -0,0 +1,305 @@
+"""
+Write-behind buffer for high-frequency tracking events.
+
+Hot client loops (tracking pixels, view counters, player heartbeats) used to
+cost one INSERT/UPDATE round trip per hit. Endpoints now emit() an event and
+return; the buffer writes events in batches from a background thread when
+EVENT_BUFFER_MAX_EVENTS are pending or every EVENT_BUFFER_FLUSH_SECONDS.
+
+Each kind of event goes to a Sink:
+- append sinks keep every event (email opens) and write them
+  with one multi-row INSERT
+- keyed sinks coalesce events per key with merge() (latest heartbeat per
+  session, summed view counts per short) and write one row per key
+
+If the database is unreachable a batch is appended to a JSONL file under
+EVENT_BUFFER_SPILL_DIR (fsynced) and replayed, ahead of newer events, by the
+next flush that can reach it.
+If a batch is rejected for its data (bad id, FK violation) it is retried row
+by row so one bad event doesn't drop its neighbours.
+
+On Lambda the buffer is off by default (EVENT_BUFFER_ENABLED); when it is
+turned on, handler.py flushes it at the end of every invocation.
+
+Usage:
+    from app.core.event_buffer import Sink, event_buffer
+
+    event_buffer.register(Sink("short_counters", write=_write_counters,
+                               key=lambda e: e["short_id"], merge=_add_counts))
+    event_buffer.emit("short_counters", {"short_id": short_id, "views": 1, "shares": 0})
+
+Events must be JSON-serializable (they may be spilled to disk). Sinks
+should make replays safe (GREATEST on timestamps, additive counters).
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.exc import InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Raised when the database can't be reached (vs. rejecting the data)
+UNAVAILABLE_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError, ConnectionError)
+# Events per write() call; keeps VALUES lists well under the bind parameter cap
+MAX_BATCH = 1000
+
+
+@dataclass
+class Sink:
+    """Where one kind of event is written, and how it coalesces."""
+    name: str
+    write: Callable[[List[Dict[str, Any]]], Any]  # writes a batch of events
+    key: Optional[Callable[[Dict[str, Any]], Hashable]] = None  # None = append-only
+    merge: Optional[Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]] = None  # (pending, new) -> merged; default keeps new
+
+
+def utc_now() -> str:
+    """Event timestamp (ISO-8601, UTC); taken at emit time, not flush time."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def values_clause(
+    rows: Sequence[Dict[str, Any]],
+    columns: Sequence[str],
+    casts: Dict[str, str],
+    alias: str = "v",
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build `(VALUES (...), ...) AS v(col, ...)` with bound, typed parameters for
+    batched UPDATE ... FROM / INSERT ... SELECT statements.
+    """
+    params = {}
+    tuples = []
+    for i, row in enumerate(rows):
+        placeholders = []
+        for j, col in enumerate(columns):
+            name = f"{alias}{i}_{j}"
+            params[name] = row.get(col)
+            placeholders.append(f"CAST(:{name} AS {casts[col]})")
+        tuples.append(f"({', '.join(placeholders)})")
+    return f"(VALUES {', '.join(tuples)}) AS {alias}({', '.join(columns)})", params
+
+
+class EventBuffer:
+    """Process-wide pending events per sink, flushed in batches."""
+
+    def __init__(
+        self,
+        max_events: int = 1000,
+        flush_seconds: float = 2.0,
+        spill_dir: Optional[str] = None,
+        background: bool = True,
+    ):
+        self.max_events = max_events
+        self.flush_seconds = flush_seconds
+        self.spill_dir = spill_dir
+        self.background = background
+        self._sinks: Dict[str, Sink] = {}
+        self._pending: Dict[str, Any] = {}  # name -> list | OrderedDict
+        self._count = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_flush_at = time.monotonic()
+        self.stats = {
+            "emitted": 0, "coalesced": 0, "written": 0, "batches": 0,
+            "spilled": 0, "replayed": 0, "dropped": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+
+    def register(self, sink: Sink) -> Sink:
+        with self._lock:
+            self._sinks[sink.name] = sink
+            self._pending.setdefault(sink.name, OrderedDict() if sink.key else [])
+        return sink
+
+    def emit(self, name: str, event: Dict[str, Any]) -> None:
+        """Queue an event for its sink; never blocks on the database."""
+        sink = self._sinks[name]
+        with self._lock:
+            pending = self._pending[name]
+            self.stats["emitted"] += 1
+            if sink.key is None:
+                pending.append(event)
+                self._count += 1
+            else:
+                key = sink.key(event)
+                if key in pending:
+                    current = pending.pop(key)
+                    pending[key] = sink.merge(current, event) if sink.merge else event
+                    self.stats["coalesced"] += 1
+                else:
+                    pending[key] = event
+                    self._count += 1
+            due = (
+                self._count >= self.max_events
+                or time.monotonic() - self._last_flush_at >= self.flush_seconds
+            )
+
+        if self.background:
+            self._ensure_thread()
+            if due:
+                self._wake.set()
+        elif due:
+            self.flush()
+
+    def discard(self, name: str, key: Hashable) -> None:
+        """Drop a pending keyed event (e.g. a heartbeat made moot by a leave)."""
+        with self._lock:
+            if self._pending[name].pop(key, None) is not None:
+                self._count -= 1
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _take(self, names: Optional[Sequence[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        with self._lock:
+            taken = {}
+            for name in (names or list(self._pending)):
+                pending = self._pending[name]
+                if not pending:
+                    continue
+                events = list(pending.values()) if isinstance(pending, OrderedDict) else pending[:]
+                pending.clear()
+                self._count -= len(events)
+                taken[name] = events
+            self._last_flush_at = time.monotonic()
+            return taken
+
+    def flush(self, *names: str) -> int:
+        """Write pending events (of the given sinks, or all). Returns events written."""
+        with self._flush_lock:
+            written = 0
+            # Spilled batches go first so newer events land on top of them
+            if self.spill_dir:
+                written += self._replay_spills()
+            for name, events in self._take(names or None).items():
+                for start in range(0, len(events), MAX_BATCH):
+                    written += self._write(name, events[start:start + MAX_BATCH])
+            return written
+
+    def _write(self, name: str, events: List[Dict[str, Any]], spill: bool = True) -> int:
+        sink = self._sinks[name]
+        try:
+            sink.write(events)
+        except UNAVAILABLE_ERRORS as e:
+            if spill and self._spill(name, events):
+                logger.warning(f"Event buffer: database unavailable, spilled {len(events)} {name} events: {e}")
+            else:
+                self.stats["dropped"] += len(events)
+                logger.warning(f"Event buffer: dropped {len(events)} {name} events: {e}")
+            return 0
+        except Exception as e:
+            if len(events) == 1:
+                self.stats["dropped"] += 1
+                logger.warning(f"Event buffer: dropped {name} event {events[0]!r}: {e}")
+                return 0
+            # One bad event shouldn't sink the batch; isolate it
+            return sum(self._write(name, [event], spill) for event in events)
+        self.stats["written"] += len(events)
+        self.stats["batches"] += 1
+        return len(events)
+
+    def _spill(self, name: str, events: List[Dict[str, Any]]) -> bool:
+        if not self.spill_dir:
+            return False
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            path = os.path.join(self.spill_dir, f"{name}.{time.time_ns()}.{os.getpid()}.jsonl")
+            with open(path + ".tmp", "w") as f:
+                for event in events:
+                    f.write(json.dumps(event, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            logger.warning(f"Event buffer: spill to {self.spill_dir} failed: {e}")
+            return False
+        self.stats["spilled"] += len(events)
+        return True
+
+    def _replay_spills(self) -> int:
+        """Re-write spilled batches, oldest first; stop at the first that still fails."""
+        try:
+            files = sorted(
+                (f for f in os.listdir(self.spill_dir) if f.endswith(".jsonl")),
+                key=lambda f: int(f.split(".")[1]),
+            )
+        except OSError:
+            return 0
+
+        replayed = 0
+        for filename in files:
+            name = filename.split(".")[0]
+            if name not in self._sinks:
+                continue  # owned by a module this process hasn't imported
+            path = os.path.join(self.spill_dir, filename)
+            try:
+                with open(path) as f:
+                    events = [json.loads(line) for line in f if line.strip()]
+            except (OSError, ValueError) as e:
+                logger.warning(f"Event buffer: unreadable spill file {path}: {e}")
+                continue
+            try:
+                self._sinks[name].write(events)
+            except UNAVAILABLE_ERRORS:
+                break
+            except Exception:
+                self._write(name, events, spill=False)
+            os.remove(path)
+            replayed += len(events)
+            self.stats["replayed"] += len(events)
+        return replayed
+
+    # ------------------------------------------------------------------
+    # Background flusher
+    # ------------------------------------------------------------------
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="event-buffer-flush", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        # Runs outside any request context, so writes never join a request's
+        # unit of work
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Event buffer flush failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = {name: len(events) for name, events in self._pending.items()}
+        return {**self.stats, "pending": pending, "sinks": sorted(self._sinks)}
+
+
+event_buffer = EventBuffer(
+    # Disabled: every emit flushes inline, i.e. write-through
+    max_events=settings.EVENT_BUFFER_MAX_EVENTS if settings.EVENT_BUFFER_ENABLED else 1,
+    flush_seconds=settings.EVENT_BUFFER_FLUSH_SECONDS,
+    spill_dir=settings.EVENT_BUFFER_SPILL_DIR or None,
+    background=settings.EVENT_BUFFER_ENABLED,
+)
+
+atexit.register(event_buffer.flush)
@@ -334,6 +334,7 @@ def log_request_end(
     duration_ms: float,
     error: Optional[str] = None,
     cold_start: Optional[bool] = None,
+    db_stats: Optional[Dict[str, int]] = None,
 ) -> None:
     """
     Log the completion of a request with timing and cold start info.
@@ -345,6 +346,7 @@ def log_request_end(
         duration_ms: Request duration in milliseconds
         error: Optional error message
         cold_start: Whether this was a cold start request (auto-detected if None)
+        db_stats: Per-request DB counters (statements, commits, connections)
     """
     logger = get_logger("request")
 
@@ -371,5 +373,16 @@ def log_request_end(
     if error:
         extra["error"] = error
 
+    db_marker = ""
+    if db_stats:
+        extra["db_statements"] = db_stats.get("statements", 0)
+        extra["db_commits"] = db_stats.get("commits", 0)
+        extra["db_connections"] = db_stats.get("connections", 0)
+        db_marker = f" [db {extra['db_statements']}q/{extra['db_commits']}c]"
+
     cold_marker = " [COLD]" if cold_start else ""
-    logger.log(level, f"{method} {path} -> {status_code} ({duration_ms:.0f}ms){cold_marker}", extra=extra)
+    logger.log(
+        level,
+        f"{method} {path} -> {status_code} ({duration_ms:.0f}ms){db_marker}{cold_marker}",
+        extra=extra,
+    )
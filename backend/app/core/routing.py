@@ -0,0 +1,209 @@
+"""
+Router registration: eager (include everything at startup) or lazy.
+
+Importing all ~120 router modules (and the services they pull in) dominates
+cold-start time on Lambda, while a single container typically serves only a
+handful of areas. In lazy mode nothing is imported at startup; the first
+request under a module's path prefix imports it and includes its router.
+
+Route order is preserved: after every lazy include the app's route list is
+re-sorted into manifest order, so /organizations/my-backlot-orgs still wins
+over /organizations/{org_id} regardless of which module loaded first.
+Building the OpenAPI schema loads every router first.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import FastAPI
+from starlette.middleware import Middleware
+
+logger = logging.getLogger(__name__)
+
+ROUTE_PREFIXES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api", "route_prefixes.json"
+)
+
+
+def route_prefixes_for(router, mount_prefix: str) -> List[str]:
+    """
+    Path prefixes (relative to the API prefix) a router's routes live under.
+
+    Each route contributes its mount prefix plus its first literal path
+    segment; a route whose first segment is a path parameter (or empty)
+    contributes the bare mount prefix, i.e. it may match anything below it.
+    """
+    prefixes = set()
+    for route in router.routes:
+        path = getattr(route, "path", "")
+        first = path.split("/")[1] if path.count("/") else path
+        if not first or "{" in first:
+            prefixes.add(mount_prefix)
+        else:
+            prefixes.add(f"{mount_prefix}/{first}")
+    return sorted(prefixes)
+
+
+def load_route_prefixes(path: str = ROUTE_PREFIXES_PATH) -> Dict[str, List[str]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Route prefix manifest unavailable ({e}); lazy routers fall back to mount prefixes")
+        return {}
+
+
+def _import_router(module: str):
+    # __import__ rather than importlib.import_module: only the former shows up
+    # in `python -X importtime` output (see app.tools.import_profile)
+    return __import__(module, fromlist=["router"]).router
+
+
+def include_routers(app: FastAPI, routers: Sequence[Tuple[str, str, str]], api_prefix: str) -> None:
+    """Eager mode: import and include every router now."""
+    for module, prefix, tag in routers:
+        app.include_router(_import_router(module), prefix=f"{api_prefix}{prefix}", tags=[tag])
+
+
+def _first_segment(path: str) -> str:
+    return path.split("/", 2)[1] if path.startswith("/") else ""
+
+
+class LazyRouterRegistry:
+    """Imports and includes manifest routers on the first request that needs them."""
+
+    def __init__(
+        self,
+        app: FastAPI,
+        routers: Sequence[Tuple[str, str, str]],
+        api_prefix: str,
+        route_prefixes: Optional[Dict[str, List[str]]] = None,
+    ):
+        self.app = app
+        self.routers = list(routers)
+        self.api_prefix = api_prefix
+        if route_prefixes is None:
+            route_prefixes = load_route_prefixes()
+
+        # Candidate entries keyed by the first path segment below the API
+        # prefix; entries that may match anything sit under "".
+        self._prefixes: List[List[str]] = []
+        self._by_segment: Dict[str, List[int]] = {}
+        for index, (module, prefix, _) in enumerate(self.routers):
+            prefixes = route_prefixes.get(module) or [prefix]
+            self._prefixes.append(prefixes)
+            for segment in {_first_segment(p) for p in prefixes}:
+                self._by_segment.setdefault(segment, []).append(index)
+
+        self._loaded = [False] * len(self.routers)
+        self._remaining = len(self.routers)
+        self._lock = threading.Lock()
+        # id(route) -> sort key; routes registered before the registry keep
+        # their place ahead of the manifest, anything added later goes last
+        self._rank: Dict[int, tuple] = {
+            id(route): (0, pos) for pos, route in enumerate(app.router.routes)
+        }
+        self.import_seconds = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return self._remaining == 0
+
+    def loaded_modules(self) -> List[str]:
+        return [module for (module, _, _), loaded in zip(self.routers, self._loaded) if loaded]
+
+    def entries_for_path(self, path: str) -> List[int]:
+        """Manifest indices whose routes could match `path`."""
+        if not path.startswith(self.api_prefix):
+            return []
+        rest = path[len(self.api_prefix):]
+        if rest and not rest.startswith("/"):
+            return []
+        candidates = set(self._by_segment.get("", ()))
+        candidates.update(self._by_segment.get(_first_segment(rest), ()))
+        return sorted(
+            index for index in candidates
+            if any(rest == p or rest.startswith(p + "/") or not p for p in self._prefixes[index])
+        )
+
+    def ensure_path(self, path: str) -> None:
+        if self._remaining:
+            self._load(i for i in self.entries_for_path(path) if not self._loaded[i])
+
+    def load_all(self) -> None:
+        if self._remaining:
+            self._load(range(len(self.routers)))
+
+    def _load(self, indices: Iterable[int]) -> None:
+        indices = list(indices)
+        if not indices:
+            return
+        with self._lock:
+            routes = self.app.router.routes
+            started = time.perf_counter()
+            loaded = []
+            for index in indices:
+                if self._loaded[index]:
+                    continue
+                module, prefix, tag = self.routers[index]
+                before = len(routes)
+                self.app.include_router(
+                    _import_router(module), prefix=f"{self.api_prefix}{prefix}", tags=[tag]
+                )
+                for pos, route in enumerate(routes[before:]):
+                    self._rank[id(route)] = (1, index, pos)
+                self._loaded[index] = True
+                self._remaining -= 1
+                loaded.append(module)
+            if not loaded:
+                return
+            ordered = sorted(enumerate(routes), key=lambda item: self._rank.get(id(item[1]), (2, item[0])))
+            routes[:] = [route for _, route in ordered]
+            self.app.openapi_schema = None
+            elapsed = time.perf_counter() - started
+            self.import_seconds += elapsed
+        logger.info(f"Lazy-loaded {len(loaded)} router(s) in {elapsed * 1000:.0f}ms: {', '.join(loaded)}")
+
+
+class LazyRouterMiddleware:
+    """ASGI middleware that loads the routers a request path needs before routing it."""
+
+    def __init__(self, app, registry: LazyRouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and not self.registry.complete:
+            self.registry.ensure_path(scope["path"])
+        await self.app(scope, receive, send)
+
+
+def install_lazy_routers(
+    app: FastAPI,
+    routers: Sequence[Tuple[str, str, str]],
+    api_prefix: str,
+    route_prefixes: Optional[Dict[str, List[str]]] = None,
+) -> LazyRouterRegistry:
+    """
+    Lazy mode: register the manifest without importing it.
+
+    Call it after the app's own routes are defined. The loading middleware
+    is appended innermost, so request logging and timing include the
+    imports, and app.openapi() loads every router before building the
+    schema.
+    """
+    registry = LazyRouterRegistry(app, routers, api_prefix, route_prefixes)
+    app.user_middleware.append(Middleware(LazyRouterMiddleware, registry=registry))
+
+    build_schema = app.openapi
+
+    def openapi():
+        registry.load_all()
+        return build_schema()
+
+    app.openapi = openapi
+    app.state.lazy_routers = registry
+    return registry
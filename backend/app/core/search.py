@@ -0,0 +1,229 @@
+"""
+Shared Search Layer
+
+Indexed, ranked search over the generated columns added by migration 277:
+- search_vector : tsvector (GIN) for full-text and word-prefix matches
+- search_text   : lower-cased fields (pg_trgm GIN) for substring matches and
+                  fuzzy word similarity, so typos still find names
+
+A row matches when any of the three hits; rank combines ts_rank_cd with
+trigram word similarity. Routers either call search() for a ranked page, or
+drop search_condition() into their own WHERE clause in place of ILIKE.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.database import execute_query
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SearchEntity:
+    """A table with search_vector/search_text columns. {a} is the table alias."""
+    table: str
+    config: str = "simple"      # text search configuration of search_vector
+    title: str = "{a}.name"     # display title in global search
+    subtitle: str = "NULL"      # display subtitle in global search
+    filter: str = ""            # condition applied to every global search
+
+
+ENTITIES: Dict[str, SearchEntity] = {
+    "profiles": SearchEntity(
+        "profiles",
+        title="COALESCE({a}.display_name, {a}.full_name, {a}.username)",
+        subtitle="{a}.username",
+    ),
+    "forum_threads": SearchEntity(
+        "forum_threads", config="english", title="{a}.title", subtitle="left({a}.content, 200)",
+    ),
+    "content": SearchEntity(
+        "content", config="english", title="{a}.title", subtitle="left({a}.description, 200)",
+        filter="{a}.status = 'published'",
+    ),
+    "crm_contacts": SearchEntity(
+        "crm_contacts",
+        title="{a}.first_name || ' ' || {a}.last_name",
+        subtitle="COALESCE({a}.company, {a}.email)",
+        filter="{a}.status != 'inactive'",
+    ),
+    "crm_companies": SearchEntity("crm_companies", subtitle="{a}.website"),
+}
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _entity(name: str) -> SearchEntity:
+    try:
+        return ENTITIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown search entity: {name}") from None
+
+
+def normalize_query(q: Optional[str]) -> str:
+    """Collapse whitespace; blank/None becomes ''."""
+    return " ".join((q or "").split())
+
+
+def prefix_tsquery(q: str) -> str:
+    """to_tsquery() input matching every word of q as a prefix ('' if none)."""
+    return " & ".join(f"{word}:*" for word in _WORD.findall(q.lower()))
+
+
+def _like_pattern(q: str) -> str:
+    escaped = q.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def search_params(q: str) -> Dict[str, Any]:
+    """Bind parameters shared by search_condition() and search_rank()."""
+    q = normalize_query(q)
+    return {"search_q": q.lower(), "search_like": _like_pattern(q), "search_tsquery": prefix_tsquery(q)}
+
+
+def search_condition(entity: str, q: str, alias: str = "t") -> Tuple[str, Dict[str, Any]]:
+    """
+    WHERE condition matching q against an entity, plus its parameters.
+
+    Matches whole words or word prefixes (tsvector), any substring
+    (trigram-indexed LIKE on search_text), or similar words (pg_trgm <%).
+    A blank q matches everything.
+    """
+    spec = _entity(entity)
+    if not normalize_query(q):
+        return "TRUE", {}
+    params = search_params(q)
+    clauses = []
+    if params["search_tsquery"]:
+        clauses.append(f"{alias}.search_vector @@ to_tsquery('{spec.config}', :search_tsquery)")
+    clauses.append(f"{alias}.search_text LIKE :search_like")
+    clauses.append(f":search_q <% {alias}.search_text")
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def search_rank(entity: str, q: str, alias: str = "t") -> str:
+    """Relevance expression (higher is better) using the search_params() names."""
+    spec = _entity(entity)
+    similarity = f"word_similarity(:search_q, {alias}.search_text)"
+    if not prefix_tsquery(normalize_query(q)):
+        return similarity
+    return f"(ts_rank_cd({alias}.search_vector, to_tsquery('{spec.config}', :search_tsquery)) + {similarity})"
+
+
+def search(
+    entity: str,
+    q: Optional[str],
+    columns: str = "t.*",
+    joins: str = "",
+    conditions: Sequence[str] = (),
+    params: Optional[Dict[str, Any]] = None,
+    order_by: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Ranked page of an entity's rows matching q (table alias t).
+
+    conditions/params add caller filters. With a blank q every row passing
+    the conditions is returned in order_by order; otherwise rows are ordered
+    by relevance, then order_by. Each row carries its search_rank.
+    """
+    spec = _entity(entity)
+    q = normalize_query(q)
+    where = list(conditions)
+    params = dict(params or {})
+    rank = "0"
+    if q:
+        condition, match_params = search_condition(entity, q)
+        where.append(condition)
+        params.update(match_params)
+        rank = search_rank(entity, q)
+
+    order = [f"{rank} DESC"] if q else []
+    if order_by:
+        order.append(order_by)
+    order.append("t.id")
+
+    return execute_query(
+        f"""
+        SELECT {columns}, {rank} AS search_rank
+        FROM {spec.table} t
+        {joins}
+        WHERE {" AND ".join(where) or "TRUE"}
+        ORDER BY {", ".join(order)}
+        LIMIT :search_limit OFFSET :search_offset
+        """,
+        {**params, "search_limit": limit, "search_offset": offset},
+    )
+
+
+def search_count(
+    entity: str,
+    q: Optional[str],
+    joins: str = "",
+    conditions: Sequence[str] = (),
+    params: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Number of rows search() would page through."""
+    spec = _entity(entity)
+    q = normalize_query(q)
+    where = list(conditions)
+    params = dict(params or {})
+    if q:
+        condition, match_params = search_condition(entity, q)
+        where.append(condition)
+        params.update(match_params)
+    rows = execute_query(
+        f"SELECT COUNT(*) AS total FROM {spec.table} t {joins} WHERE {' AND '.join(where) or 'TRUE'}",
+        params,
+    )
+    return rows[0]["total"] if rows else 0
+
+
+def global_search(
+    q: Optional[str],
+    entities: Iterable[str],
+    limit_per_entity: int = 10,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Top matches for q in each entity, in one UNION ALL query.
+
+    Returns {entity: [{"id", "title", "subtitle", "rank", "data"}]} with every
+    requested entity present; data is the full row without the search columns.
+    """
+    entities = list(dict.fromkeys(entities))
+    results: Dict[str, List[Dict[str, Any]]] = {name: [] for name in entities}
+    q = normalize_query(q)
+    if not q or not entities:
+        return results
+
+    branches = []
+    for i, name in enumerate(entities):
+        spec = _entity(name)
+        alias = f"t{i}"
+        condition, params = search_condition(name, q, alias)
+        filters = f"AND {spec.filter.format(a=alias)}" if spec.filter else ""
+        rank = search_rank(name, q, alias)
+        branches.append(
+            f"""
+            (SELECT '{name}' AS entity, {alias}.id, {spec.title.format(a=alias)} AS title,
+                    {spec.subtitle.format(a=alias)} AS subtitle, {rank} AS rank,
+                    to_jsonb({alias}) - 'search_vector' - 'search_text' AS data
+             FROM {spec.table} {alias}
+             WHERE {condition} {filters}
+             ORDER BY {rank} DESC, {alias}.id
+             LIMIT :search_limit)
+            """
+        )
+
+    rows = execute_query(
+        " UNION ALL ".join(branches) + " ORDER BY entity, rank DESC",
+        {**params, "search_limit": limit_per_entity},
+    )
+    for row in rows:
+        entity = row.pop("entity")
+        results[entity].append(row)
+    return results
@@ -4,7 +4,7 @@ Handles initialization tasks like superadmin setup.
 """
 import logging
 from app.core.config import settings
-from app.core.database import get_client
+from app.core.database import get_client, load_schema_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +57,18 @@ async def initialize_superadmin():
         logger.error(f"Error initializing superadmin: {str(e)}")
 
 
+async def warm_schema_catalog():
+    """
+    Load the FK/column catalog used to inline embedded joins.
+
+    Lambda runs with lifespan off, so there it loads lazily on first use.
+    """
+    catalog = load_schema_catalog()
+    logger.info(
+        f"Schema catalog loaded: {len(catalog.tables)} tables, {len(catalog.foreign_keys)} foreign keys"
+    )
+
+
 async def on_startup():
     """
     Run all startup tasks.
@@ -67,4 +79,7 @@ async def on_startup():
     # Initialize superadmin
     await initialize_superadmin()
 
+    # Cache FK targets for query-builder embedded joins
+    await warm_schema_catalog()
+
     logger.info("Startup tasks completed")
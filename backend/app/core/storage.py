@@ -10,10 +10,9 @@ import mimetypes
 from typing import Optional, BinaryIO
 from datetime import datetime, timedelta
 
-import boto3
 from botocore.exceptions import ClientError
-from botocore.config import Config
 
+from app.core.aws_clients import LazyClient
 from app.core.config import settings
 
 
@@ -36,22 +35,20 @@ BUCKET_MAPPING = {
     'video-publish': VIDEO_PUBLISH_BUCKET,
 }
 
-# S3 Client configuration
-s3_config = Config(
-    region_name=AWS_REGION,
-    signature_version='s3v4',
-    retries={'max_attempts': 3, 'mode': 'standard'}
-)
-
 # Always use boto3's default credential chain - this properly handles:
 # - Lambda execution role (includes AWS_SESSION_TOKEN for presigned URLs)
 # - EC2 instance profile
 # - Local ~/.aws/credentials or environment variables
 # - ECS task role, etc.
-s3_client = boto3.client(
+# Created on first use rather than at import (see app.core.aws_clients)
+s3_client = LazyClient(
     's3',
     region_name=AWS_REGION,
-    config=s3_config
+    config=dict(
+        region_name=AWS_REGION,
+        signature_version='s3v4',
+        retries={'max_attempts': 3, 'mode': 'standard'},
+    ),
 )
 
 
@@ -1594,6 +1594,7 @@ async def process_billing_grace_periods():
                     """, {"org_id": org_id})
                     owner_profile_id = str(owner["profile_id"]) if owner else None
 
+                    from app.services.feature_gates import invalidate_org_entitlements
                     from app.services.subscription_service import activate_free_tier
 
                     # Mark config as canceled
@@ -1609,6 +1610,7 @@ async def process_billing_grace_periods():
                         SET status = 'canceled', canceled_at = NOW(), updated_at = NOW()
                         WHERE organization_id = :oid AND status = 'active'
                     """, {"oid": org_id})
+                    invalidate_org_entitlements(org_id)
 
                     if owner_profile_id:
                         activate_free_tier(org_id, owner_profile_id)
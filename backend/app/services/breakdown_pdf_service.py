@@ -2,9 +2,13 @@
 PDF Generation Service for Script Breakdown Sheets
 Uses fpdf2 (pure Python) for reliable PDF generation on Lambda
 """
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 from datetime import datetime
-from fpdf import FPDF
+
+# fpdf (and the fontTools it pulls in) takes ~0.4s to import, so it is
+# imported by the generate_* functions rather than with the backlot router
+if TYPE_CHECKING:
+    from fpdf import FPDF
 
 
 # Color mapping for breakdown types (matching standard industry colors)
@@ -95,7 +99,7 @@ def format_page_length(page_length: float) -> str:
 
 
 def _render_scene_page(
-    pdf: FPDF,
+    pdf: "FPDF",
     project_title: str,
     scene: Dict[str, Any],
     breakdown_items: List[Dict[str, Any]],
@@ -263,6 +267,8 @@ def generate_breakdown_pdf(
     include_notes: bool = True,
 ) -> bytes:
     """Generate a single scene breakdown PDF using fpdf2."""
+    from fpdf import FPDF
+
     pdf = FPDF(orientation="P", unit="mm", format="Letter")
     pdf.set_auto_page_break(auto=True, margin=15)
     pdf.add_page()
@@ -293,6 +299,8 @@ def generate_project_breakdown_pdf(
     include_notes: bool = True,
 ) -> bytes:
     """Generate a multi-page project breakdown PDF using fpdf2."""
+    from fpdf import FPDF
+
     pdf = FPDF(orientation="P", unit="mm", format="Letter")
     pdf.set_auto_page_break(auto=True, margin=15)
 
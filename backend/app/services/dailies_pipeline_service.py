@@ -14,7 +14,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 import hashlib
 
-from app.core.database import execute_query, execute_single, execute_insert, execute_update
+from app.core.database import execute_query, execute_single, execute_insert, execute_update, execute_insert_many
 
 logger = logging.getLogger(__name__)
 
@@ -113,29 +113,10 @@ class DailiesPipelineService:
         })
 
         batch_id = batch["id"]
-        created_ids = []
-        sequence = 0
-
-        for clip in clips:
-            # Create dailies record
-            dailies = execute_insert("""
-                INSERT INTO backlot_dailies (
-                    project_id, shoot_day_id, filename,
-                    clip_name, scene_number, take_number, camera,
-                    codec, resolution, frame_rate, duration_seconds,
-                    timecode_in, timecode_out,
-                    notes, tags, uploaded_by,
-                    processing_status
-                ) VALUES (
-                    :project_id, :shoot_day_id, :filename,
-                    :clip_name, :scene_number, :take_number, :camera,
-                    :codec, :resolution, :frame_rate, :duration,
-                    :tc_in, :tc_out,
-                    :notes, :tags, :uploaded_by,
-                    'pending'
-                )
-                RETURNING id
-            """, {
+
+        # Create dailies records in one multi-row INSERT (RETURNING keeps input order)
+        dailies_rows = execute_insert_many("backlot_dailies", [
+            {
                 "project_id": project_id,
                 "shoot_day_id": shoot_day_id,
                 "filename": clip.get("filename"),
@@ -146,22 +127,24 @@ class DailiesPipelineService:
                 "codec": clip.get("codec"),
                 "resolution": clip.get("resolution"),
                 "frame_rate": clip.get("frame_rate"),
-                "duration": clip.get("duration_seconds"),
-                "tc_in": clip.get("timecode_in"),
-                "tc_out": clip.get("timecode_out"),
+                "duration_seconds": clip.get("duration_seconds"),
+                "timecode_in": clip.get("timecode_in"),
+                "timecode_out": clip.get("timecode_out"),
                 "notes": clip.get("notes"),
                 "tags": clip.get("tags", []),
-                "uploaded_by": uploaded_by
-            })
+                "uploaded_by": uploaded_by,
+                "processing_status": "pending",
+            }
+            for clip in clips
+        ], returning="id")
 
-            # Link to batch
-            execute_insert("""
-                INSERT INTO backlot_dailies_batch_items (batch_id, dailies_id, sequence_number)
-                VALUES (:batch_id, :dailies_id, :seq)
-            """, {"batch_id": batch_id, "dailies_id": dailies["id"], "seq": sequence})
+        # Link to batch
+        execute_insert_many("backlot_dailies_batch_items", [
+            {"batch_id": batch_id, "dailies_id": dailies["id"], "sequence_number": sequence}
+            for sequence, dailies in enumerate(dailies_rows)
+        ], returning=None)
 
-            created_ids.append(str(dailies["id"]))
-            sequence += 1
+        created_ids = [str(dailies["id"]) for dailies in dailies_rows]
 
         logger.info("dailies_bulk_created",
                    batch_id=batch_id,
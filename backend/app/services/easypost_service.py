@@ -4,7 +4,6 @@ Provides multi-carrier shipping integration with label generation and tracking.
 Supports FedEx, UPS, USPS, and DHL.
 """
 import os
-import httpx
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from pydantic import BaseModel
@@ -99,6 +98,12 @@ DEFAULT_PACKAGE_DIMENSIONS = {
 }
 
 
+def _http_client():
+    # httpx is imported on first API call, not with the gear router
+    import httpx
+    return httpx.AsyncClient()
+
+
 class EasyPostService:
     """
     EasyPost integration for multi-carrier shipping.
@@ -160,7 +165,7 @@ class EasyPostService:
             )
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with _http_client() as client:
                 response = await client.post(
                     f"{EasyPostService.EASYPOST_API_URL}/addresses",
                     headers=EasyPostService._get_headers(api_key),
@@ -300,7 +305,7 @@ class EasyPostService:
             # EasyPost filters by carrier_accounts if provided
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with _http_client() as client:
                 response = await client.post(
                     f"{EasyPostService.EASYPOST_API_URL}/shipments",
                     headers=EasyPostService._get_headers(api_key),
@@ -380,7 +385,7 @@ class EasyPostService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with _http_client() as client:
                 response = await client.post(
                     f"{EasyPostService.EASYPOST_API_URL}/shipments",
                     headers=EasyPostService._get_headers(api_key),
@@ -445,7 +450,7 @@ class EasyPostService:
             raise ValueError("EasyPost API key not configured")
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with _http_client() as client:
                 response = await client.post(
                     f"{EasyPostService.EASYPOST_API_URL}/shipments/{shipment_id}/buy",
                     headers=EasyPostService._get_headers(api_key),
@@ -504,7 +509,7 @@ class EasyPostService:
 
         try:
             # First, get the original shipment details
-            async with httpx.AsyncClient() as client:
+            async with _http_client() as client:
                 response = await client.get(
                     f"{EasyPostService.EASYPOST_API_URL}/shipments/{original_shipment_id}",
                     headers=EasyPostService._get_headers(api_key),
@@ -587,7 +592,7 @@ class EasyPostService:
             raise ValueError("EasyPost API key not configured")
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with _http_client() as client:
                 # Create or retrieve tracker
                 tracker_data = {"tracking_code": tracking_number}
                 if carrier:
@@ -648,7 +653,7 @@ class EasyPostService:
             raise ValueError("EasyPost API key not configured")
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with _http_client() as client:
                 response = await client.post(
                     f"{EasyPostService.EASYPOST_API_URL}/webhooks",
                     headers=EasyPostService._get_headers(api_key),
@@ -7,51 +7,292 @@ Supports:
 - Percentage rollouts
 - Targeted rollouts (by user, role, organization)
 - Killswitches for emergency disabling
+
+Flags are evaluated in-process against a snapshot of every flag and its
+targets. The snapshot is versioned by the feature_flag_version row (bumped by
+triggers on feature_flags / feature_flag_targets) and only reloaded when the
+version moves: long-running servers LISTEN for 'feature_flags_changed',
+Lambdas poll the version row every FEATURE_FLAG_POLL_SECONDS. Evaluations are
+sampled into an in-memory buffer and written to feature_flag_evaluations in
+batches.
 """
+import atexit
+import hashlib
+import os
+import random
+import select
+import threading
+import time
 from typing import Optional, Dict, Any, List
-from datetime import datetime
 
-from app.core.database import execute_query, execute_single, execute_insert
+from app.core.config import settings
+from app.core.database import execute_query, execute_single, execute_insert, execute_insert_many, get_engine
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
-# In-memory cache for frequently accessed flags
-_flag_cache: Dict[str, Dict[str, Any]] = {}
-_cache_timestamp: Optional[datetime] = None
+# Full reload interval when the version row is unavailable (migration 274 not
+# applied), and the safety-net version check interval in LISTEN mode
 CACHE_TTL_SECONDS = 60
 
+NOTIFY_CHANNEL = "feature_flags_changed"
 
-def _refresh_cache_if_needed() -> None:
-    """Refresh flag cache if expired."""
-    global _flag_cache, _cache_timestamp
 
-    if _cache_timestamp and (datetime.utcnow() - _cache_timestamp).seconds < CACHE_TTL_SECONDS:
-        return
+# ============================================================================
+# FLAG SNAPSHOT
+# ============================================================================
+
+_snapshot: Dict[str, Any] = {"version": None, "flags": {}}
+_snapshot_lock = threading.Lock()
+_next_check_at = 0.0
+_listener: Optional[threading.Thread] = None
+
+
+def _sync_mode() -> str:
+    """'listen' or 'poll' (FEATURE_FLAG_SYNC=auto picks poll on Lambda)."""
+    mode = (settings.FEATURE_FLAG_SYNC or "auto").lower()
+    if mode in ("listen", "poll"):
+        return mode
+    return "poll" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "listen"
 
-    flags = execute_query(
+
+def _get_version() -> Optional[int]:
+    try:
+        row = execute_single("SELECT version FROM feature_flag_version", {})
+    except Exception as e:
+        logger.warning(f"Feature flag version check failed: {e}")
+        return None
+    return row["version"] if row else None
+
+
+def _load_snapshot(version: Optional[int]) -> Dict[str, Any]:
+    """Load every flag with its enabled targets in one query."""
+    rows = execute_query(
         """
-        SELECT id, key, name, status, rollout_percentage, default_value, metadata
-        FROM feature_flags
+        SELECT
+            f.id, f.key, f.name, f.status, f.rollout_percentage, f.default_value, f.metadata,
+            COALESCE(
+                jsonb_agg(jsonb_build_array(t.target_type, t.target_value))
+                    FILTER (WHERE t.id IS NOT NULL AND t.enabled),
+                '[]'::jsonb
+            ) AS targets
+        FROM feature_flags f
+        LEFT JOIN feature_flag_targets t ON t.flag_id = f.id
+        GROUP BY f.id
         """,
         {}
     )
 
-    _flag_cache = {f["key"]: f for f in flags}
-    _cache_timestamp = datetime.utcnow()
+    flags = {}
+    for row in rows:
+        targets: Dict[str, set] = {}
+        for target_type, target_value in row.pop("targets") or []:
+            targets.setdefault(target_type, set()).add(target_value)
+        row["targets"] = targets
+        flags[row["key"]] = row
+    return {"version": version, "flags": flags}
+
+
+def _get_snapshot() -> Dict[str, Any]:
+    """Current snapshot, reloaded only if the version row has moved."""
+    global _snapshot, _next_check_at
+
+    if time.monotonic() < _next_check_at:
+        return _snapshot
+
+    with _snapshot_lock:
+        if time.monotonic() < _next_check_at:
+            return _snapshot
+
+        mode = _sync_mode()
+        if mode == "listen":
+            _start_listener()
+
+        version = _get_version()
+        if version is None or version != _snapshot["version"]:
+            _snapshot = _load_snapshot(version)
+
+        if mode == "poll" and version is not None:
+            interval = settings.FEATURE_FLAG_POLL_SECONDS
+        else:
+            interval = CACHE_TTL_SECONDS
+        _next_check_at = time.monotonic() + interval
+        return _snapshot
 
 
 def invalidate_cache() -> None:
-    """Invalidate the feature flag cache."""
-    global _flag_cache, _cache_timestamp
-    _flag_cache = {}
-    _cache_timestamp = None
+    """Re-check the flag version (and reload if it moved) on next evaluation."""
+    global _next_check_at, _snapshot
+    _next_check_at = 0.0
+    # Force a reload even if the version row is missing or unchanged locally
+    _snapshot = {"version": None, "flags": _snapshot["flags"]}
+
+
+def _connect_listener():
+    engine = get_engine()
+    cargs, cparams = engine.dialect.create_connect_args(engine.url)
+    conn = engine.dialect.connect(*cargs, **cparams)
+    conn.autocommit = True
+    conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+    return conn
+
+
+def _listen_loop() -> None:
+    """Hold a dedicated connection LISTENing for version bumps."""
+    while True:
+        conn = None
+        try:
+            conn = _connect_listener()
+            # Anything committed while we were (re)connecting was missed
+            invalidate_cache()
+            while True:
+                if select.select([conn], [], [], CACHE_TTL_SECONDS) == ([], [], []):
+                    continue
+                conn.poll()
+                if conn.notifies:
+                    conn.notifies.clear()
+                    invalidate_cache()
+        except Exception as e:
+            logger.warning(f"Feature flag listener disconnected: {e}")
+            time.sleep(5)
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+
+def _start_listener() -> None:
+    global _listener
+    if _listener is None:
+        _listener = threading.Thread(target=_listen_loop, name="feature-flag-listener", daemon=True)
+        _listener.start()
+
+
+# ============================================================================
+# EVALUATION LOG
+# ============================================================================
+
+_evaluation_buffer: List[Dict[str, Any]] = []
+_evaluation_lock = threading.Lock()
+_last_flush_at = time.monotonic()
+_evaluation_stats = {"sampled": 0, "flushed": 0, "dropped": 0}
+
+
+def _record_evaluation(flag_key: str, user_id: Optional[str], result: Dict[str, Any]) -> None:
+    """Sample an evaluation into the buffer; flush when it's big or old enough."""
+    global _last_flush_at
+
+    if random.random() >= settings.FEATURE_FLAG_EVAL_SAMPLE_RATE:
+        return
+
+    with _evaluation_lock:
+        _evaluation_buffer.append({
+            "flag_key": flag_key,
+            "user_id": user_id,
+            "result": result["enabled"],
+            "reason": result["reason"],
+        })
+        _evaluation_stats["sampled"] += 1
+        due = (
+            len(_evaluation_buffer) >= settings.FEATURE_FLAG_EVAL_BATCH_SIZE
+            or time.monotonic() - _last_flush_at >= settings.FEATURE_FLAG_EVAL_FLUSH_SECONDS
+        )
+        if due:
+            _last_flush_at = time.monotonic()
+
+    if due:
+        # Off the request's unit of work so a rollback there doesn't drop the
+        # batch and the request doesn't wait on the insert
+        threading.Thread(target=flush_evaluations, name="feature-flag-eval-flush", daemon=True).start()
+
+
+def flush_evaluations() -> int:
+    """Write buffered evaluations in one multi-row insert. Returns rows written."""
+    with _evaluation_lock:
+        batch = _evaluation_buffer[:]
+        _evaluation_buffer.clear()
+
+    if not batch:
+        return 0
+
+    try:
+        execute_insert_many("feature_flag_evaluations", batch, returning=None)
+    except Exception as e:
+        logger.warning(f"Dropped {len(batch)} feature flag evaluation log rows: {e}")
+        with _evaluation_lock:
+            _evaluation_stats["dropped"] += len(batch)
+        return 0
+
+    with _evaluation_lock:
+        _evaluation_stats["flushed"] += len(batch)
+    return len(batch)
+
+
+def get_evaluation_log_stats() -> Dict[str, Any]:
+    """Sampling/flush counters for this process."""
+    with _evaluation_lock:
+        return {
+            **_evaluation_stats,
+            "buffered": len(_evaluation_buffer),
+            "sample_rate": settings.FEATURE_FLAG_EVAL_SAMPLE_RATE,
+            "snapshot_version": _snapshot["version"],
+            "flags": len(_snapshot["flags"]),
+            "sync_mode": _sync_mode(),
+        }
+
+
+atexit.register(flush_evaluations)
 
 
 # ============================================================================
 # FLAG EVALUATION
 # ============================================================================
 
+def rollout_bucket(flag_key: str, user_id: str) -> int:
+    """
+    Deterministic rollout bucket in [0, 100) for a user on a flag.
+
+    Stable across processes and deploys (unlike Python's salted hash()), and
+    salted with the flag key so the same users aren't first in every rollout.
+    """
+    digest = hashlib.sha256(f"{flag_key}:{user_id}".encode()).digest()
+    return int.from_bytes(digest[:8], "big") % 100
+
+
+def _evaluate(flag: Optional[Dict[str, Any]], flag_key: str, user_id: Optional[str], context: Dict[str, Any]) -> Dict[str, Any]:
+    if flag is None:
+        return {"enabled": False, "reason": "flag_not_found"}
+
+    status = flag["status"]
+    result, reason = False, None
+
+    if status == "disabled":
+        result, reason = False, "disabled"
+    elif status == "enabled":
+        result, reason = True, "enabled"
+    elif status == "targeted":
+        targets = flag["targets"]
+        result, reason = False, "not_targeted"
+        if user_id is not None and str(user_id) in targets.get("user", ()):
+            result, reason = True, "targeted_user"
+        elif any(role in targets.get("role", ()) for role in context.get("roles") or ()):
+            result, reason = True, "targeted_role"
+        elif context.get("organization_id") and str(context["organization_id"]) in targets.get("organization", ()):
+            result, reason = True, "targeted_organization"
+    elif status == "percentage":
+        percentage = flag.get("rollout_percentage") or 0
+        if user_id is not None:
+            result = rollout_bucket(flag_key, str(user_id)) < percentage
+            reason = f"percentage_{percentage}"
+        else:
+            result = random.random() * 100 < percentage
+            reason = "percentage_random"
+
+    return {"enabled": result, "reason": reason, "flag_key": flag_key}
+
+
 def evaluate_flag(
     flag_key: str,
     user_id: Optional[str] = None,
@@ -69,21 +310,11 @@ def evaluate_flag(
         Dict with 'enabled' boolean and 'reason' string
     """
     context = context or {}
-
-    # Use database function for consistent evaluation
-    result = execute_single(
-        "SELECT evaluate_feature_flag(:flag_key, :user_id, :context)",
-        {
-            "flag_key": flag_key,
-            "user_id": user_id,
-            "context": context
-        }
-    )
-
-    if result and "evaluate_feature_flag" in result:
-        return result["evaluate_feature_flag"]
-
-    return {"enabled": False, "reason": "evaluation_error"}
+    flag = _get_snapshot()["flags"].get(flag_key)
+    result = _evaluate(flag, flag_key, user_id, context)
+    if flag is not None:
+        _record_evaluation(flag_key, user_id, result)
+    return result
 
 
 def is_enabled(
@@ -142,10 +373,8 @@ def get_enabled_flags_for_user(
     Returns:
         List of enabled flag keys
     """
-    _refresh_cache_if_needed()
-
     enabled = []
-    for key in _flag_cache.keys():
+    for key in _get_snapshot()["flags"].keys():
         if is_enabled(key, user_id, context):
             enabled.append(key)
 
@@ -348,6 +577,7 @@ def add_target(
     if flag["status"] != "targeted":
         update_flag(flag_key, {"status": "targeted"})
 
+    invalidate_cache()
     return target
 
 
@@ -374,6 +604,7 @@ def remove_target(
         }
     )
 
+    invalidate_cache()
     return result is not None
 
 
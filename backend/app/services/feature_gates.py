@@ -11,6 +11,10 @@ Usage:
 
     # Programmatic check:
     has_access = check_feature_access(org_id, "BUDGETING")
+
+Checks evaluate an org entitlement snapshot (tier, status, active modules)
+loaded in one query and cached per org. Anything that changes an org's
+subscription or modules must call invalidate_org_entitlements(org_id).
 """
 
 from enum import Enum
@@ -18,7 +22,9 @@ from functools import wraps
 from typing import Optional, Dict, Any
 
 from fastapi import HTTPException, Depends
-from app.core.database import execute_single, execute_query
+from app.core.cache import VersionedCache
+from app.core.config import settings
+from app.core.database import after_transaction, execute_single, execute_query
 
 
 class Feature(str, Enum):
@@ -134,9 +140,89 @@ UPGRADE_PROMPTS = {
 }
 
 
-def check_feature_access(org_id: str, feature: str) -> Dict[str, Any]:
+# =============================================================================
+# Entitlement snapshots
+# =============================================================================
+
+_entitlement_cache = VersionedCache(
+    "entitlements",
+    maxsize=settings.FEATURE_GATE_CACHE_MAX_ENTRIES,
+    ttl=settings.FEATURE_GATE_CACHE_TTL_SECONDS,
+)
+_project_org_cache = VersionedCache(
+    "project_org",
+    maxsize=settings.FEATURE_GATE_CACHE_MAX_ENTRIES,
+    ttl=settings.FEATURE_GATE_CACHE_TTL_SECONDS,
+)
+
+
+def _load_org_entitlements(org_id: str) -> Optional[Dict[str, Any]]:
+    row = execute_single("""
+        SELECT sc.tier_name, sc.status,
+               ARRAY(
+                   SELECT m.module_key FROM backlot_subscription_modules m
+                   WHERE m.organization_id = o.id AND m.status = 'active'
+               ) AS active_modules
+        FROM backlot_subscription_configs sc
+        JOIN organizations o ON o.active_subscription_config_id = sc.id
+        WHERE o.id = :oid
+    """, {"oid": org_id})
+    if not row:
+        return None
+    return {
+        "tier_name": row.get("tier_name", "free"),
+        "status": row.get("status", ""),
+        "modules": frozenset(row.get("active_modules") or ()),
+    }
+
+
+def get_org_entitlements(org_id: str) -> Optional[Dict[str, Any]]:
     """
-    Check if an organization has access to a feature.
+    Get an org's entitlement snapshot (cached per org):
+        {"tier_name": str, "status": str, "modules": frozenset of active module keys}
+    or None if the org has no active subscription config.
+    """
+    org_id = str(org_id)
+    return _entitlement_cache.get_or_load(org_id, (f"o:{org_id}",), lambda: _load_org_entitlements(org_id))
+
+
+def invalidate_org_entitlements(org_id: Any) -> None:
+    """Drop an org's cached snapshot now and again once the current transaction ends."""
+    scope = f"o:{org_id}"
+    _entitlement_cache.bump(scope)
+    after_transaction(lambda: _entitlement_cache.bump(scope))
+
+
+def _get_project_org_id(project_id: str) -> Optional[str]:
+    """organization_id of a project ("" for individual projects, None if it doesn't exist)."""
+    project_id = str(project_id)
+
+    def load():
+        project = execute_single(
+            "SELECT organization_id FROM backlot_projects WHERE id = :pid",
+            {"pid": project_id},
+        )
+        if not project:
+            return None
+        return str(project["organization_id"]) if project.get("organization_id") else ""
+
+    return _project_org_cache.get_or_load(project_id, (f"p:{project_id}",), load)
+
+
+def invalidate_project_org(project_id: Any) -> None:
+    """Call after a project is moved into or out of an organization."""
+    scope = f"p:{project_id}"
+    _project_org_cache.bump(scope)
+    after_transaction(lambda: _project_org_cache.bump(scope))
+
+
+def get_entitlement_cache_stats() -> Dict[str, Any]:
+    return {"orgs": _entitlement_cache.stats(), "projects": _project_org_cache.stats()}
+
+
+def evaluate_feature_access(entitlements: Optional[Dict[str, Any]], feature: str) -> Dict[str, Any]:
+    """
+    Evaluate feature access against an entitlement snapshot (no DB access).
 
     Returns:
         {
@@ -147,23 +233,15 @@ def check_feature_access(org_id: str, feature: str) -> Dict[str, Any]:
     """
     feature_enum = Feature(feature) if isinstance(feature, str) else feature
 
-    # Get org's current subscription
-    config = execute_single("""
-        SELECT sc.tier_name, sc.status, sc.module_config
-        FROM backlot_subscription_configs sc
-        JOIN organizations o ON o.active_subscription_config_id = sc.id
-        WHERE o.id = :oid
-    """, {"oid": org_id})
-
-    if not config:
+    if not entitlements:
         return {
             "has_access": False,
             "reason": "no_subscription",
             "upgrade_prompt": {"message": "Subscribe to access this feature.", "min_tier": "free"},
         }
 
-    tier_name = config.get("tier_name", "free")
-    status = config.get("status", "")
+    tier_name = entitlements["tier_name"]
+    status = entitlements["status"]
 
     # Check subscription status
     if status not in ("active", "free"):
@@ -180,15 +258,8 @@ def check_feature_access(org_id: str, feature: str) -> Dict[str, Any]:
 
     # Check if feature requires a module
     module_key = FEATURE_TO_MODULE.get(feature_enum)
-    if module_key:
-        # Check active modules
-        active_module = execute_single("""
-            SELECT id FROM backlot_subscription_modules
-            WHERE organization_id = :oid AND module_key = :mk AND status = 'active'
-        """, {"oid": org_id, "mk": module_key})
-
-        if active_module:
-            return {"has_access": True, "reason": None, "upgrade_prompt": None}
+    if module_key and module_key in entitlements["modules"]:
+        return {"has_access": True, "reason": None, "upgrade_prompt": None}
 
     # Access denied
     prompt = UPGRADE_PROMPTS.get(feature_enum, {"message": "Upgrade your plan to access this feature."})
@@ -199,13 +270,22 @@ def check_feature_access(org_id: str, feature: str) -> Dict[str, Any]:
     }
 
 
+def check_feature_access(org_id: str, feature: str) -> Dict[str, Any]:
+    """
+    Check if an organization has access to a feature.
+
+    Returns the same shape as evaluate_feature_access.
+    """
+    return evaluate_feature_access(get_org_entitlements(org_id), feature)
+
+
 def get_org_feature_access(org_id: str) -> Dict[str, bool]:
     """Get a full map of feature access for an org (for frontend feature gates)."""
-    result = {}
-    for feature in Feature:
-        access = check_feature_access(org_id, feature.value)
-        result[feature.value] = access["has_access"]
-    return result
+    entitlements = get_org_entitlements(org_id)
+    return {
+        feature.value: evaluate_feature_access(entitlements, feature)["has_access"]
+        for feature in Feature
+    }
 
 
 def require_module(feature_name: str):
@@ -275,21 +355,16 @@ def enforce_project_feature(project_id: str, feature_name: str):
 
     Individual projects (no org) are not module-gated and pass through.
     """
-    project = execute_single(
-        "SELECT organization_id FROM backlot_projects WHERE id = :pid",
-        {"pid": project_id},
-    )
+    org_id = _get_project_org_id(project_id)
 
-    if not project:
+    if org_id is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    org_id = project.get("organization_id")
-
     # Individual projects (no org) are not module-gated
     if not org_id:
         return
 
-    access = check_feature_access(str(org_id), feature_name)
+    access = check_feature_access(org_id, feature_name)
     if not access["has_access"]:
         prompt = access.get("upgrade_prompt", {})
         raise HTTPException(
@@ -0,0 +1,334 @@
+"""
+Gear Availability Service
+
+Date availability for gear assets, answered from gear_asset_bookings
+(migration 275): one row per booked asset holding the period as a tstzrange,
+kept in sync by triggers on rental orders, internal checkouts and work orders.
+
+- check_availability: which of N assets are free for [start_date, end_date],
+  with the conflicting bookings, in one query
+- get_availability_calendar: per-day availability of an org's whole inventory,
+  in one query
+
+Dates are inclusive whole days, matching the rental order columns. Internal
+checkouts are stored with their exact times and compared against the days in
+the caller's timezone; the other sources are date-based.
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, text
+
+from app.core.database import execute_query
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Longest range the calendar grid will build
+MAX_CALENDAR_DAYS = 92
+
+# Statuses that make an asset unavailable regardless of dates
+UNAVAILABLE_STATUSES = ("retired", "lost")
+
+# Conflict type -> reason, in the order they are reported
+CONFLICT_REASONS = {
+    "rental_order": "Already rented for these dates",
+    "internal_checkout": "Internal checkout scheduled for these dates",
+    "work_order": "Reserved for work order",
+    "blackout": "Blackout period",
+}
+
+
+# ============================================================================
+# SQL
+# ============================================================================
+
+# The requested window twice: as UTC days for date-based bookings, and as days
+# in :tz for internal checkouts. `span` covers both and drives the GiST index.
+_WINDOW_CTE = """
+    w AS (
+        SELECT d.days, l.local_days,
+               tstzrange(LEAST(lower(d.days), lower(l.local_days)),
+                         GREATEST(upper(d.days), upper(l.local_days)), '[)') AS span
+        FROM (SELECT gear_day_range(CAST(:start_date AS date), CAST(:end_date AS date)) AS days) d,
+             (SELECT tstzrange(CAST(:start_date AS timestamp) AT TIME ZONE :tz,
+                               (CAST(:end_date AS timestamp) + interval '1 day') AT TIME ZONE :tz,
+                               '[)') AS local_days) l
+    )
+"""
+
+# A booking blocks when it is a rental order (from any org), or another source
+# in the rental house's own org; pre-checkout work orders only block when the
+# org reserves dates for them.
+_BLOCKING_FILTER = """
+    (b.source_type = 'rental_order' OR b.organization_id = {org})
+    AND (b.source_type <> 'work_order' OR b.status = 'checked_out'
+         OR COALESCE(ms.work_order_reserves_dates, FALSE))
+"""
+
+_CHECK_SQL = text(
+    f"""
+    WITH {_WINDOW_CTE},
+    requested AS (
+        SELECT a.id, a.status::text AS status,
+               COALESCE(CAST(:org_id AS uuid), a.organization_id) AS org_id
+        FROM gear_assets a
+        WHERE a.id IN :asset_ids
+          AND (CAST(:owner_org_id AS uuid) IS NULL OR a.organization_id = CAST(:owner_org_id AS uuid))
+    )
+    SELECT r.id AS asset_id, r.status AS asset_status,
+           c.conflict_type, c.source_id, c.booking_status, c.starts_at, c.ends_at
+    FROM requested r
+    CROSS JOIN w
+    LEFT JOIN LATERAL (
+        SELECT b.source_type AS conflict_type, b.source_id, b.status AS booking_status,
+               lower(b.during) AS starts_at, upper(b.during) AS ends_at
+        FROM gear_asset_bookings b
+        LEFT JOIN gear_marketplace_settings ms ON ms.organization_id = b.organization_id
+        WHERE b.asset_id = r.id
+          AND b.during && w.span
+          AND b.during && CASE WHEN b.source_type = 'internal_checkout' THEN w.local_days ELSE w.days END
+          AND {_BLOCKING_FILTER.format(org="r.org_id")}
+
+        UNION ALL
+
+        SELECT 'blackout', ml.id, NULL,
+               bd.starts::timestamptz, (bd.ends + 1)::timestamptz
+        FROM gear_marketplace_listings ml
+        CROSS JOIN LATERAL (
+            SELECT CASE WHEN e->>'start' ~ '^[0-9]{{4}}-[0-9]{{2}}-[0-9]{{2}}$' THEN CAST(e->>'start' AS date) END AS starts,
+                   CASE WHEN e->>'end' ~ '^[0-9]{{4}}-[0-9]{{2}}-[0-9]{{2}}$' THEN CAST(e->>'end' AS date) END AS ends
+            FROM jsonb_array_elements(
+                CASE WHEN jsonb_typeof(ml.blackout_dates) = 'array' THEN ml.blackout_dates END
+            ) AS e
+        ) bd
+        WHERE ml.asset_id = r.id
+          AND ml.id IN :listing_ids
+          AND bd.starts <= CAST(:end_date AS date)
+          AND bd.ends >= CAST(:start_date AS date)
+    ) c ON TRUE
+    ORDER BY r.id, c.starts_at
+    """
+).bindparams(bindparam("asset_ids", expanding=True), bindparam("listing_ids", expanding=True))
+
+_CALENDAR_SQL = f"""
+    WITH {_WINDOW_CTE},
+    days AS (
+        SELECT g.day::date AS day,
+               gear_day_range(g.day::date, g.day::date) AS utc_day,
+               tstzrange(g.day AT TIME ZONE :tz, (g.day + interval '1 day') AT TIME ZONE :tz, '[)') AS local_day
+        FROM generate_series(CAST(:start_date AS timestamp), CAST(:end_date AS timestamp), interval '1 day') AS g(day)
+    ),
+    inventory AS (
+        SELECT a.id, a.name, a.internal_id, a.status::text AS status, a.category_id
+        FROM gear_assets a
+        WHERE a.organization_id = :org_id
+          AND a.is_active = TRUE
+          {{category_filter}}
+    ),
+    blocking AS (
+        SELECT b.asset_id, b.source_type, b.during
+        FROM gear_asset_bookings b
+        CROSS JOIN w
+        LEFT JOIN gear_marketplace_settings ms ON ms.organization_id = b.organization_id
+        WHERE b.asset_id IN (SELECT id FROM inventory)
+          AND b.during && w.span
+          AND {_BLOCKING_FILTER.format(org="CAST(:org_id AS uuid)")}
+    ),
+    booked AS (
+        SELECT bl.asset_id, d.day, array_agg(DISTINCT bl.source_type) AS sources
+        FROM blocking bl
+        JOIN days d
+          ON bl.during && CASE WHEN bl.source_type = 'internal_checkout' THEN d.local_day ELSE d.utc_day END
+        GROUP BY bl.asset_id, d.day
+    )
+    SELECT i.id AS asset_id, i.name, i.internal_id, i.status, i.category_id,
+           COALESCE(
+               jsonb_object_agg(bk.day::text, to_jsonb(bk.sources)) FILTER (WHERE bk.day IS NOT NULL),
+               jsonb_build_object()
+           ) AS booked_days
+    FROM inventory i
+    LEFT JOIN booked bk ON bk.asset_id = i.id
+    GROUP BY i.id, i.name, i.internal_id, i.status, i.category_id
+    ORDER BY i.name, i.id
+"""
+
+
+def unbooked_condition(asset_column: str, org_column: str) -> str:
+    """
+    SQL condition for list queries: the asset has no blocking booking between
+    :available_from and :available_to (inclusive dates, internal checkouts
+    compared in :tz). org_column is the rental house the asset is listed by.
+    """
+    return f"""
+        NOT EXISTS (
+            SELECT 1
+            FROM gear_asset_bookings b
+            LEFT JOIN gear_marketplace_settings ms ON ms.organization_id = b.organization_id
+            WHERE b.asset_id = {asset_column}
+              AND b.during && CASE
+                  WHEN b.source_type = 'internal_checkout' THEN
+                      tstzrange(CAST(:available_from AS timestamp) AT TIME ZONE :tz,
+                                (CAST(:available_to AS timestamp) + interval '1 day') AT TIME ZONE :tz, '[)')
+                  ELSE gear_day_range(CAST(:available_from AS date), CAST(:available_to AS date))
+              END
+              AND {_BLOCKING_FILTER.format(org=org_column)}
+        )
+    """
+
+
+# ============================================================================
+# AVAILABILITY CHECKS
+# ============================================================================
+
+def _unavailable_reason(asset_status: str, conflicts: List[Dict[str, Any]]) -> str:
+    """First blocking reason in report order, or "" when the asset is free."""
+    if asset_status in UNAVAILABLE_STATUSES:
+        return f"Asset is {asset_status}"
+    found = {c["type"] for c in conflicts}
+    for conflict_type, reason in CONFLICT_REASONS.items():
+        if conflict_type in found:
+            return reason
+    return ""
+
+
+def check_availability(
+    asset_ids: Iterable[str],
+    start_date: date,
+    end_date: date,
+    org_id: Optional[str] = None,
+    listing_ids: Iterable[str] = (),
+    tz: str = "UTC",
+    owner_org_id: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Check which assets are free for [start_date, end_date] (inclusive days).
+
+    org_id is the rental house whose internal checkouts, work orders and
+    settings apply; it defaults to each asset's own organization. Blackout
+    dates are checked for the given listings. With owner_org_id, assets of
+    other organizations are reported as not found.
+
+    Returns {asset_id: {"available", "reason", "conflicts"}} for every requested
+    id. Each conflict is {"type", "source_id", "status", "starts_at", "ends_at"}
+    with a half-open [starts_at, ends_at).
+    """
+    asset_ids = list(dict.fromkeys(str(a) for a in asset_ids if a))
+    if not asset_ids:
+        return {}
+
+    rows = execute_query(
+        _CHECK_SQL,
+        {
+            "asset_ids": asset_ids,
+            "listing_ids": [str(l) for l in listing_ids if l],
+            "start_date": start_date,
+            "end_date": end_date,
+            "org_id": org_id,
+            "owner_org_id": owner_org_id,
+            "tz": tz,
+        },
+    )
+
+    found: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        entry = found.setdefault(row["asset_id"], {"status": row["asset_status"], "conflicts": []})
+        if row["conflict_type"]:
+            entry["conflicts"].append({
+                "type": row["conflict_type"],
+                "source_id": row["source_id"],
+                "status": row["booking_status"],
+                "starts_at": row["starts_at"],
+                "ends_at": row["ends_at"],
+            })
+
+    results = {}
+    for asset_id in asset_ids:
+        entry = found.get(asset_id)
+        if entry is None:
+            results[asset_id] = {"available": False, "reason": "Asset not found", "conflicts": []}
+            continue
+        reason = _unavailable_reason(entry["status"], entry["conflicts"])
+        results[asset_id] = {"available": not reason, "reason": reason, "conflicts": entry["conflicts"]}
+    return results
+
+
+def check_asset_availability(
+    asset_id: str,
+    start_date: date,
+    end_date: date,
+    org_id: Optional[str] = None,
+    listing_id: Optional[str] = None,
+    tz: str = "UTC",
+) -> Dict[str, Any]:
+    """Single-asset form of check_availability."""
+    return check_availability(
+        [asset_id], start_date, end_date, org_id=org_id,
+        listing_ids=[listing_id] if listing_id else (), tz=tz,
+    )[str(asset_id)]
+
+
+# ============================================================================
+# CALENDAR
+# ============================================================================
+
+def get_availability_calendar(
+    org_id: str,
+    start_date: date,
+    end_date: date,
+    category_id: Optional[str] = None,
+    tz: str = "UTC",
+) -> Dict[str, Any]:
+    """
+    Per-day availability for an organization's active inventory.
+
+    Returns per-day totals plus each asset's booked days (sparse: only days
+    with a blocking booking, mapped to the booking types). Retired and lost
+    assets count as unavailable every day.
+    """
+    params = {"org_id": org_id, "start_date": start_date, "end_date": end_date, "tz": tz}
+    category_filter = ""
+    if category_id:
+        category_filter = "AND a.category_id = :category_id"
+        params["category_id"] = category_id
+
+    rows = execute_query(_CALENDAR_SQL.format(category_filter=category_filter), params)
+
+    day_count = (end_date - start_date).days + 1
+    days = [date.fromordinal(start_date.toordinal() + i).isoformat() for i in range(day_count)]
+    booked = dict.fromkeys(days, 0)
+    unavailable = 0
+
+    assets = []
+    for row in rows:
+        booked_days = row["booked_days"] or {}
+        if row["status"] in UNAVAILABLE_STATUSES:
+            unavailable += 1
+        else:
+            for day in booked_days:
+                if day in booked:
+                    booked[day] += 1
+        assets.append({
+            "asset_id": row["asset_id"],
+            "name": row["name"],
+            "internal_id": row["internal_id"],
+            "status": row["status"],
+            "category_id": row["category_id"],
+            "booked_days": booked_days,
+        })
+
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "total_assets": len(assets),
+        "days": [
+            {
+                "date": day,
+                "available": len(assets) - unavailable - booked[day],
+                "booked": booked[day],
+                "unavailable": unavailable,
+            }
+            for day in days
+        ],
+        "assets": assets,
+    }
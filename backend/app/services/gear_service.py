@@ -9,7 +9,12 @@ from datetime import datetime, date, timedelta, timezone
 from uuid import UUID
 import json
 
-from app.core.database import execute_query, execute_single, execute_insert, execute_update
+from sqlalchemy import bindparam, text
+
+from app.core.database import (
+    execute_query, execute_single, execute_insert, execute_update, get_db_session,
+    count_rows, decode_cursor, keyset_condition, keyset_page,
+)
 from app.core.logging import get_logger
 from app.core.storage import storage_client
 
@@ -250,11 +255,20 @@ def list_assets(
     parent_asset_id: str = None,  # 'none' for root assets only, UUID for accessories of specific parent
     include_accessory_count: bool = False,
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    cursor: str = None,
+    count: str = "exact"
 ) -> Dict[str, Any]:
-    """List assets with filtering."""
+    """
+    List assets with filtering, ordered by (name, id).
+
+    Given a cursor (next_cursor from the previous page) the page seeks past it
+    and offset is ignored. count is a count_rows() mode. Raises ValueError on
+    a bad cursor.
+    """
+    after = decode_cursor(cursor) if cursor else None
     conditions = ["a.organization_id = :org_id", "a.is_active = TRUE"]
-    params = {"org_id": org_id, "limit": limit, "offset": offset}
+    params = {"org_id": org_id, "limit": limit + 1, "offset": 0 if after else offset}
 
     if status:
         conditions.append("a.status = :status")
@@ -292,13 +306,12 @@ def list_assets(
         params["parent_asset_id"] = parent_asset_id
 
     where_clause = " AND ".join(conditions)
+    total = count_rows(f"SELECT 1 FROM gear_assets a WHERE {where_clause}", params, count)
 
-    # Get total count
-    count_result = execute_single(
-        f"SELECT COUNT(*) as total FROM gear_assets a WHERE {where_clause}",
-        params
-    )
-    total = count_result["total"] if count_result else 0
+    if after:
+        condition, cursor_params = keyset_condition("a.name", "a.id", after)
+        where_clause += f" AND {condition}"
+        params.update(cursor_params)
 
     # Build accessory count subquery if needed
     accessory_count_select = ""
@@ -319,13 +332,14 @@ def list_assets(
         LEFT JOIN profiles p ON p.id = a.current_custodian_user_id
         LEFT JOIN gear_assets pa ON pa.id = a.parent_asset_id
         WHERE {where_clause}
-        ORDER BY a.name
+        ORDER BY a.name, a.id
         LIMIT :limit OFFSET :offset
         """,
         params
     )
+    assets, next_cursor = keyset_page(assets, limit, "name")
 
-    return {"assets": assets, "total": total}
+    return {"assets": assets, "total": total, "next_cursor": next_cursor}
 
 
 def get_asset(asset_id: str, include_accessories: bool = False) -> Optional[Dict[str, Any]]:
@@ -852,144 +866,122 @@ def remove_nested_kit_from_instance(parent_kit_id: str, nested_kit_id: str) -> b
     return True
 
 
-def _cascade_accessory_checkout(asset_id: str, custodian_id: str) -> None:
-    """Cascade checkout status to all accessories of an equipment package."""
-    execute_update(
-        """
-        UPDATE gear_assets
-        SET status = 'checked_out',
-            current_custodian_user_id = :custodian_id,
-            updated_at = NOW()
-        WHERE parent_asset_id = :asset_id AND is_active = TRUE
-        """,
-        {"asset_id": asset_id, "custodian_id": custodian_id}
-    )
-
-
-def _cascade_accessory_checkin(asset_id: str) -> None:
-    """Cascade checkin status to all accessories of an equipment package."""
-    execute_update(
-        """
-        UPDATE gear_assets
-        SET status = 'available',
-            current_custodian_user_id = NULL,
-            current_location_id = COALESCE(default_home_location_id, current_location_id),
-            updated_at = NOW()
-        WHERE parent_asset_id = :asset_id AND is_active = TRUE
-        """,
-        {"asset_id": asset_id}
-    )
-
-
-def _cascade_kit_checkout(kit_id: str, custodian_id: str) -> None:
+# A checkout/checkin cascades to every kit nested under the transaction's
+# kits, every asset present in those kits, and the active accessories of each
+# asset (equipment packages). The closure is gathered in one recursive query;
+# UNION (not UNION ALL) dedups shared members and stops on membership cycles.
+_CASCADE_CLOSURE_SQL = text(
     """
-    Cascade checkout status to a kit and all its contents.
-    Updates the kit instance status and all assets within it (including nested kits).
+    WITH RECURSIVE kits(id) AS (
+        SELECT id FROM gear_kit_instances WHERE id IN :kit_ids
+        UNION
+        SELECT km.nested_kit_id
+        FROM gear_kit_memberships km
+        JOIN kits ON km.kit_instance_id = kits.id
+        WHERE km.nested_kit_id IS NOT NULL AND km.is_present = TRUE
+    ),
+    members(id) AS (
+        SELECT id FROM gear_assets WHERE id IN :asset_ids
+        UNION
+        SELECT km.asset_id
+        FROM gear_kit_memberships km
+        JOIN kits ON km.kit_instance_id = kits.id
+        WHERE km.asset_id IS NOT NULL AND km.is_present = TRUE
+    )
+    SELECT 'kit' AS kind, id FROM kits
+    UNION
+    SELECT 'asset' AS kind, id FROM members
+    UNION
+    SELECT 'asset' AS kind, ga.id
+    FROM gear_assets ga
+    JOIN members m ON ga.parent_asset_id = m.id
+    WHERE ga.is_active = TRUE
     """
-    # Update kit instance status
-    execute_update(
-        """
-        UPDATE gear_kit_instances
-        SET status = 'checked_out', updated_at = NOW()
-        WHERE id = :kit_id
-        """,
-        {"kit_id": kit_id}
-    )
-
-    # Get all direct assets in the kit
-    direct_assets = execute_query(
-        """
-        SELECT asset_id FROM gear_kit_memberships
-        WHERE kit_instance_id = :kit_id AND asset_id IS NOT NULL AND is_present = TRUE
-        """,
-        {"kit_id": kit_id}
-    )
-
-    # Update direct assets to checked_out (and their accessories)
-    for item in direct_assets:
-        if item.get("asset_id"):
-            execute_update(
-                """
-                UPDATE gear_assets
-                SET status = 'checked_out',
-                    current_custodian_user_id = :custodian_id,
-                    updated_at = NOW()
-                WHERE id = :asset_id
-                """,
-                {"asset_id": item["asset_id"], "custodian_id": custodian_id}
-            )
-            # Also cascade to accessories of this asset
-            _cascade_accessory_checkout(item["asset_id"], custodian_id)
-
-    # Get nested kits
-    nested_kits = execute_query(
-        """
-        SELECT nested_kit_id FROM gear_kit_memberships
-        WHERE kit_instance_id = :kit_id AND nested_kit_id IS NOT NULL AND is_present = TRUE
-        """,
-        {"kit_id": kit_id}
-    )
+).bindparams(bindparam("kit_ids", expanding=True), bindparam("asset_ids", expanding=True))
 
-    # Recursively cascade to nested kits (only one level deep due to 2-level limit)
-    for nested in nested_kits:
-        if nested.get("nested_kit_id"):
-            _cascade_kit_checkout(nested["nested_kit_id"], custodian_id)
+_CASCADE_KITS_SQL = text(
+    """
+    UPDATE gear_kit_instances
+    SET status = :status, updated_at = CURRENT_TIMESTAMP
+    WHERE id IN :ids
+    """
+).bindparams(bindparam("ids", expanding=True))
 
+_CASCADE_ASSETS_CHECKOUT_SQL = text(
+    """
+    UPDATE gear_assets
+    SET status = 'checked_out',
+        current_custodian_user_id = :custodian_id,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id IN :ids
+    """
+).bindparams(bindparam("ids", expanding=True))
 
-def _cascade_kit_checkin(kit_id: str) -> None:
+_CASCADE_ASSETS_CHECKIN_SQL = text(
     """
-    Cascade checkin status to a kit and all its contents.
-    Updates the kit instance status and all assets within it (including nested kits).
+    UPDATE gear_assets
+    SET status = 'available',
+        current_custodian_user_id = NULL,
+        current_location_id = COALESCE(default_home_location_id, current_location_id),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id IN :ids
     """
-    # Update kit instance status
-    execute_update(
-        """
-        UPDATE gear_kit_instances
-        SET status = 'available', updated_at = NOW()
-        WHERE id = :kit_id
-        """,
-        {"kit_id": kit_id}
-    )
+).bindparams(bindparam("ids", expanding=True))
+
+
+def _apply_cascade(
+    asset_ids: List[str],
+    kit_ids: List[str],
+    kit_status: str,
+    assets_sql,
+    params: Dict[str, Any],
+) -> Dict[str, List[str]]:
+    """Resolve the cascade closure, then one UPDATE per table in one transaction."""
+    affected = {"asset_ids": [], "kit_ids": []}
+    if not asset_ids and not kit_ids:
+        return affected
+
+    with get_db_session() as db:
+        rows = db.execute(
+            _CASCADE_CLOSURE_SQL,
+            {"asset_ids": list(asset_ids), "kit_ids": list(kit_ids)},
+        ).fetchall()
+        for kind, entity_id in rows:
+            affected[f"{kind}_ids"].append(str(entity_id))
+
+        if affected["kit_ids"]:
+            db.execute(_CASCADE_KITS_SQL, {"ids": affected["kit_ids"], "status": kit_status})
+        if affected["asset_ids"]:
+            db.execute(assets_sql, {"ids": affected["asset_ids"], **params})
+
+    return affected
+
+
+def _cascade_checkout(
+    custodian_id: str,
+    asset_ids: List[str] = (),
+    kit_ids: List[str] = (),
+) -> Dict[str, List[str]]:
+    """
+    Check out assets and kits along with everything inside them.
 
-    # Get all direct assets in the kit
-    direct_assets = execute_query(
-        """
-        SELECT asset_id FROM gear_kit_memberships
-        WHERE kit_instance_id = :kit_id AND asset_id IS NOT NULL AND is_present = TRUE
-        """,
-        {"kit_id": kit_id}
+    Covers nested kits, kit contents and equipment package accessories.
+    Returns the affected {"asset_ids", "kit_ids"} for the audit log.
+    """
+    return _apply_cascade(
+        asset_ids, kit_ids, "checked_out", _CASCADE_ASSETS_CHECKOUT_SQL, {"custodian_id": custodian_id}
     )
 
-    # Update direct assets to available (and their accessories)
-    for item in direct_assets:
-        if item.get("asset_id"):
-            execute_update(
-                """
-                UPDATE gear_assets
-                SET status = 'available',
-                    current_custodian_user_id = NULL,
-                    current_location_id = COALESCE(default_home_location_id, current_location_id),
-                    updated_at = NOW()
-                WHERE id = :asset_id
-                """,
-                {"asset_id": item["asset_id"]}
-            )
-            # Also cascade to accessories of this asset
-            _cascade_accessory_checkin(item["asset_id"])
-
-    # Get nested kits
-    nested_kits = execute_query(
-        """
-        SELECT nested_kit_id FROM gear_kit_memberships
-        WHERE kit_instance_id = :kit_id AND nested_kit_id IS NOT NULL AND is_present = TRUE
-        """,
-        {"kit_id": kit_id}
-    )
 
-    # Recursively cascade to nested kits
-    for nested in nested_kits:
-        if nested.get("nested_kit_id"):
-            _cascade_kit_checkin(nested["nested_kit_id"])
+def _cascade_checkin(
+    asset_ids: List[str] = (),
+    kit_ids: List[str] = (),
+) -> Dict[str, List[str]]:
+    """
+    Check in assets and kits along with everything inside them; assets go
+    back to their home location. Returns the affected IDs like _cascade_checkout.
+    """
+    return _apply_cascade(asset_ids, kit_ids, "available", _CASCADE_ASSETS_CHECKIN_SQL, {})
 
 
 def create_kit_instance(
@@ -1235,11 +1227,17 @@ def list_transactions(
     custodian_id: str = None,
     project_id: str = None,
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    cursor: str = None,
+    count: str = "exact"
 ) -> Dict[str, Any]:
-    """List transactions with filtering."""
+    """
+    List transactions with filtering, newest first by (initiated_at, id).
+    cursor and count work as in list_assets().
+    """
+    after = decode_cursor(cursor) if cursor else None
     conditions = ["t.organization_id = :org_id"]
-    params = {"org_id": org_id, "limit": limit, "offset": offset}
+    params = {"org_id": org_id, "limit": limit + 1, "offset": 0 if after else offset}
 
     if transaction_type:
         conditions.append("t.transaction_type = :tx_type")
@@ -1258,12 +1256,14 @@ def list_transactions(
         params["project_id"] = project_id
 
     where_clause = " AND ".join(conditions)
+    total = count_rows(f"SELECT 1 FROM gear_transactions t WHERE {where_clause}", params, count)
 
-    count_result = execute_single(
-        f"SELECT COUNT(*) as total FROM gear_transactions t WHERE {where_clause}",
-        params
-    )
-    total = count_result["total"] if count_result else 0
+    if after:
+        condition, cursor_params = keyset_condition(
+            "t.initiated_at", "t.id", after, desc=True, nullable=True
+        )
+        where_clause += f" AND {condition}"
+        params.update(cursor_params)
 
     transactions = execute_query(
         f"""
@@ -1274,13 +1274,14 @@ def list_transactions(
         LEFT JOIN profiles p ON p.id = t.initiated_by_user_id
         LEFT JOIN profiles cp ON cp.id = t.primary_custodian_user_id
         WHERE {where_clause}
-        ORDER BY t.initiated_at DESC
+        ORDER BY t.initiated_at DESC, t.id DESC
         LIMIT :limit OFFSET :offset
         """,
         params
     )
+    transactions, next_cursor = keyset_page(transactions, limit, "initiated_at")
 
-    return {"transactions": transactions, "total": total}
+    return {"transactions": transactions, "total": total, "next_cursor": next_cursor}
 
 
 def record_scan(
@@ -1330,31 +1331,18 @@ def complete_checkout(transaction_id: str, user_id: str) -> Dict[str, Any]:
         {"tx_id": transaction_id}
     )
 
-    # Update statuses for items
-    for item in tx.get("items", []):
-        # Handle individual assets (and their accessories if equipment package)
-        if item.get("asset_id"):
-            execute_update(
-                """
-                UPDATE gear_assets
-                SET status = 'checked_out',
-                    current_custodian_user_id = :custodian_id,
-                    updated_at = NOW()
-                WHERE id = :asset_id
-                """,
-                {
-                    "asset_id": item["asset_id"],
-                    "custodian_id": custodian_id
-                }
-            )
-            # Cascade to accessories of equipment packages
-            _cascade_accessory_checkout(item["asset_id"], custodian_id)
-
-        # Handle kit instances - cascade status to kit and all contents
-        if item.get("kit_instance_id"):
-            _cascade_kit_checkout(item["kit_instance_id"], custodian_id)
+    # Update statuses for items, cascading to kit contents and accessories
+    items = tx.get("items", [])
+    affected = _cascade_checkout(
+        custodian_id,
+        asset_ids=[item["asset_id"] for item in items if item.get("asset_id")],
+        kit_ids=[item["kit_instance_id"] for item in items if item.get("kit_instance_id")],
+    )
 
-    _log_audit(tx["organization_id"], "checkout_complete", "transaction", transaction_id, user_id)
+    _log_audit(
+        tx["organization_id"], "checkout_complete", "transaction", transaction_id, user_id,
+        changes=affected, transaction_id=transaction_id
+    )
 
     return get_transaction(transaction_id)
 
@@ -1375,29 +1363,17 @@ def complete_checkin(transaction_id: str, user_id: str) -> Dict[str, Any]:
         {"tx_id": transaction_id}
     )
 
-    # Update statuses for items
-    for item in tx.get("items", []):
-        # Handle individual assets (and their accessories if equipment package)
-        if item.get("asset_id"):
-            execute_update(
-                """
-                UPDATE gear_assets
-                SET status = 'available',
-                    current_custodian_user_id = NULL,
-                    current_location_id = COALESCE(default_home_location_id, current_location_id),
-                    updated_at = NOW()
-                WHERE id = :asset_id
-                """,
-                {"asset_id": item["asset_id"]}
-            )
-            # Cascade to accessories of equipment packages
-            _cascade_accessory_checkin(item["asset_id"])
-
-        # Handle kit instances - cascade status to kit and all contents
-        if item.get("kit_instance_id"):
-            _cascade_kit_checkin(item["kit_instance_id"])
+    # Update statuses for items, cascading to kit contents and accessories
+    items = tx.get("items", [])
+    affected = _cascade_checkin(
+        asset_ids=[item["asset_id"] for item in items if item.get("asset_id")],
+        kit_ids=[item["kit_instance_id"] for item in items if item.get("kit_instance_id")],
+    )
 
-    _log_audit(tx["organization_id"], "checkin_complete", "transaction", transaction_id, user_id)
+    _log_audit(
+        tx["organization_id"], "checkin_complete", "transaction", transaction_id, user_id,
+        changes=affected, transaction_id=transaction_id
+    )
 
     return get_transaction(transaction_id)
 
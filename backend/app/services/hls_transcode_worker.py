@@ -29,8 +29,6 @@ from app.services.video_pipeline import (
     VIDEO_PUBLISH_BUCKET,
 )
 
-import boto3
-
 # Configuration
 POLL_INTERVAL = 10  # seconds
 MAX_RETRIES = 3
@@ -205,6 +203,7 @@ def process_job(job: Dict) -> bool:
     print(f"  Source: s3://{source_bucket}/{source_key}")
     print(f"  Qualities: {qualities}")
 
+    import boto3
     s3_client = boto3.client("s3", region_name="us-east-1")
     version_id = uuid.uuid4().hex[:12]
 
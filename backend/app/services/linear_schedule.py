@@ -27,7 +27,8 @@ from datetime import datetime, timedelta, date
 from typing import Dict, Any, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
-from app.core.database import execute_query, execute_single
+from app.core.database import aexecute_query, aexecute_single, execute_update
+from app.core.event_buffer import Sink, event_buffer, utc_now, values_clause
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +45,7 @@ class LinearScheduleService:
     @staticmethod
     async def get_channel_by_slug(slug: str) -> Optional[Dict[str, Any]]:
         """Fetch a linear channel by its slug."""
-        channel = execute_single("""
+        channel = await aexecute_single("""
             SELECT
                 lc.*,
                 b.name as default_block_name,
@@ -60,7 +61,7 @@ class LinearScheduleService:
     @staticmethod
     async def get_channel_by_id(channel_id: str) -> Optional[Dict[str, Any]]:
         """Fetch a linear channel by ID."""
-        channel = execute_single("""
+        channel = await aexecute_single("""
             SELECT
                 lc.*,
                 b.name as default_block_name,
@@ -101,7 +102,7 @@ class LinearScheduleService:
 
         visibility_clause = f"visibility IN ({', '.join(visibility_filter)})"
 
-        channels = execute_query(f"""
+        channels = await aexecute_query(f"""
             SELECT
                 lc.id,
                 lc.slug,
@@ -170,7 +171,7 @@ class LinearScheduleService:
             return []
 
         # Get scheduled entries for this day
-        entries = execute_query("""
+        entries = await aexecute_query("""
             SELECT
                 cse.id as entry_id,
                 cse.block_id,
@@ -275,7 +276,7 @@ class LinearScheduleService:
         if not default_block_id:
             return []
 
-        block = execute_single("""
+        block = await aexecute_single("""
             SELECT id, slug, name, description, theme, computed_duration_seconds, thumbnail_url
             FROM blocks
             WHERE id = :block_id AND status = 'active'
@@ -496,7 +497,7 @@ class LinearScheduleService:
     @staticmethod
     async def get_block_items(block_id: str) -> List[Dict[str, Any]]:
         """Get all items in a block with resolved content details."""
-        items = execute_query("""
+        items = await aexecute_query("""
             SELECT
                 bi.id,
                 bi.block_id,
@@ -628,7 +629,7 @@ class LinearScheduleService:
             return None
 
         # Fetch the HLS manifest for this video asset
-        manifest = execute_single("""
+        manifest = await aexecute_single("""
             SELECT
                 hm.id,
                 hm.manifest_url,
@@ -676,7 +677,7 @@ class LinearScheduleService:
         Returns:
             Validation result with computed vs target duration and any warnings
         """
-        block = execute_single("""
+        block = await aexecute_single("""
             SELECT id, name, target_duration_seconds, computed_duration_seconds, status
             FROM blocks
             WHERE id = :block_id
@@ -726,7 +727,7 @@ class LinearScheduleService:
         Returns:
             New viewer count
         """
-        result = execute_single("""
+        result = await aexecute_single("""
             UPDATE linear_channels
             SET
                 current_viewers = GREATEST(0, current_viewers + :delta),
@@ -776,9 +777,7 @@ class LinearScheduleService:
         total_watch_seconds: int = 0
     ) -> None:
         """End a viewer session and decrement viewer count."""
-        from app.core.database import execute_update
-
-        result = execute_single("""
+        result = await aexecute_single("""
             UPDATE channel_viewer_sessions
             SET
                 ended_at = NOW(),
@@ -809,6 +808,10 @@ class LinearScheduleService:
         This creates/updates playback_sessions records that flow into
         the watch aggregation pipeline for creator earnings.
 
+        Both writes are buffered (see app.core.event_buffer): heartbeats of
+        a session coalesce into one update, and watch seconds for the same
+        session/episode are summed before the playback_sessions upsert.
+
         Args:
             session_id: The linear viewer session ID
             current_block_id: Current block being viewed
@@ -817,105 +820,120 @@ class LinearScheduleService:
             watch_seconds: Seconds watched since last heartbeat (typically 30s)
             viewer_id: User profile ID (for linking playback sessions)
         """
-        from app.core.database import execute_update
+        at = utc_now()
 
         # Update the linear viewer session
-        execute_update("""
-            UPDATE channel_viewer_sessions
-            SET
-                last_heartbeat_at = NOW(),
-                blocks_viewed = CASE
-                    WHEN :block_id IS NOT NULL AND NOT (:block_id = ANY(blocks_viewed))
-                    THEN array_append(blocks_viewed, :block_id::uuid)
-                    ELSE blocks_viewed
-                END
-            WHERE id = :session_id
-        """, {
+        event_buffer.emit(_viewer_heartbeat_sink.name, {
             "session_id": session_id,
-            "block_id": current_block_id
+            "block_ids": [current_block_id] if current_block_id else [],
+            "at": at,
         })
 
         # If we have episode/world info, track watch time in playback_sessions
         # This integrates linear viewing with the watch aggregation pipeline
         if episode_id and watch_seconds > 0:
-            await LinearScheduleService._track_linear_episode_watch(
-                session_id=session_id,
-                block_id=current_block_id,
-                episode_id=episode_id,
-                world_id=world_id,
-                watch_seconds=watch_seconds,
-                viewer_id=viewer_id
-            )
+            event_buffer.emit(_episode_watch_sink.name, {
+                # If the same viewer watches the same episode in the same session, we accumulate time
+                "session_token": f"linear:{session_id}:{episode_id}",
+                "session_id": session_id,
+                "viewer_id": viewer_id,
+                "episode_id": episode_id,
+                "world_id": world_id,
+                "block_id": current_block_id,
+                "watch_seconds": watch_seconds,
+                "at": at,
+            })
 
-    @staticmethod
-    async def _track_linear_episode_watch(
-        session_id: str,
-        block_id: Optional[str],
-        episode_id: str,
-        world_id: Optional[str],
-        watch_seconds: int,
-        viewer_id: Optional[str]
-    ) -> None:
-        """
-        Track per-episode watch time from linear viewing.
 
-        Creates or updates a playback_sessions record for the episode,
-        linked to the linear channel and block. This flows into the
-        watch aggregation pipeline for creator earnings calculation.
-        """
-        from app.core.database import execute_single
-
-        # Get channel_id from the viewer session
-        session_info = execute_single("""
-            SELECT channel_id FROM channel_viewer_sessions WHERE id = :session_id
-        """, {"session_id": session_id})
-
-        if not session_info:
-            logger.warning(f"linear_session_not_found: session_id={session_id}")
-            return
-
-        channel_id = session_info.get('channel_id')
-
-        # Upsert a playback session for this episode within the linear viewing context
-        # We use channel_id + episode_id + viewer_id as the logical key
-        # If the same viewer watches the same episode on the same channel, we accumulate time
-        execute_single("""
-            INSERT INTO playback_sessions (
-                user_id,
-                episode_id,
-                world_id,
-                channel_id,
-                block_id,
-                session_token,
-                started_at,
-                duration_watched_seconds,
-                last_heartbeat_at,
-                device_type,
-                status
-            ) VALUES (
-                :viewer_id,
-                :episode_id,
-                :world_id,
-                :channel_id,
-                :block_id,
-                :session_token,
-                NOW(),
-                :watch_seconds,
-                NOW(),
-                'linear',
-                'active'
+# =============================================================================
+# Buffered viewer heartbeats
+# =============================================================================
+
+def _merge_viewer_heartbeat(pending: dict, event: dict) -> dict:
+    blocks = pending["block_ids"] + [b for b in event["block_ids"] if b not in pending["block_ids"]]
+    return {**event, "block_ids": blocks}
+
+
+def _write_viewer_heartbeats(events: List[Dict[str, Any]]) -> None:
+    """Bump last_heartbeat_at and append newly seen blocks, one UPDATE per batch."""
+    values, params = values_clause(
+        events, ("session_id", "block_ids", "at"),
+        {"session_id": "uuid", "block_ids": "uuid[]", "at": "timestamptz"},
+    )
+    execute_update(f"""
+        UPDATE channel_viewer_sessions s
+        SET
+            last_heartbeat_at = GREATEST(s.last_heartbeat_at, v.at),
+            blocks_viewed = COALESCE(s.blocks_viewed, '{{}}') || ARRAY(
+                SELECT b FROM unnest(v.block_ids) WITH ORDINALITY AS t(b, n)
+                WHERE NOT (b = ANY(COALESCE(s.blocks_viewed, '{{}}')))
+                ORDER BY n
             )
-            ON CONFLICT (session_token) DO UPDATE SET
-                duration_watched_seconds = playback_sessions.duration_watched_seconds + :watch_seconds,
-                last_heartbeat_at = NOW(),
-                block_id = COALESCE(:block_id, playback_sessions.block_id)
-            RETURNING id
-        """, {
-            "viewer_id": viewer_id,
-            "episode_id": episode_id,
-            "world_id": world_id,
-            "channel_id": channel_id,
-            "block_id": block_id,
-            "session_token": f"linear:{session_id}:{episode_id}",
-            "watch_seconds": watch_seconds
-        })
+        FROM {values}
+        WHERE s.id = v.session_id
+    """, params)
+
+
+def _merge_episode_watch(pending: dict, event: dict) -> dict:
+    return {
+        **event,
+        "block_id": event["block_id"] or pending["block_id"],
+        "watch_seconds": pending["watch_seconds"] + event["watch_seconds"],
+    }
+
+
+def _write_episode_watch(events: List[Dict[str, Any]]) -> None:
+    """
+    Upsert per-episode playback_sessions rows for linear viewing.
+
+    Linked to the linear channel and block, so watch time flows into the
+    watch aggregation pipeline for creator earnings. Events for sessions
+    that no longer exist are skipped by the join.
+    """
+    values, params = values_clause(
+        events,
+        ("session_token", "session_id", "viewer_id", "episode_id", "world_id", "block_id", "watch_seconds", "at"),
+        {
+            "session_token": "text", "session_id": "uuid", "viewer_id": "uuid", "episode_id": "uuid",
+            "world_id": "uuid", "block_id": "uuid", "watch_seconds": "int", "at": "timestamptz",
+        },
+    )
+    execute_update(f"""
+        INSERT INTO playback_sessions (
+            user_id,
+            episode_id,
+            world_id,
+            channel_id,
+            block_id,
+            session_token,
+            started_at,
+            duration_watched_seconds,
+            last_heartbeat_at,
+            device_type,
+            status
+        )
+        SELECT
+            v.viewer_id, v.episode_id, v.world_id, s.channel_id, v.block_id,
+            v.session_token, v.at, v.watch_seconds, v.at, 'linear', 'active'
+        FROM {values}
+        JOIN channel_viewer_sessions s ON s.id = v.session_id
+        ON CONFLICT (session_token) DO UPDATE SET
+            duration_watched_seconds = playback_sessions.duration_watched_seconds + EXCLUDED.duration_watched_seconds,
+            last_heartbeat_at = GREATEST(playback_sessions.last_heartbeat_at, EXCLUDED.last_heartbeat_at),
+            block_id = COALESCE(EXCLUDED.block_id, playback_sessions.block_id)
+    """, params)
+
+
+_viewer_heartbeat_sink = event_buffer.register(Sink(
+    "linear_viewer_heartbeat",
+    write=_write_viewer_heartbeats,
+    key=lambda e: e["session_id"],
+    merge=_merge_viewer_heartbeat,
+))
+
+_episode_watch_sink = event_buffer.register(Sink(
+    "linear_episode_watch",
+    write=_write_episode_watch,
+    key=lambda e: e["session_token"],
+    merge=_merge_episode_watch,
+))
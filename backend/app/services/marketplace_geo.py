@@ -0,0 +1,159 @@
+"""
+Marketplace Geo Service
+
+SQL building blocks for proximity search over gear_marketplace_settings
+locations. Two interchangeable paths:
+
+- postgis: the generated location_geog column (migration 276), radius via
+  ST_DWithin and ordering via KNN `<->`, both on its GiST index
+- bbox: latitude/longitude bounding box on the coordinates index, then the
+  exact haversine_distance_miles() check, for databases without PostGIS
+
+Results are ordered by (distance key, id) and paged with opaque cursors.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core import database
+from app.core.database import execute_single
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+EARTH_RADIUS_MILES = 3959
+METERS_PER_MILE = 1609.344
+
+_postgis_available: Optional[bool] = None
+
+
+def postgis_enabled() -> bool:
+    """Whether to use the PostGIS path (MARKETPLACE_GEO_MODE, else detected once)."""
+    global _postgis_available
+    mode = settings.MARKETPLACE_GEO_MODE
+    if mode in ("postgis", "bbox"):
+        return mode == "postgis"
+    if _postgis_available is None:
+        try:
+            row = execute_single(
+                """
+                SELECT EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'gear_marketplace_settings' AND column_name = 'location_geog'
+                ) AS available
+                """
+            )
+            _postgis_available = bool(row and row["available"])
+        except Exception as e:
+            logger.warning(f"Marketplace PostGIS detection failed, using bbox: {e}")
+            return False
+        logger.info(f"Marketplace geo mode detected: postgis={_postgis_available}")
+    return _postgis_available
+
+
+def bounding_box(lat: float, lng: float, radius_miles: float) -> Dict[str, Any]:
+    """
+    Smallest lat/lng box containing the circle of radius_miles around a point.
+
+    Longitude bounds are None when the box reaches a pole (every longitude
+    qualifies), and wrap_lng is True when it crosses the antimeridian, in
+    which case min_lng > max_lng.
+    """
+    angular = radius_miles / EARTH_RADIUS_MILES
+    min_lat = lat - math.degrees(angular)
+    max_lat = lat + math.degrees(angular)
+    box = {"min_lat": max(min_lat, -90.0), "max_lat": min(max_lat, 90.0),
+           "min_lng": None, "max_lng": None, "wrap_lng": False}
+    if min_lat <= -90 or max_lat >= 90:
+        return box
+
+    spread = math.sin(angular) / math.cos(math.radians(lat))
+    if spread >= 1:
+        return box
+    delta_lng = math.degrees(math.asin(spread))
+    min_lng, max_lng = lng - delta_lng, lng + delta_lng
+    if min_lng < -180:
+        min_lng += 360
+        box["wrap_lng"] = True
+    elif max_lng > 180:
+        max_lng -= 360
+        box["wrap_lng"] = True
+    box.update(min_lng=min_lng, max_lng=max_lng)
+    return box
+
+
+@dataclass
+class Proximity:
+    """SQL fragments for one proximity search, all over the same alias."""
+    mode: str
+    distance: str  # distance in miles (double precision)
+    within: str    # radius condition
+    order: str     # sort key; ORDER BY it then id
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    def after(self, id_column: str, cursor: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Keyset condition for rows after a decoded cursor."""
+        if cursor.get("m") != self.mode:
+            raise ValueError("cursor is from a different search mode")
+        return (
+            f"({self.order}, {id_column}) > (:cursor_key, CAST(:cursor_id AS uuid))",
+            {"cursor_key": cursor["k"], "cursor_id": cursor["id"]},
+        )
+
+
+def proximity(lat: float, lng: float, radius_miles: float, alias: str = "ms") -> Proximity:
+    """Distance, radius filter and sort key for a search around (lat, lng)."""
+    params = {"user_lat": lat, "user_lng": lng, "radius_miles": radius_miles}
+
+    if postgis_enabled():
+        point = "ST_SetSRID(ST_MakePoint(:user_lng, :user_lat), 4326)::geography"
+        knn = f"({alias}.location_geog <-> {point})"
+        params["radius_meters"] = radius_miles * METERS_PER_MILE
+        return Proximity(
+            mode="postgis",
+            distance=f"({knn} / {METERS_PER_MILE})",
+            within=f"ST_DWithin({alias}.location_geog, {point}, :radius_meters)",
+            order=knn,
+            params=params,
+        )
+
+    distance = (
+        f"CAST(haversine_distance_miles(:user_lat, :user_lng, "
+        f"{alias}.location_latitude, {alias}.location_longitude) AS double precision)"
+    )
+    box = bounding_box(lat, lng, radius_miles)
+    conditions = [f"{alias}.location_latitude BETWEEN :min_lat AND :max_lat"]
+    params.update(min_lat=box["min_lat"], max_lat=box["max_lat"])
+    if box["min_lng"] is not None:
+        lng_op = "OR" if box["wrap_lng"] else "AND"
+        conditions.append(
+            f"({alias}.location_longitude >= :min_lng {lng_op} {alias}.location_longitude <= :max_lng)"
+        )
+        params.update(min_lng=box["min_lng"], max_lng=box["max_lng"])
+    conditions.append(f"{distance} <= :radius_miles")
+    return Proximity(
+        mode="bbox",
+        distance=distance,
+        within=" AND ".join(conditions),
+        order=distance,
+        params=params,
+    )
+
+
+# ============================================================================
+# CURSORS
+# ============================================================================
+
+def encode_cursor(mode: str, sort_key: float, row_id: str) -> str:
+    """Opaque cursor for the row a page ended on, tagged with the search mode."""
+    return database.encode_cursor(sort_key, row_id, m=mode)
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor from encode_cursor. Raises ValueError when malformed."""
+    data = database.decode_cursor(cursor)
+    try:
+        return {"m": str(data["m"]), "k": float(data["k"]), "id": data["id"]}
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"invalid cursor: {e}") from e
@@ -10,7 +10,6 @@ Provides operational tooling for the Second Watch Network platform:
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 import asyncio
-import boto3
 from botocore.exceptions import ClientError
 
 from app.core.database import execute_query, execute_single, execute_insert
@@ -113,6 +112,7 @@ async def _check_s3(check: Dict[str, Any]) -> None:
     if not bucket_name:
         raise Exception("No bucket specified")
 
+    import boto3
     s3 = boto3.client("s3")
     try:
         s3.head_bucket(Bucket=bucket_name)
@@ -131,6 +131,7 @@ async def _check_cognito(check: Dict[str, Any]) -> None:
     if not pool_id:
         raise Exception("No user pool ID specified")
 
+    import boto3
     cognito = boto3.client("cognito-idp", region_name=settings.COGNITO_REGION)
     try:
         cognito.describe_user_pool(UserPoolId=pool_id)
@@ -6,7 +6,6 @@ import io
 import base64
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date, time
-import httpx
 
 
 def _to_string(value: Any) -> str:
@@ -958,6 +957,7 @@ async def generate_call_sheet_pdf(
     logo_base64 = None
     if logo_url:
         try:
+            import httpx
             async with httpx.AsyncClient() as client:
                 response = await client.get(logo_url, timeout=10.0)
                 if response.status_code == 200:
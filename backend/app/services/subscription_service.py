@@ -11,6 +11,7 @@ from typing import Dict, Any, Optional, List
 from app.core.config import settings
 from app.core.database import execute_single, execute_insert, execute_query, execute_update
 from app.core.logging import get_logger
+from app.services.feature_gates import invalidate_org_entitlements
 
 logger = get_logger(__name__)
 
@@ -148,6 +149,7 @@ def activate_free_tier(org_id: str, profile_id: str) -> Dict[str, Any]:
         "bandwidth_gb": tier["bandwidth_gb"],
     })
 
+    invalidate_org_entitlements(org_id)
     _log_billing_event(org_id, "free_tier_activated", str(config_id))
 
     return {"success": True, "config_id": str(config_id), "tier": "free"}
@@ -327,6 +329,7 @@ def handle_subscription_activated(
         module_config = json.loads(module_config)
     _sync_modules_from_config(org_id, config_id, module_config)
 
+    invalidate_org_entitlements(org_id)
     _log_billing_event(org_id, "subscription_activated", config_id, old_status, "active", stripe_event_id)
 
     try:
@@ -372,6 +375,7 @@ def handle_payment_failed(
             WHERE id = :oid
         """, {"now": now, "oid": org_id})
 
+    invalidate_org_entitlements(org_id)
     _log_billing_event(org_id, "payment_failed", config_id, old_status, "past_due", stripe_event_id)
 
     try:
@@ -422,6 +426,7 @@ def handle_subscription_canceled(
         WHERE id = :oid
     """, {"oid": org_id})
 
+    invalidate_org_entitlements(org_id)
     _log_billing_event(org_id, "subscription_canceled", config_id, old_status, "canceled", stripe_event_id)
 
     try:
@@ -543,6 +548,7 @@ def modify_subscription(
     sync_limits_from_config(org_id, {**config_summary})
     _sync_modules_from_config(org_id, str(current["id"]), {"selected_modules": selected_modules, "use_bundle": use_bundle})
 
+    invalidate_org_entitlements(org_id)
     _log_billing_event(org_id, "plan_changed", str(current["id"]), metadata={
         "old_monthly_cents": current["monthly_total_cents"],
         "new_monthly_cents": quote["monthly_total_cents"],
@@ -637,6 +643,7 @@ def add_module(org_id: str, module_key: str, profile_id: str) -> Dict[str, Any]:
         "price": int(price * 100),
     })
 
+    invalidate_org_entitlements(org_id)
     _log_billing_event(org_id, "module_added", str(config["id"]), metadata={"module": module_key})
 
     return {"success": True, "module": module_key}
@@ -650,6 +657,7 @@ def remove_module(org_id: str, module_key: str) -> Dict[str, Any]:
         WHERE organization_id = :oid AND module_key = :mk AND status = 'active'
     """, {"oid": org_id, "mk": module_key})
 
+    invalidate_org_entitlements(org_id)
     _log_billing_event(org_id, "module_removed", metadata={"module": module_key})
 
     return {"success": True, "module": module_key}
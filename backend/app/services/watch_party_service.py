@@ -15,7 +15,8 @@ from datetime import datetime, timedelta
 from enum import Enum
 import secrets
 
-from app.core.database import execute_query, execute_single, execute_insert
+from app.core.database import execute_query, execute_single, execute_insert, execute_update
+from app.core.event_buffer import Sink, event_buffer, utc_now, values_clause
 
 
 class PartyStatus(str, Enum):
@@ -399,35 +400,29 @@ class WatchPartyService:
         user_id: str,
         position_ms: int
     ) -> Dict[str, Any]:
-        """Report individual participant's position for sync verification."""
-        execute_query("""
-            UPDATE watch_party_participants
-            SET
-                last_reported_position_ms = :position_ms,
-                last_heartbeat = NOW()
-            WHERE party_id = :party_id AND user_id = :user_id
-        """, {
+        """
+        Report individual participant's position for sync verification.
+
+        The write is buffered; only the latest report per participant is
+        applied (see _write_positions).
+        """
+        event = {
             "party_id": party_id,
             "user_id": user_id,
-            "position_ms": position_ms
-        })
+            "position_ms": position_ms,
+            "is_synced": None,
+            "offset_ms": None,
+            "at": utc_now(),
+        }
 
         # Check sync status (within 3 seconds of host)
         party_state = await WatchPartyService.get_playback_state(party_id)
         if party_state:
             offset = abs(position_ms - party_state["current_position_ms"])
-            is_synced = offset < 3000  # 3 second tolerance
+            event["is_synced"] = offset < 3000  # 3 second tolerance
+            event["offset_ms"] = offset
 
-            execute_query("""
-                UPDATE watch_party_participants
-                SET is_synced = :is_synced, sync_offset_ms = :offset
-                WHERE party_id = :party_id AND user_id = :user_id
-            """, {
-                "party_id": party_id,
-                "user_id": user_id,
-                "is_synced": is_synced,
-                "offset": offset
-            })
+        event_buffer.emit(_position_sink.name, event)
 
         return {"success": True}
 
@@ -695,3 +690,34 @@ class WatchPartyService:
         """Generate a unique invite code."""
         chars = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
         return "".join(secrets.choice(chars) for _ in range(8))
+
+# =============================================================================
+# Buffered position reports
+# =============================================================================
+
+def _write_positions(events: List[Dict[str, Any]]) -> None:
+    """Apply the latest position report of each participant in one UPDATE."""
+    values, params = values_clause(
+        events, ("party_id", "user_id", "position_ms", "is_synced", "offset_ms", "at"),
+        {
+            "party_id": "uuid", "user_id": "uuid", "position_ms": "bigint",
+            "is_synced": "boolean", "offset_ms": "int", "at": "timestamptz",
+        },
+    )
+    execute_update(f"""
+        UPDATE watch_party_participants p
+        SET
+            last_reported_position_ms = v.position_ms,
+            last_heartbeat = v.at,
+            is_synced = COALESCE(v.is_synced, p.is_synced),
+            sync_offset_ms = COALESCE(v.offset_ms, p.sync_offset_ms)
+        FROM {values}
+        WHERE p.party_id = v.party_id AND p.user_id = v.user_id
+    """, params)
+
+
+_position_sink = event_buffer.register(Sink(
+    "watch_party_position",
+    write=_write_positions,
+    key=lambda e: (e["party_id"], e["user_id"]),
+))
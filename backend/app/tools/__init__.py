@@ -0,0 +1,3 @@
+"""
+Developer tooling (lint checks, profilers) runnable with `python -m app.tools.<name>`.
+"""
@@ -0,0 +1,164 @@
+"""
+Lint check: synchronous database calls inside `async def`.
+
+The sync helpers in app.core.database (execute_query, execute_single, ...) and
+the Supabase-compat builders (client.table(...).execute()) block the event loop
+for the full DB round-trip. Inside an `async def` they should be replaced with
+the awaitable variants (aexecute_query, aexecute_single, ..., .aexecute()).
+
+Usage:
+    python -m app.tools.check_async_db                 # report findings
+    python -m app.tools.check_async_db --max-findings 0  # fail CI on any finding
+    python -m app.tools.check_async_db app/services/linear_schedule.py
+"""
+import argparse
+import ast
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+# Module-level helpers that block the event loop
+SYNC_DB_FUNCTIONS = {
+    "execute_query",
+    "execute_single",
+    "execute_insert",
+    "execute_update",
+    "execute_delete",
+}
+
+# Builder entry points whose chains end in a blocking .execute()
+BUILDER_ENTRY_POINTS = {"table", "rpc"}
+
+DEFAULT_ROOT = Path(__file__).resolve().parents[1]
+
+
+@dataclass
+class Finding:
+    path: str
+    line: int
+    function: str
+    call: str
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}: async def {self.function}() calls sync {self.call}"
+
+
+def _is_builder_execute(call: ast.Call) -> bool:
+    """True for `<...>.table(...)...execute()` / `<...>.rpc(...).execute()` chains."""
+    func = call.func
+    if not (isinstance(func, ast.Attribute) and func.attr == "execute"):
+        return False
+    node = func.value
+    while isinstance(node, (ast.Call, ast.Attribute)):
+        if isinstance(node, ast.Call):
+            inner = node.func
+            if isinstance(inner, ast.Attribute) and inner.attr in BUILDER_ENTRY_POINTS:
+                return True
+            node = inner
+        else:
+            node = node.value
+    return False
+
+
+def _sync_call_name(call: ast.Call) -> Optional[str]:
+    func = call.func
+    if isinstance(func, ast.Name) and func.id in SYNC_DB_FUNCTIONS:
+        return func.id
+    if isinstance(func, ast.Attribute) and func.attr in SYNC_DB_FUNCTIONS:
+        return func.attr
+    if _is_builder_execute(call):
+        return ".execute() on a query builder"
+    return None
+
+
+class _AsyncBodyVisitor(ast.NodeVisitor):
+    """Collects sync DB calls made directly in the body of one async function."""
+
+    def __init__(self, path: str, function: str):
+        self.path = path
+        self.function = function
+        self.findings: List[Finding] = []
+
+    def visit_Call(self, node: ast.Call) -> None:
+        name = _sync_call_name(node)
+        if name:
+            self.findings.append(Finding(self.path, node.lineno, self.function, name))
+        self.generic_visit(node)
+
+    # Nested defs/lambdas are typically handed to a threadpool
+    # (`await run_in_threadpool(execute_query, ...)` never calls it directly), so
+    # don't descend into them
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        return
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        return
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        return
+
+
+def check_source(source: str, path: str = "<string>") -> List[Finding]:
+    """Return sync DB calls made inside `async def` bodies in `source`."""
+    tree = ast.parse(source, filename=path)
+    findings: List[Finding] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.AsyncFunctionDef):
+            visitor = _AsyncBodyVisitor(path, node.name)
+            for stmt in node.body:
+                visitor.visit(stmt)
+            findings.extend(visitor.findings)
+    findings.sort(key=lambda f: f.line)
+    return findings
+
+
+def iter_python_files(paths: Iterable[Path]) -> Iterable[Path]:
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*.py") if "__pycache__" not in p.parts)
+        elif path.suffix == ".py":
+            yield path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Flag sync DB calls inside async def")
+    parser.add_argument("paths", nargs="*", type=Path, help="Files or directories (default: app/)")
+    parser.add_argument(
+        "--max-findings",
+        type=int,
+        default=None,
+        help="Exit non-zero if more findings than this (ratchet for CI)",
+    )
+    parser.add_argument("--summary", action="store_true", help="Only print per-file counts")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or [DEFAULT_ROOT]
+    findings: List[Finding] = []
+    for file_path in iter_python_files(paths):
+        try:
+            source = file_path.read_text(encoding="utf-8")
+            findings.extend(check_source(source, os.path.relpath(file_path)))
+        except SyntaxError as e:
+            print(f"{file_path}: could not parse ({e})", file=sys.stderr)
+
+    if args.summary:
+        counts = {}
+        for f in findings:
+            counts[f.path] = counts.get(f.path, 0) + 1
+        for path, count in sorted(counts.items(), key=lambda kv: -kv[1]):
+            print(f"{count:6d}  {path}")
+    else:
+        for f in findings:
+            print(f)
+
+    print(f"\n{len(findings)} sync DB call(s) inside async def", file=sys.stderr)
+
+    if args.max_findings is not None and len(findings) > args.max_findings:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
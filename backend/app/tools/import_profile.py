@@ -0,0 +1,346 @@
+"""
+Startup import profiler: what each module adds to init time and memory.
+
+Imports the target modules (default: app.main) in fresh interpreters - once
+under `-X importtime` for timing, once with tracemalloc and an import hook for
+memory - and reports per-module cumulative time and allocated memory. It then
+checks every first-party module's module-level third-party imports and flags
+the ones that are only used inside function bodies, i.e. could be moved into
+the functions that need them.
+
+Usage:
+    python -m app.tools.import_profile                        # profile app.main
+    python -m app.tools.import_profile app.services.excel_service --top 20
+    python -m app.tools.import_profile --max-ms 4000 --max-mb 120   # fail CI over budget
+    python -m app.tools.import_profile --json import_profile.json
+
+Environment variables are passed through, so LAZY_ROUTERS=true profiles the
+lazy-router startup path.
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+FIRST_PARTY = "app"
+
+# Runs in the child: wraps each loader's exec_module to record the
+# tracemalloc delta (cumulative, children included) of every module import.
+MEMORY_CHILD = r"""
+import importlib, json, sys, tracemalloc
+
+tracemalloc.start()
+memory = {}
+
+
+def _wrap(loader):
+    if isinstance(loader, type) or getattr(loader, "_import_profiled", False):
+        return
+    original = loader.exec_module
+
+    def exec_module(module):
+        before = tracemalloc.get_traced_memory()[0]
+        try:
+            original(module)
+        finally:
+            memory[module.__name__] = tracemalloc.get_traced_memory()[0] - before
+
+    try:
+        loader.exec_module = exec_module
+        loader._import_profiled = True
+    except (AttributeError, TypeError):
+        pass
+
+
+class _Profiler:
+    @classmethod
+    def find_spec(cls, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is cls or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    _wrap(spec.loader)
+                return spec
+        return None
+
+
+sys.meta_path.insert(0, _Profiler)
+for target in sys.argv[1:]:
+    importlib.import_module(target)
+sys.meta_path.remove(_Profiler)
+print(json.dumps({"memory": memory, "peak": tracemalloc.get_traced_memory()[1]}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+@dataclass
+class ModuleCost:
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    cumulative_kb: Optional[float] = None
+
+
+@dataclass
+class ModuleImport:
+    path: str
+    line: int
+    package: str
+    deferrable: bool
+
+
+@dataclass
+class PackageReport:
+    package: str
+    cumulative_ms: float
+    cumulative_kb: Optional[float]
+    importers: List[ModuleImport] = field(default_factory=list)
+
+    @property
+    def fully_deferrable(self) -> bool:
+        return bool(self.importers) and all(i.deferrable for i in self.importers)
+
+
+# ============================================================================
+# Measurement
+# ============================================================================
+
+def _run_child(args: List[str]) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=str(BACKEND_DIR))
+    proc = subprocess.run(
+        [sys.executable, *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"Import failed:\n{proc.stderr[-4000:]}")
+    return proc
+
+
+def measure_time(targets: List[str]) -> Dict[str, ModuleCost]:
+    # __import__ goes through the C import path that -X importtime instruments;
+    # importlib.import_module does not
+    code = "import sys\nfor t in sys.argv[1:]: __import__(t)"
+    proc = _run_child(["-X", "importtime", "-c", code, *targets])
+    costs = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, module = match.groups()
+            costs[module] = ModuleCost(module, int(self_us) / 1000, int(cumulative_us) / 1000)
+    return costs
+
+
+def measure_memory(targets: List[str]) -> Dict[str, int]:
+    proc = _run_child(["-c", MEMORY_CHILD, *targets])
+    return json.loads(proc.stdout.strip().splitlines()[-1])["memory"]
+
+
+# ============================================================================
+# Deferral audit
+# ============================================================================
+
+def _is_third_party(package: str) -> bool:
+    return (
+        package != FIRST_PARTY
+        and package != "__future__"
+        and package not in sys.stdlib_module_names
+    )
+
+
+def _module_path(module: str) -> Optional[Path]:
+    base = BACKEND_DIR.joinpath(*module.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+class _ImportTimeUses(ast.NodeVisitor):
+    """Collects names loaded while the module body runs (outside function bodies)."""
+
+    def __init__(self, lazy_annotations: bool):
+        self.lazy_annotations = lazy_annotations
+        self.used: Set[str] = set()
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Load):
+            self.used.add(node.id)
+
+    def _visit_signature(self, node) -> None:
+        # Decorators, defaults and (unless postponed) annotations run at def time
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        for default in node.args.defaults + [d for d in node.args.kw_defaults if d is not None]:
+            self.visit(default)
+        if not self.lazy_annotations:
+            args = node.args.posonlyargs + node.args.args + node.args.kwonlyargs
+            args += [a for a in (node.args.vararg, node.args.kwarg) if a is not None]
+            for arg in args:
+                if arg.annotation is not None:
+                    self.visit(arg.annotation)
+            if node.returns is not None:
+                self.visit(node.returns)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._visit_signature(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._visit_signature(node)
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        for default in node.args.defaults:
+            self.visit(default)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if node.value is not None:
+            self.visit(node.value)
+        if not self.lazy_annotations:
+            self.visit(node.annotation)
+
+
+def _module_level_imports(tree: ast.Module):
+    """Import statements that run with the module body (including try/if blocks)."""
+    pending = list(tree.body)
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            yield node
+        elif isinstance(node, (ast.Try, ast.If)):
+            pending.extend(node.body + node.orelse)
+            pending.extend(getattr(node, "finalbody", []))
+            for handler in getattr(node, "handlers", []):
+                pending.extend(handler.body)
+
+
+def audit_source(source: str, path: str = "<string>") -> List[ModuleImport]:
+    """Module-level third-party imports in `source`, and whether each could be deferred."""
+    tree = ast.parse(source, filename=path)
+    lazy_annotations = any(
+        isinstance(node, ast.ImportFrom) and node.module == "__future__"
+        and any(alias.name == "annotations" for alias in node.names)
+        for node in tree.body
+    )
+    uses = _ImportTimeUses(lazy_annotations)
+    for node in tree.body:
+        if not isinstance(node, (ast.Import, ast.ImportFrom)):
+            uses.visit(node)
+
+    found = []
+    for node in _module_level_imports(tree):
+        if isinstance(node, ast.ImportFrom):
+            if node.level or not node.module:
+                continue
+            package = node.module.split(".")[0]
+            bound = {alias.asname or alias.name for alias in node.names}
+        else:
+            package = node.names[0].name.split(".")[0]
+            bound = {(alias.asname or alias.name).split(".")[0] for alias in node.names}
+        if _is_third_party(package):
+            found.append(ModuleImport(path, node.lineno, package, deferrable=not (bound & uses.used)))
+    return found
+
+
+def audit_modules(modules: List[str]) -> List[ModuleImport]:
+    found = []
+    for module in modules:
+        if module != FIRST_PARTY and not module.startswith(FIRST_PARTY + "."):
+            continue
+        path = _module_path(module)
+        if path is None:
+            continue
+        try:
+            found.extend(audit_source(path.read_text(encoding="utf-8"), str(path.relative_to(BACKEND_DIR))))
+        except SyntaxError as e:
+            print(f"{path}: could not parse ({e})", file=sys.stderr)
+    return found
+
+
+def package_reports(costs: Dict[str, ModuleCost], imports: List[ModuleImport]) -> List[PackageReport]:
+    reports: Dict[str, PackageReport] = {}
+    for item in imports:
+        cost = costs.get(item.package)
+        if cost is None:
+            continue
+        report = reports.setdefault(
+            item.package, PackageReport(item.package, cost.cumulative_ms, cost.cumulative_kb)
+        )
+        report.importers.append(item)
+    return sorted(reports.values(), key=lambda r: -r.cumulative_ms)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile import time and memory of app modules")
+    parser.add_argument("targets", nargs="*", help="Modules to import (default: app.main)")
+    parser.add_argument("--top", type=int, default=30, help="Slowest modules to list")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the (slower) tracemalloc pass")
+    parser.add_argument("--max-ms", type=float, default=None, help="Exit non-zero if importing the targets takes longer")
+    parser.add_argument("--max-mb", type=float, default=None, help="Exit non-zero if importing the targets allocates more")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the full report here")
+    args = parser.parse_args(argv)
+
+    targets = args.targets or ["app.main"]
+    costs = measure_time(targets)
+    if not args.no_memory:
+        for module, delta in measure_memory(targets).items():
+            if module in costs:
+                costs[module].cumulative_kb = round(delta / 1024, 1)
+
+    total_ms = sum(costs[t].cumulative_ms for t in targets if t in costs)
+    kbs = [costs[t].cumulative_kb for t in targets if t in costs]
+    total_mb = sum(kb for kb in kbs if kb is not None) / 1024 if not args.no_memory else None
+
+    print(f"{'cumulative':>11}  {'self':>8}  {'memory':>9}  module")
+    for cost in sorted(costs.values(), key=lambda c: -c.cumulative_ms)[:args.top]:
+        memory = f"{cost.cumulative_kb / 1024:7.1f}MB" if cost.cumulative_kb is not None else f"{'-':>9}"
+        print(f"{cost.cumulative_ms:9.1f}ms  {cost.self_ms:6.1f}ms  {memory}  {cost.module}")
+
+    reports = package_reports(costs, audit_modules(sorted(costs)))
+    print("\nThird-party packages imported at module level by app code:")
+    for report in reports:
+        deferrable = sum(1 for i in report.importers if i.deferrable)
+        verdict = "deferrable" if report.fully_deferrable else f"{deferrable}/{len(report.importers)} deferrable"
+        print(f"{report.cumulative_ms:9.1f}ms  {report.package:<24} {verdict}")
+        for item in report.importers:
+            if item.deferrable:
+                print(f"             {item.path}:{item.line} only used inside functions")
+
+    memory_note = f", {total_mb:.1f}MB allocated" if total_mb is not None else ""
+    print(f"\nImporting {', '.join(targets)}: {total_ms:.0f}ms{memory_note}", file=sys.stderr)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({
+                "targets": targets,
+                "total_ms": round(total_ms, 1),
+                "total_mb": round(total_mb, 1) if total_mb is not None else None,
+                "modules": [asdict(c) for c in sorted(costs.values(), key=lambda c: -c.cumulative_ms)],
+                "packages": [
+                    {**asdict(r), "fully_deferrable": r.fully_deferrable} for r in reports
+                ],
+            }, f, indent=2)
+
+    failed = False
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"Import time budget exceeded: {total_ms:.0f}ms > {args.max_ms:.0f}ms", file=sys.stderr)
+        failed = True
+    if args.max_mb is not None and total_mb is not None and total_mb > args.max_mb:
+        print(f"Import memory budget exceeded: {total_mb:.1f}MB > {args.max_mb:.1f}MB", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Generate app/api/route_prefixes.json from the router manifest.
+
+Lazy router loading (LAZY_ROUTERS=true) decides which modules a request needs
+from the path prefixes recorded in route_prefixes.json, so it has to be kept
+in step with the routers. Imports every router in app.api.router_manifest.
+
+Usage:
+    python -m app.tools.route_manifest          # rewrite route_prefixes.json
+    python -m app.tools.route_manifest --check  # fail (exit 1) if it is stale
+"""
+import argparse
+import importlib
+import json
+import sys
+from typing import Dict, List
+
+from app.api.router_manifest import ROUTERS
+from app.core.routing import ROUTE_PREFIXES_PATH, load_route_prefixes, route_prefixes_for
+
+
+def build() -> Dict[str, List[str]]:
+    return {
+        module: route_prefixes_for(importlib.import_module(module).router, prefix)
+        for module, prefix, _ in ROUTERS
+    }
+
+
+def render(prefixes: Dict[str, List[str]]) -> str:
+    return json.dumps(prefixes, indent=2) + "\n"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate the lazy-router path prefix manifest")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if route_prefixes.json is out of date")
+    args = parser.parse_args(argv)
+
+    prefixes = build()
+
+    if args.check:
+        current = load_route_prefixes()
+        stale = sorted(m for m in set(prefixes) | set(current) if prefixes.get(m) != current.get(m))
+        for module in stale:
+            print(f"{module}: manifest {current.get(module)} != routes {prefixes.get(module)}")
+        if stale:
+            print("route_prefixes.json is stale - run: python -m app.tools.route_manifest")
+            return 1
+        print(f"route_prefixes.json is up to date ({len(prefixes)} routers)")
+        return 0
+
+    with open(ROUTE_PREFIXES_PATH, "w") as f:
+        f.write(render(prefixes))
+    print(f"Wrote {ROUTE_PREFIXES_PATH} ({len(prefixes)} routers)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
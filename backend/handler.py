@@ -14,6 +14,7 @@ import traceback
 from mangum import Mangum
 from app.main import app
 from app.core.logging import is_cold_start, get_process_age_ms
+from app.core.event_buffer import event_buffer
 
 # Create the Mangum adapter
 mangum_handler = Mangum(app, lifespan="off")
@@ -22,6 +23,14 @@ mangum_handler = Mangum(app, lifespan="off")
 _module_load_time = time.time()
 
 
+def _flush_event_buffer():
+    """Write buffered tracking events before Lambda freezes the container."""
+    try:
+        event_buffer.flush()
+    except Exception as e:
+        print(f"[LAMBDA] Event buffer flush failed: {e}", file=sys.stderr, flush=True)
+
+
 def handler(event, context):
     """
     Lambda entry point with performance instrumentation.
@@ -57,7 +66,9 @@ def handler(event, context):
             "headers": {"x-warmup-ping": "true"},
             "isBase64Encoded": False,
         }
-        return mangum_handler(warmup_event, context)
+        response = mangum_handler(warmup_event, context)
+        _flush_event_buffer()
+        return response
 
     try:
         # Extract request info
@@ -83,6 +94,10 @@ def handler(event, context):
         # Execute request
         response = mangum_handler(event, context)
 
+        # The background flush thread does not run while the container is
+        # frozen, so nothing may stay buffered past the invocation
+        _flush_event_buffer()
+
         # Calculate request duration
         request_end = time.time()
         handler_duration_ms = (request_end - request_start) * 1000
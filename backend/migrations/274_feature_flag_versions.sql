@@ -0,0 +1,42 @@
+-- Migration 274: Feature Flag Snapshot Versions
+-- Single-row version counter bumped by any change to feature_flags or
+-- feature_flag_targets. Processes keep an in-memory snapshot of all flags and
+-- targets and only reload it when the version moves: long-running servers
+-- LISTEN on 'feature_flags_changed', Lambdas poll the version row.
+
+CREATE TABLE IF NOT EXISTS feature_flag_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+INSERT INTO feature_flag_version (id, version) VALUES (TRUE, 1)
+ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_feature_flag_version()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+DECLARE
+    v_version BIGINT;
+BEGIN
+    UPDATE feature_flag_version
+    SET version = version + 1, updated_at = NOW()
+    WHERE id
+    RETURNING version INTO v_version;
+
+    -- Delivered on commit; listeners reload their snapshot
+    PERFORM pg_notify('feature_flags_changed', v_version::TEXT);
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_feature_flags_version ON feature_flags;
+CREATE TRIGGER trg_feature_flags_version
+    AFTER INSERT OR UPDATE OR DELETE ON feature_flags
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_feature_flag_version();
+
+DROP TRIGGER IF EXISTS trg_feature_flag_targets_version ON feature_flag_targets;
+CREATE TRIGGER trg_feature_flag_targets_version
+    AFTER INSERT OR UPDATE OR DELETE ON feature_flag_targets
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_feature_flag_version();
+
+COMMENT ON TABLE feature_flag_version IS 'Bumped on any feature flag/target change; drives in-process flag snapshot reloads';
@@ -0,0 +1,255 @@
+-- Migration 275: Gear Asset Bookings
+-- One row per (asset, booking source) holding the booked period as a
+-- tstzrange, kept in sync by triggers on rental orders, internal checkouts
+-- and work orders (and their item tables). Availability for any number of
+-- assets is then one GiST-indexed overlap query instead of a COUNT(*) per
+-- source per asset.
+--
+-- Only bookings that can block availability are stored:
+-- - rental_order      : confirmed .. in_use orders, whole days [start, end]
+-- - internal_checkout : pending/in_progress, not returned, scheduled with a
+--                       return time; kept as the exact [scheduled_at, expected_return_at]
+--                       so callers can compare against days in the viewer's timezone
+-- - work_order        : checked_out, or in_progress/ready (those only block
+--                       when the org's work_order_reserves_dates is on, which
+--                       is evaluated at query time)
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+CREATE TABLE IF NOT EXISTS gear_asset_bookings (
+    asset_id UUID NOT NULL REFERENCES gear_assets(id) ON DELETE CASCADE,
+    organization_id UUID NOT NULL,
+    source_type TEXT NOT NULL CHECK (source_type IN ('rental_order', 'internal_checkout', 'work_order')),
+    source_id UUID NOT NULL,
+    status TEXT NOT NULL,
+    during TSTZRANGE NOT NULL,
+    PRIMARY KEY (source_type, source_id, asset_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_gear_asset_bookings_asset_during
+    ON gear_asset_bookings USING GIST (asset_id, during);
+CREATE INDEX IF NOT EXISTS idx_gear_asset_bookings_org_during
+    ON gear_asset_bookings USING GIST (organization_id, during);
+
+-- Whole days [start_date, end_date] as a half-open range
+CREATE OR REPLACE FUNCTION gear_day_range(start_date DATE, end_date DATE)
+RETURNS TSTZRANGE LANGUAGE sql STABLE AS $$
+    SELECT tstzrange(start_date::timestamptz, (end_date + 1)::timestamptz, '[)')
+$$;
+
+-- ----------------------------------------------------------------------------
+-- Per-source refresh: replace the bookings of one order/transaction/work order
+-- ----------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION gear_refresh_rental_order_bookings(p_order_id UUID)
+RETURNS VOID LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM gear_asset_bookings WHERE source_type = 'rental_order' AND source_id = p_order_id;
+    INSERT INTO gear_asset_bookings (asset_id, organization_id, source_type, source_id, status, during)
+    SELECT DISTINCT ON (roi.asset_id)
+        roi.asset_id, ro.rental_house_org_id, 'rental_order', ro.id, ro.status::text,
+        gear_day_range(ro.rental_start_date, ro.rental_end_date)
+    FROM gear_rental_orders ro
+    JOIN gear_rental_order_items roi ON roi.order_id = ro.id
+    WHERE ro.id = p_order_id
+      AND roi.asset_id IS NOT NULL
+      AND ro.status::text IN ('confirmed', 'building', 'packed', 'ready_for_pickup', 'picked_up', 'in_use')
+      AND ro.rental_end_date >= ro.rental_start_date;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION gear_refresh_transaction_bookings(p_transaction_id UUID)
+RETURNS VOID LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM gear_asset_bookings WHERE source_type = 'internal_checkout' AND source_id = p_transaction_id;
+    INSERT INTO gear_asset_bookings (asset_id, organization_id, source_type, source_id, status, during)
+    SELECT DISTINCT ON (gti.asset_id)
+        gti.asset_id, gt.organization_id, 'internal_checkout', gt.id, gt.status::text,
+        tstzrange(gt.scheduled_at, gt.expected_return_at, '[]')
+    FROM gear_transactions gt
+    JOIN gear_transaction_items gti ON gti.transaction_id = gt.id
+    WHERE gt.id = p_transaction_id
+      AND gti.asset_id IS NOT NULL
+      AND gt.transaction_type::text = 'internal_checkout'
+      AND gt.status::text IN ('pending', 'in_progress')
+      AND gt.returned_at IS NULL
+      AND gt.scheduled_at IS NOT NULL
+      AND gt.expected_return_at IS NOT NULL
+      AND gt.expected_return_at >= gt.scheduled_at;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION gear_refresh_work_order_bookings(p_work_order_id UUID)
+RETURNS VOID LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM gear_asset_bookings WHERE source_type = 'work_order' AND source_id = p_work_order_id;
+    INSERT INTO gear_asset_bookings (asset_id, organization_id, source_type, source_id, status, during)
+    SELECT DISTINCT ON (woi.asset_id)
+        woi.asset_id, wo.organization_id, 'work_order', wo.id, wo.status,
+        gear_day_range(wo.pickup_date, wo.expected_return_date)
+    FROM gear_work_orders wo
+    JOIN gear_work_order_items woi ON woi.work_order_id = wo.id
+    WHERE wo.id = p_work_order_id
+      AND woi.asset_id IS NOT NULL
+      AND wo.status IN ('checked_out', 'in_progress', 'ready')
+      AND wo.pickup_date IS NOT NULL
+      AND wo.expected_return_date IS NOT NULL
+      AND wo.expected_return_date >= wo.pickup_date;
+END;
+$$;
+
+-- ----------------------------------------------------------------------------
+-- Triggers
+-- ----------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION gear_bookings_sync()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+DECLARE
+    v_new UUID;
+    v_old UUID;
+BEGIN
+    -- TG_ARGV[0]: which refresh; TG_ARGV[1]: column holding the source id
+    IF TG_OP <> 'DELETE' THEN
+        v_new := (to_jsonb(NEW) ->> TG_ARGV[1])::uuid;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        v_old := (to_jsonb(OLD) ->> TG_ARGV[1])::uuid;
+    END IF;
+
+    IF TG_ARGV[0] = 'rental_order' THEN
+        IF v_new IS NOT NULL THEN PERFORM gear_refresh_rental_order_bookings(v_new); END IF;
+        IF v_old IS NOT NULL AND v_old IS DISTINCT FROM v_new THEN PERFORM gear_refresh_rental_order_bookings(v_old); END IF;
+    ELSIF TG_ARGV[0] = 'internal_checkout' THEN
+        IF v_new IS NOT NULL THEN PERFORM gear_refresh_transaction_bookings(v_new); END IF;
+        IF v_old IS NOT NULL AND v_old IS DISTINCT FROM v_new THEN PERFORM gear_refresh_transaction_bookings(v_old); END IF;
+    ELSE
+        IF v_new IS NOT NULL THEN PERFORM gear_refresh_work_order_bookings(v_new); END IF;
+        IF v_old IS NOT NULL AND v_old IS DISTINCT FROM v_new THEN PERFORM gear_refresh_work_order_bookings(v_old); END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Item tables: statement level, so a statement touching N items of one order
+-- refreshes that order once instead of N times. Triggers with transition
+-- tables take a single event and no UPDATE OF column list, hence one trigger
+-- per event and the changed-column check below.
+CREATE OR REPLACE FUNCTION gear_item_bookings_sync()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+DECLARE
+    v_ids UUID[];
+    v_id UUID;
+BEGIN
+    -- TG_ARGV[0]: which refresh; TG_ARGV[1]: column holding the source id.
+    -- Transition tables: new_items (INSERT, UPDATE), old_items (UPDATE, DELETE)
+    IF TG_OP = 'INSERT' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %1$I) FROM new_items WHERE %1$I IS NOT NULL', TG_ARGV[1])
+        INTO v_ids;
+    ELSIF TG_OP = 'DELETE' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %1$I) FROM old_items WHERE %1$I IS NOT NULL', TG_ARGV[1])
+        INTO v_ids;
+    ELSE
+        -- Only items that moved to another source or changed asset matter
+        EXECUTE format(
+            'SELECT array_agg(DISTINCT v.source_id) FILTER (WHERE v.source_id IS NOT NULL)
+             FROM old_items o
+             JOIN new_items n ON n.id = o.id
+             CROSS JOIN LATERAL (VALUES (o.%1$I), (n.%1$I)) AS v(source_id)
+             WHERE (o.%1$I, o.asset_id) IS DISTINCT FROM (n.%1$I, n.asset_id)',
+            TG_ARGV[1]
+        ) INTO v_ids;
+    END IF;
+
+    FOREACH v_id IN ARRAY COALESCE(v_ids, '{}') LOOP
+        IF TG_ARGV[0] = 'rental_order' THEN
+            PERFORM gear_refresh_rental_order_bookings(v_id);
+        ELSIF TG_ARGV[0] = 'internal_checkout' THEN
+            PERFORM gear_refresh_transaction_bookings(v_id);
+        ELSE
+            PERFORM gear_refresh_work_order_bookings(v_id);
+        END IF;
+    END LOOP;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_gear_rental_orders_bookings ON gear_rental_orders;
+CREATE TRIGGER trg_gear_rental_orders_bookings
+    AFTER INSERT OR UPDATE OR DELETE ON gear_rental_orders
+    FOR EACH ROW EXECUTE FUNCTION gear_bookings_sync('rental_order', 'id');
+
+DROP TRIGGER IF EXISTS trg_gear_rental_order_items_bookings ON gear_rental_order_items;
+DROP TRIGGER IF EXISTS trg_gear_rental_order_items_bookings_insert ON gear_rental_order_items;
+CREATE TRIGGER trg_gear_rental_order_items_bookings_insert
+    AFTER INSERT ON gear_rental_order_items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION gear_item_bookings_sync('rental_order', 'order_id');
+DROP TRIGGER IF EXISTS trg_gear_rental_order_items_bookings_update ON gear_rental_order_items;
+CREATE TRIGGER trg_gear_rental_order_items_bookings_update
+    AFTER UPDATE ON gear_rental_order_items
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION gear_item_bookings_sync('rental_order', 'order_id');
+DROP TRIGGER IF EXISTS trg_gear_rental_order_items_bookings_delete ON gear_rental_order_items;
+CREATE TRIGGER trg_gear_rental_order_items_bookings_delete
+    AFTER DELETE ON gear_rental_order_items
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE FUNCTION gear_item_bookings_sync('rental_order', 'order_id');
+
+DROP TRIGGER IF EXISTS trg_gear_transactions_bookings ON gear_transactions;
+CREATE TRIGGER trg_gear_transactions_bookings
+    AFTER INSERT OR UPDATE OR DELETE ON gear_transactions
+    FOR EACH ROW EXECUTE FUNCTION gear_bookings_sync('internal_checkout', 'id');
+
+DROP TRIGGER IF EXISTS trg_gear_transaction_items_bookings ON gear_transaction_items;
+DROP TRIGGER IF EXISTS trg_gear_transaction_items_bookings_insert ON gear_transaction_items;
+CREATE TRIGGER trg_gear_transaction_items_bookings_insert
+    AFTER INSERT ON gear_transaction_items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION gear_item_bookings_sync('internal_checkout', 'transaction_id');
+DROP TRIGGER IF EXISTS trg_gear_transaction_items_bookings_update ON gear_transaction_items;
+CREATE TRIGGER trg_gear_transaction_items_bookings_update
+    AFTER UPDATE ON gear_transaction_items
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION gear_item_bookings_sync('internal_checkout', 'transaction_id');
+DROP TRIGGER IF EXISTS trg_gear_transaction_items_bookings_delete ON gear_transaction_items;
+CREATE TRIGGER trg_gear_transaction_items_bookings_delete
+    AFTER DELETE ON gear_transaction_items
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE FUNCTION gear_item_bookings_sync('internal_checkout', 'transaction_id');
+
+DROP TRIGGER IF EXISTS trg_gear_work_orders_bookings ON gear_work_orders;
+CREATE TRIGGER trg_gear_work_orders_bookings
+    AFTER INSERT OR UPDATE OR DELETE ON gear_work_orders
+    FOR EACH ROW EXECUTE FUNCTION gear_bookings_sync('work_order', 'id');
+
+DROP TRIGGER IF EXISTS trg_gear_work_order_items_bookings ON gear_work_order_items;
+DROP TRIGGER IF EXISTS trg_gear_work_order_items_bookings_insert ON gear_work_order_items;
+CREATE TRIGGER trg_gear_work_order_items_bookings_insert
+    AFTER INSERT ON gear_work_order_items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION gear_item_bookings_sync('work_order', 'work_order_id');
+DROP TRIGGER IF EXISTS trg_gear_work_order_items_bookings_update ON gear_work_order_items;
+CREATE TRIGGER trg_gear_work_order_items_bookings_update
+    AFTER UPDATE ON gear_work_order_items
+    REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+    FOR EACH STATEMENT EXECUTE FUNCTION gear_item_bookings_sync('work_order', 'work_order_id');
+DROP TRIGGER IF EXISTS trg_gear_work_order_items_bookings_delete ON gear_work_order_items;
+CREATE TRIGGER trg_gear_work_order_items_bookings_delete
+    AFTER DELETE ON gear_work_order_items
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT EXECUTE FUNCTION gear_item_bookings_sync('work_order', 'work_order_id');
+
+-- ----------------------------------------------------------------------------
+-- Backfill
+-- ----------------------------------------------------------------------------
+
+SELECT gear_refresh_rental_order_bookings(id) FROM gear_rental_orders
+WHERE status::text IN ('confirmed', 'building', 'packed', 'ready_for_pickup', 'picked_up', 'in_use');
+
+SELECT gear_refresh_transaction_bookings(id) FROM gear_transactions
+WHERE transaction_type::text = 'internal_checkout' AND status::text IN ('pending', 'in_progress') AND returned_at IS NULL;
+
+SELECT gear_refresh_work_order_bookings(id) FROM gear_work_orders
+WHERE status IN ('checked_out', 'in_progress', 'ready');
+
+COMMENT ON TABLE gear_asset_bookings IS 'Trigger-maintained booked periods per asset (rental orders, internal checkouts, work orders) for interval-indexed availability checks';
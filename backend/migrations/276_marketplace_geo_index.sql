@@ -0,0 +1,38 @@
+-- Migration 276: Marketplace Geo Index
+-- Indexed proximity search for the marketplace. When PostGIS is available,
+-- gear_marketplace_settings gets a generated geography point with a GiST index
+-- so radius filters use ST_DWithin and distance ordering uses KNN (<->).
+-- Without PostGIS the API falls back to a latitude/longitude bounding box on
+-- idx_gear_marketplace_settings_coords (migration 157) before the exact
+-- haversine check.
+
+DO $$
+BEGIN
+    CREATE EXTENSION IF NOT EXISTS postgis;
+EXCEPTION WHEN OTHERS THEN
+    RAISE NOTICE 'PostGIS not available (%), marketplace search will use the bounding-box path', SQLERRM;
+END;
+$$;
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'postgis') THEN
+        EXECUTE $sql$
+            ALTER TABLE gear_marketplace_settings
+            ADD COLUMN IF NOT EXISTS location_geog geography(Point, 4326)
+            GENERATED ALWAYS AS (
+                CASE WHEN location_latitude IS NOT NULL AND location_longitude IS NOT NULL
+                THEN ST_SetSRID(ST_MakePoint(location_longitude::float8, location_latitude::float8), 4326)::geography
+                END
+            ) STORED
+        $sql$;
+        EXECUTE 'CREATE INDEX IF NOT EXISTS idx_gear_marketplace_settings_geog
+                 ON gear_marketplace_settings USING GIST (location_geog)';
+        EXECUTE $sql$
+            COMMENT ON COLUMN gear_marketplace_settings.location_geog
+            IS 'Generated from location_latitude/location_longitude for ST_DWithin radius search and KNN ordering'
+        $sql$;
+    END IF;
+END;
+$$;
+
@@ -0,0 +1,87 @@
+-- Migration 277: Search Vectors
+-- Indexed search for the shared search layer (app/core/search.py), replacing
+-- ILIKE '%term%' scans. Each searchable table gets two generated columns:
+-- - search_vector : weighted tsvector for ranked full-text matching (GIN)
+-- - search_text   : lower-cased searchable fields for substring and fuzzy
+--                   word matching via pg_trgm (GIN gin_trgm_ops)
+-- Generated columns stay in sync without triggers.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- ----------------------------------------------------------------------------
+-- Profiles (community, directory, user search)
+-- ----------------------------------------------------------------------------
+
+ALTER TABLE profiles
+ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', COALESCE(full_name, '') || ' ' || COALESCE(display_name, '')), 'A') ||
+    setweight(to_tsvector('simple', COALESCE(username, '')), 'B')
+) STORED,
+ADD COLUMN IF NOT EXISTS search_text TEXT GENERATED ALWAYS AS (
+    lower(COALESCE(full_name, '') || ' ' || COALESCE(display_name, '') || ' ' || COALESCE(username, ''))
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_profiles_search_vector ON profiles USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_profiles_search_text_trgm ON profiles USING GIN (search_text gin_trgm_ops);
+
+-- ----------------------------------------------------------------------------
+-- Forum threads
+-- ----------------------------------------------------------------------------
+
+ALTER TABLE forum_threads
+ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE(content, '')), 'B')
+) STORED,
+ADD COLUMN IF NOT EXISTS search_text TEXT GENERATED ALWAYS AS (lower(COALESCE(title, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_forum_threads_search_vector ON forum_threads USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_forum_threads_search_text_trgm ON forum_threads USING GIN (search_text gin_trgm_ops);
+
+-- ----------------------------------------------------------------------------
+-- Content
+-- ----------------------------------------------------------------------------
+
+ALTER TABLE content
+ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', COALESCE(title, '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE(description, '')), 'B')
+) STORED,
+ADD COLUMN IF NOT EXISTS search_text TEXT GENERATED ALWAYS AS (lower(COALESCE(title, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_content_search_vector ON content USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_content_search_text_trgm ON content USING GIN (search_text gin_trgm_ops);
+
+-- ----------------------------------------------------------------------------
+-- CRM contacts and companies
+-- ----------------------------------------------------------------------------
+
+ALTER TABLE crm_contacts
+ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', COALESCE(first_name, '') || ' ' || COALESCE(last_name, '')), 'A') ||
+    setweight(to_tsvector('simple', COALESCE(company, '') || ' ' || COALESCE(email, '')), 'B') ||
+    setweight(to_tsvector('simple', COALESCE(website, '') || ' ' || COALESCE(phone, '')), 'C')
+) STORED,
+ADD COLUMN IF NOT EXISTS search_text TEXT GENERATED ALWAYS AS (
+    lower(
+        COALESCE(first_name, '') || ' ' || COALESCE(last_name, '') || ' ' ||
+        COALESCE(email, '') || ' ' || COALESCE(company, '') || ' ' ||
+        COALESCE(phone, '') || ' ' || COALESCE(website, '')
+    )
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_crm_contacts_search_vector ON crm_contacts USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_crm_contacts_search_text_trgm ON crm_contacts USING GIN (search_text gin_trgm_ops);
+
+ALTER TABLE crm_companies
+ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', COALESCE(name, '')), 'A') ||
+    setweight(to_tsvector('simple', COALESCE(website, '') || ' ' || COALESCE(city, '')), 'C')
+) STORED,
+ADD COLUMN IF NOT EXISTS search_text TEXT GENERATED ALWAYS AS (lower(COALESCE(name, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_crm_companies_search_vector ON crm_companies USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_crm_companies_search_text_trgm ON crm_companies USING GIN (search_text gin_trgm_ops);
+
+COMMENT ON COLUMN profiles.search_vector IS 'Generated: weighted name/username tsvector for app/core/search.py';
+COMMENT ON COLUMN profiles.search_text IS 'Generated: lower-cased names for trigram substring/fuzzy search';
@@ -0,0 +1,28 @@
+-- Migration 278: Keyset Pagination Indexes
+-- List endpoints page with (sort, id) cursors instead of OFFSET: each page is
+-- ORDER BY sort, id and seeks with WHERE (sort, id) > (last sort, last id).
+-- These composite indexes serve that seek directly, scoped by the column each
+-- list filters on, so a deep page costs the same as the first one.
+
+CREATE INDEX IF NOT EXISTS idx_notifications_user_created_keyset
+    ON notifications(user_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_messages_conversation_created_keyset
+    ON messages(conversation_id, created_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_community_posts_feed_keyset
+    ON community_posts(created_at DESC, id DESC)
+    WHERE is_hidden = false;
+
+CREATE INDEX IF NOT EXISTS idx_crm_contacts_created_keyset
+    ON crm_contacts(created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_crm_activities_date_keyset
+    ON crm_activities(activity_date DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_gear_assets_org_name_keyset
+    ON gear_assets(organization_id, name, id)
+    WHERE is_active = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_gear_transactions_org_initiated_keyset
+    ON gear_transactions(organization_id, initiated_at DESC, id DESC);
@@ -0,0 +1,127 @@
+"""
+Benchmark: API cold start, eager vs lazy router registration
+
+For each mode, starts a fresh interpreter under `python -X importtime`, imports
+app.main, and sends GET /health (then optionally one API path) through
+httpx's in-process ASGI transport with lifespan off, as Mangum runs it on
+Lambda. Reports wall time from process spawn to the first /health response,
+the app import time, and the slowest modules by cumulative import time.
+
+Writes to --out (default ./cold-start):
+- importtime-<mode>.txt : raw -X importtime output
+- cold_start.json       : the summary below, for CI artifacts / trend lines
+
+Usage:
+    python scripts/bench_cold_start.py [--runs 3] [--path /api/v1/backlot/projects] [--out cold-start]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CHILD = r"""
+import asyncio, json, sys, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+import httpx
+
+async def first_requests(path):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get("/health")
+        health = time.time()
+        path_ms = None
+        if path:
+            t = time.perf_counter()
+            await client.get(path)
+            path_ms = (time.perf_counter() - t) * 1000
+        return health, path_ms
+
+health_at, path_ms = asyncio.run(first_requests(sys.argv[1]))
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "health_at": health_at,
+    "path_ms": path_ms,
+}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def slowest_imports(importtime: str, top: int) -> list:
+    """Top-level-ish modules by cumulative import time (microseconds -> ms)."""
+    rows = []
+    for match in IMPORTTIME_LINE.finditer(importtime):
+        _, cumulative, indent, module = match.groups()
+        rows.append((int(cumulative), len(indent), module))
+    rows.sort(reverse=True)
+    return [
+        {"module": module, "cumulative_ms": round(us / 1000, 1), "depth": depth // 2}
+        for us, depth, module in rows[:top]
+    ]
+
+
+def run_once(mode: str, path: str) -> tuple:
+    env = dict(os.environ, LAZY_ROUTERS="true" if mode == "lazy" else "false")
+    spawned = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD, path or ""],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"{mode} run failed:\n{proc.stderr[-4000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["first_health_ms"] = (result.pop("health_at") - spawned) * 1000
+    return result, proc.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark, eager vs lazy routers")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--path", default="", help="API path to request after /health (e.g. /api/v1/backlot/projects)")
+    parser.add_argument("--top", type=int, default=25, help="Slowest imports to record")
+    parser.add_argument("--out", default="cold-start")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    summary = {"python": sys.version.split()[0], "runs": args.runs, "path": args.path or None, "modes": {}}
+
+    print(f"{'mode':>6}  {'import':>9}  {'1st /health':>11}  {'1st path':>9}")
+    for mode in ("eager", "lazy"):
+        results = []
+        for _ in range(args.runs):
+            result, importtime = run_once(mode, args.path)
+            results.append(result)
+        # Keep the last run's -X importtime log
+        with open(os.path.join(args.out, f"importtime-{mode}.txt"), "w") as f:
+            f.write(importtime)
+
+        def median(key):
+            values = [r[key] for r in results if r[key] is not None]
+            return round(statistics.median(values), 1) if values else None
+
+        stats = {
+            "import_ms": median("import_ms"),
+            "first_health_ms": median("first_health_ms"),
+            "first_path_ms": median("path_ms"),
+            "slowest_imports": slowest_imports(importtime, args.top),
+        }
+        summary["modes"][mode] = stats
+        path_col = f"{stats['first_path_ms']:8.0f}ms" if stats["first_path_ms"] is not None else f"{'-':>9}"
+        print(f"{mode:>6}  {stats['import_ms']:7.0f}ms  {stats['first_health_ms']:9.0f}ms  {path_col}")
+
+    with open(os.path.join(args.out, "cold_start.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"Wrote {args.out}/cold_start.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Shared fixtures for backend tests
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+
+from app.core import database
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """Point app.core.database at a scratch SQLite file with an `items` table."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        # Straight to the driver so it doesn't show up in request DB stats
+        conn.connection.dbapi_connection.execute("BEGIN")
+
+    database._register_stats_listeners(engine)
+    monkeypatch.setattr(database, "_engine", engine)
+    monkeypatch.setattr(database, "_SessionLocal", None)
+    database.execute_update("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)", {})
+    yield engine
+    engine.dispose()
@@ -0,0 +1,54 @@
+"""
+Tests for the async DB helpers and the sync-call-in-async lint check
+"""
+
+from app.core.database import _async_text, _get_async_database_url
+from app.tools.check_async_db import check_source
+
+
+class TestAsyncText:
+    def test_tuple_params_become_expanding(self):
+        stmt = _async_text("SELECT * FROM t WHERE id IN :ids", {"ids": ("a", "b")})
+        assert stmt._bindparams["ids"].expanding is True
+
+    def test_list_params_stay_arrays(self):
+        stmt = _async_text("SELECT * FROM t WHERE id = ANY(:ids)", {"ids": ["a", "b"]})
+        assert stmt._bindparams["ids"].expanding is False
+
+    def test_url_uses_asyncpg_and_ssl(self, monkeypatch):
+        monkeypatch.setattr(
+            "app.core.database._get_database_url",
+            lambda: "postgresql://u:p@db:5432/swn?sslmode=require",
+        )
+        url = _get_async_database_url()
+        assert url.drivername == "postgresql+asyncpg"
+        assert url.query == {"ssl": "require"}
+
+
+class TestCheckAsyncDb:
+    def test_flags_sync_helpers_in_async_def(self):
+        source = '''
+async def handler():
+    row = execute_single("SELECT 1")
+    rows = client.table("profiles").select("*").eq("id", 1).execute()
+    return row, rows
+'''
+        findings = check_source(source)
+        assert [f.line for f in findings] == [3, 4]
+        assert findings[0].call == "execute_single"
+
+    def test_ignores_sync_def_and_awaited_variants(self):
+        source = '''
+def sync_handler():
+    return execute_query("SELECT 1")
+
+async def handler():
+    rows = await aexecute_query("SELECT 1")
+    data = await client.table("profiles").select("*").aexecute()
+
+    def in_thread():
+        return execute_query("SELECT 1")
+
+    return rows, data, in_thread
+'''
+        assert check_source(source) == []
@@ -0,0 +1,163 @@
+"""
+Tests for the verified-token / profile cache behind get_current_user and the
+request-scoped identity memo
+"""
+
+import asyncio
+import time
+
+import jwt
+import pytest
+from fastapi import Depends, FastAPI, Header
+from fastapi.testclient import TestClient
+
+from app.core import auth, cache, database
+from app.core.cognito import CognitoAuth
+
+
+def make_token(exp_in: float, sub: str = "cognito-1") -> str:
+    return jwt.encode({"sub": sub, "exp": int(time.time() + exp_in)}, "test-secret", algorithm="HS256")
+
+
+class FakeClient:
+    """Answers the profiles lookups get_current_user makes."""
+
+    def __init__(self):
+        self.lookups = 0
+        self.profile = {"id": "profile-1", "full_name": "Ada", "is_admin": False, "is_staff": False, "role": None}
+
+    def table(self, name):
+        client = self
+
+        class Query:
+            def select(self, *args):
+                return self
+
+            def eq(self, *args):
+                return self
+
+            def execute(self):
+                client.lookups += 1
+                return type("Response", (), {"data": [dict(client.profile)]})()
+
+        return Query()
+
+
+@pytest.fixture
+def fake_auth(monkeypatch):
+    calls = {"verify": 0}
+
+    def verify_token(token):
+        calls["verify"] += 1
+        return {"id": "cognito-1", "email": "ada@example.com"}
+
+    client = FakeClient()
+    monkeypatch.setattr(CognitoAuth, "verify_token", staticmethod(verify_token))
+    monkeypatch.setattr(database, "get_client", lambda: client)
+    monkeypatch.setattr(cache, "_shared_backend", cache.MemoryBackend())
+    auth.clear_auth_cache()
+    yield calls, client
+    auth.clear_auth_cache()
+
+
+def current_user(token):
+    return asyncio.run(auth.get_current_user(None, f"Bearer {token}"))
+
+
+class TestAuthCache:
+    def test_repeat_requests_skip_verify_and_profile_lookup(self, fake_auth):
+        calls, client = fake_auth
+        token = make_token(3600)
+
+        first = current_user(token)
+        first["annotated"] = True
+        second = current_user(token)
+
+        assert second["id"] == "profile-1"
+        assert "annotated" not in second
+        assert calls["verify"] == 1
+        assert client.lookups == 1
+
+    def test_invalidate_reloads_profile(self, fake_auth):
+        calls, client = fake_auth
+        token = make_token(3600)
+        current_user(token)
+
+        client.profile["is_admin"] = True
+        auth.invalidate_user_cache("profile-1")
+
+        assert current_user(token)["is_admin"] is True
+        assert client.lookups == 2
+
+    def test_shared_tier_serves_other_processes(self, fake_auth):
+        calls, client = fake_auth
+        token = make_token(3600)
+        current_user(token)
+
+        # A different warm container: empty local cache, same shared tier
+        auth.clear_auth_cache()
+        current_user(token)
+
+        assert calls["verify"] == 1
+        assert client.lookups == 1
+
+    def test_entries_never_outlive_token_exp(self, fake_auth):
+        calls, client = fake_auth
+        token = make_token(-5)
+
+        current_user(token)
+        current_user(token)
+
+        assert calls["verify"] == 2
+
+
+class TestRequestIdentityMemo:
+    @pytest.fixture
+    def app(self):
+        app = FastAPI()
+
+        @app.middleware("http")
+        async def identity_scope(request, call_next):
+            # Same scope RequestContextMiddleware opens in app.main
+            auth.start_request_identity_scope()
+            return await call_next(request)
+
+        @app.get("/me")
+        async def me(authorization: str = Header(None), user=Depends(auth.get_current_user)):
+            # Inline resolutions the way the routers do it, plus a helper's
+            again = await auth.get_current_user_from_token(authorization)
+            await auth.get_current_user_from_token(authorization)
+            return {"id": again["id"], "resolutions": auth.get_request_identity_scope()["resolutions"]}
+
+        @app.get("/cognito")
+        async def cognito(authorization: str = Header(None)):
+            first = await auth.get_cognito_user_from_token(authorization)
+            await auth.get_cognito_user_from_token(authorization)
+            return {"id": first["id"], "resolutions": auth.get_request_identity_scope()["resolutions"]}
+
+        return app
+
+    def test_identity_resolves_at_most_once_per_request(self, app, fake_auth):
+        calls, client = fake_auth
+        headers = {"Authorization": f"Bearer {make_token(3600)}"}
+
+        with TestClient(app) as http:
+            for _ in range(2):
+                # Cold token cache each time: only the request memo can dedupe
+                auth.clear_auth_cache()
+                cache._shared_backend = cache.MemoryBackend()
+                body = http.get("/me", headers=headers).json()
+                assert body == {"id": "profile-1", "resolutions": 1}
+
+        assert calls["verify"] == 2
+        assert client.lookups == 2
+
+    def test_cognito_identity_resolves_once_per_request(self, app, fake_auth):
+        calls, _ = fake_auth
+        auth.clear_auth_cache()
+
+        with TestClient(app) as http:
+            body = http.get("/cognito", headers={"Authorization": f"Bearer {make_token(-5)}"}).json()
+
+        assert body == {"id": "cognito-1", "resolutions": 1}
+        assert calls["verify"] == 1
@@ -0,0 +1,140 @@
+"""
+Tests for effective Backlot view config resolution and its per-project cache
+"""
+
+import asyncio
+
+import pytest
+
+from app.core import backlot_permissions, cache, database
+from app.core.backlot_permissions import (
+    DEFAULT_VIEW_CONFIGS,
+    get_effective_view_config,
+    invalidate_permission_cache,
+    resolve_view_config,
+)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestResolveViewConfig:
+    def test_owner_wins_over_everything(self):
+        config = resolve_view_config({"is_owner": True, "org_role": "collaborative", "backlot_role": "crew"})
+        assert config["access_type"] == "owner"
+        assert config["tabs"] == DEFAULT_VIEW_CONFIGS["showrunner"]["tabs"]
+
+    def test_org_admin_and_collaborative(self):
+        admin = resolve_view_config({"organization_id": "org-1", "org_role": "admin"})
+        assert admin["access_type"] == "org_admin"
+        assert admin["organization_id"] == "org-1"
+
+        tabs = {"schedule": {"view": True, "edit": False}}
+        collab = resolve_view_config({
+            "organization_id": "org-1",
+            "org_role": "collaborative",
+            "has_org_project_access": True,
+            "org_tab_permissions": tabs,
+        })
+        assert collab["access_type"] == "org_collaborative"
+        assert collab["tabs"] == tabs
+
+        # Collaborative without a project grant falls through to the member flow
+        assert resolve_view_config({"org_role": "collaborative"})["access_type"] == "member"
+
+    def test_external_seats(self):
+        freelancer = resolve_view_config({
+            "external_seat": {"seat_type": "project", "can_timecard": True, "can_expense": False},
+        })
+        assert freelancer["role"] == "freelancer"
+        assert freelancer["tabs"]["receipts"] == {"view": False, "edit": False}
+
+        client = resolve_view_config({
+            "external_seat": {"seat_type": "view_only", "tab_permissions": {"overview": True, "budget": False}},
+        })
+        assert client["tabs"] == {"overview": {"view": True, "edit": False}, "budget": {"view": False, "edit": False}}
+
+    def test_member_merges_profile_then_override(self):
+        config = resolve_view_config({
+            "backlot_role": "dp",
+            "profile_config": {"tabs": {"budget": {"view": True, "edit": False}}},
+            "override_config": {"tabs": {"budget": {"view": True, "edit": True}}},
+        })
+        assert config["role"] == "dp"
+        assert config["has_overrides"] is True
+        assert config["tabs"]["budget"] == {"view": True, "edit": True}
+
+    def test_no_facts_resolves_to_crew(self):
+        config = resolve_view_config({})
+        assert config["role"] == "crew"
+        assert config["has_overrides"] is False
+
+
+@pytest.fixture
+def facts(monkeypatch):
+    calls = []
+    state = {"backlot_role": "editor"}
+
+    def fetch(project_id, user_id):
+        calls.append((project_id, user_id))
+        return dict(state)
+
+    monkeypatch.setattr(backlot_permissions, "_fetch_access_facts", fetch)
+    monkeypatch.setattr(cache, "_shared_backend", cache.MemoryBackend())
+    backlot_permissions._permission_cache.clear()
+    yield calls, state
+    backlot_permissions._permission_cache.clear()
+
+
+class TestPermissionCache:
+    def test_hits_until_invalidated(self, facts):
+        calls, state = facts
+        assert run(get_effective_view_config("p1", "u1"))["role"] == "editor"
+        assert run(get_effective_view_config("p1", "u1"))["role"] == "editor"
+        assert len(calls) == 1
+
+        state["backlot_role"] = "producer"
+        invalidate_permission_cache("p1", "u1")
+        assert run(get_effective_view_config("p1", "u1"))["role"] == "producer"
+        assert len(calls) == 2
+
+    def test_invalidation_scopes(self, facts):
+        calls, _ = facts
+        for key in (("p1", "u1"), ("p1", "u2"), ("p2", "u1"), ("p2", "u2")):
+            run(get_effective_view_config(*key))
+        assert len(calls) == 4
+
+        invalidate_permission_cache("p1")
+        for key in (("p1", "u1"), ("p1", "u2"), ("p2", "u1"), ("p2", "u2")):
+            run(get_effective_view_config(*key))
+        assert calls[4:] == [("p1", "u1"), ("p1", "u2")]
+
+        invalidate_permission_cache(user_id="u2")
+        for key in (("p1", "u1"), ("p1", "u2"), ("p2", "u1"), ("p2", "u2")):
+            run(get_effective_view_config(*key))
+        assert calls[6:] == [("p1", "u2"), ("p2", "u2")]
+
+    def test_remote_invalidation_via_shared_versions(self, facts):
+        # Another container bumped the version counter; our local entry is stale
+        calls, _ = facts
+        run(get_effective_view_config("p1", "u1"))
+        cache.get_shared_backend().incr("swn:perm:v:p:p1")
+        run(get_effective_view_config("p1", "u1"))
+        assert len(calls) == 2
+
+    def test_callers_get_copies(self, facts):
+        config = run(get_effective_view_config("p1", "u1"))
+        config["tabs"]["overview"]["view"] = "tampered"
+        assert run(get_effective_view_config("p1", "u1"))["tabs"]["overview"]["view"] is True
+
+    def test_invalidates_again_when_transaction_ends(self, facts, sqlite_db):
+        # A read racing the write can re-cache pre-commit state; the
+        # post-transaction bump drops it
+        calls, _ = facts
+        uow = database.begin_unit_of_work()
+        invalidate_permission_cache("p1", "u1")
+        run(get_effective_view_config("p1", "u1"))
+        uow.finish(commit=True)
+        run(get_effective_view_config("p1", "u1"))
+        assert len(calls) == 2
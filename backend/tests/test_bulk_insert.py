@@ -0,0 +1,38 @@
+"""
+Tests for batched multi-row inserts in DatabaseInsertBuilder
+"""
+
+from app.core import database
+
+
+class TestInsertChunks:
+    def test_runs_split_on_key_change_and_param_budget(self, monkeypatch):
+        monkeypatch.setattr(database, "MAX_BIND_PARAMS", 4)
+        rows = [{"a": 1, "b": 2}] * 5 + [{"a": 1}] * 2
+        chunks = [(cols, len(chunk)) for cols, chunk in database._insert_chunks(rows)]
+        assert chunks == [(("a", "b"), 2), (("a", "b"), 2), (("a", "b"), 1), (("a",), 2)]
+
+    def test_copy_field_quoting(self):
+        assert database._copy_field(None) == "\\N"
+        assert database._copy_field(True) == '"t"'
+        assert database._copy_field('say "hi"') == '"say ""hi"""'
+        assert database._copy_field("\\N") == '"\\N"'
+
+
+class TestInsertBuilder:
+    def test_list_insert_is_one_statement_in_input_order(self, sqlite_db):
+        stats = database.start_request_db_stats()
+        rows = [{"name": "a"}, {"name": "b"}, {"name": "c"}]
+        result = database.db_client.table("items").insert(rows).execute()
+
+        assert [r["name"] for r in result.data] == ["a", "b", "c"]
+        assert stats["statements"] == 1
+
+    def test_mixed_columns_and_minimal_returning(self, sqlite_db, monkeypatch):
+        monkeypatch.setattr(database, "MAX_BIND_PARAMS", 2)
+        rows = [{"name": "a"}, {"name": "b"}, {"name": "c", "id": 10}]
+        result = database.db_client.table("items").insert(rows, returning="minimal").execute()
+
+        assert result.data == []
+        names = database.execute_query("SELECT id, name FROM items ORDER BY name", {})
+        assert [(r["id"], r["name"]) for r in names] == [(1, "a"), (2, "b"), (10, "c")]
@@ -0,0 +1,42 @@
+"""
+Tests for DB_POOL_MODE resolution and the proxy-mode liveness check
+"""
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.core import database
+from app.core.config import settings
+
+
+class TestPoolMode:
+    def test_auto_follows_lambda_environment(self, monkeypatch):
+        monkeypatch.setattr(settings, "DB_POOL_MODE", "auto")
+        monkeypatch.delenv("AWS_LAMBDA_FUNCTION_NAME", raising=False)
+        assert database._get_pool_mode() == "queue"
+        monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "swn-api")
+        assert database._get_pool_mode() == "null"
+
+    def test_proxy_mode_disables_prepared_statements(self, monkeypatch):
+        monkeypatch.setattr(settings, "DB_PREPARED_STATEMENTS", True)
+        monkeypatch.setattr(settings, "DB_POOL_MODE", "proxy")
+        assert database._prepared_statements_enabled() is False
+        monkeypatch.setattr(settings, "DB_POOL_MODE", "queue")
+        assert database._prepared_statements_enabled() is True
+
+
+class TestLivenessCheck:
+    def test_dead_idle_connection_is_replaced(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'live.db'}", poolclass=QueuePool, pool_size=1)
+        database._register_liveness_check(engine, idle_seconds=0)
+
+        with engine.connect() as conn:
+            first = conn.connection.dbapi_connection
+            conn.execute(text("SELECT 1"))
+        # Simulate the proxy dropping the connection while the container was frozen
+        first.close()
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+            assert conn.connection.dbapi_connection is not first
+        engine.dispose()
@@ -0,0 +1,23 @@
+"""
+Tests for the project prefix check on desktop multipart upload keys
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.backlot import _check_desktop_upload_key
+
+
+def test_accepts_dots_inside_file_name():
+    _check_desktop_upload_key("p1", "projects/p1/assets/a1/take1..final.mov")
+
+
+@pytest.mark.parametrize("s3_key", [
+    "projects/p2/assets/a1/clip.mov",
+    "projects/p1/assets/../../p2/assets/a1/clip.mov",
+    "projects/p1/assets/a1/..",
+])
+def test_rejects_foreign_or_escaping_keys(s3_key):
+    with pytest.raises(HTTPException) as exc:
+        _check_desktop_upload_key("p1", s3_key)
+    assert exc.value.status_code == 403
@@ -0,0 +1,77 @@
+"""
+Tests for compiling Supabase-style embedded joins into the main query
+"""
+
+import pytest
+
+from app.core import database
+from app.core.database import DatabaseTable, SchemaCatalog
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    catalog = SchemaCatalog(
+        tables={"backlot_tasks", "profiles", "backlot_task_lists"},
+        columns={
+            ("backlot_tasks", "id"),
+            ("backlot_tasks", "assigned_to"),
+            ("backlot_tasks", "task_list_id"),
+            ("backlot_tasks", "created_by"),
+        },
+        foreign_keys={
+            ("backlot_tasks", "assigned_to"): "profiles",
+            ("backlot_tasks", "task_list_id"): "backlot_task_lists",
+        },
+    )
+    monkeypatch.setattr(database, "_schema_catalog", catalog)
+    monkeypatch.setattr(database, "_inline_embed_failures", set())
+    return catalog
+
+
+class TestEmbeddedJoins:
+    def test_fk_catalog_resolves_target(self, catalog):
+        table = DatabaseTable("backlot_tasks").select("*, assignee:assigned_to(full_name)")
+        inline, follow_up = table._plan_embeds()
+        assert inline == [("assignee", "profiles", "assigned_to", "full_name")]
+        assert follow_up == []
+
+    def test_embeds_compile_into_one_statement(self, catalog):
+        table = (
+            DatabaseTable("backlot_tasks")
+            .select("*, assignee:assigned_to(full_name), task_list:task_list_id(name)")
+            .eq("id", "t1")
+        )
+        inline, _ = table._plan_embeds()
+        stmt, params = table._build_query(inline)
+        query = stmt.text
+
+        assert query.startswith("SELECT *, (SELECT to_jsonb(_e0) FROM (SELECT id, full_name FROM profiles _t0 ")
+        assert "WHERE _t0.id = backlot_tasks.assigned_to LIMIT 1) _e0) AS __embed_0" in query
+        assert "FROM backlot_task_lists _t1 WHERE _t1.id = backlot_tasks.task_list_id" in query
+        assert query.endswith("FROM backlot_tasks WHERE id = :p0")
+        assert params == {"p0": "t1"}
+
+    def test_unknown_fk_column_keeps_follow_up_query(self, catalog):
+        table = DatabaseTable("backlot_tasks").select("*, project:project_id(title)")
+        inline, follow_up = table._plan_embeds()
+        assert inline == []
+        assert follow_up == [("project", "backlot_projects", "project_id", "title")]
+
+    def test_failed_shape_is_not_inlined_again(self, catalog):
+        table = DatabaseTable("backlot_tasks").select("*, assignee:assigned_to(full_name)")
+        database._inline_embed_failures.add(table._embed_shape())
+        inline, follow_up = table._plan_embeds()
+        assert inline == []
+        assert len(follow_up) == 1
+
+    def test_unpack_keeps_response_shape(self):
+        inline = [("assignee", "profiles", "assigned_to", "full_name")]
+        rows = [
+            {"id": "t1", "assigned_to": "u1", "__embed_0": {"id": "u1", "full_name": "Ann"}},
+            {"id": "t2", "assigned_to": None, "__embed_0": None},
+            {"id": "t3", "assigned_to": "u2", "__embed_0": '{"id": "u2", "full_name": "Bo"}'},
+        ]
+        result = DatabaseTable._unpack_inline_embeds(rows, inline)
+        assert result[0] == {"id": "t1", "assigned_to": "u1", "assignee": {"id": "u1", "full_name": "Ann"}}
+        assert result[1]["assignee"] is None
+        assert result[2]["assignee"] == {"id": "u2", "full_name": "Bo"}
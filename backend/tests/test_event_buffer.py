@@ -0,0 +1,132 @@
+"""
+Tests for the write-behind tracking event buffer
+"""
+
+import os
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.core.event_buffer import EventBuffer, Sink, values_clause
+
+
+def db_down():
+    return OperationalError("UPDATE ...", {}, Exception("connection refused"))
+
+
+@pytest.fixture
+def buffer(tmp_path):
+    # Flushed by hand: no background thread, no time trigger
+    return EventBuffer(max_events=100, flush_seconds=3600, spill_dir=str(tmp_path), background=False)
+
+
+@pytest.fixture
+def writes():
+    return []
+
+
+def counter_sink(writes, error=None, when=lambda events: True):
+    def write(events):
+        if error is not None and when(events):
+            raise error
+        writes.append(list(events))
+
+    return Sink(
+        "counters",
+        write=write,
+        key=lambda e: e["id"],
+        merge=lambda pending, e: {**pending, "views": pending["views"] + e["views"]},
+    )
+
+
+class TestCoalescing:
+    def test_keyed_events_merge(self, buffer, writes):
+        buffer.register(counter_sink(writes))
+        for short_id in ("a", "b", "a", "a"):
+            buffer.emit("counters", {"id": short_id, "views": 1})
+
+        assert buffer.flush() == 2
+        assert writes == [[{"id": "b", "views": 1}, {"id": "a", "views": 3}]]
+        assert buffer.get_stats()["coalesced"] == 2
+
+    def test_append_sink_keeps_every_event(self, buffer, writes):
+        buffer.register(Sink("opens", write=writes.append))
+        for i in range(3):
+            buffer.emit("opens", {"n": i})
+        buffer.flush()
+        assert writes == [[{"n": 0}, {"n": 1}, {"n": 2}]]
+
+    def test_discard_drops_pending_event(self, buffer, writes):
+        buffer.register(counter_sink(writes))
+        buffer.emit("counters", {"id": "a", "views": 1})
+        buffer.discard("counters", "a")
+        buffer.discard("counters", "missing")
+        assert buffer.flush() == 0
+        assert writes == []
+
+    def test_size_trigger_flushes(self, tmp_path, writes):
+        buffer = EventBuffer(max_events=3, flush_seconds=3600, spill_dir=str(tmp_path), background=False)
+        buffer.register(Sink("opens", write=writes.append))
+        for i in range(7):
+            buffer.emit("opens", {"n": i})
+        assert [len(batch) for batch in writes] == [3, 3]
+        assert buffer.get_stats()["pending"] == {"opens": 1}
+
+
+class TestFailures:
+    def test_spills_when_database_unavailable_and_replays(self, buffer, writes, tmp_path):
+        state = {"down": True}
+        buffer.register(counter_sink(writes, db_down(), when=lambda events: state["down"]))
+
+        buffer.emit("counters", {"id": "a", "views": 2})
+        assert buffer.flush() == 0
+        assert len(os.listdir(tmp_path)) == 1
+        assert buffer.get_stats()["spilled"] == 1
+
+        # Database is back: the spill is replayed before newer events
+        state["down"] = False
+        buffer.emit("counters", {"id": "a", "views": 1})
+        assert buffer.flush() == 2
+        assert writes == [[{"id": "a", "views": 2}], [{"id": "a", "views": 1}]]
+        assert os.listdir(tmp_path) == []
+        assert buffer.get_stats()["replayed"] == 1
+
+    def test_spill_survives_restart(self, tmp_path, writes):
+        first = EventBuffer(spill_dir=str(tmp_path), background=False)
+        first.register(counter_sink(writes, db_down()))
+        first.emit("counters", {"id": "a", "views": 5})
+        first.flush()
+
+        second = EventBuffer(spill_dir=str(tmp_path), background=False)
+        second.register(counter_sink(writes))
+        assert second.flush() == 1
+        assert writes == [[{"id": "a", "views": 5}]]
+
+    def test_bad_event_is_isolated(self, buffer, writes):
+        error = IntegrityError("INSERT ...", {}, Exception("violates foreign key"))
+        buffer.register(counter_sink(writes, error, when=lambda events: any(e["id"] == "bad" for e in events)))
+        for short_id in ("a", "bad", "b"):
+            buffer.emit("counters", {"id": short_id, "views": 1})
+
+        assert buffer.flush() == 2
+        assert writes == [[{"id": "a", "views": 1}], [{"id": "b", "views": 1}]]
+        assert buffer.get_stats()["dropped"] == 1
+
+    def test_drops_without_spill_dir(self, writes):
+        buffer = EventBuffer(spill_dir=None, background=False)
+        buffer.register(counter_sink(writes, db_down()))
+        buffer.emit("counters", {"id": "a", "views": 1})
+        assert buffer.flush() == 0
+        assert buffer.get_stats()["dropped"] == 1
+
+
+class TestValuesClause:
+    def test_typed_placeholders(self):
+        sql, params = values_clause(
+            [{"id": "x", "n": 1}, {"id": "y", "n": 2}], ("id", "n"), {"id": "uuid", "n": "int"},
+        )
+        assert sql == (
+            "(VALUES (CAST(:v0_0 AS uuid), CAST(:v0_1 AS int)), "
+            "(CAST(:v1_0 AS uuid), CAST(:v1_1 AS int))) AS v(id, n)"
+        )
+        assert params == {"v0_0": "x", "v0_1": 1, "v1_0": "y", "v1_1": 2}
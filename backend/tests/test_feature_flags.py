@@ -0,0 +1,108 @@
+"""
+Tests for in-process feature flag evaluation: versioned snapshots, rollout
+bucketing and the batched evaluation log
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.services import feature_flags_service as ffs
+
+
+@pytest.fixture
+def flags_db(monkeypatch):
+    state = {
+        "version": 1,
+        "loads": 0,
+        "inserted": [],
+        "rows": [
+            {"id": "f1", "key": "new_player", "name": "New player", "status": "enabled",
+             "rollout_percentage": 0, "default_value": False, "metadata": {}, "targets": []},
+            {"id": "f2", "key": "beta", "name": "Beta", "status": "targeted",
+             "rollout_percentage": 0, "default_value": False, "metadata": {},
+             "targets": [["user", "u-1"], ["role", "admin"], ["organization", "org-9"]]},
+            {"id": "f3", "key": "half", "name": "Half", "status": "percentage",
+             "rollout_percentage": 50, "default_value": False, "metadata": {}, "targets": []},
+        ],
+    }
+
+    def execute_single(query, params):
+        return {"version": state["version"]}
+
+    def execute_query(query, params):
+        state["loads"] += 1
+        return [dict(row) for row in state["rows"]]
+
+    def execute_insert_many(table, rows, returning="*"):
+        state["inserted"].append((table, rows))
+        return []
+
+    monkeypatch.setattr(ffs, "execute_single", execute_single)
+    monkeypatch.setattr(ffs, "execute_query", execute_query)
+    monkeypatch.setattr(ffs, "execute_insert_many", execute_insert_many)
+    monkeypatch.setattr(settings, "FEATURE_FLAG_SYNC", "poll")
+    monkeypatch.setattr(settings, "FEATURE_FLAG_POLL_SECONDS", 0)
+    monkeypatch.setattr(settings, "FEATURE_FLAG_EVAL_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(ffs, "_snapshot", {"version": None, "flags": {}})
+    monkeypatch.setattr(ffs, "_next_check_at", 0.0)
+    ffs._evaluation_buffer.clear()
+    yield state
+    ffs._evaluation_buffer.clear()
+
+
+class TestSnapshot:
+    def test_reloads_only_when_version_moves(self, flags_db):
+        assert ffs.is_enabled("new_player")
+        assert ffs.is_enabled("new_player")
+        assert flags_db["loads"] == 1
+
+        flags_db["rows"][0]["status"] = "disabled"
+        assert ffs.is_enabled("new_player")  # version unchanged, snapshot kept
+        flags_db["version"] = 2
+        assert not ffs.is_enabled("new_player")
+        assert flags_db["loads"] == 2
+
+    def test_targets_come_from_snapshot(self, flags_db):
+        assert ffs.evaluate_flag("beta", "u-1")["reason"] == "targeted_user"
+        assert ffs.evaluate_flag("beta", "u-2", {"roles": ["admin"]})["reason"] == "targeted_role"
+        assert ffs.evaluate_flag("beta", "u-2", {"organization_id": "org-9"})["reason"] == "targeted_organization"
+        assert ffs.evaluate_flag("beta", "u-2")["enabled"] is False
+        assert ffs.evaluate_flag("missing")["reason"] == "flag_not_found"
+        assert flags_db["loads"] == 1
+
+
+class TestRolloutBucket:
+    def test_deterministic_and_roughly_uniform(self):
+        assert ffs.rollout_bucket("half", "user-1") == ffs.rollout_bucket("half", "user-1")
+        buckets = [ffs.rollout_bucket("half", f"user-{i}") for i in range(10000)]
+        assert all(0 <= b < 100 for b in buckets)
+        share = sum(b < 50 for b in buckets) / len(buckets)
+        assert 0.47 < share < 0.53
+
+    def test_percentage_flag_is_sticky_per_user(self, flags_db):
+        results = {ffs.is_enabled("half", "user-42") for _ in range(20)}
+        assert len(results) == 1
+
+
+class TestEvaluationLog:
+    def test_sampled_rows_are_flushed_in_one_batch(self, flags_db, monkeypatch):
+        monkeypatch.setattr(settings, "FEATURE_FLAG_EVAL_SAMPLE_RATE", 1.0)
+        monkeypatch.setattr(settings, "FEATURE_FLAG_EVAL_BATCH_SIZE", 10_000)
+        monkeypatch.setattr(settings, "FEATURE_FLAG_EVAL_FLUSH_SECONDS", 3600)
+        monkeypatch.setattr(ffs, "_last_flush_at", ffs.time.monotonic())
+
+        for i in range(25):
+            ffs.evaluate_flag("new_player", f"u-{i}")
+        assert flags_db["inserted"] == []
+
+        assert ffs.flush_evaluations() == 25
+        assert len(flags_db["inserted"]) == 1
+        table, rows = flags_db["inserted"][0]
+        assert table == "feature_flag_evaluations"
+        assert rows[0] == {"flag_key": "new_player", "user_id": "u-0", "result": True, "reason": "enabled"}
+        assert ffs.flush_evaluations() == 0
+
+    def test_unsampled_evaluations_are_not_buffered(self, flags_db):
+        for _ in range(50):
+            ffs.evaluate_flag("new_player", "u-1")
+        assert ffs.flush_evaluations() == 0
@@ -0,0 +1,101 @@
+"""
+Tests for org entitlement snapshots behind the feature gates
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import cache
+from app.services import feature_gates
+from app.services.feature_gates import (
+    Feature,
+    check_feature_access,
+    enforce_project_feature,
+    evaluate_feature_access,
+    get_org_feature_access,
+    invalidate_org_entitlements,
+    invalidate_project_org,
+)
+
+
+def snapshot(tier="pro", status="active", modules=()):
+    return {"tier_name": tier, "status": status, "modules": frozenset(modules)}
+
+
+class TestEvaluateFeatureAccess:
+    def test_tier_and_module_grants(self):
+        assert evaluate_feature_access(snapshot("indie"), "SCHEDULING")["has_access"]
+        assert not evaluate_feature_access(snapshot("pro"), "BUDGETING")["has_access"]
+        assert evaluate_feature_access(snapshot("pro", modules={"budgeting"}), "BUDGETING")["has_access"]
+        assert evaluate_feature_access(snapshot("business"), Feature.BUDGETING)["has_access"]
+
+    def test_denials(self):
+        assert evaluate_feature_access(None, "SCHEDULING")["reason"] == "no_subscription"
+        assert evaluate_feature_access(snapshot(status="past_due"), "SCHEDULING")["reason"] == "subscription_past_due"
+        denied = evaluate_feature_access(snapshot("pro"), "TIMECARDS")
+        assert denied["reason"] == "not_included"
+        assert denied["upgrade_prompt"]["module"] == "timecards"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    state = {
+        "queries": [],
+        "orgs": {"org-1": {"tier_name": "pro", "status": "active", "active_modules": ["budgeting"]}},
+        "projects": {"proj-1": {"organization_id": "org-1"}, "solo": {"organization_id": None}},
+    }
+
+    def execute_single(query, params):
+        state["queries"].append(query)
+        if "backlot_projects" in query:
+            return state["projects"].get(params["pid"])
+        return state["orgs"].get(params["oid"])
+
+    monkeypatch.setattr(feature_gates, "execute_single", execute_single)
+    monkeypatch.setattr(cache, "_shared_backend", cache.MemoryBackend())
+    feature_gates._entitlement_cache.clear()
+    feature_gates._project_org_cache.clear()
+    yield state
+    feature_gates._entitlement_cache.clear()
+    feature_gates._project_org_cache.clear()
+
+
+class TestEntitlementSnapshot:
+    def test_full_feature_map_costs_one_query(self, db):
+        access = get_org_feature_access("org-1")
+        assert len(db["queries"]) == 1
+        assert access["BUDGETING"] is True
+        assert access["TIMECARDS"] is False
+        assert set(access) == {f.value for f in Feature}
+
+        check_feature_access("org-1", "BUDGETING")
+        assert len(db["queries"]) == 1
+
+    def test_invalidation_reloads(self, db):
+        assert check_feature_access("org-1", "EXPENSES")["has_access"] is False
+        db["orgs"]["org-1"]["active_modules"].append("expenses")
+        assert check_feature_access("org-1", "EXPENSES")["has_access"] is False
+
+        invalidate_org_entitlements("org-1")
+        assert check_feature_access("org-1", "EXPENSES")["has_access"] is True
+        assert len(db["queries"]) == 2
+
+    def test_project_gate_reads_cached_org(self, db):
+        enforce_project_feature("proj-1", "BUDGETING")
+        enforce_project_feature("proj-1", "BUDGETING")
+        assert len(db["queries"]) == 2  # project -> org, then the org snapshot
+
+        with pytest.raises(HTTPException) as exc:
+            enforce_project_feature("proj-1", "TIMECARDS")
+        assert exc.value.status_code == 403
+        assert exc.value.detail["code"] == "feature_locked"
+
+        enforce_project_feature("solo", "TIMECARDS")  # individual projects aren't gated
+        with pytest.raises(HTTPException) as exc:
+            enforce_project_feature("missing", "TIMECARDS")
+        assert exc.value.status_code == 404
+
+        db["projects"]["solo"]["organization_id"] = "org-1"
+        invalidate_project_org("solo")
+        with pytest.raises(HTTPException):
+            enforce_project_feature("solo", "TIMECARDS")
@@ -0,0 +1,118 @@
+"""
+Tests for the interval-indexed gear availability service
+"""
+
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.api.gear import quotes
+from app.services import gear_availability
+
+START, END = date(2026, 3, 10), date(2026, 3, 12)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Canned result rows; records each (query, params) sent."""
+    state = {"rows": [], "calls": []}
+
+    def fake_query(query, params):
+        state["calls"].append((str(query), params))
+        return state["rows"]
+
+    monkeypatch.setattr(gear_availability, "execute_query", fake_query)
+    return state
+
+
+def row(asset_id, status="available", conflict=None, source_id=None):
+    return {
+        "asset_id": asset_id,
+        "asset_status": status,
+        "conflict_type": conflict,
+        "source_id": source_id,
+        "booking_status": "confirmed" if conflict == "rental_order" else None,
+        "starts_at": "2026-03-09T00:00:00+00:00" if conflict else None,
+        "ends_at": "2026-03-11T00:00:00+00:00" if conflict else None,
+    }
+
+
+class TestCheckAvailability:
+    def test_many_assets_one_query(self, db):
+        db["rows"] = [row(f"a{i}") for i in range(50)] + [row("a7", conflict="rental_order", source_id="ro-1")]
+        ids = [f"a{i}" for i in range(50)]
+
+        results = gear_availability.check_availability(ids, START, END, listing_ids=["l-1", None])
+
+        assert len(db["calls"]) == 1
+        query, params = db["calls"][0]
+        assert "gear_asset_bookings" in query and "b.during && w.span" in query
+        assert params["asset_ids"] == ids
+        assert params["listing_ids"] == ["l-1"]
+        assert [a for a, r in results.items() if not r["available"]] == ["a7"]
+        assert results["a7"]["reason"] == "Already rented for these dates"
+        assert results["a7"]["conflicts"] == [{
+            "type": "rental_order", "source_id": "ro-1", "status": "confirmed",
+            "starts_at": "2026-03-09T00:00:00+00:00", "ends_at": "2026-03-11T00:00:00+00:00",
+        }]
+        assert results["a0"] == {"available": True, "reason": "", "conflicts": []}
+
+    def test_reason_priority(self, db):
+        db["rows"] = [
+            row("x", conflict="blackout", source_id="l-1"),
+            row("x", conflict="work_order", source_id="wo-1"),
+            row("x", conflict="internal_checkout", source_id="tx-1"),
+            row("retired", status="retired", conflict="rental_order", source_id="ro-1"),
+        ]
+        results = gear_availability.check_availability(["x", "retired", "missing"], START, END)
+
+        assert results["x"]["reason"] == "Internal checkout scheduled for these dates"
+        assert len(results["x"]["conflicts"]) == 3
+        assert results["retired"]["reason"] == "Asset is retired"
+        assert results["missing"] == {"available": False, "reason": "Asset not found", "conflicts": []}
+
+    def test_no_assets_no_query(self, db):
+        assert gear_availability.check_availability([None, ""], START, END) == {}
+        assert db["calls"] == []
+
+    def test_validate_item_availability_wrapper(self, db):
+        db["rows"] = [row("x", conflict="blackout", source_id="l-1")]
+        result = asyncio.run(quotes.validate_item_availability("x", "l-1", START, END, "org-1"))
+
+        assert result == (False, "Blackout period")
+        params = db["calls"][0][1]
+        assert params["org_id"] == "org-1"
+        assert params["listing_ids"] == ["l-1"]
+
+
+class TestCalendar:
+    def test_per_day_totals(self, db):
+        db["rows"] = [
+            {"asset_id": "a", "name": "Alexa", "internal_id": "C-1", "status": "available", "category_id": None,
+             "booked_days": {"2026-03-10": ["rental_order"], "2026-03-11": ["internal_checkout", "rental_order"]}},
+            {"asset_id": "b", "name": "Dolly", "internal_id": "G-1", "status": "retired", "category_id": None,
+             "booked_days": {"2026-03-10": ["work_order"]}},
+            {"asset_id": "c", "name": "Tripod", "internal_id": "G-2", "status": "checked_out", "category_id": None,
+             "booked_days": {}},
+        ]
+
+        calendar = gear_availability.get_availability_calendar("org-1", START, END, category_id="cat-1")
+
+        assert len(db["calls"]) == 1
+        query, params = db["calls"][0]
+        assert "AND a.category_id = :category_id" in query
+        assert params["category_id"] == "cat-1"
+        assert calendar["total_assets"] == 3
+        assert calendar["days"] == [
+            {"date": "2026-03-10", "available": 1, "booked": 1, "unavailable": 1},
+            {"date": "2026-03-11", "available": 1, "booked": 1, "unavailable": 1},
+            {"date": "2026-03-12", "available": 2, "booked": 0, "unavailable": 1},
+        ]
+        assert calendar["assets"][0]["booked_days"]["2026-03-11"] == ["internal_checkout", "rental_order"]
+
+    def test_without_category_filter(self, db):
+        gear_availability.get_availability_calendar("org-1", START, START)
+        query, params = db["calls"][0]
+        assert "category_id =" not in query
+        assert "category_id" not in params
@@ -0,0 +1,158 @@
+"""
+Tests for the set-based kit checkout/checkin cascade in gear_service
+"""
+
+import pytest
+
+from app.core import database
+from app.core.database import execute_query, execute_update, start_request_db_stats
+from app.services import gear_service
+
+
+@pytest.fixture
+def gear_db(sqlite_db):
+    for ddl in (
+        """CREATE TABLE gear_kit_instances (
+            id TEXT PRIMARY KEY, status TEXT DEFAULT 'available', updated_at TIMESTAMP
+        )""",
+        """CREATE TABLE gear_kit_memberships (
+            kit_instance_id TEXT, asset_id TEXT, nested_kit_id TEXT, is_present BOOLEAN DEFAULT TRUE
+        )""",
+        """CREATE TABLE gear_assets (
+            id TEXT PRIMARY KEY, status TEXT DEFAULT 'available', current_custodian_user_id TEXT,
+            current_location_id TEXT, default_home_location_id TEXT, parent_asset_id TEXT,
+            is_active BOOLEAN DEFAULT TRUE, updated_at TIMESTAMP
+        )""",
+    ):
+        execute_update(ddl, {})
+    return sqlite_db
+
+
+def add_kit(kit_id, assets=(), nested=(), missing=()):
+    execute_update("INSERT INTO gear_kit_instances (id) VALUES (:id)", {"id": kit_id})
+    for asset_id in assets:
+        add_asset(asset_id)
+        execute_update(
+            "INSERT INTO gear_kit_memberships (kit_instance_id, asset_id) VALUES (:kit, :asset)",
+            {"kit": kit_id, "asset": asset_id},
+        )
+    for asset_id in missing:
+        add_asset(asset_id)
+        execute_update(
+            "INSERT INTO gear_kit_memberships (kit_instance_id, asset_id, is_present) VALUES (:kit, :asset, FALSE)",
+            {"kit": kit_id, "asset": asset_id},
+        )
+    for nested_id in nested:
+        execute_update(
+            "INSERT INTO gear_kit_memberships (kit_instance_id, nested_kit_id) VALUES (:kit, :nested)",
+            {"kit": kit_id, "nested": nested_id},
+        )
+
+
+def add_asset(asset_id, parent=None, is_active=True, home=None):
+    execute_update(
+        """INSERT INTO gear_assets (id, parent_asset_id, is_active, default_home_location_id, current_location_id)
+           VALUES (:id, :parent, :active, :home, 'set')""",
+        {"id": asset_id, "parent": parent, "active": is_active, "home": home},
+    )
+
+
+def statuses(table):
+    return {r["id"]: r["status"] for r in execute_query(f"SELECT id, status FROM {table}")}
+
+
+def camera_package(size):
+    """Top kit holding `size` assets, a nested lens kit, and a body with accessories."""
+    add_kit("lenses", assets=[f"lens-{i}" for i in range(size)])
+    add_kit("camera", assets=["body"] + [f"item-{i}" for i in range(size)], nested=["lenses"], missing=["lost"])
+    add_asset("cage", parent="body")
+    add_asset("old-plate", parent="body", is_active=False)
+
+
+class TestCascade:
+    def test_checkout_covers_nested_kits_and_accessories(self, gear_db):
+        camera_package(3)
+        add_kit("unrelated", assets=["other"])
+
+        affected = gear_service._cascade_checkout("crew-1", kit_ids=["camera"])
+
+        assert sorted(affected["kit_ids"]) == ["camera", "lenses"]
+        assert sorted(affected["asset_ids"]) == sorted(
+            ["body", "cage"] + [f"item-{i}" for i in range(3)] + [f"lens-{i}" for i in range(3)]
+        )
+        assets = statuses("gear_assets")
+        assert {a for a, s in assets.items() if s == "checked_out"} == set(affected["asset_ids"])
+        # Not present in the kit, inactive accessory, other kit: untouched
+        assert assets["lost"] == assets["old-plate"] == assets["other"] == "available"
+        assert statuses("gear_kit_instances")["unrelated"] == "available"
+        custodians = {r["current_custodian_user_id"] for r in execute_query(
+            "SELECT current_custodian_user_id FROM gear_assets WHERE status = 'checked_out'"
+        )}
+        assert custodians == {"crew-1"}
+
+    def test_checkin_returns_assets_home(self, gear_db):
+        add_kit("kit", assets=["a"])
+        add_asset("b", home="shelf")
+        gear_service._cascade_checkout("crew-1", asset_ids=["b"], kit_ids=["kit"])
+
+        affected = gear_service._cascade_checkin(asset_ids=["b"], kit_ids=["kit"])
+
+        assert sorted(affected["asset_ids"]) == ["a", "b"]
+        rows = {r["id"]: r for r in execute_query("SELECT * FROM gear_assets")}
+        assert rows["b"]["status"] == "available"
+        assert rows["b"]["current_custodian_user_id"] is None
+        assert rows["b"]["current_location_id"] == "shelf"
+        assert rows["a"]["current_location_id"] == "set"  # no home location: stays put
+        assert statuses("gear_kit_instances")["kit"] == "available"
+
+    def test_membership_cycle_terminates(self, gear_db):
+        add_kit("a", assets=["x"], nested=["b"])
+        add_kit("b", assets=["y"], nested=["a"])
+        affected = gear_service._cascade_checkout("crew-1", kit_ids=["a"])
+        assert sorted(affected["kit_ids"]) == ["a", "b"]
+        assert sorted(affected["asset_ids"]) == ["x", "y"]
+
+    def test_nothing_to_cascade(self, gear_db):
+        stats = start_request_db_stats()
+        assert gear_service._cascade_checkin() == {"asset_ids": [], "kit_ids": []}
+        assert stats["statements"] == 0
+
+
+class TestStatementCount:
+    @pytest.mark.parametrize("size", [2, 60])
+    def test_constant_statements_regardless_of_kit_size(self, gear_db, size):
+        camera_package(size)
+        stats = start_request_db_stats()
+        affected = gear_service._cascade_checkout("crew-1", kit_ids=["camera"])
+
+        assert len(affected["asset_ids"]) == 2 * size + 2
+        # Closure query + one UPDATE per table
+        assert stats["statements"] == 3
+
+    def test_complete_checkout_single_pass(self, gear_db, monkeypatch):
+        camera_package(60)
+        add_asset("loose")
+        execute_update("CREATE TABLE gear_transactions (id TEXT PRIMARY KEY, status TEXT, handed_off_at TIMESTAMP)", {})
+        execute_update("INSERT INTO gear_transactions (id) VALUES ('tx-1')", {})
+
+        tx = {
+            "id": "tx-1",
+            "organization_id": "org-1",
+            "primary_custodian_user_id": "crew-1",
+            "items": [{"kit_instance_id": "camera"}, {"asset_id": "loose"}],
+        }
+        audits = []
+        monkeypatch.setattr(gear_service, "get_transaction", lambda tx_id: tx)
+        monkeypatch.setattr(gear_service, "_log_audit", lambda *args, **kwargs: audits.append(kwargs))
+        # SQLite has no NOW()
+        monkeypatch.setattr(gear_service, "execute_update", lambda query, params: database.execute_update(
+            query.replace("NOW()", "CURRENT_TIMESTAMP"), params
+        ))
+
+        stats = start_request_db_stats()
+        gear_service.complete_checkout("tx-1", "admin-1")
+
+        # Transaction row + closure + kits + assets
+        assert stats["statements"] == 4
+        assert len(audits[0]["changes"]["asset_ids"]) == 123
+        assert statuses("gear_transactions")["tx-1"] == "checked_out"
@@ -0,0 +1,72 @@
+"""
+Tests for the import profiler's deferral audit and deferred boto3 clients
+"""
+
+import boto3
+
+from app.core.aws_clients import LazyClient
+from app.tools.import_profile import audit_source
+
+SOURCE = '''
+import os
+import boto3
+from openpyxl.styles import Font
+from fpdf import FPDF
+from app.core.config import settings
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+HEADER_FONT = Font(bold=True)
+
+
+def render(pdf: FPDF) -> None:
+    boto3.client("s3")
+    httpx.get(os.getenv("URL"))
+'''
+
+
+class TestDeferralAudit:
+    def test_flags_imports_only_used_inside_functions(self):
+        found = {item.package: item.deferrable for item in audit_source(SOURCE)}
+        # stdlib and first-party imports are not reported
+        assert set(found) == {"boto3", "openpyxl", "fpdf", "httpx"}
+        assert found["boto3"] is True
+        assert found["openpyxl"] is False  # used at module level
+        assert found["fpdf"] is False  # annotation evaluated at def time
+        assert found["httpx"] is True  # guarded import, only called in functions
+
+    def test_postponed_annotations_are_not_import_time_uses(self):
+        found = {
+            item.package: item.deferrable
+            for item in audit_source("from __future__ import annotations\n" + SOURCE)
+        }
+        assert found["fpdf"] is True
+
+
+class TestLazyClient:
+    def test_client_created_on_first_use_only(self, monkeypatch):
+        created = []
+
+        class FakeClient:
+            def head_bucket(self, Bucket):
+                return {"bucket": Bucket}
+
+        def fake_client(service_name, **kwargs):
+            created.append((service_name, kwargs))
+            return FakeClient()
+
+        monkeypatch.setattr(boto3, "client", fake_client)
+
+        client = LazyClient("s3", region_name="us-east-1", config={"signature_version": "s3v4"})
+        assert created == []
+
+        assert client.head_bucket(Bucket="b") == {"bucket": "b"}
+        assert client.head_bucket(Bucket="c") == {"bucket": "c"}
+        assert len(created) == 1
+        service_name, kwargs = created[0]
+        assert service_name == "s3"
+        assert kwargs["region_name"] == "us-east-1"
+        assert kwargs["config"].signature_version == "s3v4"
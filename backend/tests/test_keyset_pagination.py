@@ -0,0 +1,127 @@
+"""
+Tests for keyset (cursor) pagination and count modes
+"""
+
+import pytest
+
+from app.core import database
+from app.core.database import (
+    DatabaseTable, count_rows, decode_cursor, encode_cursor, keyset_condition, keyset_page,
+)
+
+
+class TestCursors:
+    def test_round_trip_with_tags(self):
+        cursor = encode_cursor("2024-05-01T10:00:00+00:00", 42, s="name")
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == {"k": "2024-05-01T10:00:00+00:00", "id": "42", "s": "name"}
+
+    @pytest.mark.parametrize("bad", ["", "not-a-cursor", "W10", encode_cursor(1, 2)[:-3]])
+    def test_malformed_cursor_raises(self, bad):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+    def test_page_splits_extra_row(self):
+        rows = [{"id": i, "name": n} for i, n in enumerate("abc")]
+        page, cursor = keyset_page(rows, 2, "name")
+        assert [r["name"] for r in page] == ["a", "b"]
+        assert decode_cursor(cursor) == {"k": "b", "id": "1"}
+
+        page, cursor = keyset_page(rows, 3, "name")
+        assert len(page) == 3 and cursor is None
+
+
+class TestKeysetCondition:
+    def test_row_comparison(self):
+        sql, params = keyset_condition("t.created_at", "t.id", {"k": "x", "id": "1"}, desc=True)
+        assert sql == "(t.created_at, t.id) < (:cursor_key, :cursor_id)"
+        assert params == {"cursor_key": "x", "cursor_id": "1"}
+
+    def test_nullable_follows_postgres_null_placement(self):
+        after = {"k": "x", "id": "1"}
+        asc, _ = keyset_condition("c", "id", after, nullable=True)
+        assert asc.endswith("OR c IS NULL)")
+        desc, _ = keyset_condition("c", "id", after, desc=True, nullable=True)
+        assert "IS NULL" not in desc
+
+        # A page that ended on a NULL: ascending stays in the NULL tail,
+        # descending moves on to every non-NULL row
+        sql, params = keyset_condition("c", "id", {"k": None, "id": "1"}, nullable=True)
+        assert sql == "(c IS NULL AND id > :cursor_id)" and "cursor_key" not in params
+        sql, _ = keyset_condition("c", "id", {"k": None, "id": "1"}, desc=True, nullable=True)
+        assert sql == "(c IS NOT NULL OR id < :cursor_id)"
+
+
+class TestBuilderKeyset:
+    def test_after_adds_tiebreaker_and_seek(self):
+        query, params = (
+            DatabaseTable("items").select("*").eq("name", "a")
+            .order("created_at", desc=True).after(encode_cursor("t", 5)).limit(11)._build_query()
+        )
+        assert query.text == (
+            "SELECT * FROM items WHERE name = :p0 AND (created_at, id) < (:cursor_key, :cursor_id) "
+            "ORDER BY created_at DESC, id DESC LIMIT :_limit"
+        )
+        assert params == {"p0": "a", "cursor_key": "t", "cursor_id": "5", "_limit": 11}
+
+    def test_after_needs_order(self):
+        with pytest.raises(ValueError):
+            DatabaseTable("items").select("*").after(None)._build_query()
+
+    def test_walks_every_row_once_across_ties(self, sqlite_db):
+        names = ["b", "a", "b", "c", "b", "a", "c"]
+        database.db_client.table("items").insert([{"name": n} for n in names]).execute()
+
+        seen, cursor = [], None
+        while True:
+            rows = (
+                database.db_client.table("items").select("id, name")
+                .order("name").after(cursor).limit(3).execute().data
+            )
+            page, cursor = keyset_page(rows, 2, "name")
+            seen.extend((r["name"], r["id"]) for r in page)
+            if not cursor:
+                break
+
+        assert seen == sorted(seen)
+        assert len(seen) == len(names) == len(set(seen))
+
+
+class TestCounts:
+    def test_exact_and_none(self, sqlite_db):
+        database.db_client.table("items").insert([{"name": n} for n in "abca"]).execute()
+        assert count_rows("SELECT 1 FROM items WHERE name = :n", {"n": "a"}) == 2
+        assert count_rows("SELECT 1 FROM items", mode="none") is None
+
+    @pytest.mark.parametrize("planned,mode,expected", [
+        (50000, "planned", 50000),
+        (50000, "estimated", 50000),
+        (12, "planned", 12),
+        (12, "estimated", 3),  # small tables get the exact count
+    ])
+    def test_planned_modes(self, monkeypatch, planned, mode, expected):
+        calls = []
+
+        def fake_single(query, params=None):
+            sql = getattr(query, "text", query)
+            calls.append(sql)
+            if sql.startswith("EXPLAIN"):
+                return {"QUERY PLAN": [{"Plan": {"Plan Rows": planned}}]}
+            return {"cnt": 3}
+
+        monkeypatch.setattr(database, "execute_single", fake_single)
+        assert count_rows("SELECT 1 FROM items", mode=mode) == expected
+        assert calls[0] == "EXPLAIN (FORMAT JSON) SELECT 1 FROM items"
+
+    def test_builder_estimated_count(self, monkeypatch):
+        queries = []
+
+        def fake_single(query, params=None):
+            queries.append(query.text)
+            return {"QUERY PLAN": '[{"Plan": {"Plan Rows": 250000}}]'}
+
+        monkeypatch.setattr(database, "execute_single", fake_single)
+        monkeypatch.setattr(database, "execute_query", lambda query, params=None: [])
+        result = DatabaseTable("items").select("*", count="estimated").eq("name", "a").execute()
+        assert result.count == 250000
+        assert queries == ["EXPLAIN (FORMAT JSON) SELECT 1 FROM items WHERE name = :p0"]
@@ -0,0 +1,104 @@
+"""
+Tests for lazy router registration (app.core.routing)
+"""
+
+import sys
+import types
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.routing import install_lazy_routers, route_prefixes_for
+
+
+def _module(name, router):
+    module = types.ModuleType(name)
+    module.router = router
+    return module
+
+
+@pytest.fixture
+def lazy_app(monkeypatch):
+    # /orgs/mine (listed first) must keep winning over /orgs/{org_id}, even
+    # when the module owning /orgs/{org_id} is loaded first via /other
+    specific = APIRouter()
+
+    @specific.get("/orgs/mine")
+    def my_orgs():
+        return {"route": "mine"}
+
+    generic = APIRouter()
+
+    @generic.get("/orgs/{org_id}")
+    def get_org(org_id: str):
+        return {"route": "generic", "org_id": org_id}
+
+    @generic.get("/other")
+    def other():
+        return {"route": "other"}
+
+    unused = APIRouter()
+
+    @unused.get("/ping")
+    def ping():
+        return {"route": "ping"}
+
+    routers = [
+        ("lazytest.specific", "", "Specific"),
+        ("lazytest.generic", "", "Generic"),
+        ("lazytest.unused", "/unused", "Unused"),
+    ]
+    for (name, _, _), router in zip(routers, (specific, generic, unused)):
+        monkeypatch.setitem(sys.modules, name, _module(name, router))
+    prefixes = {
+        "lazytest.specific": route_prefixes_for(specific, ""),
+        "lazytest.generic": route_prefixes_for(generic, ""),
+        "lazytest.unused": route_prefixes_for(unused, "/unused"),
+    }
+
+    app = FastAPI()
+    registry = install_lazy_routers(app, routers, "/api/v1", prefixes)
+    return app, registry
+
+
+class TestLazyRouters:
+    def test_route_prefixes(self):
+        router = APIRouter(prefix="/projects")
+
+        @router.get("/{project_id}")
+        def a(project_id: str):
+            pass
+
+        @router.get("")
+        def b():
+            pass
+
+        params = APIRouter()
+
+        @params.get("/{org_id}/members")
+        def c(org_id: str):
+            pass
+
+        assert route_prefixes_for(router, "/backlot") == ["/backlot/projects"]
+        assert route_prefixes_for(params, "/orgs") == ["/orgs"]
+
+    def test_loads_only_matching_modules_in_manifest_order(self, lazy_app):
+        app, registry = lazy_app
+        client = TestClient(app)
+
+        assert client.get("/api/v1/other").json() == {"route": "other"}
+        assert registry.loaded_modules() == ["lazytest.generic"]
+
+        assert client.get("/api/v1/orgs/mine").json() == {"route": "mine"}
+        assert client.get("/api/v1/orgs/42").json()["route"] == "generic"
+        assert registry.loaded_modules() == ["lazytest.specific", "lazytest.generic"]
+
+        assert client.get("/api/v1/missing").status_code == 404
+        assert not registry.complete
+
+    def test_openapi_loads_every_router(self, lazy_app):
+        app, registry = lazy_app
+        paths = TestClient(app).get("/openapi.json").json()["paths"]
+        assert registry.complete
+        assert "/api/v1/unused/ping" in paths
@@ -0,0 +1,64 @@
+"""
+Tests for the linear channel viewer-count paths on the async DB helpers
+"""
+
+import asyncio
+
+from app.services import linear_schedule
+from app.services.linear_schedule import LinearScheduleService
+
+
+class FakeSingle:
+    """Stands in for aexecute_single, answering by the table being updated."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def __call__(self, query, params=None):
+        self.calls.append(params)
+        for table, row in self.rows.items():
+            if f"UPDATE {table}" in query:
+                return row
+        return None
+
+
+def test_update_viewer_count_awaits_async_helper(monkeypatch):
+    fake = FakeSingle({"linear_channels": {"current_viewers": 7}})
+    monkeypatch.setattr(linear_schedule, "aexecute_single", fake)
+
+    count = asyncio.run(LinearScheduleService.update_viewer_count("ch-1", -1))
+
+    assert count == 7
+    assert fake.calls == [{"channel_id": "ch-1", "delta": -1}]
+
+
+def test_update_viewer_count_missing_channel(monkeypatch):
+    monkeypatch.setattr(linear_schedule, "aexecute_single", FakeSingle({}))
+
+    assert asyncio.run(LinearScheduleService.update_viewer_count("missing")) == 0
+
+
+def test_end_viewer_session_decrements_channel(monkeypatch):
+    fake = FakeSingle({
+        "channel_viewer_sessions": {"channel_id": "ch-1"},
+        "linear_channels": {"current_viewers": 0},
+    })
+    monkeypatch.setattr(linear_schedule, "aexecute_single", fake)
+
+    asyncio.run(LinearScheduleService.end_viewer_session("sess-1", total_watch_seconds=90))
+
+    assert fake.calls == [
+        {"session_id": "sess-1", "total_watch_seconds": 90},
+        {"channel_id": "ch-1", "delta": -1},
+    ]
+
+
+def test_end_viewer_session_unknown_session(monkeypatch):
+    fake = FakeSingle({})
+    monkeypatch.setattr(linear_schedule, "aexecute_single", fake)
+
+    asyncio.run(LinearScheduleService.end_viewer_session("gone"))
+
+    # No channel to decrement
+    assert len(fake.calls) == 1
@@ -0,0 +1,126 @@
+"""
+Tests for marketplace proximity search helpers (bounding box, SQL fragments, cursors)
+"""
+
+import logging
+import math
+
+import pytest
+
+from app.core.config import settings
+from app.services import marketplace_geo
+from app.services.marketplace_geo import bounding_box, decode_cursor, encode_cursor, proximity
+
+
+def destination(lat, lng, miles, bearing):
+    """Point `miles` from (lat, lng) along `bearing` degrees, on a sphere."""
+    d = miles / marketplace_geo.EARTH_RADIUS_MILES
+    lat1, lng1, b = math.radians(lat), math.radians(lng), math.radians(bearing)
+    lat2 = math.asin(math.sin(lat1) * math.cos(d) + math.cos(lat1) * math.sin(d) * math.cos(b))
+    lng2 = lng1 + math.atan2(math.sin(b) * math.sin(d) * math.cos(lat1), math.cos(d) - math.sin(lat1) * math.sin(lat2))
+    return math.degrees(lat2), (math.degrees(lng2) + 540) % 360 - 180
+
+
+def in_box(box, lat, lng):
+    if not box["min_lat"] - 1e-9 <= lat <= box["max_lat"] + 1e-9:
+        return False
+    if box["min_lng"] is None:
+        return True
+    if box["wrap_lng"]:
+        return lng >= box["min_lng"] - 1e-9 or lng <= box["max_lng"] + 1e-9
+    return box["min_lng"] - 1e-9 <= lng <= box["max_lng"] + 1e-9
+
+
+@pytest.fixture
+def mode(monkeypatch):
+    def set_mode(value):
+        monkeypatch.setattr(settings, "MARKETPLACE_GEO_MODE", value)
+    return set_mode
+
+
+class TestBoundingBox:
+    @pytest.mark.parametrize("lat,lng,miles", [(34.05, -118.24, 50), (64.8, -147.7, 250), (-33.9, 151.2, 25)])
+    def test_contains_the_circle(self, lat, lng, miles):
+        box = bounding_box(lat, lng, miles)
+        for bearing in range(0, 360, 5):
+            assert in_box(box, *destination(lat, lng, miles * 0.999, bearing))
+        # Not the whole world
+        assert box["max_lat"] - box["min_lat"] < 10
+
+    def test_antimeridian_wraps(self):
+        box = bounding_box(51.9, 179.8, 50)
+        assert box["wrap_lng"] and box["min_lng"] > box["max_lng"]
+        assert in_box(box, 51.9, -179.5)
+        assert not in_box(box, 51.9, 0)
+
+    def test_pole_spans_every_longitude(self):
+        box = bounding_box(89.5, 10, 100)
+        assert box["min_lng"] is None and box["max_lat"] == 90.0
+
+
+class TestProximity:
+    def test_bbox_path(self, mode):
+        mode("bbox")
+        prox = proximity(34.05, -118.24, 50)
+        assert prox.mode == "bbox"
+        assert "ms.location_latitude BETWEEN :min_lat AND :max_lat" in prox.within
+        assert "haversine_distance_miles" in prox.within and prox.order == prox.distance
+        assert prox.params["radius_miles"] == 50
+        assert prox.params["min_lng"] < -118.24 < prox.params["max_lng"]
+
+    def test_postgis_path(self, mode):
+        mode("postgis")
+        prox = proximity(34.05, -118.24, 50, alias="b")
+        assert prox.within.startswith("ST_DWithin(b.location_geog,")
+        assert prox.order.startswith("(b.location_geog <->")
+        assert prox.params["radius_meters"] == pytest.approx(50 * 1609.344)
+
+    def test_auto_detects_once(self, mode, monkeypatch):
+        mode("auto")
+        calls = []
+        monkeypatch.setattr(marketplace_geo, "_postgis_available", None)
+        monkeypatch.setattr(marketplace_geo, "execute_single", lambda query: calls.append(query) or {"available": True})
+        assert proximity(0, 0, 10).mode == "postgis"
+        assert proximity(0, 0, 10).mode == "postgis"
+        assert len(calls) == 1
+
+    def test_auto_logs_at_info(self, mode, monkeypatch, caplog):
+        mode("auto")
+        monkeypatch.setattr(marketplace_geo, "_postgis_available", None)
+        monkeypatch.setattr(marketplace_geo, "execute_single", lambda query: {"available": False})
+        with caplog.at_level(logging.INFO, logger=marketplace_geo.logger.name):
+            assert proximity(0, 0, 10).mode == "bbox"
+        assert "postgis=False" in caplog.text
+
+    def test_auto_falls_back_when_detection_fails(self, mode, monkeypatch, caplog):
+        mode("auto")
+        monkeypatch.setattr(marketplace_geo, "_postgis_available", None)
+
+        def fail(query):
+            raise RuntimeError("no connection")
+        monkeypatch.setattr(marketplace_geo, "execute_single", fail)
+        with caplog.at_level(logging.INFO, logger=marketplace_geo.logger.name):
+            assert proximity(0, 0, 10).mode == "bbox"
+        assert "no connection" in caplog.text
+        # Not cached, so the next request tries again
+        assert marketplace_geo._postgis_available is None
+
+    def test_keyset_condition(self, mode):
+        mode("bbox")
+        prox = proximity(34.05, -118.24, 50)
+        clause, params = prox.after("ml.id", decode_cursor(encode_cursor("bbox", 12.5, "abc")))
+        assert clause == f"({prox.distance}, ml.id) > (:cursor_key, CAST(:cursor_id AS uuid))"
+        assert params == {"cursor_key": 12.5, "cursor_id": "abc"}
+        with pytest.raises(ValueError):
+            prox.after("ml.id", decode_cursor(encode_cursor("postgis", 1.0, "abc")))
+
+
+class TestCursor:
+    def test_round_trip_keeps_float_exact(self):
+        key = 3.0000000000000004
+        assert decode_cursor(encode_cursor("postgis", key, "id-1")) == {"m": "postgis", "k": key, "id": "id-1"}
+
+    @pytest.mark.parametrize("cursor", ["", "not-base64!", "W10", encode_cursor("bbox", 1, "x")[:-3]])
+    def test_malformed(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
@@ -0,0 +1,52 @@
+"""
+Tests for the compiled-query cache in the Supabase-compat builder
+"""
+
+import pytest
+
+from app.core import database
+from app.core.database import DatabaseTable, QueryCache
+
+
+@pytest.fixture
+def query_cache(monkeypatch):
+    cache = QueryCache(maxsize=2)
+    monkeypatch.setattr(database, "_query_cache", cache)
+    return cache
+
+
+class TestQueryCache:
+    def test_same_shape_reuses_clause_with_new_values(self, query_cache):
+        first, first_params = DatabaseTable("items").select("id, name").eq("name", "a").limit(5)._build_query()
+        second, second_params = DatabaseTable("items").select("id, name").eq("name", "b").limit(50)._build_query()
+
+        assert first is second
+        assert first.text == "SELECT id, name FROM items WHERE name = :p0 LIMIT :_limit"
+        assert first_params == {"p0": "a", "_limit": 5}
+        assert second_params == {"p0": "b", "_limit": 50}
+        assert query_cache.stats()["hits"] == 1
+
+    def test_shape_changes_miss(self, query_cache):
+        DatabaseTable("items").select("*").eq("name", "a")._build_query()
+        DatabaseTable("items").select("*").neq("name", "a")._build_query()
+        DatabaseTable("items").select("*").is_("name", None)._build_query()
+        DatabaseTable("items").select("*").eq("name", "a").order("id")._build_query()
+
+        stats = query_cache.stats()
+        assert stats["misses"] == 4
+        assert stats["hits"] == 0
+        assert stats["size"] == 2  # LRU bound
+
+    def test_cached_queries_execute(self, query_cache, sqlite_db):
+        database.db_client.table("items").insert([{"name": n} for n in "abc"]).execute()
+
+        for offset in (0, 1, 2):
+            result = (
+                database.db_client.table("items").select("name")
+                .order("name").range(offset, offset).execute()
+            )
+            assert [r["name"] for r in result.data] == ["abc"[offset]]
+
+        stats = database.get_query_cache_stats()
+        assert stats["misses"] == 2  # offset 0 omits OFFSET
+        assert stats["hits"] == 1
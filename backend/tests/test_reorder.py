@@ -0,0 +1,108 @@
+"""
+Tests for the ordered-collection helpers (execute_reorder / execute_recompact)
+"""
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core import database
+from app.core.database import execute_query, execute_recompact, execute_reorder, execute_update, start_request_db_stats
+
+
+@pytest.fixture
+def strips(sqlite_db):
+    execute_update(
+        "CREATE TABLE strips (id TEXT PRIMARY KEY, board TEXT, day TEXT, sort_order INTEGER)", {}
+    )
+    execute_update("CREATE UNIQUE INDEX strips_order ON strips (board, day, sort_order)", {})
+    rows = [
+        ("a", "b1", "d1", 3), ("b", "b1", "d1", 7), ("c", "b1", "d1", 10),
+        ("d", "b1", None, 5), ("e", "b1", None, 2),
+        ("f", "b2", "d1", 9),
+    ]
+    for row_id, board, day, order in rows:
+        execute_update(
+            "INSERT INTO strips VALUES (:id, :board, :day, :order)",
+            {"id": row_id, "board": board, "day": day, "order": order},
+        )
+    return sqlite_db
+
+
+def orders(**where):
+    clause = " AND ".join(f"{col} IS :{col}" for col in where) or "TRUE"
+    rows = execute_query(f"SELECT id, sort_order FROM strips WHERE {clause} ORDER BY sort_order", where)
+    return [(r["id"], r["sort_order"]) for r in rows]
+
+
+class TestRecompact:
+    def test_closes_gaps_in_one_statement(self, strips):
+        stats = start_request_db_stats()
+        assert execute_recompact("strips", {"board": "b1", "day": "d1"}) == 3
+        assert stats["statements"] == 1
+        assert orders(board="b1", day="d1") == [("a", 1), ("b", 2), ("c", 3)]
+        # Other scopes untouched
+        assert orders(board="b2") == [("f", 9)]
+        assert orders(board="b1", day=None) == [("e", 2), ("d", 5)]
+
+    def test_none_scope_matches_null(self, strips):
+        execute_recompact("strips", {"board": "b1", "day": None}, start=0)
+        assert orders(board="b1", day=None) == [("e", 0), ("d", 1)]
+
+    def test_rows_in_place_are_not_rewritten(self, strips):
+        execute_recompact("strips", {"board": "b1", "day": "d1"})
+        assert execute_recompact("strips", {"board": "b1", "day": "d1"}) == 0
+
+    def test_unique_index_shift(self, strips):
+        # Stored last-to-first, so shifting down hits the next row's slot
+        # before that row has moved
+        for row_id, order in (("z", 4), ("y", 3), ("x", 2)):
+            execute_update("INSERT INTO strips VALUES (:id, 'b3', 'd1', :order)", {"id": row_id, "order": order})
+        with pytest.raises(IntegrityError):
+            execute_recompact("strips", {"board": "b3", "day": "d1"})
+
+        stats = start_request_db_stats()
+        execute_recompact("strips", {"board": "b3", "day": "d1"}, unique=True)
+        assert stats["statements"] == 2
+        assert orders(board="b3") == [("x", 1), ("y", 2), ("z", 3)]
+
+
+class TestReorder:
+    @pytest.fixture
+    def captured(self, monkeypatch):
+        calls = []
+
+        def fake_update(query, params):
+            calls.append((" ".join(query.split()), params))
+            return len(params.get("ids", []))
+
+        monkeypatch.setattr(database, "execute_update", fake_update)
+        return calls
+
+    def test_single_unnest_update(self, captured):
+        assert execute_reorder("backlot_call_sheet_scenes", ["s3", "s1", "s2"], start=0,
+                               scope={"call_sheet_id": "cs-1"}) == 3
+        (query, params), = captured
+        assert query == (
+            "UPDATE backlot_call_sheet_scenes AS t SET sort_order = v.position "
+            "FROM unnest(CAST(:ids AS uuid[]), CAST(:positions AS int[])) AS v(id, position) "
+            "WHERE t.id = v.id AND t.call_sheet_id = :scope_0"
+        )
+        assert params == {"ids": ["s3", "s1", "s2"], "positions": [0, 1, 2], "scope_0": "cs-1"}
+
+    def test_repeated_id_keeps_last_position(self, captured):
+        execute_reorder("backlot_scenes", ["a", "b", "a"], column="sequence")
+        assert captured[0][1]["ids"] == ["a", "b"]
+        assert captured[0][1]["positions"] == [3, 2]
+
+    def test_empty_is_a_noop(self, captured):
+        assert execute_reorder("backlot_scenes", []) == 0
+        assert captured == []
+
+    def test_unique_negates_then_flips(self, captured):
+        execute_reorder("backlot_sides_packet_scenes", ["a", "b"], scope={"sides_packet_id": "p"}, unique=True)
+        assert "SET sort_order = -v.position" in captured[0][0]
+        assert captured[1] == (
+            "UPDATE backlot_sides_packet_scenes AS t SET sort_order = -t.sort_order "
+            "WHERE t.sort_order < 0 AND t.sides_packet_id = :scope_0",
+            {"scope_0": "p"},
+        )
@@ -0,0 +1,102 @@
+"""
+Tests for the shared search layer (query building; the SQL itself needs Postgres)
+"""
+
+import pytest
+
+from app.core import search
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """Canned result rows; records each (query, params) sent."""
+    state = {"rows": [], "calls": []}
+
+    def fake_query(query, params):
+        state["calls"].append((" ".join(query.split()), params))
+        return [dict(row) for row in state["rows"]]
+
+    monkeypatch.setattr(search, "execute_query", fake_query)
+    return state
+
+
+class TestQueryParsing:
+    def test_prefix_tsquery(self):
+        assert search.prefix_tsquery("Jane  O'Neil") == "jane:* & o:* & neil:*"
+        assert search.prefix_tsquery("!!! &|") == ""
+
+    def test_like_pattern_escapes_wildcards(self):
+        params = search.search_params("  50%_off\\ ")
+        assert params["search_like"] == "%50\\%\\_off\\\\%"
+        assert params["search_q"] == "50%_off\\"
+
+    def test_condition_uses_all_three_matchers(self):
+        sql, params = search.search_condition("crm_contacts", "Acme Films", "c")
+        assert sql == (
+            "(c.search_vector @@ to_tsquery('simple', :search_tsquery) "
+            "OR c.search_text LIKE :search_like OR :search_q <% c.search_text)"
+        )
+        assert params["search_tsquery"] == "acme:* & films:*"
+
+    def test_condition_without_words_skips_tsquery(self):
+        sql, _ = search.search_condition("content", "@@", "t")
+        assert "search_vector" not in sql
+        assert "ts_rank_cd" not in search.search_rank("content", "@@")
+
+    def test_blank_query_matches_everything(self):
+        assert search.search_condition("profiles", "   ") == ("TRUE", {})
+
+    def test_unknown_entity(self):
+        with pytest.raises(ValueError):
+            search.search_condition("nope", "x")
+
+
+class TestSearch:
+    def test_ranked_with_caller_filters(self, db):
+        search.search(
+            "profiles", "jan", columns="t.id", conditions=["t.community_visible = TRUE"],
+            params={"x": 1}, order_by="t.full_name", limit=5, offset=10,
+        )
+        (query, params), = db["calls"]
+        assert "FROM profiles t" in query
+        assert "WHERE t.community_visible = TRUE AND (t.search_vector @@ to_tsquery('simple', :search_tsquery)" in query
+        assert query.endswith(
+            "ORDER BY (ts_rank_cd(t.search_vector, to_tsquery('simple', :search_tsquery)) "
+            "+ word_similarity(:search_q, t.search_text)) DESC, t.full_name, t.id "
+            "LIMIT :search_limit OFFSET :search_offset"
+        )
+        assert params["x"] == 1 and params["search_limit"] == 5 and params["search_offset"] == 10
+
+    def test_blank_query_lists_in_order(self, db):
+        search.search("profiles", None, order_by="t.updated_at DESC")
+        query, params = db["calls"][0]
+        assert "SELECT t.*, 0 AS search_rank" in query
+        assert "WHERE TRUE ORDER BY t.updated_at DESC, t.id" in query
+        assert "search_q" not in params
+
+    def test_count(self, db):
+        db["rows"] = [{"total": 7}]
+        assert search.search_count("crm_companies", "acme") == 7
+        assert db["calls"][0][0].startswith("SELECT COUNT(*) AS total FROM crm_companies t WHERE (")
+
+
+class TestGlobalSearch:
+    def test_one_union_query_grouped_by_entity(self, db):
+        db["rows"] = [
+            {"entity": "content", "id": "c1", "title": "Night Shoot", "subtitle": None, "rank": 0.9, "data": {}},
+            {"entity": "profiles", "id": "p1", "title": "Nia", "subtitle": "nia", "rank": 0.4, "data": {}},
+        ]
+        results = search.global_search("night", ["profiles", "forum_threads", "content", "profiles"])
+
+        assert len(db["calls"]) == 1
+        query, params = db["calls"][0]
+        assert query.count("UNION ALL") == 2
+        assert "AND t2.status = 'published'" in query
+        assert params["search_limit"] == 10
+        assert [hit["id"] for hit in results["content"]] == ["c1"]
+        assert results["forum_threads"] == []
+        assert "entity" not in results["profiles"][0]
+
+    def test_blank_query_runs_nothing(self, db):
+        assert search.global_search("  ", ["profiles"]) == {"profiles": []}
+        assert db["calls"] == []
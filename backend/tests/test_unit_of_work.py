@@ -0,0 +1,59 @@
+"""
+Tests for the request-scoped unit of work in app.core.database
+
+Runs against the throwaway SQLite database from conftest.py so the real
+session/savepoint machinery is exercised.
+"""
+
+import pytest
+
+from app.core import database
+
+
+def _count_items() -> int:
+    return database.execute_single("SELECT COUNT(*) AS c FROM items", {})["c"]
+
+
+class TestUnitOfWork:
+    def test_statements_share_one_connection_and_commit(self, sqlite_db):
+        stats = database.start_request_db_stats()
+        uow = database.begin_unit_of_work()
+
+        database.execute_insert("INSERT INTO items (name) VALUES ('a') RETURNING *", {})
+        database.db_client.table("items").insert({"name": "b"}).execute()
+        rows = database.db_client.table("items").select("*").order("id").execute().data
+        uow.finish(commit=True)
+
+        assert [r["name"] for r in rows] == ["a", "b"]
+        assert stats["statements"] == 3
+        assert stats["commits"] == 1
+        assert stats["connections"] == 1
+        assert _count_items() == 2
+
+    def test_caught_failure_does_not_abort_transaction(self, sqlite_db):
+        uow = database.begin_unit_of_work()
+        database.execute_insert("INSERT INTO items (name) VALUES ('a') RETURNING *", {})
+        with pytest.raises(Exception):
+            database.execute_query("SELECT * FROM missing_table", {})
+        database.execute_insert("INSERT INTO items (name) VALUES ('b') RETURNING *", {})
+        uow.finish(commit=True)
+
+        assert _count_items() == 2
+
+    def test_rollback_discards_request_writes(self, sqlite_db):
+        uow = database.begin_unit_of_work()
+        database.execute_insert("INSERT INTO items (name) VALUES ('a') RETURNING *", {})
+        uow.finish(commit=False)
+
+        assert _count_items() == 0
+
+    def test_release_commits_and_falls_back_to_per_statement(self, sqlite_db):
+        uow = database.begin_unit_of_work()
+        database.execute_insert("INSERT INTO items (name) VALUES ('a') RETURNING *", {})
+        database.release_unit_of_work()
+
+        assert not uow.active
+        stats = database.start_request_db_stats()
+        database.execute_insert("INSERT INTO items (name) VALUES ('b') RETURNING *", {})
+        assert stats["commits"] == 1
+        assert _count_items() == 2
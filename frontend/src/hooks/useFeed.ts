@@ -30,8 +30,8 @@ export function useFeed(options: UseFeedOptions) {
     queryKey,
     queryFn: async ({ pageParam }) => {
       const data = type === 'public'
-        ? await api.listPublicFeed({ limit, before: pageParam })
-        : await api.listConnectionsFeed({ limit, before: pageParam });
+        ? await api.listPublicFeed({ limit, cursor: pageParam })
+        : await api.listConnectionsFeed({ limit, cursor: pageParam });
       return data as FeedResponse;
     },
     initialPageParam: undefined as string | undefined,
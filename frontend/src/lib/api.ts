@@ -2064,20 +2064,20 @@ class APIClient {
   // COMMUNITY FEED
   // ============================================================================
 
-  async listPublicFeed(params?: { limit?: number; before?: string }) {
+  async listPublicFeed(params?: { limit?: number; cursor?: string }) {
     const searchParams = new URLSearchParams()
     if (params?.limit) searchParams.set('limit', params.limit.toString())
-    if (params?.before) searchParams.set('before', params.before)
+    if (params?.cursor) searchParams.set('cursor', params.cursor)
     const query = searchParams.toString()
     return this.request<{ posts: any[]; next_cursor: string | null }>(
       `/api/v1/community/feed/public${query ? `?${query}` : ''}`
     )
   }
 
-  async listConnectionsFeed(params?: { limit?: number; before?: string }) {
+  async listConnectionsFeed(params?: { limit?: number; cursor?: string }) {
     const searchParams = new URLSearchParams()
     if (params?.limit) searchParams.set('limit', params.limit.toString())
-    if (params?.before) searchParams.set('before', params.before)
+    if (params?.cursor) searchParams.set('cursor', params.cursor)
     const query = searchParams.toString()
     return this.request<{ posts: any[]; next_cursor: string | null }>(
       `/api/v1/community/feed/connections${query ? `?${query}` : ''}`
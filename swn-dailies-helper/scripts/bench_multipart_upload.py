@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming multipart uploader against a local S3 stand-in.
+
+Compares the old single-PUT path (whole file read into memory, one request)
+with MultipartUploader at several part concurrencies, reporting MB/s and
+peak Python memory, then interrupts an upload halfway and resumes it. The
+last run and the resume also hash the streamed buffers, checked against a
+separate calculate_xxh64() pass.
+
+Presigned URLs come straight from boto3 instead of the SWN API, so no
+backend is needed. By default a moto server is started in a subprocess (so
+its buffers don't count towards the peak); pass --endpoint to use MinIO or
+another S3-compatible server instead:
+
+    pip install "moto[server]"
+    python scripts/bench_multipart_upload.py --size-mb 1024
+    python scripts/bench_multipart_upload.py --endpoint http://127.0.0.1:9000 \\
+        --access-key minioadmin --secret-key minioadmin
+"""
+import argparse
+import hashlib
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+import boto3
+import httpx
+from botocore.config import Config
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.checksum import calculate_xxh64, create_hasher
+from src.services.exceptions import MultipartUploadNotFoundError, UploadCancelledError
+from src.services.multipart_uploader import MultipartUploader, UploadStateStore
+
+BUCKET = "bench-multipart"
+
+
+class S3DirectAPI:
+    """Stands in for DesktopMultipartAPI, presigning against the local server."""
+
+    def __init__(self, s3):
+        self.s3 = s3
+
+    def initiate(self, project_id, file_name, content_type, file_size, part_size):
+        key = f"projects/{project_id}/assets/{uuid.uuid4()}/{file_name}"
+        response = self.s3.create_multipart_upload(Bucket=BUCKET, Key=key, ContentType=content_type)
+        return {"upload_id": response["UploadId"], "s3_key": key, "part_size": part_size}
+
+    def part_urls(self, state, part_numbers):
+        return {
+            n: self.s3.generate_presigned_url(
+                "upload_part",
+                Params={"Bucket": BUCKET, "Key": state.s3_key, "UploadId": state.upload_id, "PartNumber": n},
+                ExpiresIn=3600,
+            )
+            for n in part_numbers
+        }
+
+    def list_parts(self, state):
+        try:
+            response = self.s3.list_parts(Bucket=BUCKET, Key=state.s3_key, UploadId=state.upload_id)
+        except self.s3.exceptions.NoSuchUpload:
+            raise MultipartUploadNotFoundError(state.upload_id)
+        return {p["PartNumber"]: p["ETag"] for p in response.get("Parts", [])}
+
+    def complete(self, state):
+        parts = [{"PartNumber": n, "ETag": etag} for n, etag in sorted(state.parts.items())]
+        return self.s3.complete_multipart_upload(
+            Bucket=BUCKET, Key=state.s3_key, UploadId=state.upload_id, MultipartUpload={"Parts": parts}
+        )
+
+    def abort(self, state):
+        self.s3.abort_multipart_upload(Bucket=BUCKET, Key=state.s3_key, UploadId=state.upload_id)
+
+
+def start_moto() -> tuple:
+    """Run moto's S3 server in a subprocess; returns (process, endpoint)."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "moto.server", "-p", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    endpoint = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(endpoint, timeout=0.5)
+            return process, endpoint
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("moto server did not start")
+
+
+def make_file(directory: Path, size_mb: int) -> Path:
+    path = directory / "A001C003_bench.braw"
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        for i in range(size_mb):
+            f.write(block[i % 256:] + block[:i % 256])
+    return path
+
+
+def md5_of(path: Path) -> str:
+    h = hashlib.md5()
+    with open(path, "rb") as f:
+        while chunk := f.read(8 * 1024 * 1024):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def md5_of_object(s3, key: str) -> str:
+    h = hashlib.md5()
+    for chunk in s3.get_object(Bucket=BUCKET, Key=key)["Body"].iter_chunks(8 * 1024 * 1024):
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def measure(label: str, size: int, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<28} {size / elapsed / 1e6:8.1f} MB/s   {elapsed:7.2f}s   peak {peak / 1e6:8.1f} MB")
+    return result
+
+
+def single_put(s3, client: httpx.Client, path: Path) -> str:
+    """The previous UploaderService path: read everything, one PUT."""
+    key = f"projects/bench/assets/{uuid.uuid4()}/{path.name}"
+    url = s3.generate_presigned_url("put_object", Params={"Bucket": BUCKET, "Key": key}, ExpiresIn=3600)
+    with open(path, "rb") as f:
+        data = f.read()
+    response = client.put(url, content=data, timeout=600.0)
+    response.raise_for_status()
+    return key
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--part-mb", type=int, default=16)
+    parser.add_argument("--workers", default="1,4,8")
+    parser.add_argument("--endpoint", help="S3-compatible endpoint (default: start a moto server)")
+    parser.add_argument("--access-key", default="testing")
+    parser.add_argument("--secret-key", default="testing")
+    args = parser.parse_args()
+
+    server = None
+    endpoint = args.endpoint
+    if not endpoint:
+        server, endpoint = start_moto()
+
+    s3 = boto3.client(
+        "s3",
+        endpoint_url=endpoint,
+        aws_access_key_id=args.access_key,
+        aws_secret_access_key=args.secret_key,
+        region_name="us-east-1",
+        config=Config(signature_version="s3v4"),
+    )
+    s3.create_bucket(Bucket=BUCKET)
+    api = S3DirectAPI(s3)
+    part_size = args.part_mb * 1024 * 1024
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        path = make_file(tmp, args.size_mb)
+        size = path.stat().st_size
+        expected = md5_of(path)
+        store = UploadStateStore(tmp / "state")
+        print(f"{args.size_mb} MB file, {args.part_mb} MB parts, endpoint {endpoint}")
+
+        with httpx.Client(limits=httpx.Limits(max_connections=32)) as client:
+            key = measure("single PUT (in memory)", size, lambda: single_put(s3, client, path))
+            assert md5_of_object(s3, key) == expected
+
+            for workers in (int(w) for w in args.workers.split(",")):
+                uploader = MultipartUploader(api, client, part_size=part_size, max_workers=workers, state_store=store)
+                state = measure(
+                    f"multipart x{workers}", size,
+                    lambda: uploader.upload(path, "bench", "application/octet-stream"),
+                )
+                assert md5_of_object(s3, state.s3_key) == expected, "uploaded object differs"
+
+            checksum = measure("separate xxh64 pass", size, lambda: calculate_xxh64(str(path)))
+            hasher = create_hasher()
+            state = measure(
+                f"multipart x{workers} + xxh64", size,
+                lambda: uploader.upload(path, "bench", "application/octet-stream", hasher=hasher),
+            )
+            assert hasher.hexdigest() == checksum, "hash-while-upload digest differs"
+
+            # Interrupt roughly halfway, then resume from the saved part ETags
+            uploader = MultipartUploader(api, client, part_size=part_size, max_workers=4, state_store=store)
+            stop = threading.Event()
+
+            def progress(done, total):
+                if done >= total // 2:
+                    stop.set()
+
+            try:
+                uploader.upload(path, "bench", progress_callback=progress, is_cancelled=stop.is_set)
+                raise AssertionError("upload was not interrupted")
+            except UploadCancelledError:
+                pass
+
+            sent = []
+            hasher = create_hasher()
+            state = measure(
+                "resume after interrupt", size,
+                lambda: uploader.upload(path, "bench", progress_callback=lambda d, t: sent.append(d), hasher=hasher),
+            )
+            assert md5_of_object(s3, state.s3_key) == expected, "resumed object differs"
+            assert hasher.hexdigest() == checksum, "resumed upload digest differs"
+            print(f"  resumed at {sent[0] / size:.0%} of the file, {state.total_parts} parts total")
+
+    if server:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Benchmark the pipelined CopyEngine against the previous offload copy path.
+
+The previous RobustOffloadWorker path copied each destination in turn (one
+full read, xxHash64 + SHA-256 and a write per destination, all on one
+thread) and then re-read every destination one after another to verify.
+The engine reads the source once, hashes and writes all destinations
+concurrently, and verifies the destinations in parallel.
+
+By default source and destinations are directories on tmpfs, which shows
+the CPU/pipelining side. --loop backs each of them with its own ext4 loop
+device (needs root, losetup and mkfs.ext4) so each destination is a separate
+block device, like a RAID and a shuttle drive:
+
+    python scripts/bench_offload_copy.py --size-mb 256 --files 4
+    sudo python scripts/bench_offload_copy.py --loop --dests 2 --direct-io
+    python scripts/bench_offload_copy.py --source-dir /Volumes/CARD/bench \\
+        --dest-dir /Volumes/RAID/bench --dest-dir /Volumes/SHUTTLE/bench
+"""
+import argparse
+import hashlib
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.copy_engine import CopyEngine, CopyStats
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+CHUNK_SIZE = 64 * 1024 * 1024  # the previous worker's chunk size
+
+
+def drop_cache(path: Path):
+    """Best effort: make the next read of a file come from the device."""
+    if hasattr(os, "posix_fadvise"):
+        fd = os.open(str(path), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def dual_hash(path: Path) -> str:
+    sha = hashlib.sha256()
+    xxh = xxhash.xxh64() if HAS_XXHASH else None
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            if xxh:
+                xxh.update(chunk)
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def previous_copy(source: Path, dest: Path) -> str:
+    """The previous _atomic_write_with_checksum: one destination per source read."""
+    temp = dest.parent / (dest.name + ".swn_temp")
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    sha = hashlib.sha256()
+    xxh = xxhash.xxh64() if HAS_XXHASH else None
+    with open(source, "rb") as src, open(temp, "wb") as dst:
+        while chunk := src.read(CHUNK_SIZE):
+            if xxh:
+                xxh.update(chunk)
+            sha.update(chunk)
+            dst.write(chunk)
+        dst.flush()
+        os.fsync(dst.fileno())
+    temp.rename(dest)
+    return sha.hexdigest()
+
+
+def run_previous(sources, dest_dirs):
+    start = time.perf_counter()
+    expected = {}
+    for source in sources:
+        for dest_dir in dest_dirs:
+            expected[source.name] = previous_copy(source, dest_dir / source.name)
+    copied = time.perf_counter()
+    for source in sources:
+        for dest_dir in dest_dirs:
+            drop_cache(dest_dir / source.name)
+            assert dual_hash(dest_dir / source.name) == expected[source.name], "verify failed"
+    return copied - start, time.perf_counter() - copied, None
+
+
+def run_engine(sources, dest_dirs, direct_io):
+    engine = CopyEngine(direct_io=direct_io)
+    stats = CopyStats()
+    start = time.perf_counter()
+    expected = {}
+    for source in sources:
+        result = engine.copy(source, [d / source.name for d in dest_dirs], labels=[d.parent.name for d in dest_dirs])
+        stats.merge(result.stats)
+        expected[source.name] = result.digests["sha256"]
+    copied = time.perf_counter()
+    for source in sources:
+        results = engine.hash_files([d / source.name for d in dest_dirs])
+        for result in results.values():
+            assert result.digests["sha256"] == expected[source.name], "verify failed"
+    return copied - start, time.perf_counter() - copied, stats
+
+
+def mount_loop(stack: ExitStack, root: Path, name: str, size_mb: int) -> Path:
+    """Create, attach and mount an ext4 loop device; torn down by the stack."""
+    image = root / f"{name}.img"
+    mountpoint = root / name
+    mountpoint.mkdir()
+    with open(image, "wb") as f:
+        f.truncate(size_mb * 1024 * 1024)
+    subprocess.run(["mkfs.ext4", "-q", "-F", str(image)], check=True)
+    device = subprocess.run(
+        ["losetup", "-f", "--show", "--direct-io=on", str(image)],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip()
+    stack.callback(subprocess.run, ["losetup", "-d", device])
+    subprocess.run(["mount", device, str(mountpoint)], check=True)
+    stack.callback(subprocess.run, ["umount", str(mountpoint)])
+    return mountpoint / "bench"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=256, help="size of each file")
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--dests", type=int, default=2, help="number of destinations (tmpfs/--loop)")
+    parser.add_argument("--loop", action="store_true", help="put source and each destination on its own loop device")
+    parser.add_argument("--direct-io", action="store_true", help="run the engine with O_DIRECT")
+    parser.add_argument("--source-dir", type=Path)
+    parser.add_argument("--dest-dir", type=Path, action="append")
+    args = parser.parse_args()
+
+    with ExitStack() as stack:
+        shm = Path("/dev/shm")
+        root = Path(stack.enter_context(tempfile.TemporaryDirectory(
+            dir="/var/tmp" if args.loop else (shm if shm.is_dir() else None)
+        )))
+
+        if args.source_dir and args.dest_dir:
+            source_dir, dest_dirs, where = args.source_dir, args.dest_dir, "given directories"
+        elif args.loop:
+            if platform.system() != "Linux" or os.geteuid() != 0:
+                parser.error("--loop needs root on Linux")
+            size = args.size_mb * args.files + 128
+            source_dir = mount_loop(stack, root, "card", size)
+            dest_dirs = [mount_loop(stack, root, f"dest{i + 1}", size) for i in range(args.dests)]
+            where = "ext4 loop devices"
+        else:
+            source_dir = root / "card" / "bench"
+            dest_dirs = [root / f"dest{i + 1}" / "bench" for i in range(args.dests)]
+            where = "tmpfs" if str(root).startswith("/dev/shm") else str(root)
+
+        source_dir.mkdir(parents=True, exist_ok=True)
+        sources = []
+        block = os.urandom(1024 * 1024)
+        for n in range(args.files):
+            path = source_dir / f"A001C{n + 1:03d}.mov"
+            with open(path, "wb") as f:
+                for i in range(args.size_mb):
+                    f.write(block[i % 256:] + block[:i % 256])
+            sources.append(path)
+        total = args.size_mb * args.files * 1024 * 1024
+
+        print(f"{args.files} x {args.size_mb} MB to {len(dest_dirs)} destinations on {where}"
+              f" ({os.cpu_count()} CPU)")
+
+        runs = [("previous worker", lambda: run_previous(sources, dest_dirs)),
+                ("copy engine" + (" (O_DIRECT)" if args.direct_io else ""),
+                 lambda: run_engine(sources, dest_dirs, args.direct_io))]
+        for label, run in runs:
+            for d in dest_dirs:
+                shutil.rmtree(d, ignore_errors=True)
+                d.mkdir(parents=True)
+            for source in sources:
+                drop_cache(source)
+            copy_time, verify_time, stats = run()
+            print(f"  {label:<26} copy {total / copy_time / 1e6:7.1f} MB/s   "
+                  f"verify {total * len(dest_dirs) / verify_time / 1e6:7.1f} MB/s   "
+                  f"total {copy_time + verify_time:6.2f}s")
+            if stats:
+                print(f"    stages: {stats.summary()}")
+
+        for d in dest_dirs:
+            shutil.rmtree(d, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Benchmark the append-only offload journal against whole-document JSON rewrites.
+
+Builds a synthetic journal of --files entries (two destinations, dual
+checksums, like a large stills/proxy card) and measures:
+
+  - one save after a file state change: the previous _save_journal (whole
+    journal to JSON, fsync, rename) vs appending the change to the log
+  - a whole job's journal I/O: every file going through copy and verify
+  - resume_from_journal on a log with a full job's appends, vs json.load
+  - get_pending_journals over --journals such journals
+  - export_manifest_for_audit from a journal path
+  - OffloadManifestService.update_file, previous vs appended
+
+Journals and manifests go to a temporary HOME; --dir puts it on a specific
+disk (fsync cost differs a lot between tmpfs, SSD and spinning disks):
+
+    python scripts/bench_offload_journal.py
+    python scripts/bench_offload_journal.py --files 10000 --dir /Volumes/RAID/tmp
+"""
+import argparse
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--files", type=int, default=10000)
+parser.add_argument("--journals", type=int, default=10, help="journals for the get_pending_journals run")
+parser.add_argument("--samples", type=int, default=50, help="saves timed for the previous format")
+parser.add_argument("--dir", type=Path, help="where the temporary HOME goes (default: system temp)")
+args = parser.parse_args()
+
+# Journals and manifests must not touch the real ~/.swn-dailies-helper
+_home = tempfile.mkdtemp(prefix="swn-bench-home-", dir=args.dir)
+os.environ["HOME"] = _home
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services import robust_offload_worker  # noqa: E402
+from src.services.offload_manifest import OffloadManifestService  # noqa: E402
+from src.services.robust_offload_worker import (  # noqa: E402
+    JOURNAL_DIR,
+    DestinationCopy,
+    FileChecksum,
+    FileState,
+    OffloadJournal,
+    OffloadPhase,
+    RobustFileEntry,
+    RobustOffloadWorker,
+    export_manifest_for_audit,
+    get_pending_journals,
+)
+
+
+def make_journal(files: int) -> OffloadJournal:
+    destinations = ["/Volumes/RAID/Day01", "/Volumes/SHUTTLE/Day01"]
+    return OffloadJournal(
+        job_id=os.urandom(16).hex(),
+        source_path="/Volumes/A001",
+        destination_paths=destinations,
+        camera_label="A",
+        roll_name="A001",
+        phase=OffloadPhase.COPYING.value,
+        files=[
+            RobustFileEntry(
+                file_name=f"A001C{n:05d}_STILL.JPG",
+                relative_path="DCIM/100MEDIA",
+                file_size=4 * 1024 * 1024 + n,
+                destination_copies=[DestinationCopy(path=d) for d in destinations],
+            )
+            for n in range(files)
+        ],
+    )
+
+
+def advance(entry: RobustFileEntry, n: int):
+    """Move a file one step through copy and verify."""
+    checksum = FileChecksum(xxhash64=f"{n:016x}", sha256=f"{n:064x}")
+    if entry.state == FileState.PENDING.value:
+        entry.source_checksum_on_copy = checksum
+        for dest_copy in entry.destination_copies:
+            dest_copy.path = f"{dest_copy.path}/{entry.relative_path}/{entry.file_name}"
+        entry.state = FileState.COPY_COMPLETE.value
+    else:
+        for dest_copy in entry.destination_copies:
+            dest_copy.checksum = checksum
+            dest_copy.verified = True
+            dest_copy.verified_at = "2026-01-01T00:00:00"
+        entry.source_checksum_reread = checksum
+        entry.source_verified = entry.all_copies_verified = True
+        entry.state = FileState.FULLY_VERIFIED.value
+
+
+def previous_save(journal: OffloadJournal, path: Path):
+    """The previous _save_journal: whole journal as indented JSON, fsync, rename."""
+    temp_path = path.with_suffix(".tmp")
+    with open(temp_path, "w") as f:
+        json.dump(journal.to_dict(), f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    temp_path.rename(path)
+
+
+def timed(fn):
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def report(label: str, seconds: float, detail: str = ""):
+    value = f"{seconds:8.2f} s " if seconds >= 1 else f"{seconds * 1000:8.2f} ms"
+    print(f"  {label:<48} {value}  {detail}")
+
+
+def main():
+    n = args.files
+    samples = min(args.samples, n)
+    print(f"{n} file synthetic journal, HOME on {args.dir or tempfile.gettempdir()}")
+
+    # One save after a state change
+    journal = make_journal(n)
+    legacy_path = JOURNAL_DIR / f"{journal.job_id}.journal.json"
+    JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
+    elapsed, _ = timed(lambda: [previous_save(journal, legacy_path) or advance(journal.files[i], i)
+                                for i in range(samples)])
+    previous_per_save = elapsed / samples
+    report("previous: one save (whole journal)", previous_per_save,
+           f"{legacy_path.stat().st_size / 1e6:.1f} MB per save")
+
+    worker = RobustOffloadWorker(make_journal(n))
+    worker._save_journal()  # Initial compacted log
+    elapsed, _ = timed(lambda: [
+        advance(worker.journal.files[i], i) or worker._changed_files.add(i) or worker._save_journal()
+        for i in range(samples)
+    ])
+    report("append-only: one save (one file)", elapsed / samples)
+
+    # A whole job: every file through copy and verify
+    report("previous: whole job, save per change", previous_per_save * 2 * n, "(projected)")
+    for label, interval, every in [
+        ("append-only: whole job, save per change", 0.0, 1),
+        ("append-only: whole job, batched saves", robust_offload_worker.JOURNAL_SAVE_INTERVAL,
+         robust_offload_worker.JOURNAL_SAVE_EVERY),
+    ]:
+        robust_offload_worker.JOURNAL_SAVE_INTERVAL = interval
+        robust_offload_worker.JOURNAL_SAVE_EVERY = every
+        worker = RobustOffloadWorker(make_journal(n))
+
+        def job():
+            worker._save_journal()
+            for _ in range(2):
+                for i, entry in enumerate(worker.journal.files):
+                    advance(entry, i)
+                    worker._journal_changed(entry)
+            worker._save_journal()
+
+        elapsed, _ = timed(job)
+        report(label, elapsed, f"log {worker.journal_path.stat().st_size / 1e6:.1f} MB")
+
+    # Resume: a log holding a full job's appends vs the previous JSON file
+    job_log = worker.journal_path
+    previous_save(worker.journal, legacy_path)
+    elapsed, _ = timed(lambda: OffloadJournal.from_dict(json.load(open(legacy_path))))
+    report("previous: load journal (whole JSON)", elapsed)
+    elapsed, resumed = timed(lambda: RobustOffloadWorker.resume_from_journal(job_log))
+    assert resumed.journal.to_dict()["files"] == worker.journal.to_dict()["files"], "replay differs"
+    report("append-only: resume_from_journal (replay)", elapsed)
+    resumed._save_journal(compact=True)
+    elapsed, _ = timed(lambda: RobustOffloadWorker.resume_from_journal(job_log))
+    report("append-only: resume_from_journal (compacted)", elapsed)
+
+    # get_pending_journals over several large journals
+    for path in JOURNAL_DIR.iterdir():
+        if path != job_log:
+            path.rename(Path(_home) / path.name)
+    for i in range(args.journals - 1):
+        shutil.copy(job_log, JOURNAL_DIR / f"copy{i}{robust_offload_worker.JOURNAL_SUFFIX}")
+    legacy_dir = Path(_home) / "legacy"
+    legacy_dir.mkdir()
+    for i in range(args.journals):
+        shutil.copy(Path(_home) / legacy_path.name, legacy_dir / f"copy{i}.journal.json")
+
+    def previous_pending():
+        return [p for p in legacy_dir.glob("*.journal.json")
+                if json.load(open(p)).get("phase") not in ("complete", "failed")]
+
+    elapsed, _ = timed(previous_pending)
+    report(f"previous: pending journals ({args.journals} files)", elapsed)
+    elapsed, pending = timed(get_pending_journals)
+    assert len(pending) == args.journals
+    report(f"append-only: get_pending_journals ({args.journals} files)", elapsed)
+
+    elapsed, _ = timed(lambda: export_manifest_for_audit(job_log, Path(_home)))
+    report("export_manifest_for_audit (from path)", elapsed)
+
+    # Manifest service
+    service = OffloadManifestService(None)
+    files = [{"name": e.file_name, "relative_path": e.relative_path, "size": e.file_size}
+             for e in worker.journal.files]
+    manifest = service.create_manifest("project", None, "card", "A", "001", files, ["/Volumes/RAID"])
+    manifest_path = service.manifests_dir / f"{manifest.local_id}.legacy"
+
+    def previous_manifest_updates():
+        for i in range(samples):
+            manifest.update_file_status(manifest.files[i].file_name, offload_status="completed")
+            with open(manifest_path, "w") as f:
+                json.dump(manifest.to_dict(), f, indent=2)
+
+    elapsed, _ = timed(previous_manifest_updates)
+    report("previous: manifest update_file", elapsed / samples)
+    elapsed, _ = timed(lambda: [service.update_file(manifest.files[i].file_name, manifest, upload_status="completed")
+                                for i in range(samples)])
+    report("append-only: manifest update_file", elapsed / samples)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        shutil.rmtree(_home, ignore_errors=True)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark RobustOffloadWorker on a card full of small files.
+
+Stills, sidecars, XML and proxies cost per-file open/fsync/rename latency
+rather than bandwidth, so the worker copies and verifies them in concurrent
+size-packed batches (large files still run alone) and batches its journal
+saves. This runs the same job with one file in flight (the previous
+behaviour, including a journal save per file), one at a time with batched
+journal saves, and with the default concurrency, and reports files/s for the
+whole copy + verify job.
+
+Journals and the checksum cache go to a temporary HOME. --loop puts the card
+and each destination on its own ext4 loop device (needs root), which is
+where fsync latency shows:
+
+    python scripts/bench_offload_small_files.py --files 2000
+    sudo python scripts/bench_offload_small_files.py --loop --files 2000 --large 2
+"""
+import argparse
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+# Journals and the checksum cache must not touch the real ~/.swn-dailies-helper
+_home = tempfile.mkdtemp(prefix="swn-bench-home-")
+os.environ["HOME"] = _home
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_offload_copy import drop_cache, mount_loop  # noqa: E402
+
+from src.services import robust_offload_worker  # noqa: E402
+from src.services.robust_offload_worker import MAX_CONCURRENT_FILES, RobustOffloadWorker  # noqa: E402
+
+
+def make_card(source_dir: Path, files: int, large: int, large_mb: int) -> list:
+    """Sony-style clip folder: small XML/JPG sidecars plus a few large clips."""
+    entries = []
+    clip_dir = source_dir / "PRIVATE" / "M4ROOT" / "CLIP"
+    clip_dir.mkdir(parents=True)
+    for n in range(files):
+        name = f"C{n + 1:04d}M01.XML" if n % 2 else f"C{n + 1:04d}T01.JPG"
+        path = clip_dir / name
+        path.write_bytes(os.urandom(2048 + (n * 7919) % (512 * 1024)))
+        entries.append({"name": name, "relative_path": "PRIVATE/M4ROOT/CLIP", "size": path.stat().st_size})
+    block = os.urandom(1024 * 1024)
+    for n in range(large):
+        path = clip_dir / f"C{n + 1:04d}.MP4"
+        with open(path, "wb") as f:
+            for i in range(large_mb):
+                f.write(block[i % 256:] + block[:i % 256])
+        entries.append({"name": path.name, "relative_path": "PRIVATE/M4ROOT/CLIP", "size": path.stat().st_size})
+    return entries
+
+
+def run_job(source_dir: Path, dest_dirs: list, entries: list, concurrency: int) -> dict:
+    worker = RobustOffloadWorker.create_new(
+        str(source_dir), [str(d) for d in dest_dirs], entries,
+        generate_mhl=False, max_concurrent_files=concurrency,
+    )
+    result = {}
+    worker.offload_completed.connect(lambda ok, message, stats: result.update(ok=ok, message=message))
+    worker.run()
+    if not result.get("ok"):
+        raise RuntimeError(result.get("message", "offload did not complete"))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=1000, help="number of small files")
+    parser.add_argument("--large", type=int, default=1, help="number of large clips")
+    parser.add_argument("--large-mb", type=int, default=300)
+    parser.add_argument("--dests", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_FILES)
+    parser.add_argument("--loop", action="store_true", help="put card and each destination on its own loop device")
+    args = parser.parse_args()
+
+    with ExitStack() as stack:
+        stack.callback(shutil.rmtree, _home, True)
+        shm = Path("/dev/shm")
+        root = Path(stack.enter_context(tempfile.TemporaryDirectory(
+            dir="/var/tmp" if args.loop else (shm if shm.is_dir() else None)
+        )))
+
+        if args.loop:
+            if platform.system() != "Linux" or os.geteuid() != 0:
+                parser.error("--loop needs root on Linux")
+            size = args.files // 2 + args.large * args.large_mb + 256
+            source_dir = mount_loop(stack, root, "card", size)
+            dest_roots = [mount_loop(stack, root, f"dest{i + 1}", size) for i in range(args.dests)]
+            where = "ext4 loop devices"
+        else:
+            source_dir = root / "card" / "bench"
+            dest_roots = [root / f"dest{i + 1}" / "bench" for i in range(args.dests)]
+            where = "tmpfs" if str(root).startswith("/dev/shm") else str(root)
+
+        entries = make_card(source_dir, args.files, args.large, args.large_mb)
+        total = sum(e["size"] for e in entries)
+        print(f"{args.files} small files + {args.large} x {args.large_mb} MB clips "
+              f"({total / 1e6:.0f} MB) to {len(dest_roots)} destinations on {where} ({os.cpu_count()} CPU)")
+
+        runs = [
+            # One file at a time and a journal rewrite after every file, as before
+            ("sequential", 1, 0.0, 1),
+            ("batched journal", 1,
+             robust_offload_worker.JOURNAL_SAVE_INTERVAL, robust_offload_worker.JOURNAL_SAVE_EVERY),
+            (f"concurrent x{args.concurrency}", args.concurrency,
+             robust_offload_worker.JOURNAL_SAVE_INTERVAL, robust_offload_worker.JOURNAL_SAVE_EVERY),
+        ]
+        for label, concurrency, save_interval, save_every in runs:
+            robust_offload_worker.JOURNAL_SAVE_INTERVAL = save_interval
+            robust_offload_worker.JOURNAL_SAVE_EVERY = save_every
+            dest_dirs = [d / label.replace(" ", "_") for d in dest_roots]
+            for path in source_dir.rglob("*"):
+                if path.is_file():
+                    drop_cache(path)
+
+            start = time.perf_counter()
+            run_job(source_dir, dest_dirs, entries, concurrency)
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<16} {len(entries) / elapsed:8.1f} files/s   "
+                  f"{total / elapsed / 1e6:7.1f} MB/s   {elapsed:6.2f}s")
+
+            for d in dest_dirs:
+                shutil.rmtree(d, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
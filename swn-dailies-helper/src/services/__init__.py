@@ -19,6 +19,7 @@ from src.services.checksum import (
     VerificationResult,
     check_xxhash_available,
 )
+from src.services.checksum_cache import ChecksumCache, cached_xxh64, get_checksum_cache
 # Professional media tool services
 from src.services.binary_manager import BinaryManager, get_binary_manager
 from src.services.mediainfo_service import MediaInfoService, get_mediainfo_service
@@ -54,6 +55,9 @@ __all__ = [
     "ChecksumResult",
     "VerificationResult",
     "check_xxhash_available",
+    "ChecksumCache",
+    "cached_xxh64",
+    "get_checksum_cache",
     # Professional media tool services
     "BinaryManager",
     "get_binary_manager",
@@ -45,6 +45,18 @@ class VerificationResult:
     file_size: int
 
 
+def create_hasher():
+    """
+    Return a fresh incremental hasher matching calculate_xxh64().
+
+    XXH64 when xxhash is installed, otherwise SHA-256, so digests from code
+    that hashes its own buffers (e.g. while uploading) compare equal.
+    """
+    if HAS_XXHASH:
+        return xxhash.xxh64()
+    return hashlib.sha256()
+
+
 def calculate_xxh64(
     file_path: str,
     chunk_size: int = CHUNK_SIZE,
@@ -65,10 +77,7 @@ def calculate_xxh64(
     total_size = path.stat().st_size
     bytes_read = 0
 
-    if HAS_XXHASH:
-        hasher = xxhash.xxh64()
-    else:
-        hasher = hashlib.sha256()
+    hasher = create_hasher()
 
     # Use memory-mapped I/O for large files
     if total_size > MMAP_THRESHOLD:
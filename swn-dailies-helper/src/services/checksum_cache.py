@@ -0,0 +1,190 @@
+"""
+Checksum Cache - Remember file checksums so unchanged files are never re-hashed.
+
+Entries are keyed on the absolute path and only trusted while the file's
+(size, mtime, inode) identity is unchanged. The offload workers record each
+destination copy they verify, and the uploader records what it hashes while
+streaming, so queuing an offloaded clip for upload (or uploading it again)
+costs no extra read of the media.
+"""
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from src.services.checksum import calculate_xxh64, check_xxhash_available
+from src.services.config import CONFIG_DIR
+
+MAX_ENTRIES = 50000  # Oldest entries are pruned past this on startup
+
+FileIdentity = Tuple[int, int, int]  # (size, mtime_ns, inode)
+
+
+def file_identity(path_or_stat: Union[str, Path, os.stat_result]) -> FileIdentity:
+    """Return the (size, mtime_ns, inode) triple cached checksums are keyed on."""
+    st = path_or_stat if isinstance(path_or_stat, os.stat_result) else os.stat(path_or_stat)
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+@dataclass
+class CachedChecksum:
+    """Checksums known for one file identity (either may be empty)."""
+    xxhash64: str = ""
+    sha256: str = ""
+
+
+class ChecksumCache:
+    """SQLite-backed checksum cache shared by the offload and upload services."""
+
+    def __init__(self, db_path: Optional[str] = None):
+        if db_path is None:
+            CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+            db_path = str(CONFIG_DIR / "checksum_cache.db")
+
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _init_database(self):
+        """Create the schema and prune the oldest entries past MAX_ENTRIES."""
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS checksums (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                xxhash64 TEXT NOT NULL DEFAULT '',
+                sha256 TEXT NOT NULL DEFAULT '',
+                cached_at TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            DELETE FROM checksums WHERE path IN (
+                SELECT path FROM checksums ORDER BY cached_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (MAX_ENTRIES,))
+        conn.commit()
+        conn.close()
+
+    def lookup(self, file_path: Union[str, Path]) -> Optional[CachedChecksum]:
+        """Return cached checksums if the file is unchanged since they were stored."""
+        path = os.path.abspath(file_path)
+        try:
+            identity = file_identity(path)
+        except OSError:
+            return None
+
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT size, mtime_ns, inode, xxhash64, sha256 FROM checksums WHERE path = ?",
+            (path,),
+        ).fetchone()
+        conn.close()
+
+        if not row or tuple(row[:3]) != identity:
+            return None
+        return CachedChecksum(xxhash64=row[3], sha256=row[4])
+
+    def store(
+        self,
+        file_path: Union[str, Path],
+        identity: FileIdentity,
+        xxhash64: str = "",
+        sha256: str = "",
+    ) -> bool:
+        """
+        Record checksums for a file.
+
+        Args:
+            file_path: Path that was hashed
+            identity: file_identity() taken before the file was read; nothing is
+                stored if the file no longer matches it (changed while hashing)
+            xxhash64: XXH64 hex digest, if computed
+            sha256: SHA-256 hex digest, if computed
+
+        Returns:
+            True if the entry was stored
+        """
+        path = os.path.abspath(file_path)
+        try:
+            if file_identity(path) != tuple(identity):
+                return False
+        except OSError:
+            return False
+
+        size, mtime_ns, inode = identity
+        with self._lock:
+            conn = self._connect()
+            # Keep the other digest when the same file version gains a second one
+            conn.execute("""
+                INSERT INTO checksums (path, size, mtime_ns, inode, xxhash64, sha256, cached_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    xxhash64 = CASE WHEN excluded.xxhash64 = '' AND size = excluded.size
+                        AND mtime_ns = excluded.mtime_ns AND inode = excluded.inode
+                        THEN xxhash64 ELSE excluded.xxhash64 END,
+                    sha256 = CASE WHEN excluded.sha256 = '' AND size = excluded.size
+                        AND mtime_ns = excluded.mtime_ns AND inode = excluded.inode
+                        THEN sha256 ELSE excluded.sha256 END,
+                    size = excluded.size,
+                    mtime_ns = excluded.mtime_ns,
+                    inode = excluded.inode,
+                    cached_at = excluded.cached_at
+            """, (path, size, mtime_ns, inode, xxhash64, sha256, datetime.now().isoformat()))
+            conn.commit()
+            conn.close()
+        return True
+
+    def forget(self, file_path: Union[str, Path]):
+        """Drop any entry for a path."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM checksums WHERE path = ?", (os.path.abspath(file_path),))
+            conn.commit()
+            conn.close()
+
+    def lookup_xxh64(self, file_path: Union[str, Path]) -> Optional[str]:
+        """Cached digest in calculate_xxh64()'s algorithm (SHA-256 without xxhash)."""
+        cached = self.lookup(file_path)
+        if not cached:
+            return None
+        return (cached.xxhash64 if check_xxhash_available() else cached.sha256) or None
+
+    def store_xxh64(self, file_path: Union[str, Path], identity: FileIdentity, digest: str) -> bool:
+        """Store a calculate_xxh64()-style digest under the right algorithm."""
+        if check_xxhash_available():
+            return self.store(file_path, identity, xxhash64=digest)
+        return self.store(file_path, identity, sha256=digest)
+
+
+def cached_xxh64(file_path: Union[str, Path]) -> str:
+    """calculate_xxh64() that answers from the cache when the file is unchanged."""
+    cache = get_checksum_cache()
+    digest = cache.lookup_xxh64(file_path)
+    if digest:
+        return digest
+
+    identity = file_identity(file_path)
+    digest = calculate_xxh64(str(file_path))
+    cache.store_xxh64(file_path, identity, digest)
+    return digest
+
+
+# Singleton instance
+_cache: Optional[ChecksumCache] = None
+
+
+def get_checksum_cache() -> ChecksumCache:
+    """Get the singleton checksum cache instance."""
+    global _cache
+    if _cache is None:
+        _cache = ChecksumCache()
+    return _cache
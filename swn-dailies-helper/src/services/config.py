@@ -226,6 +226,8 @@ class ConfigManager:
         """Get upload configuration settings."""
         return self.get("upload_settings", {
             "parallel_uploads": 3,
+            "part_workers": 4,  # Parallel parts per multipart upload
+            "part_size_mb": 64,
             "max_retries": 3,
             "retry_delay_base": 2.0,
             "verify_checksum": True,
@@ -239,6 +241,16 @@ class ConfigManager:
         """Set upload configuration settings."""
         self.set("upload_settings", settings)
 
+    def get_offload_settings(self) -> dict:
+        """Get offload copy engine settings."""
+        return self.get("offload_settings", {
+            "direct_io": False,  # O_DIRECT reads/writes (bypass the page cache) where supported
+        })
+
+    def set_offload_settings(self, settings: dict):
+        """Set offload copy engine settings."""
+        self.set("offload_settings", settings)
+
     # Naming Convention Settings
     def get_naming_convention(self) -> dict:
         """Get folder naming convention settings."""
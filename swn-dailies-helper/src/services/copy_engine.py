@@ -0,0 +1,467 @@
+"""
+Pipelined copy engine for offloads.
+
+A reader thread fills a ring of reusable buffers from the source. Each filled
+buffer goes at once to one hashing thread per algorithm and one writer thread
+per destination, and returns to the ring when all of them are done with it.
+The card is read once however many destinations there are, a RAID and a
+shuttle drive are written concurrently, and a file copies at the speed of the
+slowest stage instead of the sum of them.
+
+Optional hints: posix_fadvise (sequential read-ahead on the source, drop-behind
+so a card doesn't evict everything else from the page cache) and O_DIRECT,
+which bypasses the page cache entirely where the filesystem supports it.
+"""
+import errno
+import hashlib
+import mmap
+import os
+import platform
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+from src.services.exceptions import CopyCancelledError
+
+DEFAULT_BUFFER_SIZE = 8 * 1024 * 1024  # 8MB buffers
+DEFAULT_RING_SIZE = 8  # buffers in flight per file
+DIRECT_IO_ALIGN = 4096  # O_DIRECT offset/length/address alignment
+TEMP_SUFFIX = ".swn_temp"  # Temp file suffix for atomic writes
+
+HAS_FADVISE = hasattr(os, "posix_fadvise")
+O_DIRECT = getattr(os, "O_DIRECT", 0)
+O_BINARY = getattr(os, "O_BINARY", 0)  # Windows
+
+
+def _hasher_factories() -> Dict[str, Callable]:
+    factories = {"sha256": hashlib.sha256}
+    if HAS_XXHASH:
+        factories["xxhash64"] = xxhash.xxh64
+    return factories
+
+
+def checksum_algorithms(*names: str) -> List[str]:
+    """The requested algorithms that are available here ("xxhash64" needs xxhash)."""
+    available = _hasher_factories()
+    return [name for name in names if name in available]
+
+
+@dataclass
+class StageStats:
+    """Bytes moved by one pipeline stage and the time it spent working (not waiting)."""
+    bytes: int = 0
+    busy: float = 0.0
+
+    @property
+    def mbps(self) -> float:
+        return self.bytes / self.busy / 1e6 if self.busy > 0 else 0.0
+
+    def add(self, other: "StageStats"):
+        self.bytes += other.bytes
+        self.busy += other.busy
+
+
+@dataclass
+class CopyStats:
+    """Per-stage throughput for one or more copies."""
+    read: StageStats = field(default_factory=StageStats)
+    hash: Dict[str, StageStats] = field(default_factory=dict)  # algorithm -> stats
+    write: Dict[str, StageStats] = field(default_factory=dict)  # destination label -> stats
+    bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def mbps(self) -> float:
+        return self.bytes / self.elapsed / 1e6 if self.elapsed > 0 else 0.0
+
+    def merge(self, other: "CopyStats"):
+        self.read.add(other.read)
+        for group, theirs in ((self.hash, other.hash), (self.write, other.write)):
+            for name, stats in theirs.items():
+                group.setdefault(name, StageStats()).add(stats)
+        self.bytes += other.bytes
+        self.elapsed += other.elapsed
+
+    def to_dict(self) -> Dict:
+        return {
+            "bytes": self.bytes,
+            "overall_mbps": round(self.mbps, 1),
+            "read_mbps": round(self.read.mbps, 1),
+            "hash_mbps": {name: round(s.mbps, 1) for name, s in self.hash.items()},
+            "write_mbps": {name: round(s.mbps, 1) for name, s in self.write.items()},
+        }
+
+    def summary(self) -> str:
+        parts = [f"{self.mbps:.0f} MB/s overall", f"read {self.read.mbps:.0f}"]
+        parts += [f"{name} {s.mbps:.0f}" for name, s in self.hash.items()]
+        parts += [f"write {name} {s.mbps:.0f}" for name, s in self.write.items()]
+        return ", ".join(parts)
+
+
+@dataclass
+class CopyResult:
+    """Digests of the bytes read (hex, keyed by algorithm) and stage stats."""
+    digests: Dict[str, str]
+    stats: CopyStats
+
+
+def _fadvise(fd: int, offset: int, length: int, advice_name: str):
+    if HAS_FADVISE:
+        try:
+            os.posix_fadvise(fd, offset, length, getattr(os, advice_name))
+        except OSError:
+            pass
+
+
+def _open(path: Path, flags: int, direct: bool) -> tuple:
+    """Open with O_DIRECT when asked and supported; returns (fd, direct_in_effect)."""
+    flags |= O_BINARY
+    if direct and O_DIRECT:
+        try:
+            return os.open(str(path), flags | O_DIRECT, 0o644), True
+        except OSError as e:
+            if e.errno != errno.EINVAL:  # e.g. tmpfs doesn't do O_DIRECT
+                raise
+    return os.open(str(path), flags, 0o644), False
+
+
+def _fsync_dir(directory: Path):
+    if platform.system() != "Windows":
+        dir_fd = os.open(str(directory), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class CopyEngine:
+    """
+    Copy a file to any number of destinations, hashing it on the way.
+
+    Args:
+        algorithms: Checksums to compute ("xxhash64", "sha256"); unavailable
+            ones are skipped
+        buffer_size: Size of each ring buffer
+        ring_size: Number of buffers; bounds memory at buffer_size x ring_size
+        direct_io: Use O_DIRECT for reads and writes where supported
+        fadvise: Use posix_fadvise read-ahead/drop-behind hints where available
+        durable: Write to a temp file, fsync and rename into place (atomic);
+            otherwise write the destination directly
+    """
+
+    def __init__(
+        self,
+        algorithms: Sequence[str] = ("xxhash64", "sha256"),
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        ring_size: int = DEFAULT_RING_SIZE,
+        direct_io: bool = False,
+        fadvise: bool = True,
+        durable: bool = True,
+    ):
+        self.algorithms = checksum_algorithms(*algorithms)
+        self.buffer_size = max(DIRECT_IO_ALIGN, buffer_size // DIRECT_IO_ALIGN * DIRECT_IO_ALIGN)
+        self.ring_size = max(2, ring_size)
+        self.direct_io = direct_io
+        self.fadvise = fadvise
+        self.durable = durable
+
+    def copy(
+        self,
+        source: Path,
+        destinations: Sequence[Path],
+        labels: Optional[Sequence[str]] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> CopyResult:
+        """
+        Copy source to every destination in one read.
+
+        progress_callback(bytes_written, total) reports the slowest destination
+        and is called from the calling thread. On error or cancellation every
+        partial output is removed and the error (CopyCancelledError when
+        cancelled) is raised.
+
+        labels name each destination in the stats (default: its path).
+        """
+        source = Path(source)
+        destinations = [Path(d) for d in destinations]
+        labels = list(labels) if labels else [str(d) for d in destinations]
+        for dest in destinations:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+        outputs = [
+            d.parent / (d.name + TEMP_SUFFIX) if self.durable else d
+            for d in destinations
+        ]
+
+        try:
+            result = self._run(source, outputs, labels, progress_callback, is_cancelled, drop_cache=False)
+            if self.durable:
+                for output, dest in zip(outputs, destinations):
+                    output.replace(dest)
+                for directory in {d.parent for d in destinations}:
+                    _fsync_dir(directory)
+        except BaseException:
+            for output in outputs:
+                try:
+                    output.unlink(missing_ok=True)
+                except OSError:
+                    pass
+            raise
+        return result
+
+    def hash_file(
+        self,
+        path: Path,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        drop_cache: bool = True,
+    ) -> CopyResult:
+        """Hash a file through the same read/hash pipeline (a copy with no destinations)."""
+        return self._run(Path(path), [], [], progress_callback, None, drop_cache=drop_cache)
+
+    def hash_files(
+        self,
+        paths: Sequence[Path],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        drop_cache: bool = True,
+    ) -> Dict[Path, CopyResult]:
+        """
+        Hash several files at once, one thread each, e.g. every destination copy
+        of a file during verification. Returns {path: CopyResult}; a file that
+        couldn't be read maps to the exception instead.
+
+        progress_callback(bytes_done, total_bytes) sums all files and may be
+        called from worker threads.
+        """
+        paths = [Path(p) for p in paths]
+        lock = threading.Lock()
+        done = {p: 0 for p in paths}
+        total = 0
+        for p in paths:
+            try:
+                total += p.stat().st_size
+            except OSError:
+                pass
+
+        def progress_for(path: Path):
+            def report(current: int, _size: int):
+                with lock:
+                    done[path] = current
+                    overall = sum(done.values())
+                if progress_callback:
+                    progress_callback(overall, total)
+            return report
+
+        results: Dict[Path, CopyResult] = {}
+        with ThreadPoolExecutor(max_workers=max(1, len(paths)), thread_name_prefix="verify") as executor:
+            futures = {p: executor.submit(self.hash_file, p, progress_for(p), drop_cache) for p in paths}
+            for p, future in futures.items():
+                try:
+                    results[p] = future.result()
+                except Exception as e:
+                    results[p] = e
+        return results
+
+    def _run(
+        self,
+        source: Path,
+        outputs: List[Path],
+        labels: List[str],
+        progress_callback: Optional[Callable[[int, int], None]],
+        is_cancelled: Optional[Callable[[], bool]],
+        drop_cache: bool,
+    ) -> CopyResult:
+        started = time.perf_counter()
+        total = source.stat().st_size
+        factories = _hasher_factories()
+        hashers = {name: factories[name]() for name in self.algorithms}
+        stats = CopyStats(
+            hash={name: StageStats() for name in hashers},
+            write={label: StageStats() for label in labels},
+        )
+
+        # Only allocate as many buffers as the file can fill
+        ring = min(self.ring_size, max(2, -(-total // self.buffer_size)))
+        buffers = [mmap.mmap(-1, self.buffer_size) for _ in range(ring)]
+        free: "queue.Queue[int]" = queue.Queue()
+        for i in range(ring):
+            free.put(i)
+
+        consumers = len(hashers) + len(outputs)
+        refs = [0] * ring
+        refs_lock = threading.Lock()
+        abort = threading.Event()
+        errors: List[BaseException] = []
+        written = [0] * len(outputs)
+
+        def fail(error: BaseException):
+            with refs_lock:
+                errors.append(error)
+            abort.set()
+
+        def release(index: int):
+            with refs_lock:
+                refs[index] -= 1
+                last = refs[index] == 0
+            if last:
+                free.put(index)
+
+        queues = [queue.Queue() for _ in range(consumers)]
+
+        def reader():
+            fd = None
+            src = None
+            try:
+                fd, direct = _open(source, os.O_RDONLY, self.direct_io)
+                src = os.fdopen(fd, "rb", buffering=0)
+                if self.fadvise:
+                    if drop_cache:
+                        _fadvise(fd, 0, 0, "POSIX_FADV_DONTNEED")
+                    _fadvise(fd, 0, 0, "POSIX_FADV_SEQUENTIAL")
+                offset = 0
+                while not abort.is_set():
+                    index = free.get()
+                    if abort.is_set():
+                        break
+                    t = time.perf_counter()
+                    with memoryview(buffers[index]) as view:
+                        n = src.readinto(view) or 0
+                        # Regular files only read short at EOF, but don't rely on it
+                        while 0 < n < self.buffer_size and not direct:
+                            more = src.readinto(view[n:])
+                            if not more:
+                                break
+                            n += more
+                    stats.read.busy += time.perf_counter() - t
+                    if n == 0:
+                        free.put(index)
+                        break
+                    if self.fadvise and not direct:
+                        _fadvise(fd, offset, n, "POSIX_FADV_DONTNEED")
+                    stats.read.bytes += n
+                    offset += n
+                    if consumers == 0:
+                        free.put(index)
+                        continue
+                    refs[index] = consumers
+                    for q in queues:
+                        q.put((index, n))
+            except BaseException as e:
+                fail(e)
+            finally:
+                if src is not None:
+                    src.close()
+                elif fd is not None:
+                    os.close(fd)
+                for q in queues:
+                    q.put(None)
+
+        def consume(q: queue.Queue, work: Callable[[memoryview], None], finish: Callable[[], None]):
+            try:
+                while True:
+                    item = q.get()
+                    if item is None:
+                        break
+                    index, n = item
+                    try:
+                        if not abort.is_set():
+                            with memoryview(buffers[index]) as view:
+                                work(view[:n])
+                    except BaseException as e:
+                        fail(e)
+                    finally:
+                        release(index)
+                if not abort.is_set():
+                    finish()
+            except BaseException as e:
+                fail(e)
+
+        def hash_stage(name: str):
+            hasher = hashers[name]
+            stage = stats.hash[name]
+
+            def work(view: memoryview):
+                t = time.perf_counter()
+                hasher.update(view)
+                stage.busy += time.perf_counter() - t
+                stage.bytes += len(view)
+
+            return work, lambda: None
+
+        def write_stage(i: int):
+            stage = stats.write[labels[i]]
+            fd, direct = _open(outputs[i], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, self.direct_io)
+            state = {"direct": direct}
+
+            def work(view: memoryview):
+                t = time.perf_counter()
+                if state["direct"] and len(view) % DIRECT_IO_ALIGN:
+                    # The unaligned tail can't go through O_DIRECT
+                    import fcntl
+                    fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) & ~O_DIRECT)
+                    state["direct"] = False
+                offset = 0
+                while offset < len(view):
+                    offset += os.write(fd, view[offset:])
+                stage.busy += time.perf_counter() - t
+                stage.bytes += len(view)
+                written[i] += len(view)
+
+            def finish():
+                t = time.perf_counter()
+                if self.durable:
+                    os.fsync(fd)
+                if self.fadvise and not direct:
+                    # Written data is on disk (or on its way); don't let it crowd the cache
+                    _fadvise(fd, 0, 0, "POSIX_FADV_DONTNEED")
+                stage.busy += time.perf_counter() - t
+
+            return fd, work, finish
+
+        threads = []
+        fds = []
+        try:
+            stages = [hash_stage(name) for name in hashers]
+            for i in range(len(outputs)):
+                fd, work, finish = write_stage(i)
+                fds.append(fd)
+                stages.append((work, finish))
+            for q, (work, finish) in zip(queues, stages):
+                threads.append(threading.Thread(target=consume, args=(q, work, finish), daemon=True))
+            threads.append(threading.Thread(target=reader, daemon=True))
+            for t in threads:
+                t.start()
+
+            # Wait on each stage in turn (not just the reader, which finishes
+            # first and would leave this loop spinning while writers fsync)
+            for t in threads:
+                while t.is_alive():
+                    t.join(0.1)
+                    if is_cancelled and is_cancelled() and not abort.is_set():
+                        fail(CopyCancelledError(str(source)))
+                    if progress_callback:
+                        progress_callback(min(written) if written else stats.read.bytes, total)
+        finally:
+            for fd in fds:
+                os.close(fd)
+            for buffer in buffers:
+                buffer.close()
+
+        if errors:
+            # Prefer the real failure over the cancellation it may have triggered
+            raise next((e for e in errors if not isinstance(e, CopyCancelledError)), errors[0])
+
+        stats.bytes = stats.read.bytes
+        stats.elapsed = time.perf_counter() - started
+        if progress_callback:
+            progress_callback(stats.bytes, total)
+        return CopyResult(digests={name: h.hexdigest() for name, h in hashers.items()}, stats=stats)
@@ -72,6 +72,22 @@ class ChecksumMismatchError(UploadError):
         self.actual = actual
 
 
+class MultipartUploadNotFoundError(UploadError):
+    """The server no longer has the multipart upload (completed, aborted or expired)."""
+
+    def __init__(self, upload_id: str):
+        super().__init__(f"Multipart upload {upload_id} no longer exists", "UPLOAD_NOT_FOUND")
+        self.upload_id = upload_id
+
+
+class UploadCancelledError(UploadError):
+    """Upload was cancelled before it finished."""
+
+    def __init__(self, filename: str):
+        super().__init__(f"Upload of '{filename}' cancelled", "UPLOAD_CANCELLED")
+        self.filename = filename
+
+
 # File System Errors
 class FileSystemError(SWNHelperError):
     """File system related errors."""
@@ -119,6 +135,22 @@ class PathTraversalError(FileSystemError):
         super().__init__("Access denied - path traversal detected", "PATH_TRAVERSAL")
 
 
+class CopyCancelledError(FileSystemError):
+    """A file copy was cancelled before it finished."""
+
+    def __init__(self, path: str):
+        super().__init__(f"Copy cancelled: {path}", "COPY_CANCELLED")
+        self.path = path
+
+
+class JournalCorruptError(FileSystemError):
+    """An offload journal or manifest log could not be replayed."""
+
+    def __init__(self, path: str, reason: str):
+        super().__init__(f"Journal is corrupt ({reason}): {path}", "JOURNAL_CORRUPT")
+        self.path = path
+
+
 # Watch Folder Errors
 class WatchFolderError(SWNHelperError):
     """Watch folder related errors."""
@@ -0,0 +1,182 @@
+"""
+Journal Log - Append-only JSON-lines storage for offload journals and manifests.
+
+A log holds one document: a header (the job or manifest fields) and a fixed
+list of items (its files). A save appends one line per changed item and then
+a header line, instead of rewriting the whole document:
+
+    {"op": "item", "index": 17, "data": {...}}
+    {"op": "header", "items": 5000, "data": {...}}
+
+Replay applies the lines in order, so the last record for each item wins.
+Every record is a complete state, so a crash between two lines of a save
+loses nothing already written, and a torn final line is skipped. Once the
+appended records outnumber the items the log is compacted: rewritten as
+every item and one header through a temp file + fsync + rename, so a crash
+leaves either the old or the new log intact.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from src.services.exceptions import JournalCorruptError
+
+logger = logging.getLogger("swn-helper")
+
+COMPACT_MIN_RECORDS = 1000  # Never compact a log shorter than this
+TAIL_BLOCK_SIZE = 64 * 1024  # read_header() scans backwards in blocks this big
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _fsync_dir(path: Path):
+    """Make a rename in path durable (not supported on Windows)."""
+    if os.name == "nt":
+        return
+    fd = os.open(str(path), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class JournalLog:
+    """Append-only JSON-lines log of one header + items document."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        # Records appended since the last compaction; None until this log has
+        # been replayed or compacted, since an unknown tail (maybe torn) must
+        # not be appended to
+        self._appended: Optional[int] = None
+
+    def compaction_due(self, new_records: int, item_count: int) -> bool:
+        """Whether the next save should compact instead of appending new_records."""
+        if self._appended is None:
+            return True
+        return self._appended + new_records > max(COMPACT_MIN_RECORDS, item_count)
+
+    def append(self, header: Dict[str, Any], item_count: int, changed: Dict[int, Dict[str, Any]]):
+        """Append the changed items and a header record, then fsync."""
+        if self._appended is None:
+            raise RuntimeError(f"Journal log {self.path} must be replayed or compacted before appending")
+
+        data = bytearray()
+        for index in sorted(changed):
+            data += _encode({"op": "item", "index": index, "data": changed[index]})
+        data += _encode({"op": "header", "items": item_count, "data": header})
+
+        with open(self.path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._appended += 1 + len(changed)
+
+    def compact(self, header: Dict[str, Any], items: Sequence[Dict[str, Any]]):
+        """Atomically replace the log with every item and one header."""
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            f.writelines(
+                _encode({"op": "item", "index": index, "data": item})
+                for index, item in enumerate(items)
+            )
+            f.write(_encode({"op": "header", "items": len(items), "data": header}))
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temp_path, self.path)
+        _fsync_dir(self.path.parent)
+        self._appended = 0
+
+    def replay(self) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Rebuild the document from the log.
+
+        Returns:
+            (header, items) as of the last complete record
+
+        Raises:
+            JournalCorruptError: no header, or an item never written
+        """
+        with open(self.path, "rb") as f:
+            lines = f.read().split(b"\n")
+        # Anything after the last newline is a torn append (crash mid-write)
+        torn = bool(lines.pop())
+
+        try:
+            # One parse of the whole log is much faster than one per line
+            records = json.loads(b"[" + b",".join(lines) + b"]")
+        except ValueError:
+            records = []
+            for line in lines:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # Unreadable line: later lines are still whole records
+                    logger.warning(f"Skipping unreadable record in {self.path}")
+                    torn = True
+
+        header = None
+        items: List[Optional[Dict[str, Any]]] = []
+        for record in records:
+            try:
+                op = record["op"]
+                if op == "header":
+                    header = record["data"]
+                    count = record["items"]
+                    if count > len(items):
+                        items.extend([None] * (count - len(items)))
+                elif op == "item":
+                    index = record["index"]
+                    if index >= len(items):
+                        items.extend([None] * (index + 1 - len(items)))
+                    items[index] = record["data"]
+            except (KeyError, TypeError):
+                logger.warning(f"Skipping malformed record in {self.path}")
+
+        if header is None:
+            raise JournalCorruptError(str(self.path), "no header record")
+        missing = sum(1 for item in items if item is None)
+        if missing:
+            raise JournalCorruptError(str(self.path), f"{missing} items never written")
+
+        # A log with a torn line is rewritten before anything is appended to
+        # it; otherwise count what was appended beyond one full snapshot
+        self._appended = None if torn else max(0, len(records) - len(items) - 1)
+        return header, items
+
+    @staticmethod
+    def read_header(path: Union[str, Path]) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        Return the latest (header, item_count) of a log without replaying it.
+
+        Every save ends with a header record, so it is normally the last line;
+        the scan back only goes further past a torn append.
+        """
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            tail = b""
+            while end > 0:
+                start = max(0, end - TAIL_BLOCK_SIZE)
+                f.seek(start)
+                tail = f.read(end - start) + tail
+                end = start
+
+                lines = tail.split(b"\n")
+                # The first piece may be a partial line unless we reached the start
+                complete = lines if start == 0 else lines[1:]
+                for line in reversed(complete):
+                    if not line.startswith(b'{"op":"header"'):
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Torn final line
+                    return record["data"], record["items"]
+                tail = lines[0] if start > 0 else b""
+        return None
@@ -17,7 +17,7 @@ from fastapi.responses import FileResponse, StreamingResponse, JSONResponse
 import uvicorn
 
 from src.services.card_reader import CardReader
-from src.services.checksum import calculate_xxh64
+from src.services.checksum_cache import cached_xxh64
 from src.services.config import ConfigManager
 from src.services.metadata_extractor import MetadataExtractor
 from src.services.qc_checker import QCChecker
@@ -296,7 +296,7 @@ async def calculate_checksum(path: str):
         raise HTTPException(status_code=400, detail="Path is not a file")
 
     try:
-        checksum = calculate_xxh64(str(file_path))
+        checksum = cached_xxh64(file_path)
         return {"checksum": checksum, "algorithm": "xxh64"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
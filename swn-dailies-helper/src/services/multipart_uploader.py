@@ -0,0 +1,462 @@
+"""
+Streaming multipart upload to S3 through presigned part URLs.
+
+Large camera originals are sent as fixed-size parts read straight from disk,
+so memory stays at (parallel parts x part size) whatever the clip size. Parts
+go up in parallel over one pooled HTTP client, progress is counted from the
+bytes actually sent, and each finished part's ETag is saved so an interrupted
+upload resumes at the first missing part instead of byte 0.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+from src.services.config import CONFIG_DIR
+from src.services.exceptions import (
+    APIConnectionError,
+    APIResponseError,
+    FileUploadError,
+    UploadCancelledError,
+)
+from src.services.exceptions import (
+    MultipartUploadNotFoundError as UploadNotFoundError,
+)
+from src.services.exceptions import (
+    TimeoutError as SWNTimeoutError,
+)
+
+logger = logging.getLogger("swn-helper")
+
+DEFAULT_PART_SIZE = 64 * 1024 * 1024  # 64MB parts
+DEFAULT_PART_WORKERS = 4
+SEND_CHUNK = 1024 * 1024  # progress granularity within a part
+URL_BATCH = 100  # part URLs fetched per API call (server maximum)
+URL_MAX_AGE = 45 * 60  # refetch presigned part URLs well before their 1h expiry
+
+
+@dataclass
+class MultipartState:
+    """Resumable state of one multipart upload, persisted after every part."""
+    file_path: str
+    file_size: int
+    mtime_ns: int
+    project_id: str
+    upload_id: str
+    s3_key: str
+    part_size: int
+    standalone_asset_id: Optional[str] = None
+    parts: Dict[int, str] = field(default_factory=dict)  # part number -> ETag
+
+    @property
+    def total_parts(self) -> int:
+        return max(1, -(-self.file_size // self.part_size))
+
+    def part_range(self, part_number: int) -> tuple:
+        """(offset, length) of a 1-based part within the file."""
+        offset = (part_number - 1) * self.part_size
+        return offset, min(self.part_size, self.file_size - offset)
+
+    def bytes_done(self) -> int:
+        return sum(self.part_range(n)[1] for n in self.parts)
+
+
+class UploadStateStore:
+    """JSON state files under the config dir, keyed on file identity and project."""
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory) if directory else CONFIG_DIR / "uploads"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, file_path: str, size: int, mtime_ns: int, project_id: str) -> Path:
+        ident = f"{os.path.abspath(file_path)}|{size}|{mtime_ns}|{project_id}"
+        return self.directory / f"{hashlib.sha1(ident.encode()).hexdigest()}.json"
+
+    def load(self, file_path: str, size: int, mtime_ns: int, project_id: str) -> Optional[MultipartState]:
+        path = self._path(file_path, size, mtime_ns, project_id)
+        try:
+            data = json.loads(path.read_text())
+            data["parts"] = {int(n): etag for n, etag in data.get("parts", {}).items()}
+            return MultipartState(**data)
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError, OSError) as e:
+            logger.warning(f"Discarding unreadable upload state {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def save(self, state: MultipartState):
+        path = self._path(state.file_path, state.file_size, state.mtime_ns, state.project_id)
+        with self._lock:
+            data = asdict(state)
+            data["parts"] = {str(n): etag for n, etag in sorted(state.parts.items())}
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data))
+            os.replace(tmp, path)
+
+    def delete(self, state: MultipartState):
+        self._path(state.file_path, state.file_size, state.mtime_ns, state.project_id).unlink(missing_ok=True)
+
+
+class DesktopMultipartAPI:
+    """Client for the backend's desktop-key multipart endpoints."""
+
+    def __init__(self, api_base: str, api_key: str, client: httpx.Client):
+        self.api_base = api_base.rstrip("/")
+        self.api_key = api_key
+        self.client = client
+
+    def _post(self, path: str, body: dict, action: str) -> dict:
+        try:
+            response = self.client.post(
+                f"{self.api_base}/api/v1/backlot/desktop-keys/dailies/multipart/{path}",
+                headers={"X-API-Key": self.api_key, "Content-Type": "application/json"},
+                json=body,
+                timeout=30.0,
+            )
+        except httpx.ConnectError:
+            raise APIConnectionError("Failed to connect to SWN server")
+        except httpx.TimeoutException:
+            raise SWNTimeoutError(action)
+
+        if response.status_code == 404:
+            raise UploadNotFoundError(body.get("upload_id", ""))
+        if response.status_code not in (200, 201):
+            try:
+                detail = response.json().get("detail", response.text)
+            except Exception:
+                detail = response.text
+            raise APIResponseError(response.status_code, detail)
+        return response.json()
+
+    def initiate(self, project_id: str, file_name: str, content_type: str, file_size: int, part_size: int) -> dict:
+        return self._post("initiate", {
+            "project_id": project_id,
+            "file_name": file_name,
+            "content_type": content_type,
+            "file_size": file_size,
+            "part_size": part_size,
+        }, "starting multipart upload")
+
+    def part_urls(self, state: MultipartState, part_numbers: List[int]) -> Dict[int, str]:
+        result = self._post("part-urls", {
+            "project_id": state.project_id,
+            "s3_key": state.s3_key,
+            "upload_id": state.upload_id,
+            "part_numbers": part_numbers,
+        }, "getting part upload URLs")
+        return {int(n): url for n, url in result["urls"].items()}
+
+    def list_parts(self, state: MultipartState) -> Dict[int, str]:
+        result = self._post("parts", {
+            "project_id": state.project_id,
+            "s3_key": state.s3_key,
+            "upload_id": state.upload_id,
+        }, "listing uploaded parts")
+        return {int(p["partNumber"]): p["etag"] for p in result["parts"]}
+
+    def complete(self, state: MultipartState) -> dict:
+        return self._post("complete", {
+            "project_id": state.project_id,
+            "s3_key": state.s3_key,
+            "upload_id": state.upload_id,
+            "parts": [{"partNumber": n, "etag": etag} for n, etag in sorted(state.parts.items())],
+        }, "completing multipart upload")
+
+    def abort(self, state: MultipartState):
+        self._post("abort", {
+            "project_id": state.project_id,
+            "s3_key": state.s3_key,
+            "upload_id": state.upload_id,
+        }, "aborting multipart upload")
+
+
+def _read_part(file_path: str, offset: int, length: int) -> bytes:
+    """Read one part; each call owns its handle so parts can be read concurrently."""
+    with open(file_path, "rb", buffering=0) as f:
+        f.seek(offset)
+        data = f.read(length)
+    if len(data) != length:
+        raise FileUploadError(os.path.basename(file_path), "File changed size during upload")
+    return data
+
+
+class _SequentialReader:
+    """
+    Reads parts strictly in file order and feeds each to a hasher as it's read.
+
+    Parts are still sent in parallel; only the disk reads are serialised, which
+    keeps access sequential on card and shuttle media and lets the file's
+    checksum come from the same buffers that go over the wire. Parts already
+    uploaded by an earlier run are read for the hash only.
+    """
+
+    def __init__(self, hasher, state: MultipartState, file_path: str):
+        self.hasher = hasher
+        self.state = state
+        self.file_path = file_path
+        self._uploaded = set(state.parts)
+        self._next = 1
+        self._abandoned = False
+        self._cond = threading.Condition()
+
+    def _skip_uploaded(self):
+        while self._next in self._uploaded:
+            self.hasher.update(_read_part(self.file_path, *self.state.part_range(self._next)))
+            self._next += 1
+
+    def read(self, part_number: int, file_name: str) -> bytes:
+        with self._cond:
+            try:
+                self._skip_uploaded()
+                self._cond.wait_for(lambda: self._abandoned or self._next == part_number)
+                if self._abandoned:
+                    raise UploadCancelledError(file_name)
+                data = _read_part(self.file_path, *self.state.part_range(part_number))
+                self.hasher.update(data)
+                self._next += 1
+                self._skip_uploaded()
+                return data
+            except BaseException:
+                self._abandoned = True
+                raise
+            finally:
+                self._cond.notify_all()
+
+    def abandon(self):
+        """Release parts waiting on a part that will never be read."""
+        with self._cond:
+            self._abandoned = True
+            self._cond.notify_all()
+
+    def finish(self) -> bool:
+        """Hash any trailing already-uploaded parts; True once the whole file is hashed."""
+        with self._cond:
+            if not self._abandoned:
+                self._skip_uploaded()
+            return not self._abandoned and self._next > self.state.total_parts
+
+
+def _iter_with_progress(data: bytes, on_sent: Callable[[int], None]) -> Iterator[memoryview]:
+    """Yield a part in SEND_CHUNK slices, reporting each slice once handed to the socket."""
+    view = memoryview(data)
+    for start in range(0, len(view), SEND_CHUNK):
+        chunk = view[start:start + SEND_CHUNK]
+        yield chunk
+        on_sent(len(chunk))
+
+
+class MultipartUploader:
+    """
+    Upload files as parallel, resumable multipart uploads.
+
+    `api` provides initiate/part_urls/list_parts/complete/abort (see
+    DesktopMultipartAPI); `client` is the pooled HTTP client parts are PUT on.
+    """
+
+    def __init__(
+        self,
+        api: DesktopMultipartAPI,
+        client: httpx.Client,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_workers: int = DEFAULT_PART_WORKERS,
+        state_store: Optional[UploadStateStore] = None,
+        max_part_retries: int = 3,
+        retry_delay_base: float = 1.0,
+    ):
+        self.api = api
+        self.client = client
+        self.part_size = part_size
+        self.max_workers = max(1, max_workers)
+        self.state_store = state_store or UploadStateStore()
+        self.max_part_retries = max_part_retries
+        self.retry_delay_base = retry_delay_base
+
+    def _resume_or_start(self, file_path: str, project_id: str, file_name: str, content_type: str) -> MultipartState:
+        stat = os.stat(file_path)
+        state = self.state_store.load(file_path, stat.st_size, stat.st_mtime_ns, project_id)
+        if state:
+            try:
+                server_parts = self.api.list_parts(state)
+            except UploadNotFoundError:
+                logger.info(f"Previous upload of {file_name} expired, starting over")
+                self.state_store.delete(state)
+                state = None
+            else:
+                # Keep only parts S3 holds with the ETag we recorded
+                state.parts = {n: etag for n, etag in state.parts.items() if server_parts.get(n) == etag}
+                logger.info(f"Resuming {file_name}: {len(state.parts)}/{state.total_parts} parts already uploaded")
+                return state
+
+        info = self.api.initiate(project_id, file_name, content_type, stat.st_size, self.part_size)
+        state = MultipartState(
+            file_path=os.path.abspath(file_path),
+            file_size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            project_id=project_id,
+            upload_id=info["upload_id"],
+            s3_key=info.get("s3_key") or info["key"],
+            part_size=int(info.get("part_size") or self.part_size),
+            standalone_asset_id=info.get("standalone_asset_id"),
+        )
+        self.state_store.save(state)
+        return state
+
+    def upload(
+        self,
+        file_path,
+        project_id: str,
+        content_type: str = "application/octet-stream",
+        file_name: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        hasher=None,
+    ) -> MultipartState:
+        """
+        Upload a file and complete the multipart upload. Returns the final state
+        (s3_key, standalone_asset_id, parts).
+
+        progress_callback(bytes_done, total_bytes) fires as bytes are sent. On
+        cancel or failure the saved state is kept, so calling upload() again for
+        the same unchanged file resumes it.
+
+        If a hasher (anything with update(), e.g. xxhash.xxh64()) is given, it
+        receives the whole file in order from the buffers being uploaded, so the
+        caller needs no separate checksum pass.
+        """
+        file_path = str(file_path)
+        file_name = file_name or os.path.basename(file_path)
+        is_cancelled = is_cancelled or (lambda: False)
+        state = self._resume_or_start(file_path, project_id, file_name, content_type)
+
+        lock = threading.Lock()
+        done = state.bytes_done()
+        urls: Dict[int, tuple] = {}  # part number -> (url, fetched_at)
+        pending = [n for n in range(1, state.total_parts + 1) if n not in state.parts]
+        reader = _SequentialReader(hasher, state, file_path) if hasher is not None else None
+
+        def report(delta: int):
+            nonlocal done
+            with lock:
+                done += delta
+                current = done
+            if progress_callback:
+                progress_callback(current, state.file_size)
+
+        def part_url(n: int, refresh: bool = False) -> str:
+            with lock:
+                cached = urls.get(n)
+                if cached and not refresh and time.monotonic() - cached[1] < URL_MAX_AGE:
+                    return cached[0]
+                # Fetch this part and the next unfetched pending ones in one call
+                batch = [n] + [p for p in pending if p > n and p not in urls][:URL_BATCH - 1]
+                fetched_at = time.monotonic()
+                for number, url in self.api.part_urls(state, batch).items():
+                    urls[number] = (url, fetched_at)
+                return urls[n][0]
+
+        def send_part(n: int):
+            if is_cancelled():
+                if reader:
+                    reader.abandon()
+                return
+            offset, length = state.part_range(n)
+            if reader:
+                data = reader.read(n, file_name)
+            else:
+                data = _read_part(file_path, offset, length)
+            attempt = 0
+            refresh = False
+            while True:
+                sent = 0
+                status = None
+
+                def on_sent(size: int):
+                    nonlocal sent
+                    sent += size
+                    report(size)
+
+                try:
+                    response = self.client.put(
+                        part_url(n, refresh),
+                        content=_iter_with_progress(data, on_sent),
+                        headers={"Content-Length": str(length)},
+                    )
+                    status = response.status_code
+                    if status == 404:
+                        raise UploadNotFoundError(state.upload_id)
+                    if status != 200:
+                        raise FileUploadError(file_name, f"Part {n} failed with status {status}: {response.text[:200]}")
+                    etag = response.headers.get("ETag")
+                    if not etag:
+                        raise FileUploadError(file_name, f"Part {n} returned no ETag")
+                except (httpx.TransportError, FileUploadError) as e:
+                    report(-sent)
+                    attempt += 1
+                    if attempt > self.max_part_retries or is_cancelled():
+                        if isinstance(e, httpx.TransportError):
+                            raise FileUploadError(file_name, f"Part {n} failed: {type(e).__name__}: {e}")
+                        raise
+                    # An expired or rejected presigned URL shows up as 403
+                    refresh = status == 403
+                    logger.warning(f"Part {n} of {file_name} failed (attempt {attempt}): {e}")
+                    time.sleep((2 ** (attempt - 1)) * self.retry_delay_base)
+                    continue
+                except BaseException:
+                    report(-sent)
+                    raise
+                with lock:
+                    state.parts[n] = etag
+                self.state_store.save(state)
+                return
+
+        if progress_callback:
+            progress_callback(done, state.file_size)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="part-upload") as executor:
+                futures = [executor.submit(send_part, n) for n in pending]
+                finished, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in not_done:
+                    future.cancel()
+                errors = [f.exception() for f in finished if f.exception()]
+                if errors:
+                    # Parts released by an abandoned read fail as cancelled; report the cause
+                    error = next((e for e in errors if not isinstance(e, UploadCancelledError)), errors[0])
+                    if isinstance(error, UploadNotFoundError):
+                        self.state_store.delete(state)
+                    raise error
+
+        if is_cancelled() or len(state.parts) < state.total_parts:
+            raise UploadCancelledError(file_name)
+        if reader and not reader.finish():
+            raise UploadCancelledError(file_name)
+
+        try:
+            self.api.complete(state)
+        except UploadNotFoundError:
+            self.state_store.delete(state)
+            raise
+        self.state_store.delete(state)
+        return state
+
+    def abort(self, file_path, project_id: str):
+        """Abort a saved, unfinished upload of this file and forget its state."""
+        stat = os.stat(file_path)
+        state = self.state_store.load(str(file_path), stat.st_size, stat.st_mtime_ns, project_id)
+        if not state:
+            return
+        try:
+            self.api.abort(state)
+        except UploadNotFoundError:
+            pass
+        self.state_store.delete(state)
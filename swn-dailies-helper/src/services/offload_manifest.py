@@ -1,15 +1,22 @@
 """
 Offload Manifest Service - Tracks offload operations and syncs with Backlot API.
+
+Manifests are stored as append-only journal logs (see journal_log): per-file
+updates append one record instead of rewriting the whole manifest.
 """
 import json
 import uuid
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Iterable
 from enum import Enum
 
 from .config import ConfigManager
+from .journal_log import JournalLog
+
+MANIFEST_SUFFIX = ".jsonl"
+LEGACY_MANIFEST_SUFFIX = ".json"  # Whole-document JSON manifests from older versions
 
 
 class OffloadStatus(str, Enum):
@@ -90,6 +97,12 @@ class OffloadManifest:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
+        data = self.header_dict()
+        data["files"] = [f.to_dict() for f in self.files]
+        return data
+
+    def header_dict(self) -> Dict[str, Any]:
+        """Everything but the files."""
         return {
             "local_id": self.local_id,
             "server_id": self.server_id,
@@ -106,7 +119,6 @@ class OffloadManifest:
             "upload_status": self.upload_status,
             "create_footage_asset": self.create_footage_asset,
             "created_footage_asset_id": self.created_footage_asset_id,
-            "files": [f.to_dict() for f in self.files],
             "started_at": self.started_at,
             "completed_at": self.completed_at,
             "created_at": self.created_at,
@@ -129,9 +141,9 @@ class OffloadManifest:
         source_checksum: Optional[str] = None,
         dest_checksum: Optional[str] = None,
         error_message: Optional[str] = None,
-    ):
-        """Update status of a specific file in the manifest."""
-        for f in self.files:
+    ) -> Optional[int]:
+        """Update status of a specific file in the manifest; returns its index if found."""
+        for idx, f in enumerate(self.files):
             if f.file_name == file_name:
                 if offload_status:
                     f.offload_status = offload_status
@@ -144,7 +156,8 @@ class OffloadManifest:
                     f.checksum_verified = source_checksum == dest_checksum
                 if error_message:
                     f.error_message = error_message
-                break
+                return idx
+        return None
 
     def get_progress(self) -> Dict[str, Any]:
         """Get current progress of the offload operation."""
@@ -171,6 +184,7 @@ class OffloadManifestService:
         self.manifests_dir = Path.home() / ".swn-dailies-helper" / "manifests"
         self.manifests_dir.mkdir(parents=True, exist_ok=True)
         self._active_manifest: Optional[OffloadManifest] = None
+        self._logs: Dict[str, JournalLog] = {}  # local_id -> log written or replayed here
 
     @property
     def active_manifest(self) -> Optional[OffloadManifest]:
@@ -257,54 +271,105 @@ class OffloadManifestService:
         if not manifest:
             raise ValueError("No manifest to update")
 
-        manifest.update_file_status(file_name, **kwargs)
-        self._save_manifest(manifest)
+        idx = manifest.update_file_status(file_name, **kwargs)
+        self._save_manifest(manifest, changed_files=[] if idx is None else [idx])
         return manifest
 
-    def _save_manifest(self, manifest: OffloadManifest):
-        """Save manifest to local file."""
-        file_path = self.manifests_dir / f"{manifest.local_id}.json"
-        with open(file_path, "w") as f:
-            json.dump(manifest.to_dict(), f, indent=2)
+    def _save_manifest(self, manifest: OffloadManifest, changed_files: Optional[Iterable[int]] = None):
+        """
+        Save manifest to its local log.
+
+        With changed_files, only the header and those files are appended.
+        Without, files may have been changed directly (as the offload worker
+        does), so the whole manifest is written as a compacted log.
+        """
+        log = self._logs.get(manifest.local_id)
+        if log is None:
+            log = self._logs[manifest.local_id] = JournalLog(self._manifest_path(manifest.local_id))
+
+        header = manifest.header_dict()
+        if changed_files is not None:
+            changed = {idx: manifest.files[idx].to_dict() for idx in changed_files}
+            if not log.compaction_due(1 + len(changed), len(manifest.files)):
+                log.append(header, len(manifest.files), changed)
+                return
+
+        log.compact(header, [f.to_dict() for f in manifest.files])
+        (self.manifests_dir / f"{manifest.local_id}{LEGACY_MANIFEST_SUFFIX}").unlink(missing_ok=True)
+
+    def _manifest_path(self, local_id: str) -> Path:
+        return self.manifests_dir / f"{local_id}{MANIFEST_SUFFIX}"
+
+    def _manifest_paths(self) -> List[Path]:
+        """Manifest files, newest name first; a legacy JSON file only if it has no log."""
+        paths = {p.stem: p for p in self.manifests_dir.glob(f"*{LEGACY_MANIFEST_SUFFIX}")}
+        paths.update((p.stem, p) for p in self.manifests_dir.glob(f"*{MANIFEST_SUFFIX}"))
+        return [paths[stem] for stem in sorted(paths, reverse=True)]
+
+    def _read_manifest(self, file_path: Path) -> OffloadManifest:
+        if file_path.suffix == LEGACY_MANIFEST_SUFFIX:
+            with open(file_path) as f:
+                return OffloadManifest.from_dict(json.load(f))
+
+        log = JournalLog(file_path)
+        header, files = log.replay()
+        data = dict(header)
+        data["files"] = files
+        manifest = OffloadManifest.from_dict(data)
+        self._logs[manifest.local_id] = log
+        return manifest
+
+    def _read_header(self, file_path: Path) -> Dict[str, Any]:
+        if file_path.suffix == LEGACY_MANIFEST_SUFFIX:
+            with open(file_path) as f:
+                return json.load(f)
+        header, _ = JournalLog.read_header(file_path)
+        return header
 
     def load_manifest(self, local_id: str) -> Optional[OffloadManifest]:
         """Load a manifest from local file."""
-        file_path = self.manifests_dir / f"{local_id}.json"
+        file_path = self._manifest_path(local_id)
         if not file_path.exists():
-            return None
+            file_path = self.manifests_dir / f"{local_id}{LEGACY_MANIFEST_SUFFIX}"
+            if not file_path.exists():
+                return None
 
-        with open(file_path) as f:
-            data = json.load(f)
-        return OffloadManifest.from_dict(data)
+        return self._read_manifest(file_path)
 
-    def list_manifests(self, limit: int = 50) -> List[OffloadManifest]:
-        """List recent manifests."""
+    def list_manifests(
+        self,
+        limit: int = 50,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> List[OffloadManifest]:
+        """
+        List recent manifests.
+
+        where, if given, filters on the manifest fields (without files) so
+        only matching manifests are loaded in full.
+        """
         manifests = []
-        for file_path in sorted(self.manifests_dir.glob("*.json"), reverse=True)[:limit]:
+        for file_path in self._manifest_paths()[:limit]:
             try:
-                with open(file_path) as f:
-                    data = json.load(f)
-                manifests.append(OffloadManifest.from_dict(data))
+                if where and not where(self._read_header(file_path)):
+                    continue
+                manifests.append(self._read_manifest(file_path))
             except Exception:
                 continue
         return manifests
 
     def get_pending_manifests(self) -> List[OffloadManifest]:
         """Get manifests that need to be synced to server."""
-        manifests = self.list_manifests()
-        return [
-            m for m in manifests
-            if m.project_id and not m.server_id and m.offload_status == OffloadStatus.COMPLETED.value
-        ]
+        return self.list_manifests(where=lambda m: (
+            m.get("project_id") and not m.get("server_id")
+            and m.get("offload_status") == OffloadStatus.COMPLETED.value
+        ))
 
     def get_pending_uploads(self) -> List[OffloadManifest]:
         """Get manifests with files pending upload."""
-        manifests = self.list_manifests()
-        return [
-            m for m in manifests
-            if m.offload_status == OffloadStatus.COMPLETED.value
-            and m.upload_status in (UploadStatus.PENDING.value, UploadStatus.FAILED.value)
-        ]
+        return self.list_manifests(where=lambda m: (
+            m.get("offload_status") == OffloadStatus.COMPLETED.value
+            and m.get("upload_status") in (UploadStatus.PENDING.value, UploadStatus.FAILED.value)
+        ))
 
     def start_upload(self, manifest: Optional[OffloadManifest] = None) -> OffloadManifest:
         """Mark manifest as upload in progress."""
@@ -2,6 +2,7 @@
 Offload worker for copying files from camera cards to destinations.
 Runs in a separate thread to keep UI responsive.
 """
+import logging
 import os
 import shutil
 from datetime import datetime
@@ -10,17 +11,15 @@ from typing import List, Optional, Dict, Any
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
-try:
-    import xxhash
-    HAS_XXHASH = True
-except ImportError:
-    HAS_XXHASH = False
-    import hashlib
-
+from src.services.checksum_cache import file_identity, get_checksum_cache
+from src.services.copy_engine import CopyEngine, CopyStats, checksum_algorithms
+from src.services.exceptions import CopyCancelledError
 from src.services.offload_manifest import OffloadManifest, OffloadedFile
 
-# 64MB chunk size for file operations
-CHUNK_SIZE = 64 * 1024 * 1024
+logger = logging.getLogger("swn-helper")
+
+# XXH64 like calculate_xxh64(), or SHA-256 when xxhash isn't installed
+CHECKSUM_ALGORITHM = checksum_algorithms("xxhash64", "sha256")[0]
 
 
 class OffloadWorker(QThread):
@@ -39,6 +38,7 @@ class OffloadWorker(QThread):
         source_path: str,
         destinations: List[str],
         verify_checksums: bool = True,
+        direct_io: bool = False,
         parent=None
     ):
         super().__init__(parent)
@@ -48,6 +48,10 @@ class OffloadWorker(QThread):
         self.verify_checksums = verify_checksums
         self._cancelled = False
 
+        # One source read feeds every destination; writes go straight to the final path
+        self.engine = CopyEngine(algorithms=(CHECKSUM_ALGORITHM,), direct_io=direct_io, durable=False)
+        self.copy_stats = CopyStats()
+
         # Statistics
         self.stats = {
             "files_copied": 0,
@@ -131,112 +135,76 @@ class OffloadWorker(QThread):
             file_info.error_message = f"Source file not found: {source_file}"
             return False
 
-        file_size = source_file.stat().st_size
-        bytes_copied = 0
-
-        # Initialize hasher for source checksum
-        if HAS_XXHASH:
-            hasher = xxhash.xxh64()
-        else:
-            hasher = hashlib.sha256()
-
         # Prepare destination paths
         dest_paths = []
         for dest_base in self.destinations:
             if file_info.relative_path:
-                dest_dir = dest_base / file_info.relative_path
+                dest_paths.append(dest_base / file_info.relative_path / file_info.file_name)
             else:
-                dest_dir = dest_base
+                dest_paths.append(dest_base / file_info.file_name)
 
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            dest_paths.append(dest_dir / file_info.file_name)
+        def progress_cb(bytes_copied, file_size):
+            self.file_progress.emit(bytes_copied, file_size)
 
         try:
-            # Open source file
-            with open(source_file, 'rb') as src:
-                # Open all destination files
-                dest_files = [open(dp, 'wb') for dp in dest_paths]
-
-                try:
-                    while True:
-                        if self._cancelled:
-                            # Clean up partial files
-                            for df in dest_files:
-                                df.close()
-                            for dp in dest_paths:
-                                if dp.exists():
-                                    dp.unlink()
-                            return False
-
-                        chunk = src.read(CHUNK_SIZE)
-                        if not chunk:
-                            break
-
-                        # Update hasher
-                        hasher.update(chunk)
-
-                        # Write to all destinations
-                        for df in dest_files:
-                            df.write(chunk)
-
-                        bytes_copied += len(chunk)
-                        self.stats["bytes_copied"] += len(chunk)
-                        self.file_progress.emit(bytes_copied, file_size)
-
-                finally:
-                    for df in dest_files:
-                        df.close()
-
-            # Store source checksum
-            file_info.source_checksum = hasher.hexdigest()
-
-            # Verify checksums if enabled
-            if self.verify_checksums:
-                self.status_message.emit(f"Verifying {file_info.file_name}...")
-                verified = self._verify_destinations(file_info, dest_paths)
-                if not verified:
-                    return False
-
-            return True
-
+            # Copy to all destinations concurrently (partial files are removed on failure)
+            result = self.engine.copy(
+                source_file,
+                dest_paths,
+                labels=[str(d) for d in self.destinations],
+                progress_callback=progress_cb,
+                is_cancelled=lambda: self._cancelled,
+            )
+        except CopyCancelledError:
+            return False
         except Exception as e:
             file_info.error_message = str(e)
-            # Clean up partial files on error
-            for dp in dest_paths:
-                if dp.exists():
-                    try:
-                        dp.unlink()
-                    except:
-                        pass
             return False
 
+        self.copy_stats.merge(result.stats)
+        self.stats["bytes_copied"] += result.stats.bytes
+
+        # Store source checksum
+        file_info.source_checksum = result.digests[CHECKSUM_ALGORITHM]
+
+        # Verify checksums if enabled
+        if self.verify_checksums:
+            self.status_message.emit(f"Verifying {file_info.file_name}...")
+            verified = self._verify_destinations(file_info, dest_paths)
+            if not verified:
+                return False
+
+        return True
+
     def _verify_destinations(self, file_info: OffloadedFile, dest_paths: List[Path]) -> bool:
         """
         Verify checksums of copied files against source.
 
         Returns True if all destinations match, False otherwise.
         """
+        identities = {}
         for dest_path in dest_paths:
-            if HAS_XXHASH:
-                hasher = xxhash.xxh64()
-            else:
-                hasher = hashlib.sha256()
-
             try:
-                with open(dest_path, 'rb') as f:
-                    while chunk := f.read(CHUNK_SIZE):
-                        hasher.update(chunk)
+                identities[dest_path] = file_identity(dest_path)
+            except OSError as e:
+                file_info.error_message = f"Verification failed: {str(e)}"
+                file_info.checksum_verified = False
+                self.stats["checksums_failed"] += 1
+                return False
 
-                dest_checksum = hasher.hexdigest()
+        # Read every destination back at once
+        results = self.engine.hash_files(dest_paths)
 
-                if dest_checksum != file_info.source_checksum:
-                    file_info.error_message = f"Checksum mismatch for {dest_path}"
-                    file_info.checksum_verified = False
-                    self.stats["checksums_failed"] += 1
-                    return False
+        for dest_path in dest_paths:
+            result = results[dest_path]
+            if isinstance(result, Exception):
+                file_info.error_message = f"Verification failed: {str(result)}"
+                file_info.checksum_verified = False
+                self.stats["checksums_failed"] += 1
+                return False
 
-            except Exception as e:
-                file_info.error_message = f"Verification failed: {str(e)}"
+            if result.digests[CHECKSUM_ALGORITHM] != file_info.source_checksum:
+                file_info.error_message = f"Checksum mismatch for {dest_path}"
                 file_info.checksum_verified = False
                 self.stats["checksums_failed"] += 1
                 return False
@@ -245,11 +213,20 @@ class OffloadWorker(QThread):
         file_info.dest_checksum = file_info.source_checksum
         file_info.checksum_verified = True
         self.stats["checksums_verified"] += 1
+
+        # Remember the verified checksum so uploading these copies needs no re-hash
+        try:
+            cache = get_checksum_cache()
+            for dest_path, identity in identities.items():
+                cache.store_xxh64(dest_path, identity, file_info.source_checksum)
+        except Exception as e:
+            logger.warning(f"Could not cache checksums for {file_info.file_name}: {e}")
         return True
 
     def _finalize(self, success: bool, message: str):
         """Finalize the offload operation."""
         self.stats["completed_at"] = datetime.now().isoformat()
+        self.stats["throughput"] = self.copy_stats.to_dict()
 
         # Update manifest status
         self.manifest.offload_status = "completed" if success else "failed"
@@ -2,37 +2,56 @@
 Robust Offload Worker - Production-grade file offload with data integrity guarantees.
 
 Key Features:
-1. Atomic writes (temp file + fsync + rename)
+1. Atomic writes (temp file + fsync + rename), one source read for all
+   destinations via the pipelined CopyEngine
 2. Dual checksums: xxHash64 for speed, SHA-256 for legal audit trail
 3. Re-read verification (source re-read after copy to bypass OS cache)
 4. Two-copy verification before safe-to-format
 5. Resumable/idempotent operations with journal
 6. Full manifest with job signature hash
 """
+import logging
 import os
 import json
 import hashlib
 import tempfile
 import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Callable, Union
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
-try:
-    import xxhash
-    HAS_XXHASH = True
-except ImportError:
-    HAS_XXHASH = False
+from src.services.checksum_cache import file_identity, get_checksum_cache
+from src.services.copy_engine import HAS_XXHASH, CopyEngine, CopyStats
+from src.services.exceptions import CopyCancelledError
+from src.services.journal_log import JournalLog
 
-# 64MB chunk size for file operations
-CHUNK_SIZE = 64 * 1024 * 1024
+logger = logging.getLogger("swn-helper")
 
-# Temp file suffix for atomic writes
-TEMP_SUFFIX = ".swn_temp"
+# Scheduling: files at or above LARGE_FILE_THRESHOLD are copied/verified alone
+# so they get the full bandwidth; smaller ones (stills, sidecars, XML, proxies)
+# are packed into batches that run concurrently, since their cost is per-file
+# open/fsync/rename latency rather than throughput.
+LARGE_FILE_THRESHOLD = 256 * 1024 * 1024
+SMALL_BATCH_BYTES = 256 * 1024 * 1024
+MAX_CONCURRENT_FILES = 8
+
+# Journal saves are batched: at most one every JOURNAL_SAVE_INTERVAL seconds,
+# or sooner once JOURNAL_SAVE_EVERY files have changed state. A file finished
+# but not yet saved is simply redone on resume (writes are temp + rename).
+# Each save appends only the changed files to the journal log (journal_log).
+JOURNAL_SAVE_INTERVAL = 2.0
+JOURNAL_SAVE_EVERY = 64
+
+JOURNAL_DIR = Path.home() / ".swn-dailies-helper" / "journals"
+JOURNAL_SUFFIX = ".journal.jsonl"
+LEGACY_JOURNAL_SUFFIX = ".journal.json"  # Whole-document JSON journals from older versions
 
 
 class FileState(str, Enum):
@@ -195,7 +214,8 @@ class RobustFileEntry:
 class OffloadJournal:
     """
     Journal file for resumable offload operations.
-    Saved atomically after each significant state change.
+    Stored as an append-only JournalLog: the job fields are its header and
+    each file entry one of its items.
     """
     job_id: str
     source_path: str
@@ -227,13 +247,18 @@ class OffloadJournal:
     job_signature: Optional[str] = None
 
     def to_dict(self) -> Dict:
+        data = self.header_dict()
+        data["files"] = [f.to_dict() for f in self.files]
+        return data
+
+    def header_dict(self) -> Dict:
+        """Everything but the file entries."""
         return {
             "job_id": self.job_id,
             "source_path": self.source_path,
             "destination_paths": self.destination_paths,
             "phase": self.phase,
             "current_file_index": self.current_file_index,
-            "files": [f.to_dict() for f in self.files],
             "project_id": self.project_id,
             "camera_label": self.camera_label,
             "roll_name": self.roll_name,
@@ -340,115 +365,82 @@ def _drop_os_cache(file_path: Path) -> None:
         pass
 
 
-def _compute_dual_checksum(file_path: Path, progress_callback=None) -> FileChecksum:
+def _to_checksum(digests: Dict[str, str]) -> FileChecksum:
+    return FileChecksum(xxhash64=digests.get("xxhash64", ""), sha256=digests.get("sha256", ""))
+
+
+def _compute_dual_checksum(file_path: Path, progress_callback=None, engine: Optional[CopyEngine] = None) -> FileChecksum:
     """
     Compute both xxHash64 and SHA-256 checksums in a single pass.
     """
-    if HAS_XXHASH:
-        xxhasher = xxhash.xxh64()
-    else:
-        xxhasher = None
-    sha_hasher = hashlib.sha256()
-
-    file_size = file_path.stat().st_size
-    bytes_read = 0
-
-    with open(file_path, 'rb') as f:
-        while True:
-            chunk = f.read(CHUNK_SIZE)
-            if not chunk:
-                break
-
-            if xxhasher:
-                xxhasher.update(chunk)
-            sha_hasher.update(chunk)
-
-            bytes_read += len(chunk)
-            if progress_callback:
-                progress_callback(bytes_read, file_size)
-
-    return FileChecksum(
-        xxhash64=xxhasher.hexdigest() if xxhasher else "",
-        sha256=sha_hasher.hexdigest()
-    )
+    result = (engine or CopyEngine()).hash_file(file_path, progress_callback, drop_cache=False)
+    return _to_checksum(result.digests)
 
 
 def _atomic_write_with_checksum(
     source_path: Path,
-    dest_path: Path,
+    dest_paths: List[Path],
+    labels: Optional[List[str]] = None,
     progress_callback=None,
-) -> Tuple[FileChecksum, bool]:
+    is_cancelled=None,
+    engine: Optional[CopyEngine] = None,
+) -> Tuple[FileChecksum, CopyStats]:
     """
-    Copy file with atomic write pattern:
-    1. Write to temp file
+    Copy file to every destination with atomic write pattern:
+    1. Write to temp files (one read of the source, all destinations in parallel)
     2. fsync to ensure data is on disk
-    3. Rename to final path (atomic on most filesystems)
+    3. Rename to final paths (atomic on most filesystems)
 
-    Returns (checksum, success)
+    Returns (checksum, stats). Temp files are removed on failure.
     """
-    temp_path = dest_path.parent / (dest_path.name + TEMP_SUFFIX)
-
-    # Ensure destination directory exists
-    dest_path.parent.mkdir(parents=True, exist_ok=True)
-
-    if HAS_XXHASH:
-        xxhasher = xxhash.xxh64()
-    else:
-        xxhasher = None
-    sha_hasher = hashlib.sha256()
+    result = (engine or CopyEngine()).copy(
+        source_path,
+        dest_paths,
+        labels=labels,
+        progress_callback=progress_callback,
+        is_cancelled=is_cancelled,
+    )
+    return _to_checksum(result.digests), result.stats
 
-    file_size = source_path.stat().st_size
-    bytes_copied = 0
 
-    try:
-        with open(source_path, 'rb') as src:
-            with open(temp_path, 'wb') as dst:
-                while True:
-                    chunk = src.read(CHUNK_SIZE)
-                    if not chunk:
-                        break
-
-                    # Update checksums
-                    if xxhasher:
-                        xxhasher.update(chunk)
-                    sha_hasher.update(chunk)
-
-                    # Write to temp file
-                    dst.write(chunk)
-
-                    bytes_copied += len(chunk)
-                    if progress_callback:
-                        progress_callback(bytes_copied, file_size)
-
-                # fsync to ensure data is on disk
-                dst.flush()
-                os.fsync(dst.fileno())
-
-        # Also fsync parent directory (important on Linux)
-        if platform.system() != "Windows":
-            dir_fd = os.open(str(dest_path.parent), os.O_RDONLY)
-            try:
-                os.fsync(dir_fd)
-            finally:
-                os.close(dir_fd)
+def plan_batches(
+    entries: List["RobustFileEntry"],
+    large_threshold: int = LARGE_FILE_THRESHOLD,
+    batch_bytes: int = SMALL_BATCH_BYTES,
+    max_files: int = MAX_CONCURRENT_FILES,
+) -> List[List["RobustFileEntry"]]:
+    """
+    Group files into batches; the files of a batch run concurrently and
+    batches run one after another.
 
-        # Atomic rename
-        temp_path.rename(dest_path)
+    Each large file is a batch of its own, in journal order. Small files are
+    bin-packed first-fit decreasing into batches of at most max_files files
+    and batch_bytes bytes, so one batch never mixes a near-threshold file
+    with a long tail of tiny ones beyond the byte budget.
+    """
+    batches = [[entry] for entry in entries if entry.file_size >= large_threshold]
 
-        checksum = FileChecksum(
-            xxhash64=xxhasher.hexdigest() if xxhasher else "",
-            sha256=sha_hasher.hexdigest()
-        )
-        return checksum, True
+    small = sorted(
+        (entry for entry in entries if entry.file_size < large_threshold),
+        key=lambda entry: entry.file_size,
+        reverse=True,
+    )
+    open_bins: List[List[Any]] = []  # [bytes, entries]; dropped once full
+    for entry in small:
+        for bin_ in open_bins:
+            if bin_[0] + entry.file_size <= batch_bytes:
+                bin_[0] += entry.file_size
+                bin_[1].append(entry)
+                if len(bin_[1]) >= max_files:
+                    open_bins.remove(bin_)
+                break
+        else:
+            bin_ = [entry.file_size, [entry]]
+            batches.append(bin_[1])
+            if max_files > 1:
+                open_bins.append(bin_)
 
-    except Exception as e:
-        # Clean up temp file on failure
-        if temp_path.exists():
-            try:
-                temp_path.unlink()
-            except:
-                pass
-        raise
+    return batches
 
 
 class RobustOffloadWorker(QThread):
@@ -462,6 +454,7 @@ class RobustOffloadWorker(QThread):
     - Two-copy minimum before safe-to-format
     - Resumable operations via journal
     - Full audit trail in manifest
+    - Size-aware scheduling: small files run concurrently, large ones alone
     """
 
     # Signals
@@ -477,17 +470,36 @@ class RobustOffloadWorker(QThread):
         self,
         journal: OffloadJournal,
         verify_source: bool = True,  # Re-read source after copy
+        direct_io: bool = False,  # O_DIRECT reads/writes where supported
+        max_concurrent_files: int = MAX_CONCURRENT_FILES,  # Small files in flight at once
         parent=None
     ):
         super().__init__(parent)
         self.journal = journal
         self.verify_source = verify_source
+        self.max_concurrent_files = max(1, max_concurrent_files)
         self._cancelled = False
 
-        # Journal persistence path
-        self.journal_dir = Path.home() / ".swn-dailies-helper" / "journals"
+        # File entries are updated from the batch threads; _journal_lock keeps
+        # journal snapshots consistent, _save_lock orders the writes
+        self._journal_lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._unsaved_changes = 0
+        self._last_journal_save = 0.0
+        self._positions = {id(f): idx for idx, f in enumerate(journal.files)}
+        self._changed_files: set = set()  # Indexes to append on the next save
+
+        # Pipelined copy/hash engine and its per-stage throughput
+        self.engine = CopyEngine(direct_io=direct_io)
+        self.copy_stats = CopyStats()
+        self.verify_stats = CopyStats()
+
+        # Journal persistence; the first save writes a compacted log
+        self.journal_dir = JOURNAL_DIR
         self.journal_dir.mkdir(parents=True, exist_ok=True)
-        self.journal_path = self.journal_dir / f"{journal.job_id}.journal.json"
+        self.journal_path = self.journal_dir / f"{journal.job_id}{JOURNAL_SUFFIX}"
+        self._journal_log = JournalLog(self.journal_path)
+        self._legacy_journal_path: Optional[Path] = None
 
     @classmethod
     def create_new(
@@ -501,6 +513,8 @@ class RobustOffloadWorker(QThread):
         verify_source: bool = True,
         generate_mhl: bool = True,
         mhl_format: str = "standard",
+        direct_io: bool = False,
+        max_concurrent_files: int = MAX_CONCURRENT_FILES,
         parent=None,
     ) -> "RobustOffloadWorker":
         """Create a new offload job."""
@@ -529,31 +543,74 @@ class RobustOffloadWorker(QThread):
             ]
         )
 
-        return cls(journal=journal, verify_source=verify_source, parent=parent)
+        return cls(
+            journal=journal,
+            verify_source=verify_source,
+            direct_io=direct_io,
+            max_concurrent_files=max_concurrent_files,
+            parent=parent,
+        )
 
     @classmethod
-    def resume_from_journal(cls, journal_path: Path, parent=None) -> "RobustOffloadWorker":
+    def resume_from_journal(cls, journal_path: Path, direct_io: bool = False, parent=None) -> "RobustOffloadWorker":
         """Resume an interrupted offload from a journal file."""
-        with open(journal_path) as f:
-            data = json.load(f)
-        journal = OffloadJournal.from_dict(data)
-        return cls(journal=journal, parent=parent)
+        journal_path = Path(journal_path)
+        if journal_path.name.endswith(LEGACY_JOURNAL_SUFFIX):
+            worker = cls(journal=load_journal(journal_path), direct_io=direct_io, parent=parent)
+            # Replaced by a journal log on the first save
+            worker._legacy_journal_path = journal_path
+            return worker
+
+        # Keep appending to the replayed log (it is compacted first if its tail was torn)
+        log = JournalLog(journal_path)
+        header, files = log.replay()
+        worker = cls(journal=_journal_from_records(header, files), direct_io=direct_io, parent=parent)
+        if log.path == worker.journal_path:
+            worker._journal_log = log
+        return worker
 
     def cancel(self):
         """Request cancellation."""
         self._cancelled = True
 
-    def _save_journal(self):
-        """Atomically save journal state."""
-        self.journal.updated_at = datetime.now().isoformat()
-
-        temp_path = self.journal_path.with_suffix('.tmp')
-        with open(temp_path, 'w') as f:
-            json.dump(self.journal.to_dict(), f, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
-
-        temp_path.rename(self.journal_path)
+    def _save_journal(self, compact: bool = False):
+        """
+        Persist the journal: append the header and the files changed since the
+        last save, or rewrite the whole log when compaction is due (or asked for).
+        """
+        with self._save_lock:
+            with self._journal_lock:
+                self.journal.updated_at = datetime.now().isoformat()
+                header = self.journal.header_dict()
+                files = self.journal.files
+                compact = compact or self._journal_log.compaction_due(1 + len(self._changed_files), len(files))
+                if compact:
+                    items = [f.to_dict() for f in files]
+                else:
+                    changed = {idx: files[idx].to_dict() for idx in self._changed_files}
+                self._changed_files.clear()
+                self._unsaved_changes = 0
+                self._last_journal_save = time.monotonic()
+
+            if compact:
+                self._journal_log.compact(header, items)
+                if self._legacy_journal_path:
+                    self._legacy_journal_path.unlink(missing_ok=True)
+                    self._legacy_journal_path = None
+            else:
+                self._journal_log.append(header, len(files), changed)
+
+    def _journal_changed(self, file_entry: RobustFileEntry):
+        """Note a file state change, saving the journal if a batched save is due."""
+        with self._journal_lock:
+            self._changed_files.add(self._positions[id(file_entry)])
+            self._unsaved_changes += 1
+            due = (
+                self._unsaved_changes >= JOURNAL_SAVE_EVERY
+                or time.monotonic() - self._last_journal_save >= JOURNAL_SAVE_INTERVAL
+            )
+        if due:
+            self._save_journal()
 
     def run(self):
         """Main worker execution."""
@@ -561,74 +618,47 @@ class RobustOffloadWorker(QThread):
             self._run_offload()
         except Exception as e:
             self.journal.phase = OffloadPhase.FAILED.value
-            self._save_journal()
+            self._save_journal(compact=True)
             self.offload_completed.emit(False, f"Offload failed: {e}", self.journal.get_stats())
 
     def _run_offload(self):
         """Execute the offload operation."""
-        source_path = Path(self.journal.source_path)
-        total_files = len(self.journal.files)
-
         # Phase 1: Copy all files
         self.journal.phase = OffloadPhase.COPYING.value
         self.phase_changed.emit("Copying files")
         self._save_journal()
 
-        for idx, file_entry in enumerate(self.journal.files):
-            if self._cancelled:
-                self.status_message.emit("Offload cancelled")
-                self._save_journal()
-                self.offload_completed.emit(False, "Cancelled by user", self.journal.get_stats())
-                return
-
-            # Skip already copied files (for resume)
-            if file_entry.state not in [FileState.PENDING.value, FileState.COPYING.value]:
-                continue
-
-            self.journal.current_file_index = idx
-            self.progress_updated.emit(idx + 1, total_files, file_entry.file_name)
-            self.status_message.emit(f"Copying {file_entry.file_name}...")
+        pending = [
+            f for f in self.journal.files
+            if f.state in (FileState.PENDING.value, FileState.COPYING.value)  # Skip copied files (resume)
+        ]
+        self._run_batches(pending, "Copying", self._copy_single_file)
+        self._save_journal()
 
-            try:
-                self._copy_single_file(file_entry, source_path)
-            except Exception as e:
-                file_entry.state = FileState.FAILED.value
-                file_entry.error_message = str(e)
-                self.file_completed.emit(file_entry.file_name, False, str(e))
-                self._save_journal()
-                continue
+        if self._cancelled:
+            self.status_message.emit("Offload cancelled")
+            self.offload_completed.emit(False, "Cancelled by user", self.journal.get_stats())
+            return
 
-            self._save_journal()
+        if self.copy_stats.bytes:
+            logger.info(f"Offload copy throughput: {self.copy_stats.summary()}")
 
         # Phase 2: Verify all destinations
         self.journal.phase = OffloadPhase.VERIFYING.value
         self.phase_changed.emit("Verifying copies")
         self._save_journal()
 
-        for idx, file_entry in enumerate(self.journal.files):
-            if self._cancelled:
-                self.status_message.emit("Verification cancelled")
-                self._save_journal()
-                self.offload_completed.emit(False, "Cancelled by user", self.journal.get_stats())
-                return
-
-            # Skip failed or already verified files
-            if file_entry.state == FileState.FAILED.value:
-                continue
-            if file_entry.state == FileState.FULLY_VERIFIED.value:
-                continue
-
-            self.progress_updated.emit(idx + 1, total_files, file_entry.file_name)
-            self.status_message.emit(f"Verifying {file_entry.file_name}...")
-
-            try:
-                self._verify_single_file(file_entry, source_path)
-            except Exception as e:
-                file_entry.state = FileState.FAILED.value
-                file_entry.error_message = str(e)
-                self.file_completed.emit(file_entry.file_name, False, str(e))
+        pending = [
+            f for f in self.journal.files
+            if f.state not in (FileState.FAILED.value, FileState.FULLY_VERIFIED.value)
+        ]
+        self._run_batches(pending, "Verifying", self._verify_single_file)
+        self._save_journal()
 
-            self._save_journal()
+        if self._cancelled:
+            self.status_message.emit("Verification cancelled")
+            self.offload_completed.emit(False, "Cancelled by user", self.journal.get_stats())
+            return
 
         # Compute job signature
         self.journal.job_signature = self.journal.compute_job_signature()
@@ -639,9 +669,10 @@ class RobustOffloadWorker(QThread):
 
         # Finalize
         stats = self.journal.get_stats()
+        stats["throughput"] = {"copy": self.copy_stats.to_dict(), "verify": self.verify_stats.to_dict()}
         self.journal.phase = OffloadPhase.COMPLETE.value
         self.journal.completed_at = datetime.now().isoformat()
-        self._save_journal()
+        self._save_journal(compact=True)
 
         # Emit safe-to-format signal
         self.safe_to_format.emit(stats["safe_to_format"])
@@ -659,7 +690,52 @@ class RobustOffloadWorker(QThread):
                 stats
             )
 
-    def _copy_single_file(self, file_entry: RobustFileEntry, source_base: Path):
+    def _run_batches(
+        self,
+        entries: List[RobustFileEntry],
+        action: str,
+        process: Callable[[RobustFileEntry, Path, bool], None],
+    ):
+        """
+        Run process(entry, source_base, report_progress) over entries batch by
+        batch (see plan_batches). Stops between batches once cancelled; files
+        not reached are left in their current state for resume.
+        """
+        source_path = Path(self.journal.source_path)
+        total_files = len(self.journal.files)
+
+        def run_one(file_entry: RobustFileEntry, report_progress: bool):
+            idx = self._positions[id(file_entry)]
+            self.journal.current_file_index = idx
+            self.progress_updated.emit(idx + 1, total_files, file_entry.file_name)
+            self.status_message.emit(f"{action} {file_entry.file_name}...")
+
+            try:
+                process(file_entry, source_path, report_progress)
+            except CopyCancelledError:
+                # Left for resume; the caller reports the cancellation
+                with self._journal_lock:
+                    file_entry.state = FileState.PENDING.value
+            except Exception as e:
+                with self._journal_lock:
+                    file_entry.state = FileState.FAILED.value
+                    file_entry.error_message = str(e)
+                self.file_completed.emit(file_entry.file_name, False, str(e))
+
+            self._journal_changed(file_entry)
+
+        batches = plan_batches(entries, max_files=self.max_concurrent_files)
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_files, thread_name_prefix="offload") as pool:
+            for batch in batches:
+                if self._cancelled:
+                    return
+                if len(batch) == 1:
+                    # Byte progress only makes sense for a file running alone
+                    run_one(batch[0], True)
+                else:
+                    list(pool.map(run_one, batch, [False] * len(batch)))
+
+    def _copy_single_file(self, file_entry: RobustFileEntry, source_base: Path, report_progress: bool = True):
         """Copy a single file to all destinations with atomic writes."""
         # Build source path
         if file_entry.relative_path:
@@ -670,67 +746,99 @@ class RobustOffloadWorker(QThread):
         if not source_file.exists():
             raise FileNotFoundError(f"Source not found: {source_file}")
 
-        file_entry.state = FileState.COPYING.value
-        file_entry.copy_started_at = datetime.now().isoformat()
-
-        file_size = source_file.stat().st_size
-        bytes_copied = 0
+        with self._journal_lock:
+            file_entry.state = FileState.COPYING.value
+            file_entry.copy_started_at = datetime.now().isoformat()
 
-        # Copy to all destinations with atomic write
+        # Copy to all destinations at once with atomic writes
+        labels = [dest_copy.path for dest_copy in file_entry.destination_copies]
+        dest_files = []
         for dest_copy in file_entry.destination_copies:
             dest_base = Path(dest_copy.path)
             if file_entry.relative_path:
-                dest_file = dest_base / file_entry.relative_path / file_entry.file_name
+                dest_files.append(dest_base / file_entry.relative_path / file_entry.file_name)
             else:
-                dest_file = dest_base / file_entry.file_name
-
-            def progress_cb(current, total):
-                self.file_progress.emit(current, total)
-
-            checksum, success = _atomic_write_with_checksum(
-                source_file,
-                dest_file,
-                progress_callback=progress_cb
-            )
+                dest_files.append(dest_base / file_entry.file_name)
+
+        def progress_cb(current, total):
+            self.file_progress.emit(current, total)
+
+        checksum, stats = _atomic_write_with_checksum(
+            source_file,
+            dest_files,
+            labels=labels,
+            progress_callback=progress_cb if report_progress else None,
+            is_cancelled=lambda: self._cancelled,
+            engine=self.engine,
+        )
 
-            if not success:
-                raise RuntimeError(f"Failed to copy to {dest_file}")
+        # Paths and state change together so a journal snapshot never pairs
+        # full destination paths with a file that would be copied again
+        with self._journal_lock:
+            self.copy_stats.merge(stats)
 
             # Store checksum (same for all copies since from same source read)
             if not file_entry.source_checksum_on_copy:
                 file_entry.source_checksum_on_copy = checksum
 
-            dest_copy.path = str(dest_file)  # Update to full path
+            for dest_copy, dest_file in zip(file_entry.destination_copies, dest_files):
+                dest_copy.path = str(dest_file)  # Update to full path
 
-        file_entry.state = FileState.COPY_COMPLETE.value
-        file_entry.copy_completed_at = datetime.now().isoformat()
+            file_entry.state = FileState.COPY_COMPLETE.value
+            file_entry.copy_completed_at = datetime.now().isoformat()
         self.file_completed.emit(file_entry.file_name, True, "")
 
-    def _verify_single_file(self, file_entry: RobustFileEntry, source_base: Path):
+    def _verify_single_file(self, file_entry: RobustFileEntry, source_base: Path, report_progress: bool = True):
         """
         Verify a file by:
         1. Reading each destination copy and checking checksum
         2. Optionally re-reading source (bypasses OS cache) to verify original
         """
-        file_entry.state = FileState.VERIFYING_DEST.value
+        with self._journal_lock:
+            file_entry.state = FileState.VERIFYING_DEST.value
 
-        # Verify each destination copy
-        verified_count = 0
+        # Read every destination copy in parallel
+        identities = {}
+        errors = {}  # id(dest_copy) -> error, applied with the results below
         for dest_copy in file_entry.destination_copies:
             dest_path = Path(dest_copy.path)
 
             if not dest_path.exists():
-                dest_copy.error = "File not found"
+                errors[id(dest_copy)] = "File not found"
                 continue
 
+            # Drop cache before reading for true verification
+            _drop_os_cache(dest_path)
             try:
-                # Drop cache before reading for true verification
-                _drop_os_cache(dest_path)
+                identities[dest_path] = file_identity(dest_path)
+            except OSError as e:
+                errors[id(dest_copy)] = str(e)
 
-                def progress_cb(current, total):
-                    self.file_progress.emit(current, total)
+        def progress_cb(current, total):
+            self.file_progress.emit(current, total)
+
+        results = self.engine.hash_files(
+            list(identities), progress_cb if report_progress else None, drop_cache=False
+        )
+
+        # Copies and state change together, as in _copy_single_file, so a
+        # journal snapshot never holds a half-verified entry
+        verified = []  # (path, checksum) to cache once the lock is released
+        with self._journal_lock:
+            for dest_copy in file_entry.destination_copies:
+                dest_path = Path(dest_copy.path)
+                if id(dest_copy) in errors:
+                    dest_copy.error = errors[id(dest_copy)]
+                    continue
+                result = results.get(dest_path)
+                if result is None:
+                    continue
+                if isinstance(result, Exception):
+                    dest_copy.error = str(result)
+                    continue
 
-                dest_checksum = _compute_dual_checksum(dest_path, progress_cb)
+                self.verify_stats.merge(result.stats)
+                dest_checksum = _to_checksum(result.digests)
                 dest_copy.checksum = dest_checksum
 
                 # Compare with source checksum
@@ -738,18 +846,22 @@ class RobustOffloadWorker(QThread):
                     (not HAS_XXHASH or dest_checksum.xxhash64 == file_entry.source_checksum_on_copy.xxhash64)):
                     dest_copy.verified = True
                     dest_copy.verified_at = datetime.now().isoformat()
-                    verified_count += 1
+                    verified.append((dest_path, dest_checksum))
                 else:
                     dest_copy.error = "Checksum mismatch"
-            except Exception as e:
-                dest_copy.error = str(e)
 
-        file_entry.state = FileState.DEST_VERIFIED.value
+            file_entry.state = FileState.DEST_VERIFIED.value
+            if self.verify_source:
+                file_entry.state = FileState.VERIFYING_SOURCE.value
+
+        for dest_path, dest_checksum in verified:
+            self._cache_checksum(dest_path, identities[dest_path], dest_checksum)
+        verified_count = len(verified)
 
         # Optionally re-read source to verify against OS cache
+        source_reread = None
+        source_error = None
         if self.verify_source:
-            file_entry.state = FileState.VERIFYING_SOURCE.value
-
             # Build source path
             if file_entry.relative_path:
                 source_file = source_base / file_entry.relative_path / file_entry.file_name
@@ -761,28 +873,40 @@ class RobustOffloadWorker(QThread):
                     # Drop cache to ensure we read from disk
                     _drop_os_cache(source_file)
 
-                    source_reread = _compute_dual_checksum(source_file)
-                    file_entry.source_checksum_reread = source_reread
-
-                    # Compare with original checksum
-                    if source_reread.sha256 == file_entry.source_checksum_on_copy.sha256:
-                        file_entry.source_verified = True
-                    else:
-                        file_entry.error_message = "Source checksum changed during offload!"
+                    source_reread = _compute_dual_checksum(source_file, engine=self.engine)
                 except Exception as e:
-                    file_entry.error_message = f"Source re-read failed: {e}"
-        else:
-            file_entry.source_verified = True  # Skip source re-verification
+                    source_error = f"Source re-read failed: {e}"
 
-        # Check if fully verified
-        if file_entry.source_verified and verified_count >= 1:
-            file_entry.all_copies_verified = True
-            file_entry.state = FileState.FULLY_VERIFIED.value
-            file_entry.verification_completed_at = datetime.now().isoformat()
-        else:
-            file_entry.state = FileState.FAILED.value
-            if not file_entry.error_message:
-                file_entry.error_message = f"Only {verified_count} copies verified"
+        with self._journal_lock:
+            if not self.verify_source:
+                file_entry.source_verified = True  # Skip source re-verification
+            elif source_reread is not None:
+                file_entry.source_checksum_reread = source_reread
+
+                # Compare with original checksum
+                if source_reread.sha256 == file_entry.source_checksum_on_copy.sha256:
+                    file_entry.source_verified = True
+                else:
+                    file_entry.error_message = "Source checksum changed during offload!"
+            elif source_error:
+                file_entry.error_message = source_error
+
+            # Check if fully verified
+            if file_entry.source_verified and verified_count >= 1:
+                file_entry.all_copies_verified = True
+                file_entry.state = FileState.FULLY_VERIFIED.value
+                file_entry.verification_completed_at = datetime.now().isoformat()
+            else:
+                file_entry.state = FileState.FAILED.value
+                if not file_entry.error_message:
+                    file_entry.error_message = f"Only {verified_count} copies verified"
+
+    def _cache_checksum(self, path: Path, identity: tuple, checksum: FileChecksum):
+        """Remember a verified copy's checksums so uploading it needs no re-hash."""
+        try:
+            get_checksum_cache().store(path, identity, xxhash64=checksum.xxhash64, sha256=checksum.sha256)
+        except Exception as e:
+            logger.warning(f"Could not cache checksum for {path}: {e}")
 
     def _generate_mhl_manifests(self):
         """
@@ -897,11 +1021,49 @@ class RobustOffloadWorker(QThread):
             self.status_message.emit(f"Generated {len(generated_mhl_paths)} {format_name} manifest(s)")
 
 
-def export_manifest_for_audit(journal: OffloadJournal, output_path: Path) -> Path:
+def _journal_from_records(header: Dict[str, Any], files: List[Dict[str, Any]]) -> OffloadJournal:
+    data = dict(header)
+    data["files"] = files
+    return OffloadJournal.from_dict(data)
+
+
+def load_journal(journal_path: Path) -> OffloadJournal:
+    """Load a journal by replaying its log (or reading a legacy JSON journal)."""
+    journal_path = Path(journal_path)
+    if journal_path.name.endswith(LEGACY_JOURNAL_SUFFIX):
+        with open(journal_path) as f:
+            return OffloadJournal.from_dict(json.load(f))
+    return _journal_from_records(*JournalLog(journal_path).replay())
+
+
+def read_journal_header(journal_path: Path) -> Tuple[Dict[str, Any], int]:
+    """
+    Return a journal's job fields and file count without loading its files.
+
+    For a journal log only the tail is read, back to the latest header.
+    """
+    journal_path = Path(journal_path)
+    if journal_path.name.endswith(LEGACY_JOURNAL_SUFFIX):
+        with open(journal_path) as f:
+            data = json.load(f)
+        return data, len(data.get("files", []))
+
+    header = JournalLog.read_header(journal_path)
+    if header is None:
+        raise ValueError(f"No journal header in {journal_path}")
+    return header
+
+
+def export_manifest_for_audit(journal: Union[OffloadJournal, Path], output_path: Path) -> Path:
     """
     Export a human-readable manifest file for audit purposes.
     This can be verified later without the camera card present.
+
+    Accepts a loaded journal or the path of a journal to load.
     """
+    if not isinstance(journal, OffloadJournal):
+        journal = load_journal(journal)
+
     manifest = {
         "manifest_version": "2.0",
         "job_id": journal.job_id,
@@ -942,27 +1104,27 @@ def export_manifest_for_audit(journal: OffloadJournal, output_path: Path) -> Pat
     manifest_json = json.dumps(manifest, indent=2, sort_keys=True)
     manifest["manifest_checksum"] = hashlib.sha256(manifest_json.encode()).hexdigest()
 
+    # One write of the encoded document rather than json.dump's many small ones
     output_file = output_path / f"offload_manifest_{journal.job_id[:8]}.json"
     with open(output_file, 'w') as f:
-        json.dump(manifest, f, indent=2)
+        f.write(json.dumps(manifest, indent=2))
 
     return output_file
 
 
 def get_pending_journals() -> List[Path]:
     """Find all incomplete journal files for resume."""
-    journal_dir = Path.home() / ".swn-dailies-helper" / "journals"
-    if not journal_dir.exists():
+    if not JOURNAL_DIR.exists():
         return []
 
     pending = []
-    for journal_file in journal_dir.glob("*.journal.json"):
+    journal_files = list(JOURNAL_DIR.glob(f"*{JOURNAL_SUFFIX}")) + list(JOURNAL_DIR.glob(f"*{LEGACY_JOURNAL_SUFFIX}"))
+    for journal_file in journal_files:
         try:
-            with open(journal_file) as f:
-                data = json.load(f)
-            if data.get("phase") not in [OffloadPhase.COMPLETE.value, OffloadPhase.FAILED.value]:
+            header, _ = read_journal_header(journal_file)
+            if header.get("phase") not in [OffloadPhase.COMPLETE.value, OffloadPhase.FAILED.value]:
                 pending.append(journal_file)
-        except:
+        except Exception:
             continue
 
     return pending
@@ -17,7 +17,14 @@ import httpx
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from src.services.config import ConfigManager
-from src.services.checksum import calculate_xxh64
+from src.services.checksum import create_hasher
+from src.services.checksum_cache import file_identity, get_checksum_cache
+from src.services.multipart_uploader import (
+    DEFAULT_PART_SIZE,
+    DEFAULT_PART_WORKERS,
+    DesktopMultipartAPI,
+    MultipartUploader,
+)
 from src.services.exceptions import (
     UploadError,
     PresignedUrlError,
@@ -71,12 +78,16 @@ class UploaderService:
 
     API_BASE = "https://vnvvoelid6.execute-api.us-east-1.amazonaws.com"
     CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB chunks for progress tracking
+    MULTIPART_THRESHOLD = 64 * 1024 * 1024  # Larger files go up as resumable multipart uploads
 
     def __init__(self, config: ConfigManager):
         self.config = config
         self._cancel_flag = False
         self._current_jobs: List[UploadJob] = []
         self._progress_callback: Optional[Callable[[int, float, str], None]] = None
+        self._http: Optional[httpx.Client] = None
+        self._multipart: Optional[MultipartUploader] = None
+        self._multipart_lock = threading.Lock()
 
     def set_progress_callback(self, callback: Callable[[int, float, str], None]):
         """Set callback for progress updates: (job_index, progress_percent, status_text)"""
@@ -118,6 +129,39 @@ class UploaderService:
         self._cancel_flag = False
         self._current_jobs = []
 
+    def _get_multipart_uploader(self) -> MultipartUploader:
+        """Shared multipart uploader; all parts of all jobs reuse one connection pool."""
+        with self._multipart_lock:
+            if self._multipart is None:
+                api_key = self.config.get_api_key()
+                if not api_key:
+                    raise APIKeyNotFoundError()
+                settings = self.config.get_upload_settings()
+                workers = settings.get("part_workers", DEFAULT_PART_WORKERS)
+                parallel = settings.get("parallel_uploads", 3)
+                self._http = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=workers * parallel + 4,
+                        max_keepalive_connections=workers * parallel,
+                    ),
+                    timeout=httpx.Timeout(30.0, write=300.0, read=300.0),
+                )
+                self._multipart = MultipartUploader(
+                    api=DesktopMultipartAPI(self.API_BASE, api_key, self._http),
+                    client=self._http,
+                    part_size=settings.get("part_size_mb", DEFAULT_PART_SIZE // (1024 * 1024)) * 1024 * 1024,
+                    max_workers=workers,
+                )
+            return self._multipart
+
+    def close(self):
+        """Close the shared HTTP connection pool."""
+        with self._multipart_lock:
+            if self._http is not None:
+                self._http.close()
+            self._http = None
+            self._multipart = None
+
     def get_presigned_url(
         self,
         project_id: str,
@@ -280,16 +324,102 @@ class UploaderService:
         retry_prefix = f"[Retry {job.retry_count}/{3}] " if job.retry_count > 0 else ""
         self._notify_progress(job_index, 0, f"{retry_prefix}Getting upload URL for {job.file_name}...")
 
-        # Calculate checksum first if verification enabled (and not already calculated)
+        # Reuse the offload's (or an earlier upload's) checksum if the file is
+        # unchanged; otherwise hash the same buffers we upload
+        hasher = None
+        identity = None
         if verify_checksum and not job.checksum:
-            self._notify_progress(job_index, 0, f"{retry_prefix}Calculating checksum for {job.file_name}...")
-            job.checksum = calculate_xxh64(str(job.file_path))
+            job.checksum = self._cached_checksum(job.file_path)
+            if not job.checksum:
+                identity = file_identity(job.file_path)
+                hasher = create_hasher()
+
+        if job.file_size >= self.MULTIPART_THRESHOLD:
+            self._upload_multipart(job, job_index, project_id, retry_prefix, hasher)
+        else:
+            self._upload_single(job, job_index, project_id, card_id, retry_prefix, hasher)
 
         if self._cancel_flag:
             job.status = UploadStatus.CANCELLED
             return False
 
-        # Get presigned URL
+        if hasher is not None:
+            job.checksum = hasher.hexdigest()
+            self._remember_checksum(job.file_path, identity, job.checksum)
+
+        # Verify with server if checksum was calculated
+        if verify_checksum and job.checksum and job.s3_key:
+            job.status = UploadStatus.VERIFYING
+            self._notify_progress(job_index, 100, f"{retry_prefix}Verifying {job.file_name}...")
+
+            try:
+                confirm_result = self.confirm_upload(
+                    project_id=project_id,
+                    s3_key=job.s3_key,
+                    checksum=job.checksum,
+                    file_size=job.file_size,
+                    file_name=job.file_name,
+                )
+                # Store clip_id from confirmation
+                job.clip_id = confirm_result.get("clip_id")
+                logger.info(f"Upload confirmed: {job.file_name} -> clip_id={job.clip_id}")
+            except FileUploadError as e:
+                # Checksum mismatch - this is a real failure
+                raise
+            except Exception as e:
+                # Log but don't fail on confirmation errors (file is already uploaded)
+                logger.warning(f"Upload confirmation failed for {job.file_name}: {e}")
+
+        # Mark complete
+        job.status = UploadStatus.COMPLETE
+        job.progress = 100
+        self._notify_progress(job_index, 100, f"Complete: {job.file_name}")
+        return True
+
+    def _cached_checksum(self, file_path: Path) -> Optional[str]:
+        """Checksum from the cache if this exact file version was hashed before."""
+        try:
+            return get_checksum_cache().lookup_xxh64(file_path)
+        except Exception as e:
+            logger.warning(f"Checksum cache lookup failed for {file_path}: {e}")
+            return None
+
+    def _remember_checksum(self, file_path: Path, identity: tuple, checksum: str):
+        try:
+            get_checksum_cache().store_xxh64(file_path, identity, checksum)
+        except Exception as e:
+            logger.warning(f"Could not cache checksum for {file_path}: {e}")
+
+    def _upload_multipart(self, job: UploadJob, job_index: int, project_id: str, retry_prefix: str, hasher=None):
+        """Stream a large file as a parallel multipart upload, resuming saved parts."""
+        self._notify_progress(job_index, job.progress, f"{retry_prefix}Uploading {job.file_name}...")
+
+        def on_progress(done: int, total: int):
+            job.progress = (done / total) * 100 if total else 100
+            self._notify_progress(job_index, job.progress, f"{retry_prefix}Uploading {job.file_name}... {job.progress:.0f}%")
+
+        state = self._get_multipart_uploader().upload(
+            job.file_path,
+            project_id=project_id,
+            content_type=job.content_type,
+            file_name=job.file_name,
+            progress_callback=on_progress,
+            is_cancelled=lambda: self._cancel_flag,
+            hasher=hasher,
+        )
+        job.s3_key = state.s3_key
+        logger.info(f"Multipart upload complete: {job.file_name} -> {job.s3_key} ({state.total_parts} parts)")
+
+    def _upload_single(
+        self,
+        job: UploadJob,
+        job_index: int,
+        project_id: str,
+        card_id: Optional[str],
+        retry_prefix: str,
+        hasher=None,
+    ):
+        """Upload a small file with one presigned PUT, streamed (and hashed) from disk."""
         upload_info = self.get_presigned_url(
             project_id=project_id,
             file_name=job.file_name,
@@ -306,37 +436,27 @@ class UploaderService:
             raise PresignedUrlError(f"No upload URL returned. Response: {upload_info}")
 
         logger.info(f"Uploading to S3 key: {job.s3_key}")
-
-        # Upload with progress tracking
         self._notify_progress(job_index, 0, f"{retry_prefix}Uploading {job.file_name}...")
 
-        with open(job.file_path, "rb") as f:
-            file_data = f.read()
-
-        # Track upload progress
-        total_size = len(file_data)
-        uploaded = 0
-
-        def upload_progress():
-            nonlocal uploaded
-            while uploaded < total_size and not self._cancel_flag:
-                progress = (uploaded / total_size) * 100
-                job.progress = progress
-                self._notify_progress(job_index, progress, f"{retry_prefix}Uploading {job.file_name}... {progress:.0f}%")
-                time.sleep(0.5)
-
-        progress_thread = threading.Thread(target=upload_progress, daemon=True)
-        progress_thread.start()
+        def read_chunks():
+            sent = 0
+            with open(job.file_path, "rb") as f:
+                while chunk := f.read(self.CHUNK_SIZE):
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    yield chunk
+                    sent += len(chunk)
+                    job.progress = (sent / job.file_size) * 100 if job.file_size else 100
+                    self._notify_progress(job_index, job.progress, f"{retry_prefix}Uploading {job.file_name}... {job.progress:.0f}%")
 
         try:
             with httpx.Client() as client:
                 response = client.put(
                     upload_url,
-                    content=file_data,
-                    headers={"Content-Type": job.content_type},
+                    content=read_chunks(),
+                    headers={"Content-Type": job.content_type, "Content-Length": str(job.file_size)},
                     timeout=600.0,  # 10 minutes for large files
                 )
-                uploaded = total_size
         except httpx.TimeoutException as e:
             raise FileUploadError(job.file_name, f"Upload timed out: {e}")
         except httpx.ConnectError as e:
@@ -344,8 +464,6 @@ class UploaderService:
         except Exception as e:
             raise FileUploadError(job.file_name, f"Upload failed: {type(e).__name__}: {e}")
 
-        progress_thread.join(timeout=1)
-
         if response.status_code not in (200, 204):
             # Try to get error details from response
             error_body = ""
@@ -355,39 +473,6 @@ class UploaderService:
                 pass
             raise FileUploadError(job.file_name, f"S3 upload failed with status {response.status_code}: {error_body}")
 
-        if self._cancel_flag:
-            job.status = UploadStatus.CANCELLED
-            return False
-
-        # Verify with server if checksum was calculated
-        if verify_checksum and job.checksum and job.s3_key:
-            job.status = UploadStatus.VERIFYING
-            self._notify_progress(job_index, 100, f"{retry_prefix}Verifying {job.file_name}...")
-
-            try:
-                confirm_result = self.confirm_upload(
-                    project_id=project_id,
-                    s3_key=job.s3_key,
-                    checksum=job.checksum,
-                    file_size=job.file_size,
-                    file_name=job.file_name,
-                )
-                # Store clip_id from confirmation
-                job.clip_id = confirm_result.get("clip_id")
-                logger.info(f"Upload confirmed: {job.file_name} -> clip_id={job.clip_id}")
-            except FileUploadError as e:
-                # Checksum mismatch - this is a real failure
-                raise
-            except Exception as e:
-                # Log but don't fail on confirmation errors (file is already uploaded)
-                logger.warning(f"Upload confirmation failed for {job.file_name}: {e}")
-
-        # Mark complete
-        job.status = UploadStatus.COMPLETE
-        job.progress = 100
-        self._notify_progress(job_index, 100, f"Complete: {job.file_name}")
-        return True
-
     def _register_completed_jobs(
         self,
         jobs: List[UploadJob],
@@ -20,7 +20,7 @@ from src.services.offload_manifest import OffloadManifestService, OffloadManifes
 from src.services.offload_worker import OffloadWorker, format_bytes
 from src.services.robust_offload_worker import (
     RobustOffloadWorker, OffloadJournal, RobustFileEntry,
-    DestinationCopy, export_manifest_for_audit, get_pending_journals
+    DestinationCopy, export_manifest_for_audit, get_pending_journals, read_journal_header
 )
 from src.services.session_manager import SessionManager
 from src.services.overnight_worker import OvernightUploadWorker
@@ -805,6 +805,7 @@ class OffloadPage(QWidget):
             verify_source=True,  # Re-read source to bypass OS cache
             generate_mhl=self.offload_options.get("generate_mhl", True),
             mhl_format=self.offload_options.get("mhl_format", "standard"),
+            direct_io=self.config.get_offload_settings().get("direct_io", False),
         )
 
         self.current_journal = self.robust_worker.journal
@@ -829,6 +830,7 @@ class OffloadPage(QWidget):
             source_path=str(source.path),
             destinations=destinations,
             verify_checksums=self.offload_options.get("verify_checksum", True),
+            direct_io=self.config.get_offload_settings().get("direct_io", False),
         )
 
         # Connect signals
@@ -1175,12 +1177,10 @@ class OffloadPage(QWidget):
                 pending_info = []
                 for journal_path in pending[:5]:  # Show max 5
                     try:
-                        with open(journal_path) as f:
-                            import json
-                            data = json.load(f)
+                        data, file_count = read_journal_header(journal_path)
                         pending_info.append(
                             f"- {data.get('camera_label', 'Unknown')}: "
-                            f"{len(data.get('files', []))} files, "
+                            f"{file_count} files, "
                             f"phase: {data.get('phase', 'unknown')}"
                         )
                     except:
@@ -1215,7 +1215,10 @@ class OffloadPage(QWidget):
         journal_path = journal_paths[0]
 
         try:
-            self.robust_worker = RobustOffloadWorker.resume_from_journal(journal_path)
+            self.robust_worker = RobustOffloadWorker.resume_from_journal(
+                journal_path,
+                direct_io=self.config.get_offload_settings().get("direct_io", False),
+            )
             self.current_journal = self.robust_worker.journal
 
             # Connect signals